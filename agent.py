@@ -0,0 +1,290 @@
+# agent.py
+#
+# Modo agente: sirve por HTTP las sondas de system_info.py como JSON para que
+# fleet.py (u otra herramienta) recoja el inventario de muchos equipos sin
+# intervención manual.
+#
+#   GET /health                       estado del agente
+#   GET /probes                       sondas disponibles en este equipo
+#   GET /snapshot?probes=cpu,ram      ejecuta las sondas (todas las del informe
+#                    &timeout=20      si no se indican) y devuelve una línea por
+#                                     sonda con el mismo formato que main.py
+#                    &since=SUMA      devuelve un mensaje de snapshot_delta.py:
+#                                     solo los cambios desde la respuesta con
+#                                     esa suma de control, o la respuesta
+#                                     completa si el agente ya no la recuerda
+#                                     (since vacío pide siempre la completa)
+#
+# El servidor habla HTTP/1.1 con keep-alive (el agregador reutiliza la conexión
+# entre peticiones) y comprime con gzip si el cliente lo acepta. Peticiones
+# iguales que llegan a la vez comparten una única ejecución de las sondas y su
+# resultado se reutiliza durante `max_age` segundos, para que varios
+# agregadores no multipliquen las consultas WMI.
+#
+# Con --history el agente además graba las métricas del equipo y los cambios de
+# inventario de cada ejecución en history_store.py.
+#
+# Uso:
+#   python agent.py                          # 127.0.0.1:8765
+#   python agent.py --bind 0.0.0.0 --token secreto --max-age 5
+#   python agent.py --history                # y graba el historial del equipo
+
+import argparse
+import gzip
+import hmac
+import json
+import platform
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+
+import system_info
+import hw_report
+import snapshot_delta
+from hw_report import probe_line
+
+
+AGENT_VERSION = 1
+DEFAULT_PORT = 8765
+DEFAULT_MAX_AGE = 2.0
+MIN_GZIP_BYTES = 1024
+
+# Campos de la respuesta que cambian en cada ejecución y no se comparan en los
+# deltas (además de los volátiles de los registros)
+RESPONSE_VOLATILE_FIELDS = dict(snapshot_delta.VOLATILE_FIELDS)
+RESPONSE_VOLATILE_FIELDS[None] = {"time", "seconds", "taken_at", "wall_seconds"}
+
+
+class _Pending:
+    """Ejecución en curso que comparten las peticiones iguales"""
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SnapshotService:
+    """Ejecuta las sondas pedidas; une peticiones iguales y reutiliza resultados recientes"""
+
+    def __init__(self, max_age=DEFAULT_MAX_AGE, max_workers=6, journal=None):
+        self.max_age = max_age
+        self.journal = journal  # history_store.SnapshotJournal opcional
+        self.max_workers = max_workers
+        self.host = platform.node()
+        self.started_at = time.time()
+        self._lock = threading.Lock()
+        self._pending = {}      # clave -> _Pending
+        self._results = {}      # clave -> (monotonic, respuesta)
+        self._encoders = {}     # clave -> snapshot_delta.DeltaEncoder
+        self.runs = 0
+
+    def snapshot(self, names, timeout=None):
+        key = (tuple(names), timeout)
+        with self._lock:
+            cached = self._results.get(key)
+            if cached is not None and time.monotonic() - cached[0] <= self.max_age:
+                return cached[1]
+            pending = self._pending.get(key)
+            owner = pending is None
+            if owner:
+                pending = self._pending[key] = _Pending()
+
+        if not owner:
+            # Otra petición igual está en curso: se comparte su resultado
+            pending.done.wait()
+            if pending.error is not None:
+                raise RuntimeError(pending.error)
+            return pending.result
+
+        try:
+            pending.result = self._run(names, timeout)
+        except Exception as e:
+            pending.error = str(e)
+            raise
+        finally:
+            with self._lock:
+                now = time.monotonic()
+                if pending.result is not None:
+                    self._results[key] = (now, pending.result)
+                for old in [k for k, (at, _) in self._results.items() if now - at > self.max_age and k != key]:
+                    del self._results[old]
+                del self._pending[key]
+            pending.done.set()
+        return pending.result
+
+    def delta(self, names, timeout=None, since=None):
+        """Mensaje completo o delta (snapshot_delta.py) respecto a la respuesta `since`"""
+        response = self.snapshot(names, timeout)
+        key = (tuple(names), timeout)
+        with self._lock:
+            encoder = self._encoders.get(key)
+            if encoder is None:
+                encoder = self._encoders[key] = snapshot_delta.DeltaEncoder(volatile=RESPONSE_VOLATILE_FIELDS)
+            return encoder.encode(response, since=since)
+
+    def _run(self, names, timeout):
+        lines = []
+        timeouts = None if timeout is None else {name: timeout for name in names}
+        report = hw_report.run_report(
+            names, max_workers=self.max_workers, timeouts=timeouts,
+            on_probe=lambda timing, record: lines.append(
+                probe_line(timing, record, self.host, system_info.backend)),
+        )
+        self.runs += 1
+        if self.journal is not None:
+            try:
+                self.journal.record_snapshot(report.snapshot)
+            except OSError as e:
+                print(f"No se pudo guardar el historial: {e}", file=sys.stderr)
+        return {
+            "host": self.host,
+            "backend": system_info.backend,
+            "taken_at": report.started_at,
+            "wall_seconds": round(report.wall_seconds, 4),
+            "probes": lines,
+        }
+
+    def health(self):
+        return {
+            "agent": AGENT_VERSION,
+            "host": self.host,
+            "backend": system_info.backend,
+            "uptime": round(time.time() - self.started_at, 1),
+            "runs": self.runs,
+        }
+
+
+class AgentHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"       # Keep-alive: la conexión se reutiliza
+    server_version = f"ARKToolsPC-Agent/{AGENT_VERSION}"
+
+    def log_message(self, format, *args):
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+    def _send_json(self, status, data):
+        body = json.dumps(data, ensure_ascii=False, default=str).encode("utf-8")
+        gzipped = len(body) >= MIN_GZIP_BYTES and "gzip" in self.headers.get("Accept-Encoding", "")
+        if gzipped:
+            body = gzip.compress(body, compresslevel=5)
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        if gzipped:
+            self.send_header("Content-Encoding", "gzip")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _authorized(self):
+        token = self.server.token
+        if not token:
+            return True
+        given = self.headers.get("Authorization", "")
+        return hmac.compare_digest(given.encode(), f"Bearer {token}".encode())
+
+    def do_GET(self):
+        if not self._authorized():
+            self._send_json(401, {"error": "No autorizado"})
+            return
+
+        url = urlsplit(self.path)
+        query = parse_qs(url.query, keep_blank_values=True)
+        service = self.server.service
+
+        if url.path == "/health":
+            self._send_json(200, service.health())
+        elif url.path == "/probes":
+            self._send_json(200, {"probes": list(system_info.PROBES)})
+        elif url.path == "/snapshot":
+            names = [n for value in query.get("probes", []) for n in value.split(",") if n]
+            names = list(dict.fromkeys(names)) or list(hw_report.REPORT_PROBES)
+            unknown = [n for n in names if n not in system_info.PROBES]
+            if unknown:
+                self._send_json(400, {"error": f"Sondas desconocidas: {', '.join(unknown)}"})
+                return
+            try:
+                timeout = float(query["timeout"][0]) if "timeout" in query else None
+            except ValueError:
+                self._send_json(400, {"error": "timeout no válido"})
+                return
+            try:
+                if "since" in query:
+                    since = query.get("since", [""])[0]
+                    self._send_json(200, service.delta(names, timeout, since=since or None))
+                else:
+                    self._send_json(200, service.snapshot(names, timeout))
+            except Exception as e:
+                self._send_json(500, {"error": str(e)})
+        else:
+            self._send_json(404, {"error": f"Ruta desconocida: {url.path}"})
+
+
+class AgentServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, service=None, token=None, quiet=False):
+        super().__init__(address, AgentHandler)
+        self.service = service or SnapshotService()
+        self.token = token
+        self.quiet = quiet
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+def serve_in_thread(bind="127.0.0.1", port=0, **kwargs):
+    """Arranca un agente en un hilo (port=0 elige un puerto libre); devuelve el servidor"""
+    server = AgentServer((bind, port), **kwargs)
+    threading.Thread(target=server.serve_forever, name=f"Agent-{server.server_address[1]}",
+                     daemon=True).start()
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Agente de inventario de ARKToolsPC (HTTP)")
+    parser.add_argument("--bind", default="127.0.0.1", help="Dirección de escucha (127.0.0.1 por defecto)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--token", help="Exige la cabecera 'Authorization: Bearer TOKEN'")
+    parser.add_argument("--max-age", type=float, default=DEFAULT_MAX_AGE,
+                        help="Segundos durante los que se reutiliza un resultado")
+    parser.add_argument("--backend", help="Fuerza el backend (windows, linux)")
+    parser.add_argument("--history", nargs="?", const="", metavar="CARPETA",
+                        help="Graba métricas y cambios de inventario (carpeta por defecto si no se indica)")
+    parser.add_argument("-q", "--quiet", action="store_true", help="Sin registro de peticiones")
+    args = parser.parse_args(argv)
+
+    if args.backend:
+        try:
+            system_info.set_backend(args.backend.lower())
+        except ValueError as e:
+            parser.error(str(e))
+
+    store = recorder = None
+    if args.history is not None:
+        import history_store
+        store = history_store.HistoryStore(args.history or None)
+        recorder = history_store.HistoryRecorder(store).start()
+
+    service = SnapshotService(max_age=args.max_age, journal=store.journal if store else None)
+    server = AgentServer((args.bind, args.port), service=service, token=args.token, quiet=args.quiet)
+    print(f"Agente ARKToolsPC en {server.url} ({system_info.backend})", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if recorder is not None:
+            recorder.stop()
+            store.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,23 +4,14 @@ import tkinter as tk
 from tkinter import ttk, Menu
 from ttkthemes import ThemedTk
 
-# Importamos las funciones desde system_info.py
-from system_info import (
-    get_system_info,
-    get_cpu_info,
-    get_ram_info,
-    get_disk_info,
-    get_gpu_info,
-    get_motherboard_info,
-    get_network_info,
-    get_nic_info,       
-    get_audio_devices,  
-    get_com_ports,      
-    get_usb_devices,
-    get_bluetooth_devices,
-    get_os_info,
-    get_regional_settings
-    )
+# Sondas de system_info.py: se recolectan como registros y se muestran con renderers.py
+from system_info import collect, refresh_static
+from renderers import render_text
+import cpu_sampler
+from hw_report import run_report
+from tk_monitor import MonitorWindow
+from device_table import table_for
+from tk_device_table import DeviceTableFrame
 
 class ARKToolsPCApp:
     def __init__(self, root):
@@ -30,6 +21,9 @@ class ARKToolsPCApp:
         self.root.minsize(800, 600)
         self.root.resizable(True, True)
 
+        # El uso de CPU se muestrea en segundo plano desde el arranque
+        cpu_sampler.start()
+
         # Estilo
         self.style = ttk.Style()
         self.style.configure("TButton", padding=10, font=("Segoe UI", 10))
@@ -56,13 +50,16 @@ class ARKToolsPCApp:
         # Área de contenido
         self.content_text = tk.Text(self.main_frame, wrap="word", bg="black", fg="white", font=("Consolas", 10))        
         self.content_text.pack(fill="both", expand=True, padx=10, pady=10)
+
+        # Tabla para las listas de dispositivos (ocupa el lugar del área de texto)
+        self.device_table = DeviceTableFrame(self.main_frame)
         
         # Botón Salir (en el área principal)
-        exit_button_frame = ttk.Frame(self.main_frame)
-        exit_button_frame.pack(side="bottom", fill="x", padx=10, pady=10)
+        self.exit_button_frame = ttk.Frame(self.main_frame)
+        self.exit_button_frame.pack(side="bottom", fill="x", padx=10, pady=10)
 
         exit_button = ttk.Button(
-            exit_button_frame,
+            self.exit_button_frame,
             text="Salir de la Aplicación",
             style="Exit.TButton",     # Aplica el estilo personalizado
             command=self.exit_app
@@ -90,30 +87,34 @@ class ARKToolsPCApp:
         hardware_menu = Menu(herramientas_menu, tearoff=0)
 
         # Submenú: Información del Hardware
-        hardware_menu.add_command(label="Sistema", command=lambda: self.show_content(get_system_info))
-        hardware_menu.add_command(label="CPU", command=lambda: self.show_content(get_cpu_info))
-        hardware_menu.add_command(label="Memoria RAM", command=lambda: self.show_content(get_ram_info))
-        hardware_menu.add_command(label="Disco", command=lambda: self.show_content(get_disk_info))
-        hardware_menu.add_command(label="GPU", command=lambda: self.show_content(get_gpu_info))
-        hardware_menu.add_command(label="Placa Base", command=lambda: self.show_content(get_motherboard_info))
-        hardware_menu.add_command(label="Tarjetas de Red", command=lambda: self.show_content(get_nic_info))
-        hardware_menu.add_command(label="Tarjetas de Audio", command=lambda: self.show_content(get_audio_devices))
-        hardware_menu.add_command(label="Puertos COM", command=lambda: self.show_content(get_com_ports))
-        hardware_menu.add_command(label="Dispositivos USB", command=lambda: self.show_content(get_usb_devices))
-        hardware_menu.add_command(label="Dispositivos Bluetooth", command=lambda: self.show_content(get_bluetooth_devices))
+        hardware_menu.add_command(label="Sistema", command=lambda: self.show_content("system"))
+        hardware_menu.add_command(label="CPU", command=lambda: self.show_content("cpu"))
+        hardware_menu.add_command(label="Memoria RAM", command=lambda: self.show_content("ram"))
+        hardware_menu.add_command(label="Disco", command=lambda: self.show_content("disk"))
+        hardware_menu.add_command(label="GPU", command=lambda: self.show_content("gpu"))
+        hardware_menu.add_command(label="Placa Base", command=lambda: self.show_content("motherboard"))
+        hardware_menu.add_command(label="Tarjetas de Red", command=lambda: self.show_content("nic"))
+        hardware_menu.add_command(label="Tarjetas de Audio", command=lambda: self.show_content("audio"))
+        hardware_menu.add_command(label="Puertos COM", command=lambda: self.show_content("com"))
+        hardware_menu.add_command(label="Dispositivos USB", command=lambda: self.show_content("usb"))
+        hardware_menu.add_command(label="Dispositivos Bluetooth", command=lambda: self.show_content("bluetooth"))
 
         herramientas_menu.add_cascade(label="Información del Hardware", menu=hardware_menu)
         #herramientas_menu.add_command(label="Otra herramienta (pendiente)", command=lambda: self.show_placeholder("Herramienta Pendiente"))
-        herramientas_menu.add_command(label="Información de Red", command=lambda: self.show_content(get_network_info))
-        herramientas_menu.add_command(label="Información del Sistema Operativo", command=lambda: self.show_content(get_os_info))
-        herramientas_menu.add_command(label="Configuración Regional", command=lambda: self.show_content(get_regional_settings))
+        herramientas_menu.add_command(label="Información de Red", command=lambda: self.show_content("network"))
+        herramientas_menu.add_command(label="Salida de ipconfig /all", command=lambda: self.show_content("ipconfig"))
+        herramientas_menu.add_command(label="Información del Sistema Operativo", command=lambda: self.show_content("os"))
+        herramientas_menu.add_command(label="Configuración Regional", command=lambda: self.show_content("regional"))
+        herramientas_menu.add_command(label="Monitor en vivo...", command=self.show_monitor)
+        herramientas_menu.add_separator()
+        herramientas_menu.add_command(label="Actualizar datos de hardware (sin caché)", command=refresh_static)
         menubar.add_cascade(label="Herramientas", menu=herramientas_menu)
         
         # Menú "Informes"
         informes_menu = Menu(menubar, tearoff=0)
         sub_informes_menu = Menu(informes_menu, tearoff=0)
 
-        sub_informes_menu.add_command(label="Informe de Hardware", command=lambda: self.show_placeholder("Informe de Hardware"))
+        sub_informes_menu.add_command(label="Informe de Hardware", command=self.show_report)
 
         informes_menu.add_cascade(label="Generar Informe", menu=sub_informes_menu)
         menubar.add_cascade(label="Informes", menu=informes_menu)
@@ -124,32 +125,83 @@ class ARKToolsPCApp:
         ayuda_menu.add_command(label="Acerca de...", command=self.show_about)
         menubar.add_cascade(label="Ayuda", menu=ayuda_menu)
 
-    def show_content(self, func):
-        """Muestra el resultado de una función en el área de texto"""
-        from io import StringIO
-        import sys
+    def show_content(self, *probes):
+        """Recolecta las sondas indicadas y muestra sus registros (como tabla si son listas de dispositivos)"""
+        snapshot = collect(probes)
+        table = table_for(snapshot[probes[0]]) if len(probes) == 1 else None
+        if table is not None:
+            self.device_table.set_table(table)
+            self.content_text.pack_forget()
+            self.device_table.pack(fill="both", expand=True, padx=10, pady=10, before=self.exit_button_frame)
+            return
+
+        output = render_text(snapshot)
+        self.show_text()
+        self.content_text.delete(1.0, tk.END)
+        self.content_text.insert(tk.END, output)
+        self.content_text.see(tk.END)
 
-        old_stdout = sys.stdout
-        redirected_output = StringIO()
-        sys.stdout = redirected_output
+    def show_text(self):
+        """Vuelve a mostrar el área de texto en lugar de la tabla"""
+        if not self.content_text.winfo_manager():
+            self.device_table.pack_forget()
+            self.device_table.clear()
+            self.content_text.pack(fill="both", expand=True, padx=10, pady=10, before=self.exit_button_frame)
+
+    def show_monitor(self):
+        """Abre el monitor en vivo; solo muestrea mientras la ventana está abierta"""
+        monitor_window = getattr(self, "monitor_window", None)
+        if monitor_window is not None and monitor_window.window.winfo_exists():
+            monitor_window.window.lift()
+            return
+        self.monitor_window = MonitorWindow(self.root)
+
+    def show_report(self):
+        """Genera el informe de hardware en un hilo aparte sin bloquear la ventana"""
+        import threading
+
+        if getattr(self, "report_thread", None) is not None and self.report_thread.is_alive():
+            return  # Ya hay un informe en curso
+
+        self.report_result = None
+        self.report_error = None
+        self.report_thread = threading.Thread(target=self._run_report, daemon=True)
+        self.report_thread.start()
+
+        self.show_text()
+        self.content_text.delete(1.0, tk.END)
+        self.content_text.insert(tk.END, "Generando informe de hardware...")
+        self.root.after(100, self._poll_report)
 
+    def _run_report(self):
         try:
-            func()  # Ejecutar función
-        finally:
-            sys.stdout = old_stdout
+            self.report_result = run_report()
+        except Exception as e:
+            self.report_error = str(e) or type(e).__name__
 
-        output = redirected_output.getvalue()
+    def _poll_report(self):
+        """Comprueba desde el hilo de Tk si el informe terminó (Tk no es seguro entre hilos)"""
+        if self.report_thread.is_alive():
+            self.root.after(100, self._poll_report)
+            return
+
+        self.show_text()
         self.content_text.delete(1.0, tk.END)
-        self.content_text.insert(tk.END, output)
+        if self.report_result is None:
+            self.content_text.insert(tk.END, f"No se pudo generar el informe de hardware: {self.report_error}")
+            return
+        self.content_text.insert(tk.END, render_text(self.report_result))
         self.content_text.see(tk.END)
 
     def show_placeholder(self, tool_name):
         """Muestra un mensaje temporal para herramientas no implementadas"""
+        self.show_text()
         self.content_text.delete(1.0, tk.END)
         self.content_text.insert(tk.END, f"[PENDIENTE] {tool_name} - Funcionalidad aún no implementada.")
 
     def show_about(self):
         """Muestra información 'Acerca de...'"""
+        self.show_text()
         self.content_text.delete(1.0, tk.END)
         about_text = (
             "ARKToolsPC - Diagnóstico de Hardware\n"
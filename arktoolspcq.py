@@ -4,34 +4,69 @@
 # Versión: 1.0.6
 # Este script es una aplicación de escritorio que permite obtener información detallada del hardware del sistema.
 
+import multiprocessing
 import sys
+import time
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QTextEdit,
-    QMenuBar, QMenu, QPushButton, QMessageBox, QLabel, QHBoxLayout, QMessageBox
+    QMenuBar, QMenu, QPushButton, QMessageBox, QLabel, QHBoxLayout, QMessageBox,
+    QFileDialog, QStackedWidget, QInputDialog
 )
 from PyQt6.QtGui import QAction, QTextCursor, QPalette, QColor
 from PyQt6.QtCore import Qt
 
-# Importa las funciones de system_info.py (igual que en tu versión original)
-from system_info import (
-    get_system_info, 
-    get_cpu_info, 
-    get_ram_info, 
-    get_disk_info,
-    get_gpu_info, 
-    get_motherboard_info, 
-    get_network_info,
-    get_nic_info, 
-    get_audio_devices, 
-    get_com_ports,
-    get_usb_devices, 
-    get_bluetooth_devices, 
-    get_os_info,
-    get_regional_settings,
-    set_regional_settings,
-    show_current_datetime,
-    show_regional_and_datetime    
-)
+# Sondas de system_info.py: se recolectan como registros y se muestran con renderers.py
+from system_info import collect, set_regional_settings, refresh_static
+from renderers import render_html, render_json
+from records import Snapshot, HardwareReport, CPUInfo, DiskInfo, RAMInfo
+from hw_report import run_report
+import cpu_sampler
+from qt_workers import TaskDispatcher
+import diagnostics
+from qt_diagnostics import DiagnosticsDialog
+from qt_monitor import MonitorDialog
+from device_table import table_for
+from qt_device_table import DeviceTableView
+from inventory_search import InventoryIndex
+from qt_search import SearchDialog
+import disk_bench
+import mem_bench
+import cpu_bench
+
+# Sondas del submenú "Información del Hardware" (texto del menú, nombre de la sonda)
+HARDWARE_PROBES = [
+    ("Sistema", "system"),
+    ("CPU", "cpu"),
+    ("Memoria RAM", "ram"),
+    ("Disco", "disk"),
+    ("GPU", "gpu"),
+    ("Placa Base", "motherboard"),
+    ("Tarjetas de Red", "nic"),
+    ("Tarjetas de Audio", "audio"),
+    ("Puertos COM", "com"),
+    ("Dispositivos USB", "usb"),
+    ("Dispositivos Bluetooth", "bluetooth")
+]
+
+PROBE_LABELS = dict((probe, text) for text, probe in HARDWARE_PROBES)
+PROBE_LABELS.update({
+    "network": "Red",
+    "ipconfig": "ipconfig /all",
+    "os": "Sistema Operativo",
+    "regional": "Configuración Regional",
+    "datetime": "Fecha y Hora",
+    "report": "Informe de Hardware",
+    "disk_bench": "Prueba de rendimiento de disco",
+    "mem_bench": "Prueba de rendimiento de memoria",
+    "cpu_bench": "Prueba de rendimiento de CPU",
+})
+
+
+def request_label(key):
+    """Texto de una petición: una tupla de sondas o una clave con nombre ("report")"""
+    if isinstance(key, tuple):
+        return " + ".join(PROBE_LABELS.get(p, p) for p in key)
+    return PROBE_LABELS.get(key, str(key))
 
 class ARKToolsPCApp(QMainWindow):
     def __init__(self):
@@ -40,6 +75,30 @@ class ARKToolsPCApp(QMainWindow):
         self.setGeometry(100, 100, 800, 600)
         self.setMinimumSize(800, 600)
 
+        # Registros recolectados durante la sesión (para exportar sin re-consultar)
+        self.collected = Snapshot()
+        # Índice de búsqueda sobre lo recolectado; se actualiza por sonda al llegar cada resultado
+        self.search_index = InventoryIndex()
+        self.search_dialog = None
+        # Pruebas de disco de la sesión (volumen -> DiskBenchmark), mostradas con cada consulta de discos
+        self.disk_benchmarks = {}
+        # Última prueba de memoria de la sesión, mostrada con cada consulta de RAM
+        self.memory_benchmark = None
+        # Última prueba de CPU de la sesión, mostrada con cada consulta de CPU
+        self.cpu_benchmark = None
+
+        # El uso de CPU se muestrea en segundo plano desde el arranque
+        cpu_sampler.start()
+
+        # Las sondas se ejecutan en un pool de hilos; la última petición es la que se muestra
+        self.current_request = None
+        self.dispatcher = TaskDispatcher(self.statusBar(), parent=self)
+        self.dispatcher.result_ready.connect(self.on_probe_result)
+        self.dispatcher.task_failed.connect(self.on_probe_failed)
+        self.dispatcher.task_cancelled.connect(self.on_probe_cancelled)
+        self.diagnostics_dialog = None
+        self.monitor_dialog = None
+
         # Configurar paleta de colores
         palette = self.palette()
         palette.setColor(QPalette.ColorRole.Window, QColor(240, 240, 240))  # Fondo gris claro
@@ -109,10 +168,14 @@ class ARKToolsPCApp(QMainWindow):
         layout = QVBoxLayout(central_widget)
         layout.setContentsMargins(10, 10, 10, 10)
 
-        # Área de texto
+        # Área de contenido: texto, o tabla para las listas de dispositivos
         self.content_text = QTextEdit()
         self.content_text.setReadOnly(True)
-        layout.addWidget(self.content_text)
+        self.device_table = DeviceTableView()
+        self.content_stack = QStackedWidget()
+        self.content_stack.addWidget(self.content_text)
+        self.content_stack.addWidget(self.device_table)
+        layout.addWidget(self.content_stack)
 
         # Contenedor para botones inferiores
         button_bottom_layout = QHBoxLayout()
@@ -145,6 +208,7 @@ class ARKToolsPCApp(QMainWindow):
         file_menu = menubar.addMenu("Archivo")
         file_menu.addAction("Nuevo")
         file_menu.addAction("Abrir")
+        file_menu.addAction("Exportar resultados (JSON)...", self.export_json)
         file_menu.addSeparator()
         exit_action = QAction("Salir", self)
         exit_action.triggered.connect(self.close)
@@ -163,34 +227,32 @@ class ARKToolsPCApp(QMainWindow):
         
         # Submenú: Hardware
         hardware_menu = tools_menu.addMenu("Información del Hardware")
-        hardware_actions = [
-            ("Sistema", get_system_info),
-            ("CPU", get_cpu_info),
-            ("Memoria RAM", get_ram_info),
-            ("Disco", get_disk_info),
-            ("GPU", get_gpu_info),
-            ("Placa Base", get_motherboard_info),
-            ("Tarjetas de Red", get_nic_info),
-            ("Tarjetas de Audio", get_audio_devices),
-            ("Puertos COM", get_com_ports),
-            ("Dispositivos USB", get_usb_devices),
-            ("Dispositivos Bluetooth", get_bluetooth_devices)
-        ]
-        
-        for text, func in hardware_actions:
+        for text, probe in HARDWARE_PROBES:
             action = QAction(text, self)
-            action.triggered.connect(lambda _, f=func: self.show_content(f))
+            action.triggered.connect(lambda _, p=probe: self.show_content(p))
             hardware_menu.addAction(action)
 
         # Otras herramientas
-        tools_menu.addAction("Información de Red", lambda: self.show_content(get_network_info))
-        tools_menu.addAction("Información del SO", lambda: self.show_content(get_os_info))
-        tools_menu.addAction("Configuración Regional", lambda: self.show_content(get_regional_settings))
+        tools_menu.addAction("Información de Red", lambda: self.show_content("network"))
+        tools_menu.addAction("Salida de ipconfig /all", lambda: self.show_content("ipconfig"))
+        tools_menu.addAction("Información del SO", lambda: self.show_content("os"))
+        tools_menu.addAction("Configuración Regional", lambda: self.show_content("regional"))
+        tools_menu.addAction("Monitor en vivo...", self.show_monitor)
+        tools_menu.addAction("Prueba de rendimiento de disco...", self.run_disk_benchmark)
+        tools_menu.addAction("Prueba de rendimiento de memoria...", self.run_memory_benchmark)
+        tools_menu.addAction("Prueba de rendimiento de CPU...", self.run_cpu_benchmark)
+        search_action = QAction("Buscar en el inventario...", self)
+        search_action.setShortcut("Ctrl+F")
+        search_action.triggered.connect(self.show_search)
+        tools_menu.addAction(search_action)
+        tools_menu.addSeparator()
+        tools_menu.addAction("Actualizar datos de hardware (sin caché)", self.refresh_hardware_cache)
+        tools_menu.addAction("Diagnóstico de rendimiento...", self.show_diagnostics)
         
 
         # Menú: Informes
         reports_menu = menubar.addMenu("Informes")
-        reports_menu.addAction("Informe de Hardware", lambda: self.show_placeholder("Informe de Hardware"))
+        reports_menu.addAction("Informe de Hardware", self.show_report)
 
         # Menú: Ayuda
         help_menu = menubar.addMenu("Ayuda")
@@ -230,34 +292,188 @@ class ARKToolsPCApp(QMainWindow):
         if response == QMessageBox.StandardButton.Yes:
             try:
                 action()  # Ejecutar la función pasada como parámetro
-                self.show_content(get_regional_settings)  # Mostrar la nueva configuración inmediatamente
-                self.show_content(show_current_datetime)  # Ejemplos
-                self.show_content(show_regional_and_datetime) 
+                self.show_content("regional", "datetime")  # Mostrar la nueva configuración y un ejemplo
                 self.show_notification("Acción Confirmada", "La configuración se ha actualizado correctamente.")
             except Exception as e:
                 self.show_notification("Error", f"No se pudo aplicar la configuración: {e}", is_error=True)
 
-    def show_content(self, func):
-        """Muestra el resultado de una función en el área de texto"""
-        import io
-        import sys
-        from contextlib import redirect_stdout
+    def show_content(self, *probes):
+        """
+        Recolecta las sondas indicadas en segundo plano y muestra sus registros
+        cuando llegan. Repetir la petición mientras está en curso no la duplica.
+        """
+        self.submit_request(probes, lambda: collect(probes))
+
+    def show_report(self):
+        """Genera el informe de hardware completo (todas las sondas en paralelo)"""
+        self.submit_request("report", run_report, pass_cancel=True)
 
-        buffer = io.StringIO()
-        with redirect_stdout(buffer):
-            func()  # Ejecutar la función del módulo system_info
+    def submit_request(self, key, func, pass_cancel=False):
+        label = request_label(key)
+        self.current_request = key
 
+        if not self.dispatcher.submit(key, func, label, pass_cancel=pass_cancel):
+            self.statusBar().showMessage(f"{label}: consulta ya en curso", 2000)
+            return
+
+        self.content_stack.setCurrentWidget(self.content_text)
         self.content_text.clear()
-        self.content_text.setPlainText(buffer.getvalue())
+        self.content_text.setPlainText(f"Consultando {label}...")
+
+    def on_probe_result(self, key, result):
+        """Guarda los registros recibidos y los muestra si son los de la última petición"""
+        snapshot = result.snapshot if isinstance(result, HardwareReport) else result
+        for record in snapshot.records.values():
+            if isinstance(record, DiskInfo):
+                self.disk_benchmarks.update((b.volume, b) for b in record.benchmarks)
+                disk_bench.attach(record, *self.disk_benchmarks.values())
+            elif isinstance(record, RAMInfo):
+                if record.benchmark is not None:
+                    self.memory_benchmark = record.benchmark
+                record.benchmark = self.memory_benchmark
+            elif isinstance(record, CPUInfo):
+                if record.benchmark is not None:
+                    self.cpu_benchmark = record.benchmark
+                record.benchmark = self.cpu_benchmark
+        self.collected.records.update(snapshot.records)
+        self.search_index.update_snapshot(snapshot)
+        if self.search_dialog is not None and self.search_dialog.isVisible():
+            self.search_dialog.refresh()
+        if key != self.current_request:
+            return
+
+        if self.show_table(key, result):
+            return
+
+        start = time.perf_counter()
+        html = render_html(result)
+        rendered = time.perf_counter()
+        self.content_stack.setCurrentWidget(self.content_text)
+        self.content_text.clear()
+        self.content_text.setHtml(html)
         self.content_text.moveCursor(QTextCursor.MoveOperation.End)
+        if diagnostics.enabled:
+            label = request_label(key)
+            diagnostics.add_render(label, "html", rendered - start, len(html))
+            diagnostics.add_render(label, "qt", time.perf_counter() - rendered, len(html))
+
+    def show_table(self, key, result):
+        """Muestra como tabla una sonda suelta con lista de dispositivos; False si no la tiene"""
+        if isinstance(result, HardwareReport) or len(result.records) != 1:
+            return False
+        start = time.perf_counter()
+        table = table_for(next(iter(result.records.values())))
+        if table is None:
+            return False
+        built = time.perf_counter()
+        self.device_table.set_table(table)
+        self.content_stack.setCurrentWidget(self.device_table)
+        if diagnostics.enabled:
+            label = request_label(key)
+            diagnostics.add_render(label, "tabla", built - start, table.total)
+            diagnostics.add_render(label, "qt", time.perf_counter() - built, table.total)
+        return True
+
+    def on_probe_failed(self, key, message):
+        label = request_label(key)
+        if key == self.current_request:
+            self.content_text.setPlainText(f"Error al consultar {label}: {message}")
+        else:
+            self.statusBar().showMessage(f"Error al consultar {label}: {message}", 5000)
+
+    def on_probe_cancelled(self, key):
+        if key == self.current_request:
+            self.content_text.setPlainText(f"[CANCELADO] {request_label(key)}")
+
+    def closeEvent(self, event):
+        """Descarta las consultas pendientes al cerrar la ventana"""
+        self.dispatcher.cancel_all()
+        self.dispatcher.pool.clear()
+        super().closeEvent(event)
+
+    def show_diagnostics(self):
+        """Abre el panel de diagnóstico de rendimiento (no modal)"""
+        if self.diagnostics_dialog is None:
+            self.diagnostics_dialog = DiagnosticsDialog(self)
+        self.diagnostics_dialog.show()
+        self.diagnostics_dialog.raise_()
+
+    def show_monitor(self):
+        """Abre el monitor en vivo (no modal); solo muestrea mientras está abierto"""
+        if self.monitor_dialog is None:
+            self.monitor_dialog = MonitorDialog(parent=self)
+        self.monitor_dialog.show()
+        self.monitor_dialog.raise_()
+
+    def run_disk_benchmark(self):
+        """Mide un volumen en segundo plano; el resultado se muestra junto a la información de discos"""
+        try:
+            choices = disk_bench.volumes()
+        except Exception as e:
+            self.show_notification("Error", f"No se pudieron listar los volúmenes: {e}", is_error=True)
+            return
+        if not choices:
+            self.show_notification("Prueba de disco", "No se encontraron volúmenes con escritura.")
+            return
+        volume, accepted = QInputDialog.getItem(
+            self, "Prueba de rendimiento de disco",
+            f"Volumen (se escribe un archivo temporal de {disk_bench.DEFAULT_SIZE_MB} MB que se borra al terminar):",
+            choices, 0, False)
+        if accepted:
+            self.submit_request(("disk_bench", volume),
+                                lambda cancel: disk_bench.benchmark_snapshot(volume, cancel=cancel),
+                                pass_cancel=True)
+
+    def run_memory_benchmark(self):
+        """Mide la memoria en segundo plano; el resultado se muestra junto a la información de RAM"""
+        self.submit_request("mem_bench", lambda cancel: mem_bench.benchmark_snapshot(cancel=cancel),
+                            pass_cancel=True)
+
+    def run_cpu_benchmark(self):
+        """Mide la CPU en segundo plano (unos 30 s con todos los núcleos al 100 %)"""
+        self.submit_request("cpu_bench", lambda cancel: cpu_bench.benchmark_snapshot(cancel=cancel),
+                            pass_cancel=True)
+
+    def show_search(self):
+        """Abre la búsqueda sobre lo recolectado en la sesión (no modal, no consulta el hardware)"""
+        if self.search_dialog is None:
+            self.search_dialog = SearchDialog(self.search_index, PROBE_LABELS, parent=self)
+        self.search_dialog.refresh()
+        self.search_dialog.show()
+        self.search_dialog.raise_()
+        self.search_dialog.query_edit.setFocus()
+
+    def refresh_hardware_cache(self):
+        """Descarta la caché de hardware fijo; las próximas consultas van directas al hardware"""
+        refresh_static()
+        self.statusBar().showMessage("Caché de hardware descartada", 3000)
+
+    def export_json(self):
+        """Guarda en JSON todo lo recolectado en la sesión, sin volver a consultar el hardware"""
+        if not self.collected.records:
+            self.show_notification("Exportar", "Todavía no se ha recolectado información.")
+            return
+
+        path, _ = QFileDialog.getSaveFileName(self, "Exportar resultados", "arktoolspc.json", "JSON (*.json)")
+        if not path:
+            return
+        try:
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(render_json(self.collected))
+            self.show_notification("Exportar", f"Resultados guardados en {path}")
+        except OSError as e:
+            self.show_notification("Error", f"No se pudo guardar el archivo: {e}", is_error=True)
     
     def clear_content(self):
-        """Limpia el área de contenido (QTextEdit)"""
+        """Limpia el área de contenido (texto y tabla)"""
         self.content_text.clear()
+        self.device_table.clear()
+        self.content_stack.setCurrentWidget(self.content_text)
 
 
     def show_placeholder(self, tool_name):
         """Muestra un mensaje para herramientas no implementadas"""
+        self.content_stack.setCurrentWidget(self.content_text)
         self.content_text.clear()
         self.content_text.setPlainText(f"[PENDIENTE] {tool_name} - Funcionalidad aún no implementada.")
 
@@ -284,6 +500,7 @@ class ARKToolsPCApp(QMainWindow):
         self.centralWidget().layout().addWidget(footer)
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()  # Procesos de cpu_bench.py en el ejecutable empaquetado
     app = QApplication(sys.argv)
     app.setStyle("Fusion")  # Estilo consistente en todos los sistemas
     window = ARKToolsPCApp()
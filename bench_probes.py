@@ -0,0 +1,269 @@
+# bench_probes.py
+#
+# Benchmark de las sondas de system_info.py. Cada sonda se mide:
+#   - en frío: primera llamada con las conexiones WMI, el índice PnP y la
+#     caché de hardware vacíos;
+#   - en caliente: N llamadas repetidas (percentiles de latencia);
+#   - en memoria: pico y bloques retenidos de una llamada (tracemalloc).
+#
+# Las sondas se pueden ejecutar contra el equipo real, contra una grabación
+# de probe_replay.py (con latencia simulada) o contra un equipo sintético.
+# Con --baseline se compara con un resultado anterior y se termina con
+# código 1 si alguna sonda empeora más allá del umbral, y también si con el
+# backend de Windows alguna sonda que siempre consulta WMI no lo hizo.
+#
+# Uso:
+#   python bench_probes.py --fake 400 --json actual.json
+#   python bench_probes.py --fixture cliente.json.gz --latency laggy_wmi
+#   python bench_probes.py --fake --baseline base.json --threshold 0.25
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import system_info
+import wmi_session
+import device_inventory
+import hw_cache
+import probe_replay
+
+
+DEFAULT_WARM_RUNS = 20
+DEFAULT_THRESHOLD = 0.20        # 20 % más lento que la referencia
+DEFAULT_MIN_DELTA_MS = 2.0      # Diferencias menores se consideran ruido
+
+# Sondas que con el backend de Windows consultan WMI siempre en frío; si no lo
+# hacen, la medición no recorre el camino de Windows (por ejemplo, una grabación
+# reproducida en Linux sin sustituir platform.system())
+WINDOWS_WMI_PROBES = ("cpu", "ram", "disk", "gpu", "motherboard", "nic", "audio", "usb", "bluetooth", "os")
+
+
+def percentile(values, p):
+    """Percentil p (0-100) con interpolación lineal"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    k = (len(ordered) - 1) * p / 100
+    low = int(k)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (k - low)
+
+
+def summarize(samples_ms):
+    return {
+        "min": min(samples_ms),
+        "p50": percentile(samples_ms, 50),
+        "p90": percentile(samples_ms, 90),
+        "p99": percentile(samples_ms, 99),
+        "max": max(samples_ms),
+        "mean": statistics.fmean(samples_ms),
+    }
+
+
+def reset_cold_state(use_cache):
+    """Deja las sondas como en el primer uso"""
+    wmi_session.session.invalidate_all()
+    device_inventory.inventory.invalidate()
+    if use_cache:
+        hw_cache.cache.clear()
+
+
+def _timed(func):
+    start = time.perf_counter()
+    record = func()
+    return (time.perf_counter() - start) * 1000, record
+
+
+def _allocations(func):
+    """Pico (KB) y bloques retenidos de una llamada, medidos con tracemalloc"""
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        func()
+        after = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    stats = after.compare_to(before, "filename")
+    return {
+        "peak_kb": peak / 1024,
+        "net_blocks": sum(stat.count_diff for stat in stats),
+        "net_kb": sum(stat.size_diff for stat in stats) / 1024,
+    }
+
+
+def bench_probe(name, warm_runs=DEFAULT_WARM_RUNS, use_cache=False, allocations=True):
+    func = system_info.PROBES[name]
+    result = {"probe": name}
+
+    reset_cold_state(use_cache)
+    stats_before = wmi_session.session.stats()
+    result["cold_ms"], record = _timed(func)
+    stats_after = wmi_session.session.stats()
+    result["cold_wmi_queries"] = stats_after["queries"] - stats_before["queries"]
+    result["cold_wmi_properties"] = stats_after["properties"] - stats_before["properties"]
+    result["error"] = getattr(record, "error", None)
+
+    samples = [_timed(func)[0] for _ in range(warm_runs)]
+    result["warm_ms"] = summarize(samples) if samples else None
+
+    if allocations:
+        result["alloc"] = _allocations(func)
+    return result
+
+
+def run_suite(probes=None, warm_runs=DEFAULT_WARM_RUNS, use_cache=False, allocations=True, progress=None):
+    names = list(system_info.PROBES) if not probes else probes
+    results = {}
+    for name in names:
+        results[name] = bench_probe(name, warm_runs=warm_runs, use_cache=use_cache, allocations=allocations)
+        if progress is not None:
+            progress(results[name])
+    return results
+
+
+def missing_wmi_queries(results, backend):
+    """Sondas de WINDOWS_WMI_PROBES medidas que no hicieron ninguna consulta WMI en frío"""
+    if backend != "windows":
+        return []
+    return [name for name in WINDOWS_WMI_PROBES
+            if name in results and not results[name]["error"] and not results[name]["cold_wmi_queries"]]
+
+
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD, min_delta_ms=DEFAULT_MIN_DELTA_MS):
+    """
+    Sondas que empeoran respecto a la referencia: (sonda, métrica, antes, ahora).
+    Se comparan el tiempo en frío y la mediana en caliente.
+    """
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get("probes", {}).get(name)
+        if previous is None:
+            continue
+        pairs = [("cold_ms", previous.get("cold_ms"), current.get("cold_ms"))]
+        if previous.get("warm_ms") and current.get("warm_ms"):
+            pairs.append(("warm_p50_ms", previous["warm_ms"]["p50"], current["warm_ms"]["p50"]))
+        for metric, before, now in pairs:
+            if before is None or now is None:
+                continue
+            if now > before * (1 + threshold) and now - before > min_delta_ms:
+                regressions.append((name, metric, before, now))
+    return regressions
+
+
+def _print_result(result):
+    warm = result["warm_ms"]
+    alloc = result.get("alloc")
+    line = f"{result['probe']:<12} {result['cold_ms']:>9.2f}"
+    if warm:
+        line += f" {warm['p50']:>9.3f} {warm['p90']:>9.3f} {warm['p99']:>9.3f}"
+    else:
+        line += f" {'-':>9} {'-':>9} {'-':>9}"
+    line += f" {result['cold_wmi_queries']:>5} {result.get('cold_wmi_properties', 0):>7}"
+    if alloc:
+        line += f" {alloc['peak_kb']:>9.1f} {alloc['net_blocks']:>7}"
+    if result["error"]:
+        line += f"  ERROR: {result['error']}"
+    print(line)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark de las sondas de ARKToolsPC")
+    parser.add_argument("probes", nargs="*", help="Sondas a medir (por defecto todas)")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--fixture", metavar="ARCHIVO", help="Grabación de probe_replay.py")
+    source.add_argument("--fake", nargs="?", const=120, type=int, metavar="PNP",
+                        help="Equipo sintético con PNP dispositivos PnP (120 por defecto)")
+    parser.add_argument("--latency", default="none", choices=sorted(probe_replay.LATENCY_PROFILES),
+                        help="Latencia simulada de la grabación")
+    parser.add_argument("--runs", type=int, default=DEFAULT_WARM_RUNS, help="Llamadas en caliente por sonda")
+    parser.add_argument("--cache", action="store_true", help="Mide con la caché de hardware activa")
+    parser.add_argument("--no-alloc", action="store_true", help="No mide memoria (tracemalloc es lento)")
+    parser.add_argument("--json", metavar="ARCHIVO", help="Guarda los resultados en JSON")
+    parser.add_argument("--baseline", metavar="ARCHIVO", help="Resultado anterior con el que comparar")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Empeoramiento relativo tolerado (0.2 = 20 %%)")
+    parser.add_argument("--min-delta", type=float, default=DEFAULT_MIN_DELTA_MS,
+                        help="Diferencia mínima en ms para considerar una regresión")
+    args = parser.parse_args(argv)
+
+    unknown = [name for name in args.probes if name not in system_info.PROBES]
+    if unknown:
+        parser.error(f"Sondas desconocidas: {', '.join(unknown)}")
+
+    replayer = None
+    if args.fixture:
+        replayer = probe_replay.Replayer(probe_replay.load_fixture(args.fixture), latency=args.latency,
+                                         use_cache=args.cache)
+        source_name = os.path.basename(args.fixture)
+    elif args.fake is not None:
+        replayer = probe_replay.Replayer(probe_replay.synthetic_fixture(pnp_devices=args.fake),
+                                         latency=args.latency, use_cache=args.cache)
+        source_name = f"sintético ({args.fake} PnP)"
+    else:
+        source_name = "equipo real"
+
+    # La caché de hardware se mide sobre un archivo temporal: nunca se toca la del usuario
+    user_cache = hw_cache.cache
+    tmp_dir = tempfile.TemporaryDirectory()
+    hw_cache.cache = hw_cache.HardwareCache(path=os.path.join(tmp_dir.name, "hw_cache.json"), enabled=args.cache)
+
+    print(f"Origen: {source_name}, backend: {replayer.backend if replayer else system_info.backend}, "
+          f"latencia: {args.latency if replayer else '-'}, caché: {'sí' if args.cache else 'no'}, "
+          f"{args.runs} llamadas en caliente\n")
+    header = f"{'Sonda':<12} {'Frío ms':>9} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9} {'WMI':>5} {'Props':>7}"
+    if not args.no_alloc:
+        header += f" {'Pico KB':>9} {'Bloques':>7}"
+    print(header)
+    print("-" * 80)
+
+    try:
+        if replayer is not None:
+            replayer.start()
+        results = run_suite(args.probes, warm_runs=args.runs, use_cache=args.cache,
+                            allocations=not args.no_alloc, progress=_print_result)
+    finally:
+        if replayer is not None:
+            replayer.stop()
+        hw_cache.cache = user_cache
+        tmp_dir.cleanup()
+
+    output = {
+        "python": sys.version.split()[0],
+        "source": source_name,
+        "backend": replayer.backend if replayer else system_info.backend,
+        "latency": args.latency if replayer else None,
+        "cache": args.cache,
+        "warm_runs": args.runs,
+        "probes": results,
+    }
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(output, f, indent=2, ensure_ascii=False)
+
+    missing = missing_wmi_queries(results, output["backend"])
+    if missing:
+        print(f"\nSin consultas WMI con el backend de Windows: {', '.join(missing)} "
+              f"(la medición no corresponde al camino de Windows)")
+        return 1
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold, args.min_delta)
+        if regressions:
+            print(f"\nRegresiones (umbral {args.threshold:.0%}, mínimo {args.min_delta:g} ms):")
+            for name, metric, before, now in regressions:
+                print(f"  {name:<12} {metric:<12} {before:9.2f} ms -> {now:9.2f} ms ({now / before - 1:+.0%})")
+            return 1
+        print("\nSin regresiones respecto a la referencia.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,160 @@
+# bench_startup.py
+#
+# Benchmark de arranque: mide cuánto cuesta importar main.py, las dos GUI y
+# system_info.py en un intérprete nuevo (python -X importtime) y lo compara
+# con un presupuesto en milisegundos. Termina con código 1 si algún destino
+# supera su presupuesto o no se puede importar, para poder usarlo en CI; con
+# --allow-missing los destinos que no se pueden importar solo se avisan.
+#
+# Uso:
+#   python bench_startup.py
+#   python bench_startup.py --allow-missing
+#   python bench_startup.py --runs 9 --top 5 --budget main=120 --json startup.json
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+
+# Presupuesto de importación (ms, mediana) de cada destino
+DEFAULT_BUDGETS = {
+    "system_info": 120.0,
+    "main": 130.0,
+    "arktoolspc": 450.0,     # tkinter + ttkthemes
+    "arktoolspcq": 650.0,    # PyQt6
+}
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def parse_importtime(stderr):
+    """Convierte la salida de -X importtime en {módulo: (propio_us, acumulado_us)}"""
+    times = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3:
+            continue
+        self_us, cumulative_us, name = parts
+        times[name.strip()] = (int(self_us), int(cumulative_us))
+    return times
+
+
+def measure_once(target):
+    """Importa `target` en un proceso nuevo. Devuelve (ms de importación o None si falla, ms de proceso, tiempos o error)"""
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {target}"],
+        cwd=REPO_DIR,
+        capture_output=True,
+        text=True,
+    )
+    process_ms = (time.perf_counter() - start) * 1000
+    if result.returncode != 0:
+        return None, process_ms, result.stderr.strip().splitlines()[-1:] or ["error"]
+
+    times = parse_importtime(result.stderr)
+    if target not in times:
+        return None, process_ms, ["sin datos de importtime"]
+    return times[target][1] / 1000, process_ms, times
+
+
+def measure(target, runs):
+    import_ms, process_ms, last_times, error = [], [], {}, None
+    for _ in range(runs):
+        ms, proc_ms, times = measure_once(target)
+        if ms is None:
+            error = times[0] if times else "error"
+            break
+        import_ms.append(ms)
+        process_ms.append(proc_ms)
+        last_times = times
+
+    if error is not None:
+        return {"target": target, "available": False, "error": error}
+
+    heaviest = sorted(
+        ((name, own / 1000) for name, (own, _) in last_times.items()),
+        key=lambda item: item[1],
+        reverse=True,
+    )
+    return {
+        "target": target,
+        "available": True,
+        "runs": runs,
+        "import_ms_median": statistics.median(import_ms),
+        "import_ms_min": min(import_ms),
+        "import_ms_max": max(import_ms),
+        "process_ms_median": statistics.median(process_ms),
+        "heaviest": heaviest,
+    }
+
+
+def parse_budgets(values):
+    budgets = dict(DEFAULT_BUDGETS)
+    for value in values or []:
+        name, _, ms = value.partition("=")
+        budgets[name.strip()] = float(ms)
+    return budgets
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark de arranque de ARKToolsPC")
+    parser.add_argument("targets", nargs="*", help="Módulos a medir (por defecto todos los presupuestados)")
+    parser.add_argument("--runs", type=int, default=7, help="Repeticiones por destino (se usa la mediana)")
+    parser.add_argument("--budget", action="append", metavar="MÓDULO=MS", help="Sustituye un presupuesto")
+    parser.add_argument("--top", type=int, default=0, help="Muestra los N módulos más costosos de cada destino")
+    parser.add_argument("--json", metavar="ARCHIVO", help="Guarda los resultados en JSON")
+    parser.add_argument("--allow-missing", action="store_true",
+                        help="No falla si un destino presupuestado no se puede importar")
+    args = parser.parse_args(argv)
+
+    budgets = parse_budgets(args.budget)
+    targets = args.targets or list(DEFAULT_BUDGETS)
+
+    print(f"{'Destino':<14} {'Import (ms)':>12} {'Mín':>8} {'Máx':>8} {'Proceso':>9} {'Presup.':>9}  Estado")
+    print("-" * 76)
+
+    results, over_budget, missing = [], [], []
+    for target in targets:
+        result = measure(target, args.runs)
+        budget = budgets.get(target)
+        result["budget_ms"] = budget
+
+        if not result["available"]:
+            result["status"] = "no disponible"
+            if budget is not None and not args.allow_missing:
+                missing.append(target)
+            print(f"{target:<14} {'-':>12} {'-':>8} {'-':>8} {'-':>9} {budget or '-':>9}  "
+                  f"no disponible ({result['error']})")
+        else:
+            ok = budget is None or result["import_ms_median"] <= budget
+            result["status"] = "ok" if ok else "excedido"
+            if not ok:
+                over_budget.append(target)
+            print(f"{target:<14} {result['import_ms_median']:>12.1f} {result['import_ms_min']:>8.1f} "
+                  f"{result['import_ms_max']:>8.1f} {result['process_ms_median']:>9.1f} "
+                  f"{budget if budget is not None else '-':>9}  {'OK' if ok else 'EXCEDIDO'}")
+            for name, own_ms in result["heaviest"][:args.top]:
+                print(f"    {own_ms:8.1f} ms  {name}")
+        result["heaviest"] = result.get("heaviest", [])[:args.top]
+        results.append(result)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"python": sys.version.split()[0], "results": results}, f, indent=2, ensure_ascii=False)
+
+    if over_budget:
+        print(f"\nPresupuesto de importación excedido: {', '.join(over_budget)}")
+    if missing:
+        print(f"\nNo se pudieron importar: {', '.join(missing)} (usa --allow-missing para omitirlos)")
+    return 1 if over_budget or missing else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,257 @@
+# cpu_bench.py
+#
+# Prueba de rendimiento y escalado de la CPU. Un núcleo de cálculo fijo (enteros
+# y coma flotante en Python puro, sin memoria que compartir) se ejecuta:
+#
+#   1. en el propio proceso, un hilo: puntuación por núcleo;
+#   2. en un grupo de procesos con 1, 2, ... N trabajadores a la vez (N =
+#      núcleos lógicos o --workers): curva de escalado. La eficiencia de cada punto es la
+#      puntuación total frente a N veces la de un solo proceso del grupo;
+#   3. con todos los trabajadores durante `sustained` segundos, en rondas
+#      cortas: la puntuación de cada ronda muestra si el equipo baja el ritmo
+#      (límite térmico o de potencia) una vez pasado el turbo inicial.
+#
+# Durante la prueba sostenida se leen del muestreador en segundo plano
+# (cpu_sampler.py) la frecuencia y el uso total; una frecuencia final muy por
+# debajo de la inicial o de la máxima del procesador confirma el recorte. En
+# Windows psutil suele devolver la frecuencia nominal en lugar de la real, así
+# que la caída de puntuación es la medida principal.
+#
+# Puntuación = miles de iteraciones del núcleo por segundo; solo es comparable
+# entre equipos con la misma versión de Python.
+#
+# Uso:
+#   python cpu_bench.py
+#   python cpu_bench.py --sustained 120 --workers 8
+
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from lazy_deps import psutil
+
+import cpu_sampler
+from records import CPUBenchmark, CPUScalingStep, Snapshot
+
+
+STEP_SECONDS = 2.0              # Duración de cada punto de la curva
+SUSTAINED_SECONDS = 30.0
+ROUND_SECONDS = 2.0             # Rondas de la prueba sostenida
+START_DELAY = 0.1               # Margen para que todos los trabajadores empiecen a la vez
+BATCH = 5000                    # Iteraciones entre comprobaciones del reloj
+MAX_CURVE_POINTS = 16           # Con más núcleos la curva se mide en potencias de dos
+
+THROTTLE_LIMIT = 10.0           # % de caída de la puntuación sostenida que se considera recorte
+FREQUENCY_DROP = 0.9            # Frecuencia final por debajo del 90 % de la inicial
+MAX_CLOCK_FRACTION = 0.8        # ... o del 80 % de la máxima del procesador
+EFFICIENCY_LIMIT = 75.0         # % de eficiencia esperado hasta los núcleos físicos
+BUSY_LIMIT = 25.0               # % de uso previo a partir del cual el resultado es dudoso
+LOAD_LIMIT = 90.0               # % de uso esperado durante la prueba sostenida
+
+
+class BenchmarkCancelled(Exception):
+    pass
+
+
+def _check(cancel):
+    if cancel is not None and cancel.is_set():
+        raise BenchmarkCancelled()
+
+
+# Núcleo de cálculo (se ejecuta en los procesos del grupo: debe ser de nivel de módulo)
+
+def _kernel(iterations, state):
+    """Generador congruencial y acumulación en coma flotante; devuelve el estado final"""
+    acc = 0.0
+    for _ in range(iterations):
+        state = (state * 1103515245 + 12345) & 0x7FFFFFFF
+        acc += (state & 1023) * 0.0009765625
+        acc *= 0.999
+    return state + int(acc)
+
+
+def _timed(seconds, start_at):
+    """Espera a `start_at` (reloj del sistema) y ejecuta el núcleo `seconds` segundos: (iteraciones, segundos)"""
+    delay = start_at - time.time()
+    if delay > 0:
+        time.sleep(delay)
+    state, iterations = 1, 0
+    start = time.perf_counter()
+    deadline = start + seconds
+    while True:
+        state = _kernel(BATCH, state)
+        iterations += BATCH
+        now = time.perf_counter()
+        if now >= deadline:
+            return iterations, now - start
+
+
+def _score(results):
+    """Puntuación total de varios trabajadores simultáneos"""
+    return sum(iterations / elapsed for iterations, elapsed in results) / 1000
+
+
+def _round(pool, workers, seconds):
+    start_at = time.time() + START_DELAY
+    futures = [pool.submit(_timed, seconds, start_at) for _ in range(workers)]
+    return _score([future.result() for future in futures])
+
+
+def worker_counts(logical, physical=None):
+    """Trabajadores de cada punto de la curva: 1..N, o potencias de dos más los núcleos físicos y N"""
+    if logical <= MAX_CURVE_POINTS:
+        return list(range(1, logical + 1))
+    counts = {logical}
+    if physical and physical < logical:
+        counts.add(physical)
+    count = 1
+    while count < logical:
+        counts.add(count)
+        count *= 2
+    return sorted(counts)
+
+
+# Muestreador
+
+def _sampler_window(collected):
+    """Añade las muestras actuales del muestreador compartido a `collected` (timestamp -> muestra)"""
+    for sample in cpu_sampler.sampler.window():
+        collected[sample.timestamp] = sample
+
+
+def _mean(values):
+    values = [v for v in values if v is not None]
+    return round(sum(values) / len(values), 1) if values else None
+
+
+def _frequency(result, samples, start, end):
+    quarter = (end - start) / 4
+    head = [s.freq_mhz for s in samples if start <= s.timestamp <= start + quarter]
+    tail = [s.freq_mhz for s in samples if end - quarter <= s.timestamp <= end]
+    during = [s for s in samples if start <= s.timestamp <= end]
+    result.freq_start_mhz = _mean(head)
+    result.freq_end_mhz = _mean(tail)
+    frequencies = [s.freq_mhz for s in during if s.freq_mhz]
+    result.freq_min_mhz = round(min(frequencies), 1) if frequencies else None
+    result.load_percent = _mean([s.total for s in during])
+
+
+def _notes(result, max_clock_mhz, busy):
+    notes = []
+    if busy is not None and busy > BUSY_LIMIT:
+        notes.append(f"La CPU ya estaba al {busy:.0f} % antes de la prueba: otros procesos restan puntuación")
+    physical = result.physical_cores or result.logical_cores
+    at_physical = [step for step in result.scaling if step.workers <= physical]
+    if at_physical and at_physical[-1].efficiency_percent is not None \
+            and at_physical[-1].efficiency_percent < EFFICIENCY_LIMIT:
+        step = at_physical[-1]
+        notes.append(f"Con {step.workers} procesos la eficiencia es del {step.efficiency_percent:.0f} %: "
+                     f"los núcleos no rinden a la vez como por separado (límite de potencia o núcleos ocupados)")
+    if result.throttle_percent is not None and result.throttle_percent > THROTTLE_LIMIT:
+        notes.append(f"La puntuación con todos los núcleos cae un {result.throttle_percent:.0f} % durante "
+                     f"la prueba sostenida: posible recorte térmico o de potencia")
+    if result.freq_start_mhz and result.freq_end_mhz and result.freq_end_mhz < result.freq_start_mhz * FREQUENCY_DROP:
+        notes.append(f"La frecuencia baja de {result.freq_start_mhz:.0f} a {result.freq_end_mhz:.0f} MHz "
+                     f"durante la prueba sostenida")
+    elif max_clock_mhz and result.freq_end_mhz and result.freq_end_mhz < max_clock_mhz * MAX_CLOCK_FRACTION:
+        notes.append(f"Con carga la frecuencia ({result.freq_end_mhz:.0f} MHz) queda lejos de la máxima "
+                     f"del procesador ({max_clock_mhz} MHz): plan de energía o límite de potencia")
+    if result.load_percent is not None and result.load_percent < LOAD_LIMIT:
+        notes.append(f"Uso medio del {result.load_percent:.0f} % con todos los trabajadores: el sistema "
+                     f"no dio todos los núcleos a la prueba")
+    return notes
+
+
+def run(processors=(), workers=None, step_seconds=STEP_SECONDS, sustained=SUSTAINED_SECONDS,
+        round_seconds=ROUND_SECONDS, cancel=None):
+    """Mide la CPU; `processors` son los Processor de get_cpu_info() (frecuencia máxima)"""
+    started = time.perf_counter()
+    logical = psutil.cpu_count() or os.cpu_count() or 1
+    result = CPUBenchmark(logical_cores=logical, physical_cores=psutil.cpu_count(logical=False),
+                          workers=workers or logical)
+    max_clock = max((p.max_clock_mhz for p in processors if p.max_clock_mhz), default=None)
+    cpu_sampler.start()
+    busy = cpu_sampler.sampler.average(seconds=5)
+    pool = None
+    try:
+        _check(cancel)
+        _timed(0.3, time.time())    # Calentamiento: sube la frecuencia antes de medir
+        iterations, elapsed = _timed(step_seconds, time.time())
+        result.single_score = round(iterations / elapsed / 1000, 1)
+
+        # "spawn" también en Linux: no se copian los hilos de la interfaz al hacer fork
+        pool = ProcessPoolExecutor(max_workers=result.workers, mp_context=multiprocessing.get_context("spawn"))
+        _round(pool, result.workers, 0.2)  # Arranca todos los procesos antes de medir
+        baseline = None
+        for count in worker_counts(result.workers, result.physical_cores):
+            _check(cancel)
+            score = _round(pool, count, step_seconds)
+            # La eficiencia se mide contra un solo proceso del grupo: mismas condiciones que el resto
+            baseline = baseline or score
+            result.scaling.append(CPUScalingStep(
+                workers=count,
+                score=round(score, 1),
+                per_worker=round(score / count, 1),
+                efficiency_percent=round(100 * score / (count * baseline), 1),
+            ))
+
+        samples = {}
+        sustained_start = time.time()
+        while time.time() - sustained_start < sustained:
+            _check(cancel)
+            result.sustained_scores.append(round(_round(pool, result.workers, round_seconds), 1))
+            _sampler_window(samples)
+        sustained_end = time.time()
+        result.sustained_seconds = round(sustained_end - sustained_start, 1)
+
+        scores = result.sustained_scores
+        edge = max(1, len(scores) // 4)
+        first, last = sum(scores[:edge]) / edge, sum(scores[-edge:]) / edge
+        if len(scores) >= 2 and first:
+            result.throttle_percent = round(100 * (first - last) / first, 1)
+        _frequency(result, sorted(samples.values(), key=lambda s: s.timestamp), sustained_start, sustained_end)
+        result.notes = _notes(result, max_clock, busy)
+    except BenchmarkCancelled:
+        result.error = "Cancelada"
+    except Exception as e:
+        result.error = str(e)
+    finally:
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+    result.seconds = round(time.perf_counter() - started, 2)
+    return result
+
+
+def benchmark_snapshot(cancel=None, **kwargs):
+    """Mide la CPU y devuelve la sonda "cpu" con el resultado junto a los procesadores"""
+    import system_info
+    info = system_info.collect(["cpu"])["cpu"]
+    info.benchmark = run(info.processors, cancel=cancel, **kwargs)
+    if cancel is not None and cancel.is_set():
+        raise BenchmarkCancelled()
+    return Snapshot(records={"cpu": info})
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Prueba de rendimiento y escalado de CPU de ARKToolsPC")
+    parser.add_argument("--workers", type=int, help="Procesos como máximo (por defecto los núcleos lógicos)")
+    parser.add_argument("--step", type=float, default=STEP_SECONDS, help="Segundos de cada punto de la curva")
+    parser.add_argument("--sustained", type=float, default=SUSTAINED_SECONDS,
+                        help="Segundos de la prueba sostenida con todos los procesos")
+    parser.add_argument("--json", action="store_true", help="Salida JSON")
+    args = parser.parse_args(argv)
+
+    import system_info
+    from renderers import render_json, text_lines
+    processors = system_info.collect(["cpu"])["cpu"].processors
+    result = run(processors, workers=args.workers, step_seconds=args.step, sustained=args.sustained)
+    print(render_json(result) if args.json else "\n".join(text_lines(result)))
+    return 1 if result.error else 0
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    sys.exit(main())
@@ -0,0 +1,206 @@
+# cpu_sampler.py
+#
+# Muestreador de uso de CPU en segundo plano. Un hilo ligero toma una muestra
+# cada `interval` segundos (uso total, uso por núcleo, tiempos de CPU y
+# frecuencia) y la guarda en una ventana circular. get_cpu_info y cualquier
+# otro consumidor leen la última muestra al instante en lugar de bloquear
+# un segundo con psutil.cpu_percent(interval=1).
+
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Optional
+
+from lazy_deps import psutil
+
+
+@dataclass(slots=True)
+class CPUSample:
+    timestamp: float
+    total: float
+    per_core: tuple = ()
+    user: float = 0.0
+    system: float = 0.0
+    idle: float = 0.0
+    freq_mhz: Optional[float] = None
+
+
+@dataclass(slots=True)
+class SamplerStats:
+    """Coste del propio muestreador, para verificar que es despreciable"""
+    samples: int = 0
+    cpu_seconds: float = 0.0
+    wall_seconds: float = 0.0
+    sample_seconds: float = 0.0
+    started_at: Optional[float] = field(default=None)
+
+    @property
+    def overhead_percent(self):
+        """Tiempo de CPU del hilo sobre el tiempo transcurrido (en % de un núcleo)"""
+        if not self.wall_seconds:
+            return 0.0
+        return 100.0 * self.cpu_seconds / self.wall_seconds
+
+    @property
+    def avg_sample_ms(self):
+        return 1000.0 * self.sample_seconds / self.samples if self.samples else 0.0
+
+
+class CPUSampler:
+    """
+    Hilo de muestreo con ventana circular de `window` muestras tomadas cada
+    `interval` segundos. `percpu` y `frequency` permiten reducir el trabajo
+    por muestra en equipos muy lentos.
+    """
+
+    def __init__(self, interval=0.5, window=120, percpu=True, frequency=True):
+        self.interval = interval
+        self.percpu = percpu
+        self.frequency = frequency
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._stats = SamplerStats()
+
+    # Control
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """Arranca el hilo si no está en marcha (idempotente)"""
+        with self._lock:
+            if self.running:
+                return self
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="CPUSampler", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+        self._thread = None
+
+    def configure(self, interval=None, window=None, percpu=None, frequency=None):
+        """Ajusta el muestreo en caliente; la ventana conserva las muestras más recientes"""
+        with self._lock:
+            if interval is not None:
+                self.interval = interval
+            if window is not None and window != self._samples.maxlen:
+                self._samples = deque(self._samples, maxlen=window)
+            if percpu is not None:
+                self.percpu = percpu
+            if frequency is not None:
+                self.frequency = frequency
+
+    # Muestreo
+
+    def _prime(self):
+        # La primera llamada con interval=None siempre devuelve 0.0: sirve de referencia
+        psutil.cpu_percent(interval=None)
+        psutil.cpu_percent(interval=None, percpu=True)
+
+    def _take_sample(self):
+        total = psutil.cpu_percent(interval=None)
+        per_core = tuple(psutil.cpu_percent(interval=None, percpu=True)) if self.percpu else ()
+        times = psutil.cpu_times()
+
+        freq = None
+        if self.frequency:
+            try:
+                current = psutil.cpu_freq()
+                freq = current.current if current else None
+            except (AttributeError, NotImplementedError, OSError):
+                freq = None
+
+        return CPUSample(
+            timestamp=time.time(),
+            total=total,
+            per_core=per_core,
+            user=times.user,
+            system=times.system,
+            idle=times.idle,
+            freq_mhz=freq,
+        )
+
+    def _run(self):
+        started_wall = time.perf_counter()
+        started_cpu = time.thread_time()
+        self._stats.started_at = time.time()
+        self._prime()
+
+        while not self._stop.wait(self.interval):
+            t0 = time.perf_counter()
+            try:
+                sample = self._take_sample()
+            except Exception:
+                # Un fallo puntual de psutil no debe detener el muestreo
+                continue
+            elapsed = time.perf_counter() - t0
+
+            with self._lock:
+                self._samples.append(sample)
+                self._stats.samples += 1
+                self._stats.sample_seconds += elapsed
+                self._stats.cpu_seconds = time.thread_time() - started_cpu
+                self._stats.wall_seconds = time.perf_counter() - started_wall
+            self._ready.set()
+
+    # Lectura
+
+    def latest(self, wait=None):
+        """
+        Última muestra disponible. Si todavía no hay ninguna y `wait` no es None,
+        espera como máximo `wait` segundos a la primera (solo ocurre al arrancar).
+        """
+        if not self._ready.is_set() and wait:
+            self._ready.wait(wait)
+        with self._lock:
+            return self._samples[-1] if self._samples else None
+
+    def window(self, seconds=None):
+        """Muestras de la ventana, opcionalmente solo las de los últimos `seconds`"""
+        with self._lock:
+            samples = list(self._samples)
+        if seconds is None:
+            return samples
+        limit = time.time() - seconds
+        return [s for s in samples if s.timestamp >= limit]
+
+    def average(self, seconds=None):
+        """Uso medio total en la ventana (o en los últimos `seconds`)"""
+        samples = self.window(seconds)
+        if not samples:
+            return None
+        return sum(s.total for s in samples) / len(samples)
+
+    def stats(self):
+        with self._lock:
+            s = self._stats
+            return SamplerStats(s.samples, s.cpu_seconds, s.wall_seconds, s.sample_seconds, s.started_at)
+
+
+# Muestreador compartido por system_info.py y las interfaces gráficas
+sampler = CPUSampler()
+
+
+def start(interval=None, window=None):
+    """Configura (opcionalmente) y arranca el muestreador compartido"""
+    sampler.configure(interval=interval, window=window)
+    return sampler.start()
+
+
+def latest():
+    """
+    Última muestra del muestreador compartido, arrancándolo si hace falta.
+    Solo la primera lectura tras el arranque espera (como mucho dos intervalos).
+    """
+    sampler.start()
+    return sampler.latest(wait=sampler.interval * 2)
@@ -0,0 +1,213 @@
+# device_inventory.py
+#
+# Inventario de dispositivos PnP construido con una sola enumeración de
+# Win32_PnPEntity. El resultado queda indexado por bus (prefijo del DeviceID:
+# USB, USBSTOR, BTHENUM, HID, PCI...), por clase PnP (PNPClass) y por vistas
+# con nombre ("usb", "bluetooth", ...), de modo que todas las vistas de
+# dispositivos leen del mismo índice en lugar de recorrer la tabla completa.
+
+import bisect
+import threading
+import time
+
+import wmi_session
+
+
+USB_BUSES = {"USB", "USBSTOR", "USBPRINT"}
+BLUETOOTH_BUSES = {"BTH", "BTHENUM", "BTHLE", "BTHLEDEVICE", "BTHHFENUM"}
+
+
+def device_bus(device_id):
+    """Bus de un dispositivo a partir de su DeviceID: 'USB\\VID_046D&PID_C52B\\...' -> 'USB'"""
+    if not device_id:
+        return ""
+    return str(device_id).split("\\", 1)[0].upper()
+
+
+def _is_usb(device):
+    # Además del bus se conserva el criterio histórico (descripción con "USB"),
+    # que incluye por ejemplo los "Dispositivo de entrada USB" enumerados bajo HID.
+    return (
+        device_bus(device.DeviceID) in USB_BUSES
+        or str(getattr(device, "PNPClass", None) or "").upper() == "USB"
+        or "USB" in str(device.Description or "")
+    )
+
+
+def _is_bluetooth(device):
+    return (
+        device_bus(device.DeviceID) in BLUETOOTH_BUSES
+        or str(getattr(device, "PNPClass", None) or "").lower() == "bluetooth"
+        or "bluetooth" in str(device.Description or "").lower()
+    )
+
+
+# Vistas con nombre: nombre -> predicado sobre una instancia de Win32_PnPEntity
+VIEWS = {
+    "usb": _is_usb,
+    "bluetooth": _is_bluetooth,
+}
+
+# Propiedades de Win32_PnPEntity que se piden: las que leen las vistas y
+# system_info._pnp_device (el resto de la instancia no se transfiere)
+PNP_PROPERTIES = ["DeviceID", "Name", "Description", "Status", "PNPClass"]
+
+# Propiedades que no existen en todas las versiones: PNPClass llega con Windows
+# 10 y en versiones anteriores la consulta proyectada falla entera
+OPTIONAL_PNP_PROPERTIES = {"PNPClass"}
+_optional_supported = True
+
+
+def register_view(name, predicate, properties=()):
+    """
+    Registra una vista nueva. Se calcula en la misma pasada que el resto del
+    índice, así que la siguiente actualización del inventario ya la incluye.
+    `properties` son las propiedades adicionales que lee el predicado.
+    """
+    VIEWS[name] = predicate
+    PNP_PROPERTIES.extend(p for p in properties if p not in PNP_PROPERTIES)
+    inventory.invalidate()
+
+
+def pnp_query(where=None, optional=True):
+    properties = PNP_PROPERTIES if optional else [p for p in PNP_PROPERTIES if p not in OPTIONAL_PNP_PROPERTIES]
+    return wmi_session.WMIQuery("Win32_PnPEntity", properties, where=where)
+
+
+def select_pnp(where=None):
+    """
+    Instancias de Win32_PnPEntity con PNP_PROPERTIES. Si el servidor rechaza la
+    consulta por una propiedad opcional, se repite sin ellas (y ya no se piden
+    más en esta sesión); las vistas leen esas propiedades como None.
+    """
+    global _optional_supported
+    if _optional_supported:
+        try:
+            return wmi_session.select(pnp_query(where))
+        except Exception as e:
+            if not wmi_session.is_query_error(e):
+                raise
+            _optional_supported = False
+    return wmi_session.select(pnp_query(where, optional=False))
+
+
+class PnPIndex:
+    """Índice inmutable de una enumeración de Win32_PnPEntity"""
+
+    def __init__(self, devices, views=None):
+        views = VIEWS if views is None else views
+        self.devices = list(devices)
+        self.created = time.monotonic()
+        self.by_bus = {}
+        self.by_class = {}
+        self.by_view = {name: [] for name in views}
+
+        keyed = []
+        for device in self.devices:
+            self.by_bus.setdefault(device_bus(device.DeviceID), []).append(device)
+            self.by_class.setdefault(str(getattr(device, "PNPClass", None) or "").upper(), []).append(device)
+            for name, predicate in views.items():
+                if predicate(device):
+                    self.by_view[name].append(device)
+            if device.DeviceID:
+                keyed.append((str(device.DeviceID).upper(), device))
+
+        keyed.sort(key=lambda item: item[0])
+        self._ids = [key for key, _ in keyed]
+        self._by_id = [device for _, device in keyed]
+
+    def bus(self, name):
+        return list(self.by_bus.get(name.upper(), []))
+
+    def pnp_class(self, name):
+        return list(self.by_class.get(name.upper(), []))
+
+    def view(self, name):
+        return list(self.by_view.get(name, []))
+
+    def with_prefix(self, prefix):
+        """Dispositivos cuyo DeviceID empieza por `prefix` (búsqueda binaria)"""
+        prefix = prefix.upper()
+        start = bisect.bisect_left(self._ids, prefix)
+        result = []
+        for i in range(start, len(self._ids)):
+            if not self._ids[i].startswith(prefix):
+                break
+            result.append(self._by_id[i])
+        return result
+
+    def get(self, device_id):
+        matches = [d for d in self.with_prefix(device_id) if str(d.DeviceID).upper() == device_id.upper()]
+        return matches[0] if matches else None
+
+    def __len__(self):
+        return len(self.devices)
+
+
+class PnPInventory:
+    """
+    Mantiene el índice PnP vigente. Una enumeración sirve a todas las vistas
+    mientras no supere `ttl` segundos; `refresh(force=True)` la repite.
+    """
+
+    def __init__(self, ttl=30.0):
+        self.ttl = ttl
+        self._index = None
+        self._lock = threading.Lock()
+
+    def invalidate(self):
+        with self._lock:
+            self._index = None
+
+    def _fresh(self):
+        index = self._index
+        if index is None:
+            return None
+        if self.ttl is not None and time.monotonic() - index.created > self.ttl:
+            return None
+        return index
+
+    def index(self, force=False):
+        """Devuelve el índice vigente, enumerando Win32_PnPEntity solo si hace falta"""
+        if not force:
+            index = self._fresh()
+            if index is not None:
+                return index
+
+        with self._lock:
+            if not force:
+                index = self._fresh()
+                if index is not None:
+                    return index
+            self._index = PnPIndex(select_pnp())
+            return self._index
+
+    def refresh(self, force=True):
+        return self.index(force=force)
+
+    def view(self, name):
+        return self.index().view(name)
+
+    def devices_on_bus(self, bus):
+        """
+        Dispositivos de un bus concreto. Si el índice está vigente se responde
+        desde memoria; si no, se filtra en el servidor con WQL para no traer
+        toda la tabla cuando solo interesa un bus.
+        """
+        index = self._fresh()
+        if index is not None:
+            return index.bus(bus)
+        pattern = bus.upper() + "\\%"
+        return select_pnp(f"DeviceID LIKE {wmi_session.quote(pattern)}")
+
+
+# Inventario global compartido por las vistas de system_info.py
+inventory = PnPInventory()
+
+
+def usb_devices():
+    return inventory.view("usb")
+
+
+def bluetooth_devices():
+    return inventory.view("bluetooth")
@@ -0,0 +1,200 @@
+# device_table.py
+#
+# Vista tabular de los registros con listas de dispositivos (USB, Bluetooth,
+# puertos COM, tarjetas de red, audio y adaptadores de red), independiente del
+# toolkit: qt_device_table.py y tk_device_table.py la muestran con un modelo
+# que solo pinta las filas visibles.
+#
+# Las celdas se formatean una sola vez al construir la tabla; ordenar y filtrar
+# trabajan sobre índices de fila en memoria, sin volver a consultar el hardware:
+#   - la clave de orden de cada columna se calcula la primera vez que se ordena
+#     por ella (orden natural: "COM9" antes que "COM10"; vacíos siempre al final);
+#   - el filtro busca todos los términos (sin distinguir mayúsculas) en el texto
+#     de la fila, y si el texto nuevo amplía el anterior solo recorre las filas
+#     que ya estaban visibles.
+
+import re
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from records import NetworkInfo, NICInfo, AudioInfo, COMInfo, USBInfo, BluetoothInfo
+from device_inventory import device_bus
+
+
+@dataclass(slots=True, frozen=True)
+class Column:
+    title: str
+    value: Callable                     # registro de la fila -> valor (str, número o None)
+    numeric: bool = False
+    format: Optional[Callable] = None   # valor -> texto (por defecto str())
+
+
+def _attr(name):
+    return lambda item: getattr(item, name)
+
+
+def _mbps(value):
+    return f"{value // 1_000_000} Mb/s"
+
+
+def _mb(value):
+    return f"{value / 1024 ** 2:.1f}"
+
+
+def _joined(name):
+    return lambda item: ", ".join(getattr(item, name)) or None
+
+
+def _adapter_state(adapter):
+    state = "activo" if adapter.is_up else "inactivo" if adapter.is_up is not None else None
+    return ", ".join(s for s in (adapter.status, state) if s) or None
+
+
+PNP_COLUMNS = (
+    Column("Descripción", _attr("description")),
+    Column("Nombre", _attr("name")),
+    Column("Bus", lambda device: device_bus(device.device_id) or None),
+    Column("Estado", _attr("status")),
+    Column("ID del dispositivo", _attr("device_id")),
+)
+
+# Tipo de registro -> (título, atributo con la lista de filas, columnas)
+TABLES = {
+    USBInfo: ("Dispositivos USB", "devices", PNP_COLUMNS),
+    BluetoothInfo: ("Dispositivos Bluetooth", "devices", PNP_COLUMNS),
+    COMInfo: ("Puertos COM", "ports", (
+        Column("Puerto", _attr("port")),
+        Column("Descripción", _attr("description")),
+        Column("HWID", _attr("hwid")),
+    )),
+    NICInfo: ("Tarjetas de Red", "nics", (
+        Column("Conexión", _attr("connection_id")),
+        Column("Modelo", _attr("name")),
+        Column("Fabricante", _attr("manufacturer")),
+        Column("Dirección MAC", _attr("mac_address")),
+        Column("Tipo", _attr("adapter_type")),
+        Column("Estado", _attr("status")),
+        Column("Velocidad", _attr("speed_bps"), numeric=True, format=_mbps),
+    )),
+    AudioInfo: ("Tarjetas de Audio", "devices", (
+        Column("Nombre", _attr("name")),
+        Column("Fabricante", _attr("manufacturer")),
+        Column("Estado", _attr("status")),
+    )),
+    NetworkInfo: ("Adaptadores de Red", "adapters", (
+        Column("Adaptador", _attr("name")),
+        Column("Descripción", _attr("description")),
+        Column("Estado", _adapter_state),
+        Column("Dirección MAC", _attr("mac_address")),
+        Column("IPv4", _joined("ipv4")),
+        Column("IPv6", _joined("ipv6")),
+        Column("Puerta de enlace", _joined("gateways")),
+        Column("DNS", _joined("dns_servers")),
+        Column("Velocidad", _attr("speed_bps"), numeric=True, format=_mbps),
+        Column("Recibidos MB", _attr("bytes_recv"), numeric=True, format=_mb),
+        Column("Enviados MB", _attr("bytes_sent"), numeric=True, format=_mb),
+    )),
+}
+
+
+_DIGITS = re.compile(r"(\d+)")
+
+
+def _natural_key(text):
+    """'COM10' -> ('com', 10, ''): los números se comparan como números"""
+    parts = _DIGITS.split(text.casefold())
+    return tuple(int(p) if i % 2 else p for i, p in enumerate(parts))
+
+
+class DeviceTable:
+    """
+    Filas ya formateadas de un registro y el orden/filtro actual. `order` son
+    los índices de las filas visibles, en el orden en que se muestran.
+    """
+
+    def __init__(self, title, columns, items, error=None):
+        self.title = title
+        self.columns = tuple(columns)
+        self.error = error
+        self._values = []
+        self.rows = []
+        for item in items:
+            values = tuple(column.value(item) for column in self.columns)
+            self._values.append(values)
+            self.rows.append(tuple(
+                "" if v is None else (column.format or str)(v)
+                for column, v in zip(self.columns, values)))
+        self._haystack = ["\t".join(row).casefold() for row in self.rows]
+        self._keys = {}                 # columna -> clave de orden por fila
+        self.sort_column = None
+        self.descending = False
+        self.filter_text = ""
+        self._sorted = list(range(len(self.rows)))
+        self.order = self._sorted
+
+    def __len__(self):
+        return len(self.order)
+
+    @property
+    def total(self):
+        return len(self.rows)
+
+    def cell(self, row, column):
+        """Texto de la celda en la fila visible `row`"""
+        return self.rows[self.order[row]][column]
+
+    def _sort_keys(self, column):
+        keys = self._keys.get(column)
+        if keys is None:
+            if self.columns[column].numeric:
+                keys = [values[column] for values in self._values]
+            else:
+                keys = [_natural_key(row[column]) if row[column] else None for row in self.rows]
+            self._keys[column] = keys
+        return keys
+
+    def sort(self, column, descending=False):
+        """Ordena por una columna; las celdas vacías quedan al final en ambos sentidos"""
+        keys = self._sort_keys(column)
+        present = [i for i in range(len(keys)) if keys[i] is not None]
+        present.sort(key=keys.__getitem__, reverse=descending)
+        self._sorted = present + [i for i in range(len(keys)) if keys[i] is None]
+        self.sort_column, self.descending = column, descending
+        self._apply_filter(self.filter_text, self._sorted)
+
+    def set_filter(self, text):
+        """Muestra solo las filas que contienen todos los términos de `text`"""
+        text = " ".join(text.casefold().split())
+        if text == self.filter_text:
+            return False
+        # Un filtro que amplía el anterior solo puede quitar filas
+        narrowing = self.filter_text and text.startswith(self.filter_text)
+        self._apply_filter(text, self.order if narrowing else self._sorted)
+        return True
+
+    def _apply_filter(self, text, candidates):
+        self.filter_text = text
+        if not text:
+            self.order = self._sorted
+            return
+        terms = text.split()
+        haystack = self._haystack
+        self.order = [i for i in candidates if all(term in haystack[i] for term in terms)]
+
+    def summary(self):
+        shown = f"{len(self.order)} de {self.total}" if self.filter_text else str(self.total)
+        text = f"{self.title}: {shown} filas"
+        if self.error:
+            text += f" (error: {self.error})"
+        return text
+
+
+def table_for(record):
+    """DeviceTable de un registro con lista de dispositivos, o None si no tiene vista tabular"""
+    spec = TABLES.get(type(record))
+    if spec is None:
+        return None
+    if isinstance(record, NetworkInfo) and record.raw_text:
+        return None             # Sonda "ipconfig": solo texto
+    title, attribute, columns = spec
+    return DeviceTable(title, columns, getattr(record, attribute), error=record.error)
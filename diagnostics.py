@@ -0,0 +1,227 @@
+# diagnostics.py
+#
+# Instrumentación de las sondas para averiguar dónde se va el tiempo cuando
+# "la herramienta va lenta": conexión WMI, consultas WMI, procesos externos
+# (ipconfig, powershell), procesado en Python y renderizado en la GUI.
+#
+# Cada sonda del backend activo se envuelve con traced() (ver
+# system_info.set_backend). Mientras la instrumentación está desactivada el
+# envoltorio solo comprueba un booleano; al activarla, cada llamada deja una
+# traza con el tiempo de cada fase, el número de consultas WMI y filas y la
+# duración de cada proceso externo. Las trazas se consultan en el panel de
+# diagnóstico de arktoolspcq.py o se exportan a JSON.
+#
+# Se activa desde la GUI o con la variable de entorno ARKTOOLSPC_DIAG=1.
+
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field, asdict
+from typing import Optional
+
+
+MAX_TRACES = 500
+
+# Fases que se miden; lo que queda del total es procesado en Python
+# (incluida la conversión de las propiedades WMI, que se leen bajo demanda)
+PHASES = ("wmi_connect", "wmi_query", "subprocess", "cpu_sampler")
+
+PHASE_LABELS = {
+    "wmi_connect": "Conexión WMI",
+    "wmi_query": "Consultas WMI",
+    "subprocess": "Procesos externos",
+    "cpu_sampler": "Espera de muestra de CPU",
+    "python": "Procesado",
+    "render": "Renderizado",
+}
+
+
+@dataclass(slots=True)
+class CommandTrace:
+    command: str
+    seconds: float
+    returncode: Optional[int] = None
+    error: Optional[str] = None
+
+
+@dataclass(slots=True)
+class ProbeTrace:
+    probe: str
+    started_at: float
+    thread: str = ""
+    total: float = 0.0
+    phases: dict = field(default_factory=dict)
+    wmi_connects: int = 0
+    wmi_queries: int = 0
+    wmi_rows: int = 0
+    wmi_properties: int = 0
+    commands: list = field(default_factory=list)
+    error: Optional[str] = None
+
+    @property
+    def python_seconds(self):
+        """Tiempo no atribuido a ninguna fase medida"""
+        return max(0.0, self.total - sum(self.phases.values()))
+
+
+@dataclass(slots=True)
+class RenderTrace:
+    target: str                 # Qué se renderizó (por ejemplo "cpu + ram")
+    format: str                 # html, text, json...
+    started_at: float
+    seconds: float
+    chars: int = 0
+
+
+enabled = bool(os.environ.get("ARKTOOLSPC_DIAG"))
+
+_local = threading.local()
+_lock = threading.Lock()
+_traces = deque(maxlen=MAX_TRACES)
+_renders = deque(maxlen=MAX_TRACES)
+
+
+def enable():
+    global enabled
+    enabled = True
+
+
+def disable():
+    global enabled
+    enabled = False
+
+
+def clear():
+    with _lock:
+        _traces.clear()
+        _renders.clear()
+
+
+# Registro de trazas
+
+def _current():
+    return getattr(_local, "trace", None)
+
+
+def traced(name, func):
+    """Envuelve una sonda para que deje una traza cuando la instrumentación está activa"""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not enabled:
+            return func(*args, **kwargs)
+
+        trace = ProbeTrace(probe=name, started_at=time.time(), thread=threading.current_thread().name)
+        previous = _current()
+        _local.trace = trace
+        start = time.perf_counter()
+        try:
+            record = func(*args, **kwargs)
+            trace.error = getattr(record, "error", None)
+            return record
+        except Exception as e:
+            trace.error = str(e)
+            raise
+        finally:
+            trace.total = time.perf_counter() - start
+            _local.trace = previous
+            with _lock:
+                _traces.append(trace)
+    return wrapper
+
+
+def add_phase(phase, seconds, queries=0, rows=0, connects=0, properties=0):
+    """Suma tiempo a una fase de la sonda en curso en este hilo (si hay alguna)"""
+    trace = _current()
+    if trace is None:
+        return
+    trace.phases[phase] = trace.phases.get(phase, 0.0) + seconds
+    trace.wmi_queries += queries
+    trace.wmi_rows += rows
+    trace.wmi_properties += properties
+    trace.wmi_connects += connects
+
+
+def add_command(command, seconds, returncode=None, error=None):
+    trace = _current()
+    if trace is None:
+        return
+    if not isinstance(command, str):
+        command = " ".join(str(part) for part in command)
+    trace.phases["subprocess"] = trace.phases.get("subprocess", 0.0) + seconds
+    trace.commands.append(CommandTrace(command=command, seconds=seconds, returncode=returncode, error=error))
+
+
+def add_render(target, format, seconds, chars=0):
+    if not enabled:
+        return
+    with _lock:
+        _renders.append(RenderTrace(target=target, format=format, started_at=time.time(),
+                                    seconds=seconds, chars=chars))
+
+
+def run_command(run, args, **kwargs):
+    """Ejecuta run(args, **kwargs) (subprocess.run) midiendo su duración si la instrumentación está activa"""
+    if not enabled:
+        return run(args, **kwargs)
+    start = time.perf_counter()
+    try:
+        result = run(args, **kwargs)
+    except Exception as e:
+        add_command(args, time.perf_counter() - start, error=str(e))
+        raise
+    add_command(args, time.perf_counter() - start, returncode=result.returncode)
+    return result
+
+
+# Consulta y exportación
+
+def traces():
+    with _lock:
+        return list(_traces)
+
+
+def renders():
+    with _lock:
+        return list(_renders)
+
+
+def summary():
+    """Agregado por sonda: llamadas, tiempo medio y máximo y tiempo medio por fase (segundos)"""
+    grouped = {}
+    for trace in traces():
+        grouped.setdefault(trace.probe, []).append(trace)
+
+    result = {}
+    for probe, items in grouped.items():
+        count = len(items)
+        phases = {phase: sum(t.phases.get(phase, 0.0) for t in items) / count for phase in PHASES}
+        phases["python"] = sum(t.python_seconds for t in items) / count
+        result[probe] = {
+            "calls": count,
+            "mean": sum(t.total for t in items) / count,
+            "max": max(t.total for t in items),
+            "phases": phases,
+            "wmi_queries": sum(t.wmi_queries for t in items) / count,
+            "wmi_rows": sum(t.wmi_rows for t in items) / count,
+            "wmi_properties": sum(t.wmi_properties for t in items) / count,
+            "errors": sum(1 for t in items if t.error),
+        }
+    return result
+
+
+def to_dict():
+    return {
+        "enabled": enabled,
+        "exported_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "summary": summary(),
+        "probes": [dict(asdict(t), python=t.python_seconds) for t in traces()],
+        "renders": [asdict(r) for r in renders()],
+    }
+
+
+def export_json(path):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(to_dict(), f, indent=2, ensure_ascii=False)
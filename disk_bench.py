@@ -0,0 +1,378 @@
+# disk_bench.py
+#
+# Prueba de rendimiento de almacenamiento sobre un volumen: escritura y lectura
+# secuencial (bloques de 1 MB), IOPS de lectura y escritura aleatoria de 4 KB y
+# percentiles de latencia de cada operación.
+#
+# Se trabaja con un archivo temporal en el volumen elegido, que se borra al
+# terminar (también si la prueba falla o se cancela). Para medir el disco y no
+# la memoria se evita la caché del sistema:
+#   - Windows: CreateFileW con FILE_FLAG_NO_BUFFERING | FILE_FLAG_WRITE_THROUGH;
+#   - Linux: O_DIRECT (si el sistema de archivos no lo admite, como tmpfs, se
+#     usa la caché con fsync tras escribir y POSIX_FADV_DONTNEED antes de leer);
+#   - macOS: F_NOCACHE.
+# La E/S sin caché exige búferes, desplazamientos y tamaños alineados al
+# sector: los búferes son mmap anónimos (alineados a página) y los bloques son
+# múltiplos de 4 KB.
+#
+# El resultado (records.DiskBenchmark) indica el disco físico del volumen
+# (mismo identificador que Disk.device_id) para mostrarse junto a los datos de
+# get_disk_info(). En arktoolspcq.py se ejecuta en el pool de qt_workers.py y se
+# puede cancelar; cancel se comprueba entre bloques.
+#
+# Uso:
+#   python disk_bench.py                       # volumen del directorio actual
+#   python disk_bench.py D:\ --size 1024 --duration 5 --threads 4
+
+import argparse
+import io
+import mmap
+import os
+import random
+import shutil
+import struct
+import sys
+import tempfile
+import threading
+import time
+from array import array
+
+# psutil se carga en el primer uso (ver lazy_deps.py)
+from lazy_deps import psutil
+
+from records import DiskBenchmark, Snapshot
+
+
+SEQUENTIAL_BLOCK = 1024 * 1024
+RANDOM_BLOCK = 4096
+DEFAULT_SIZE_MB = 256
+DEFAULT_DURATION = 3.0          # Segundos de cada prueba aleatoria
+FREE_SPACE_MARGIN = 1.1
+PERCENTILES = (50, 95, 99)
+
+
+class BenchmarkCancelled(Exception):
+    pass
+
+
+# Apertura sin caché
+
+def _open_windows(path):
+    import ctypes
+    import msvcrt
+    from ctypes import wintypes
+
+    GENERIC_READ, GENERIC_WRITE = 0x80000000, 0x40000000
+    FILE_SHARE_READ, FILE_SHARE_WRITE = 0x1, 0x2
+    OPEN_ALWAYS = 4
+    FILE_FLAG_NO_BUFFERING, FILE_FLAG_WRITE_THROUGH = 0x20000000, 0x80000000
+
+    create = ctypes.windll.kernel32.CreateFileW
+    create.argtypes = (wintypes.LPCWSTR, wintypes.DWORD, wintypes.DWORD, wintypes.LPVOID,
+                       wintypes.DWORD, wintypes.DWORD, wintypes.HANDLE)
+    create.restype = wintypes.HANDLE
+    handle = create(path, GENERIC_READ | GENERIC_WRITE, FILE_SHARE_READ | FILE_SHARE_WRITE, None,
+                    OPEN_ALWAYS, FILE_FLAG_NO_BUFFERING | FILE_FLAG_WRITE_THROUGH, None)
+    if handle in (None, wintypes.HANDLE(-1).value):
+        raise ctypes.WinError()
+    fd = msvcrt.open_osfhandle(handle, os.O_RDWR | os.O_BINARY)
+    return io.FileIO(fd, "r+b", closefd=True), True
+
+
+def _open_posix(path):
+    flags = os.O_RDWR | os.O_CREAT
+    direct = getattr(os, "O_DIRECT", 0)
+    if direct:
+        try:
+            return io.FileIO(os.open(path, flags | direct, 0o600), "r+b", closefd=True), True
+        except OSError:
+            pass            # Sistema de archivos sin O_DIRECT: se usa la caché
+    raw = io.FileIO(os.open(path, flags, 0o600), "r+b", closefd=True)
+    try:
+        import fcntl
+        if hasattr(fcntl, "F_NOCACHE"):
+            fcntl.fcntl(raw.fileno(), fcntl.F_NOCACHE, 1)
+            return raw, True
+    except (ImportError, OSError):
+        pass
+    return raw, False
+
+
+def open_scratch(path):
+    """Abre (o crea) el archivo de prueba sin caché si es posible: (archivo, sin_caché)"""
+    if sys.platform == "win32":
+        return _open_windows(path)
+    return _open_posix(path)
+
+
+def _drop_cache(raw):
+    """Sin E/S directa: vacía a disco y descarta de la caché lo escrito"""
+    os.fsync(raw.fileno())
+    if hasattr(os, "posix_fadvise"):
+        os.posix_fadvise(raw.fileno(), 0, 0, os.POSIX_FADV_DONTNEED)
+
+
+# Disco físico de un volumen
+
+def _windows_disk(path):
+    import ctypes
+    from ctypes import wintypes
+
+    IOCTL_VOLUME_GET_VOLUME_DISK_EXTENTS = 0x00560000
+    drive = os.path.splitdrive(os.path.abspath(path))[0]
+    if not drive or drive.startswith("\\\\"):
+        return None             # Unidad de red o ruta UNC
+    kernel32 = ctypes.windll.kernel32
+    kernel32.CreateFileW.restype = wintypes.HANDLE
+    handle = kernel32.CreateFileW(f"\\\\.\\{drive}", 0, 0x3, None, 3, 0, None)
+    if handle in (None, wintypes.HANDLE(-1).value):
+        return None
+    try:
+        buffer = ctypes.create_string_buffer(32)
+        returned = wintypes.DWORD()
+        if not kernel32.DeviceIoControl(wintypes.HANDLE(handle), IOCTL_VOLUME_GET_VOLUME_DISK_EXTENTS,
+                                        None, 0, buffer, len(buffer), ctypes.byref(returned), None):
+            return None         # Volumen en varios discos (más de una extensión) o sin disco
+        count, disk_number = struct.unpack_from("<I4xI", buffer.raw)
+        return f"\\\\.\\PHYSICALDRIVE{disk_number}" if count == 1 else None
+    finally:
+        kernel32.CloseHandle(wintypes.HANDLE(handle))
+
+
+def _linux_disk(path):
+    st = os.stat(path)
+    base = os.path.realpath(f"/sys/dev/block/{os.major(st.st_dev)}:{os.minor(st.st_dev)}")
+    for _ in range(4):
+        if not os.path.isdir(base):
+            return None
+        if os.path.exists(os.path.join(base, "partition")):
+            base = os.path.dirname(base)
+            continue
+        # dm-* / md* sobre un único dispositivo: se sigue hasta el disco
+        slaves = os.path.join(base, "slaves")
+        members = os.listdir(slaves) if os.path.isdir(slaves) else []
+        if len(members) != 1:
+            break
+        base = os.path.realpath(os.path.join(slaves, members[0]))
+    return f"/dev/{os.path.basename(base)}" if os.path.exists(os.path.join(base, "device")) else None
+
+
+def volume_disk(path):
+    """Identificador del disco físico de un volumen (como Disk.device_id) o None"""
+    try:
+        if sys.platform == "win32":
+            return _windows_disk(path)
+        if sys.platform.startswith("linux"):
+            return _linux_disk(path)
+    except OSError:
+        pass
+    return None
+
+
+def volumes():
+    """Puntos de montaje (unidades en Windows) en los que se puede escribir"""
+    found = []
+    for partition in psutil.disk_partitions(all=False):
+        options = partition.opts.split(",")
+        if "cdrom" in options or "ro" in options or partition.fstype in ("squashfs", "iso9660"):
+            continue
+        if partition.mountpoint not in found:
+            found.append(partition.mountpoint)
+    return found
+
+
+# Medición
+
+def _buffer(size):
+    """Búfer alineado a página relleno de datos no comprimibles"""
+    buffer = mmap.mmap(-1, size)
+    buffer.write(os.urandom(size))
+    return buffer
+
+
+def _check(cancel):
+    if cancel is not None and cancel.is_set():
+        raise BenchmarkCancelled()
+
+
+def _percentiles(latencies_ns):
+    if not latencies_ns:
+        return {}
+    ordered = sorted(latencies_ns)
+    result = {}
+    for p in PERCENTILES:
+        rank = max(0, min(len(ordered) - 1, int(round(p / 100 * len(ordered) + 0.5)) - 1))
+        result[f"p{p}"] = round(ordered[rank] / 1000, 1)
+    result["max"] = round(ordered[-1] / 1000, 1)
+    return result
+
+
+def _sequential(raw, size, write, cancel):
+    buffer = _buffer(SEQUENTIAL_BLOCK)
+    view = memoryview(buffer)
+    try:
+        raw.seek(0)
+        start = time.perf_counter()
+        for _ in range(size // SEQUENTIAL_BLOCK):
+            _check(cancel)
+            done = raw.write(view) if write else raw.readinto(view)
+            if done != SEQUENTIAL_BLOCK:
+                raise OSError(f"E/S incompleta: {done} de {SEQUENTIAL_BLOCK} bytes")
+        if write:
+            os.fsync(raw.fileno())
+        return size / (time.perf_counter() - start) / 1e6
+    finally:
+        view.release()
+        buffer.close()
+
+
+def _random_worker(path, size, write, deadline, seed, latencies, errors, cancel):
+    raw = None
+    buffer = _buffer(RANDOM_BLOCK)
+    view = memoryview(buffer)
+    try:
+        raw, _ = open_scratch(path)
+        blocks = size // RANDOM_BLOCK
+        rng = random.Random(seed)
+        clock = time.perf_counter_ns
+        end = int(deadline * 1e9)
+        while True:
+            now = clock()
+            if now >= end or (cancel is not None and cancel.is_set()):
+                break
+            raw.seek(rng.randrange(blocks) * RANDOM_BLOCK)
+            if write:
+                raw.write(view)
+            else:
+                raw.readinto(view)
+            latencies.append(clock() - now)
+        if write:
+            os.fsync(raw.fileno())
+    except Exception as e:
+        errors.append(e)
+    finally:
+        view.release()
+        buffer.close()
+        if raw is not None:
+            raw.close()
+
+
+def _random(path, size, write, duration, threads, cancel):
+    """IOPS y latencias de E/S aleatoria de 4 KB con `threads` operaciones en curso"""
+    per_thread = [array("q") for _ in range(threads)]
+    errors = []
+    start = time.perf_counter()
+    workers = [threading.Thread(target=_random_worker, daemon=True,
+                                args=(path, size, write, start + duration, seed, latencies, errors, cancel))
+               for seed, latencies in enumerate(per_thread)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - start
+    _check(cancel)
+    if errors:
+        raise errors[0]
+    latencies = [value for chunk in per_thread for value in chunk]
+    return len(latencies) / elapsed, _percentiles(latencies)
+
+
+def run(path=".", size_mb=DEFAULT_SIZE_MB, duration=DEFAULT_DURATION, threads=1, cancel=None):
+    """Mide el volumen de `path`; los errores quedan en DiskBenchmark.error"""
+    volume = os.path.abspath(path)
+    result = DiskBenchmark(volume=volume, threads=threads, disk_id=volume_disk(volume))
+    size = max(1, int(size_mb)) * SEQUENTIAL_BLOCK
+    result.file_bytes = size
+    started = time.perf_counter()
+    scratch = None
+    try:
+        free = shutil.disk_usage(volume).free
+        if free < size * FREE_SPACE_MARGIN:
+            raise OSError(f"Espacio libre insuficiente: {free // 2 ** 20} MB para un archivo de {size_mb} MB")
+        fd, scratch = tempfile.mkstemp(prefix="arktoolspc-bench-", suffix=".tmp", dir=volume)
+        os.close(fd)
+
+        raw, result.direct_io = open_scratch(scratch)
+        try:
+            result.seq_write_mbps = round(_sequential(raw, size, True, cancel), 1)
+            if not result.direct_io:
+                _drop_cache(raw)
+            result.seq_read_mbps = round(_sequential(raw, size, False, cancel), 1)
+            if not result.direct_io:
+                _drop_cache(raw)
+        finally:
+            raw.close()
+
+        iops, result.read_latency_us = _random(scratch, size, False, duration, threads, cancel)
+        result.rand_read_iops = round(iops, 1)
+        iops, result.write_latency_us = _random(scratch, size, True, duration, threads, cancel)
+        result.rand_write_iops = round(iops, 1)
+    except BenchmarkCancelled:
+        result.error = "Cancelada"
+    except Exception as e:
+        result.error = str(e)
+    finally:
+        if scratch is not None:
+            try:
+                os.remove(scratch)
+            except OSError as e:
+                result.error = result.error or f"No se pudo borrar {scratch}: {e}"
+    result.seconds = round(time.perf_counter() - started, 2)
+    return result
+
+
+# Resultados junto a los discos
+
+def _same_disk(a, b):
+    return a is not None and b is not None and a.casefold() == b.casefold()
+
+
+def attach(info, *benchmarks):
+    """Añade resultados a un DiskInfo (sustituye los anteriores del mismo volumen)"""
+    for benchmark in benchmarks:
+        info.benchmarks = [b for b in info.benchmarks if b.volume != benchmark.volume]
+        info.benchmarks.append(benchmark)
+    return info
+
+
+def disk_benchmarks(info, disk):
+    """Resultados de un DiskInfo que corresponden a uno de sus discos"""
+    return [b for b in info.benchmarks if _same_disk(b.disk_id, disk.device_id)]
+
+
+def benchmark_snapshot(path, cancel=None, **kwargs):
+    """Mide un volumen y devuelve la sonda "disk" con el resultado junto a su disco"""
+    import system_info
+    benchmark = run(path, cancel=cancel, **kwargs)
+    if cancel is not None and cancel.is_set():
+        raise BenchmarkCancelled()
+    info = system_info.collect(["disk"])["disk"]
+    return Snapshot(records={"disk": attach(info, benchmark)})
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Prueba de rendimiento de disco de ARKToolsPC")
+    parser.add_argument("path", nargs="?", default=".", help="Carpeta del volumen a medir (por defecto la actual)")
+    parser.add_argument("--size", type=int, default=DEFAULT_SIZE_MB, help="Tamaño del archivo de prueba en MB")
+    parser.add_argument("--duration", type=float, default=DEFAULT_DURATION,
+                        help="Segundos de cada prueba aleatoria")
+    parser.add_argument("--threads", type=int, default=1, help="Operaciones aleatorias simultáneas")
+    parser.add_argument("--json", action="store_true", help="Salida JSON")
+    parser.add_argument("--list", action="store_true", help="Lista los volúmenes y termina")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for volume in volumes():
+            print(f"{volume}\t{volume_disk(volume) or '-'}")
+        return 0
+    if args.threads < 1:
+        parser.error("--threads debe ser al menos 1")
+
+    from renderers import render_json, text_lines
+    result = run(args.path, size_mb=args.size, duration=args.duration, threads=args.threads)
+    print(render_json(result) if args.json else "\n".join(text_lines(result)))
+    return 1 if result.error else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,435 @@
+# fleet.py
+#
+# Agregador de inventario: consulta muchos agentes (agent.py) a la vez con
+# asyncio y escribe una línea JSON por equipo en cuanto responde.
+#
+#   - Paralelismo acotado: como mucho `concurrency` peticiones en vuelo.
+#   - Reutilización de conexiones: HTTP/1.1 keep-alive con un pequeño pool
+#     por agente; en varias rondas (--rounds) no se abre una conexión nueva
+#     por petición.
+#   - Tiempos límite de conexión y de petición, y reintentos con espera
+#     exponencial (con variación aleatoria) ante errores de red, tiempos
+#     agotados y respuestas 5xx.
+#   - Con --delta cada agente envía solo los cambios desde la última respuesta
+#     recibida (snapshot_delta.py); si falta la base, se pide la completa.
+#
+# Solo usa la biblioteca estándar (asyncio + un cliente HTTP/1.1 mínimo que
+# entiende las respuestas con Content-Length del agente).
+#
+# Uso:
+#   python fleet.py equipos.txt --probes cpu,ram,disk --concurrency 64
+#   python fleet.py --agent pc-01:8765 --agent pc-02:8765 --token secreto
+#   python fleet.py --local 8 --rounds 3        # 8 agentes de prueba en localhost
+#   python fleet.py equipos.txt --delta --rounds 24 --interval 3600
+#
+# Código de salida: 0 todos correctos, 1 alguno falló o respondió a medias,
+# 2 argumentos incorrectos, 3 fallaron todos.
+
+import argparse
+import asyncio
+import gzip
+import json
+import random
+import sys
+import time
+from dataclasses import dataclass
+from typing import Optional
+from urllib.parse import quote
+
+import snapshot_delta
+
+DEFAULT_PORT = 8765
+DEFAULT_CONCURRENCY = 32
+DEFAULT_CONNECT_TIMEOUT = 5.0
+DEFAULT_TIMEOUT = 60.0          # Una petición de /snapshot espera a todas las sondas
+DEFAULT_RETRIES = 2
+DEFAULT_BACKOFF = 0.5
+MAX_IDLE_PER_AGENT = 2
+MAX_HEADER_LINES = 100
+
+
+class AgentError(Exception):
+    """Fallo al consultar un agente; `retryable` indica si merece la pena reintentar"""
+
+    def __init__(self, message, status=None, retryable=True):
+        super().__init__(message)
+        self.status = status
+        self.retryable = retryable
+        self.attempts = 1
+
+
+@dataclass(slots=True)
+class AgentResult:
+    agent: str
+    status: str = "error"               # ok | partial | error
+    attempts: int = 0
+    seconds: float = 0.0
+    http_status: Optional[int] = None
+    error: Optional[str] = None
+    response: Optional[dict] = None
+    transfer: Optional[str] = None      # full | delta (solo con --delta)
+
+    def to_dict(self):
+        return {
+            "agent": self.agent,
+            "status": self.status,
+            "attempts": self.attempts,
+            "seconds": round(self.seconds, 4),
+            "http_status": self.http_status,
+            "error": self.error,
+            "transfer": self.transfer,
+            "response": self.response,
+        }
+
+
+@dataclass(slots=True)
+class PoolStats:
+    opened: int = 0
+    reused: int = 0
+    requests: int = 0
+    retries: int = 0
+    stale: int = 0                      # Conexiones reutilizadas que el agente ya había cerrado
+    bytes_received: int = 0             # Cuerpos de respuesta tal como llegan (comprimidos)
+    full: int = 0                       # Respuestas completas y deltas recibidos con --delta
+    deltas: int = 0
+    resyncs: int = 0
+
+
+def parse_agent(text):
+    """'host', 'host:puerto' o 'http://host:puerto' -> (host, puerto)"""
+    text = text.strip()
+    if "://" in text:
+        text = text.split("://", 1)[1]
+    text = text.rstrip("/")
+    host, sep, port = text.rpartition(":")
+    if not sep or not port.isdigit():
+        return text, DEFAULT_PORT
+    return host.strip("[]"), int(port)
+
+
+class _Connection:
+    __slots__ = ("reader", "writer", "requests")
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.requests = 0
+
+    def close(self):
+        self.writer.close()
+
+
+class ConnectionPool:
+    """Conexiones keep-alive libres por agente"""
+
+    def __init__(self, connect_timeout=DEFAULT_CONNECT_TIMEOUT, max_idle=MAX_IDLE_PER_AGENT):
+        self.connect_timeout = connect_timeout
+        self.max_idle = max_idle
+        self.stats = PoolStats()
+        self._idle = {}
+
+    async def acquire(self, address):
+        idle = self._idle.get(address)
+        while idle:
+            conn = idle.pop()
+            if not conn.reader.at_eof():
+                self.stats.reused += 1
+                return conn
+            conn.close()
+        try:
+            reader, writer = await asyncio.wait_for(asyncio.open_connection(*address), self.connect_timeout)
+        except asyncio.TimeoutError:
+            raise AgentError(f"Sin conexión tras {self.connect_timeout:g} s") from None
+        self.stats.opened += 1
+        return _Connection(reader, writer)
+
+    def release(self, address, conn, keep):
+        idle = self._idle.setdefault(address, [])
+        if keep and len(idle) < self.max_idle:
+            idle.append(conn)
+        else:
+            conn.close()
+
+    async def close(self):
+        for conns in self._idle.values():
+            for conn in conns:
+                conn.close()
+                try:
+                    await conn.writer.wait_closed()
+                except OSError:
+                    pass
+        self._idle.clear()
+
+
+async def _exchange(conn, host, path, token):
+    """Envía un GET y lee la respuesta: (estado, cabeceras, cuerpo, bytes recibidos)"""
+    lines = [
+        f"GET {path} HTTP/1.1",
+        f"Host: {host}",
+        "Accept: application/json",
+        "Accept-Encoding: gzip",
+        "Connection: keep-alive",
+    ]
+    if token:
+        lines.append(f"Authorization: Bearer {token}")
+    conn.writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+    await conn.writer.drain()
+    conn.requests += 1
+
+    status_line = await conn.reader.readline()
+    if not status_line:
+        raise asyncio.IncompleteReadError(b"", None)
+    parts = status_line.decode("latin-1").split(" ", 2)
+    if len(parts) < 2 or not parts[1].isdigit():
+        raise AgentError(f"Respuesta HTTP no válida: {status_line[:60]!r}", retryable=False)
+    status = int(parts[1])
+
+    headers = {}
+    for _ in range(MAX_HEADER_LINES):
+        line = await conn.reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    if "content-length" in headers:
+        body = await conn.reader.readexactly(int(headers["content-length"]))
+    else:
+        body = await conn.reader.read()
+        headers["connection"] = "close"
+    wire_bytes = len(body)
+    if headers.get("content-encoding") == "gzip":
+        body = gzip.decompress(body)
+    return status, headers, body, wire_bytes
+
+
+class FleetClient:
+    def __init__(self, token=None, concurrency=DEFAULT_CONCURRENCY, timeout=DEFAULT_TIMEOUT,
+                 connect_timeout=DEFAULT_CONNECT_TIMEOUT, retries=DEFAULT_RETRIES, backoff=DEFAULT_BACKOFF,
+                 delta=False):
+        self.token = token
+        self.delta = delta
+        self.decoders = {}      # agente -> snapshot_delta.DeltaDecoder (con delta=True)
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.pool = ConnectionPool(connect_timeout=connect_timeout)
+        self._semaphore = asyncio.Semaphore(concurrency)
+
+    @property
+    def stats(self):
+        return self.pool.stats
+
+    async def _request_once(self, address, path):
+        conn = await self.pool.acquire(address)
+        reused = conn.requests > 0
+        keep = False
+        try:
+            status, headers, body, wire_bytes = await asyncio.wait_for(
+                _exchange(conn, address[0], path, self.token), self.timeout)
+            self.stats.bytes_received += wire_bytes
+            keep = headers.get("connection", "").lower() != "close"
+        except (asyncio.IncompleteReadError, ConnectionResetError, BrokenPipeError) as e:
+            if reused:
+                # El agente cerró la conexión ociosa: se repite en una nueva sin gastar un intento
+                self.stats.stale += 1
+                return await self._request_once(address, path)
+            raise AgentError(f"Conexión cerrada por el agente: {e.__class__.__name__}") from None
+        except asyncio.TimeoutError:
+            raise AgentError(f"Sin respuesta tras {self.timeout:g} s") from None
+        finally:
+            self.pool.release(address, conn, keep)
+        return status, body
+
+    async def get_json(self, address, path):
+        """GET con reintentos; devuelve (intentos, estado HTTP, JSON)"""
+        attempt = 0
+        while True:
+            attempt += 1
+            self.stats.requests += 1
+            try:
+                async with self._semaphore:
+                    status, body = await self._request_once(address, path)
+                if status >= 500:
+                    raise AgentError(f"HTTP {status}", status=status)
+                data = json.loads(body) if body else None
+                if status >= 400:
+                    message = data.get("error") if isinstance(data, dict) else None
+                    raise AgentError(f"HTTP {status}: {message or 'error'}", status=status, retryable=False)
+                return attempt, status, data
+            except (AgentError, OSError, ValueError) as e:
+                if not isinstance(e, AgentError):
+                    # Errores de red (conexión rechazada, red caída...) se reintentan; JSON roto no
+                    e = AgentError(str(e) or e.__class__.__name__, retryable=isinstance(e, OSError))
+                if not e.retryable or attempt > self.retries:
+                    e.attempts = attempt
+                    raise e from None
+                self.stats.retries += 1
+                delay = self.backoff * 2 ** (attempt - 1)
+                await asyncio.sleep(delay * random.uniform(0.5, 1.5))
+
+    def _snapshot_path(self, probes, probe_timeout, since=None):
+        query = []
+        if probes:
+            query.append("probes=" + quote(",".join(probes)))
+        if probe_timeout is not None:
+            query.append(f"timeout={probe_timeout:g}")
+        if since is not None:
+            query.append(f"since={since}")
+        return "/snapshot" + ("?" + "&".join(query) if query else "")
+
+    async def _get_delta(self, agent, address, probes, probe_timeout):
+        """Pide solo los cambios desde la última respuesta; si no cuadran, la respuesta completa"""
+        decoder = self.decoders.setdefault(agent, snapshot_delta.DeltaDecoder())
+        path = self._snapshot_path(probes, probe_timeout, since=decoder.checksum or "")
+        attempts, status, message = await self.get_json(address, path)
+        try:
+            data = decoder.decode(message)
+        except snapshot_delta.DeltaError:
+            # Se perdió un delta o el agente se reinició: resincronización completa
+            self.stats.resyncs += 1
+            more, status, message = await self.get_json(address, self._snapshot_path(probes, probe_timeout, ""))
+            attempts += more
+            try:
+                data = decoder.decode(message)
+            except snapshot_delta.DeltaError as e:
+                raise AgentError(f"Respuesta no válida: {e}", retryable=False) from None
+        if message.get("type") == "SnapshotDelta":
+            self.stats.deltas += 1
+            transfer = "delta"
+        else:
+            self.stats.full += 1
+            transfer = "full"
+        return attempts, status, data, transfer
+
+    async def snapshot(self, agent, probes=None, probe_timeout=None):
+        address = parse_agent(agent)
+        result = AgentResult(agent=agent)
+        start = time.perf_counter()
+        try:
+            if self.delta:
+                result.attempts, result.http_status, result.response, result.transfer = \
+                    await self._get_delta(agent, address, probes, probe_timeout)
+            else:
+                result.attempts, result.http_status, result.response = \
+                    await self.get_json(address, self._snapshot_path(probes, probe_timeout))
+        except AgentError as e:
+            result.error = str(e)
+            result.http_status = e.status
+            result.attempts = e.attempts
+        else:
+            statuses = [line.get("status") for line in result.response.get("probes", [])]
+            result.status = "ok" if all(status == "ok" for status in statuses) else "partial"
+        result.seconds = time.perf_counter() - start
+        return result
+
+    async def poll(self, agents, probes=None, probe_timeout=None, on_result=None):
+        """Consulta todos los agentes; on_result(resultado) se llama según van respondiendo"""
+        tasks = [asyncio.create_task(self.snapshot(agent, probes, probe_timeout)) for agent in agents]
+        results = []
+        for task in asyncio.as_completed(tasks):
+            result = await task
+            results.append(result)
+            if on_result is not None:
+                on_result(result)
+        return results
+
+    async def close(self):
+        await self.pool.close()
+
+
+def read_agents(path):
+    """Un agente por línea ('host' o 'host:puerto'); se ignoran líneas vacías y comentarios"""
+    with open(path, encoding="utf-8") as f:
+        return [line.split("#", 1)[0].strip() for line in f if line.split("#", 1)[0].strip()]
+
+
+def exit_code(results):
+    failed = sum(1 for r in results if r.status != "ok")
+    if not failed:
+        return 0
+    return 3 if failed == len(results) else 1
+
+
+async def run(agents, args):
+    client = FleetClient(token=args.token, concurrency=args.concurrency, timeout=args.timeout,
+                         connect_timeout=args.connect_timeout, retries=args.retries, delta=args.delta)
+
+    def emit(result):
+        if not args.quiet_results:
+            sys.stdout.write(json.dumps(result.to_dict(), ensure_ascii=False, default=str) + "\n")
+            sys.stdout.flush()
+
+    results = []
+    try:
+        for round_number in range(args.rounds):
+            if round_number:
+                await asyncio.sleep(args.interval)
+            start = time.perf_counter()
+            received = client.stats.bytes_received
+            results = await client.poll(agents, args.probes, args.probe_timeout, on_result=emit)
+            ok = sum(1 for r in results if r.status == "ok")
+            print(f"Ronda {round_number + 1}: {ok}/{len(results)} agentes correctos en "
+                  f"{time.perf_counter() - start:.2f} s, {client.stats.bytes_received - received} bytes recibidos",
+                  file=sys.stderr)
+    finally:
+        await client.close()
+
+    s = client.stats
+    print(f"Peticiones: {s.requests} (reintentos {s.retries}); conexiones abiertas {s.opened}, "
+          f"reutilizadas {s.reused}, caducadas {s.stale}; {s.bytes_received} bytes recibidos", file=sys.stderr)
+    if args.delta:
+        print(f"Respuestas completas {s.full}, deltas {s.deltas}, resincronizaciones {s.resyncs}", file=sys.stderr)
+    return exit_code(results)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Agregador de inventario de ARKToolsPC")
+    parser.add_argument("agents_file", nargs="?", help="Archivo con un agente por línea (host[:puerto])")
+    parser.add_argument("--agent", action="append", default=[], help="Agente adicional (repetible)")
+    parser.add_argument("--local", type=int, default=0, metavar="N",
+                        help="Arranca N agentes de prueba en localhost y los consulta")
+    parser.add_argument("--probes", type=lambda text: [p for p in text.split(",") if p],
+                        help="Sondas separadas por comas (por defecto las del informe)")
+    parser.add_argument("--probe-timeout", type=float, help="Límite por sonda en el agente (segundos)")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="Peticiones simultáneas")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT, help="Límite por petición (segundos)")
+    parser.add_argument("--connect-timeout", type=float, default=DEFAULT_CONNECT_TIMEOUT)
+    parser.add_argument("--retries", type=int, default=DEFAULT_RETRIES, help="Reintentos por agente")
+    parser.add_argument("--token", help="Token de los agentes")
+    parser.add_argument("--rounds", type=int, default=1, help="Rondas de consulta (reutilizan conexiones)")
+    parser.add_argument("--interval", type=float, default=0.0, help="Segundos entre rondas")
+    parser.add_argument("--delta", action="store_true",
+                        help="Pide solo los cambios desde la respuesta anterior de cada agente")
+    parser.add_argument("--quiet-results", action="store_true", help="No escribe los resultados, solo el resumen")
+    args = parser.parse_args(argv)
+
+    agents = list(args.agent)
+    if args.agents_file:
+        agents += read_agents(args.agents_file)
+
+    servers = []
+    if args.local:
+        import agent
+        for _ in range(args.local):
+            server = agent.serve_in_thread(token=args.token, quiet=True)
+            servers.append(server)
+            agents.append(f"127.0.0.1:{server.server_address[1]}")
+
+    if not agents:
+        parser.error("Indica al menos un agente (archivo, --agent o --local)")
+    if args.concurrency < 1 or args.rounds < 1 or args.retries < 0:
+        parser.error("--concurrency y --rounds deben ser al menos 1 y --retries no puede ser negativo")
+
+    try:
+        return asyncio.run(run(agents, args))
+    except KeyboardInterrupt:
+        return 130
+    finally:
+        for server in servers:
+            server.shutdown()
+            server.server_close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,520 @@
+# history_store.py
+#
+# Historial en disco de métricas (CPU, memoria, E/S de discos y tráfico de red
+# de psutil) y de inventarios, para ver tendencias de semanas o meses.
+#
+# Métricas: cada serie tiene un archivo por nivel de resolución, de tamaño fijo
+# y proyectado en memoria (mmap):
+#
+#   cabecera (64 bytes)   nivel, capacidad, posición de escritura y el tramo
+#                         abierto (inicio, suma, mínimo, máximo, muestras)
+#   registros (24 bytes)  inicio del tramo (float64), media, mínimo y máximo
+#                         (float32) y número de muestras (uint32)
+#
+# Cada muestra se acumula en el tramo abierto de todos los niveles (10 s, 1
+# min, 15 min y 1 h por defecto); al cerrarse un tramo se añade su registro y
+# el registro nunca se reescribe. Cada nivel es circular: al llenarse, el
+# registro nuevo sustituye al más antiguo, así que el tamaño en disco queda
+# fijado al crear el archivo (capacidad x 24 bytes por nivel; con los niveles
+# por defecto, ~1 MB por serie: 1 día a 10 s, 7 días a 1 min, 92 días a 15 min
+# y 2 años a 1 h) y el número de series está limitado (MAX_SERIES).
+#
+# read() elige el nivel más fino que cubre el intervalo pedido, busca sus
+# extremos con búsqueda binaria sobre el mmap y solo lee esos registros.
+#
+# Inventarios: SnapshotJournal añade a un diario (snapshots.log) el registro de
+# cada sonda solo cuando su contenido cambia (suma de control de
+# snapshot_delta.py, sin los campos volátiles), comprimido. El diario rota al
+# superar max_bytes (se conserva un archivo anterior).
+#
+# Uso:
+#   python history_store.py record                   # graba hasta Ctrl+C
+#   python history_store.py list
+#   python history_store.py show cpu.total --hours 24 --points 48
+#   python history_store.py snapshots --probe usb
+
+import argparse
+import bisect
+import json
+import math
+import mmap
+import os
+import struct
+import sys
+import threading
+import time
+import zlib
+from array import array
+from dataclasses import dataclass, field
+from urllib.parse import quote, unquote
+
+import snapshot_delta
+from records import to_dict, from_dict
+
+
+FORMAT_VERSION = 1
+MAGIC = b"ARKH"
+HEADER = struct.Struct("<4sHHdIIIddddI")       # 64 bytes con el relleno
+HEADER_SIZE = 64
+RECORD = struct.Struct("<dfffI")
+SUFFIX = ".arkh"
+
+# (segundos por tramo, registros): 1 día, 7 días, ~92 días y 2 años
+TIERS = ((10, 8640), (60, 10080), (900, 8832), (3600, 17520))
+MAX_SERIES = 48
+JOURNAL_MAX_BYTES = 16 * 1024 ** 2
+
+# Series de live_monitor.py que se graban (cpu.<n> por núcleo solo con cores=True)
+RECORDED_PREFIXES = ("cpu.total", "mem.", "disk.", "net.")
+
+
+def default_history_path():
+    override = os.environ.get("ARKTOOLSPC_HISTORY")
+    if override:
+        return override
+    base = os.environ.get("LOCALAPPDATA") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "ARKToolsPC", "history")
+
+
+@dataclass(slots=True)
+class HistorySeries:
+    """Resultado de HistoryStore.read(): un punto por tramo del nivel elegido"""
+    name: str
+    step: float
+    times: array = field(default_factory=lambda: array("d"))
+    mean: array = field(default_factory=lambda: array("d"))
+    minimum: array = field(default_factory=lambda: array("d"))
+    maximum: array = field(default_factory=lambda: array("d"))
+
+    def __len__(self):
+        return len(self.times)
+
+    def _append(self, start, mean, minimum, maximum):
+        self.times.append(start)
+        self.mean.append(mean)
+        self.minimum.append(minimum)
+        self.maximum.append(maximum)
+
+
+class _TierFile:
+    """Un nivel de una serie: anillo de registros de tamaño fijo sobre mmap"""
+
+    def __init__(self, path, step, capacity):
+        exists = os.path.exists(path)
+        self.path = path
+        self._file = open(path, "r+b" if exists else "w+b")
+        if not exists:
+            self._file.truncate(HEADER_SIZE + capacity * RECORD.size)
+        self._map = mmap.mmap(self._file.fileno(), 0)
+        if exists:
+            (magic, version, _, step, capacity, self.head, self.count,
+             self.open_start, self.open_sum, self.open_min, self.open_max,
+             self.open_n) = HEADER.unpack_from(self._map, 0)
+            if magic != MAGIC or version != FORMAT_VERSION:
+                self.close()
+                raise ValueError(f"{path}: no es un archivo de historial válido")
+        else:
+            self.head = self.count = self.open_n = 0
+            self.open_start = self.open_sum = 0.0
+            self.open_min = self.open_max = 0.0
+        # Un archivo existente conserva su nivel y capacidad
+        self.step = float(step)
+        self.capacity = int(capacity)
+        if not exists:
+            self._write_header()
+
+    def _write_header(self):
+        HEADER.pack_into(self._map, 0, MAGIC, FORMAT_VERSION, 0, self.step, self.capacity,
+                         self.head, self.count, self.open_start, self.open_sum,
+                         self.open_min, self.open_max, self.open_n)
+
+    def _offset(self, index):
+        """Desplazamiento del registro lógico `index` (0 = el más antiguo)"""
+        return HEADER_SIZE + ((self.head - self.count + index) % self.capacity) * RECORD.size
+
+    def add(self, timestamp, value):
+        """Acumula una muestra; False si es anterior al tramo abierto"""
+        start = math.floor(timestamp / self.step) * self.step
+        if self.open_n and start < self.open_start:
+            return False
+        if self.open_n and start > self.open_start:
+            self._close_bucket()
+        if not self.open_n:
+            self.open_start, self.open_sum = start, 0.0
+            self.open_min = self.open_max = value
+        self.open_sum += value
+        self.open_min = min(self.open_min, value)
+        self.open_max = max(self.open_max, value)
+        self.open_n += 1
+        self._write_header()
+        return True
+
+    def _close_bucket(self):
+        # Primero el registro y después la cabecera que lo hace visible
+        RECORD.pack_into(self._map, HEADER_SIZE + self.head * RECORD.size, self.open_start,
+                         self.open_sum / self.open_n, self.open_min, self.open_max, self.open_n)
+        self.head = (self.head + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+        self.open_n = 0
+
+    def start_time(self, index):
+        return struct.unpack_from("<d", self._map, self._offset(index))[0]
+
+    def oldest(self):
+        if self.count:
+            return self.start_time(0)
+        return self.open_start if self.open_n else None
+
+    def newest(self):
+        """Fin del tramo más reciente (el abierto si tiene muestras)"""
+        if self.open_n:
+            return self.open_start + self.step
+        return self.start_time(self.count - 1) + self.step if self.count else None
+
+    def read(self, series, start, end):
+        """Añade a `series` los tramos que se solapan con [start, end)"""
+        times = _StartTimes(self)
+        lo = 0 if start is None else bisect.bisect_right(times, start - self.step)
+        hi = self.count if end is None else bisect.bisect_left(times, end)
+        # Hasta dos trozos contiguos del anillo, sin leer el resto del archivo
+        index = lo
+        while index < hi:
+            offset = self._offset(index)
+            run = min(hi - index, (HEADER_SIZE + self.capacity * RECORD.size - offset) // RECORD.size)
+            for begin, mean, minimum, maximum, _ in RECORD.iter_unpack(
+                    self._map[offset:offset + run * RECORD.size]):
+                series._append(begin, mean, minimum, maximum)
+            index += run
+        if self.open_n and (end is None or self.open_start < end) and \
+                (start is None or self.open_start + self.step > start):
+            series._append(self.open_start, self.open_sum / self.open_n, self.open_min, self.open_max)
+
+    def flush(self):
+        self._map.flush()
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+
+class _StartTimes:
+    """Vista de solo lectura de los inicios de tramo para bisect"""
+    __slots__ = ("_tier",)
+
+    def __init__(self, tier):
+        self._tier = tier
+
+    def __len__(self):
+        return self._tier.count
+
+    def __getitem__(self, index):
+        return self._tier.start_time(index)
+
+
+class HistoryStore:
+    """Series de métricas con varios niveles de resolución en `path`"""
+
+    def __init__(self, path=None, tiers=TIERS, max_series=MAX_SERIES):
+        self.path = path or default_history_path()
+        self.tiers = tuple(sorted(tiers))
+        self.max_series = max_series
+        self.dropped = 0            # Muestras descartadas (desordenadas o series de más)
+        self._series = {}           # nombre -> [_TierFile] del más fino al más grueso
+        self._lock = threading.Lock()
+        os.makedirs(self.path, exist_ok=True)
+        self.journal = SnapshotJournal(os.path.join(self.path, "snapshots.log"))
+
+    def _file_name(self, name, step):
+        return os.path.join(self.path, f"{quote(name, safe='')}.{int(step)}s{SUFFIX}")
+
+    def series_names(self):
+        names = set(self._series)
+        for entry in os.listdir(self.path):
+            if entry.endswith(SUFFIX):
+                names.add(unquote(entry[:-len(SUFFIX)].rsplit(".", 1)[0]))
+        return sorted(names)
+
+    def _open(self, name, create):
+        files = self._series.get(name)
+        if files is not None:
+            return files
+        exists = os.path.exists(self._file_name(name, self.tiers[0][0]))
+        if not exists and (not create or len(self._series_on_disk()) >= self.max_series):
+            return None
+        files = self._series[name] = [_TierFile(self._file_name(name, step), step, capacity)
+                                      for step, capacity in self.tiers]
+        return files
+
+    def _series_on_disk(self):
+        step = int(self.tiers[0][0])
+        return [e for e in os.listdir(self.path) if e.endswith(f".{step}s{SUFFIX}")]
+
+    def append(self, name, timestamp, value):
+        if value is None or math.isnan(value):
+            return
+        with self._lock:
+            files = self._open(name, create=True)
+            if files is None:
+                self.dropped += 1
+                return
+            for tier in files:
+                if not tier.add(timestamp, value):
+                    self.dropped += 1
+                    break
+
+    def append_many(self, timestamp, values):
+        for name, value in values.items():
+            self.append(name, timestamp, value)
+
+    def read(self, name, start=None, end=None, max_points=None):
+        """
+        Tramos de una serie entre `start` y `end` (segundos epoch; None = sin
+        límite) del nivel más fino que los cubre. Con `max_points` se usa el
+        primer nivel que devuelva como mucho esos puntos.
+        """
+        with self._lock:
+            files = self._open(name, create=False)
+            if files is None:
+                return HistorySeries(name, self.tiers[0][0])
+            tier = self._choose(files, start, end, max_points)
+            series = HistorySeries(name, tier.step)
+            tier.read(series, start, end)
+            return series
+
+    @staticmethod
+    def _choose(files, start, end, max_points):
+        for tier in files:
+            oldest, newest = tier.oldest(), tier.newest()
+            span_end = end if end is not None else (newest if newest is not None else time.time())
+            # Un nivel que aún no dio la vuelta guarda la serie entera: cubre cualquier
+            # inicio, aunque sea anterior a la primera muestra
+            covers = start is None or tier.count < tier.capacity or (oldest is not None and oldest <= start)
+            if max_points:
+                # El tramo que se devuelve no empieza antes de la muestra más antigua
+                span_start = oldest if oldest is not None else span_end
+                if start is not None:
+                    span_start = max(span_start, start)
+                small_enough = (span_end - span_start) / tier.step <= max_points
+            else:
+                small_enough = True
+            if covers and small_enough:
+                return tier
+        return files[-1]
+
+    def footprint(self):
+        """Bytes en disco de las series y del diario de inventarios"""
+        total = 0
+        for entry in os.listdir(self.path):
+            if entry.endswith(SUFFIX) or entry.startswith("snapshots.log"):
+                total += os.path.getsize(os.path.join(self.path, entry))
+        return total
+
+    def max_footprint(self):
+        """Tamaño máximo que puede alcanzar el historial con esta configuración"""
+        per_series = sum(HEADER_SIZE + capacity * RECORD.size for _, capacity in self.tiers)
+        return self.max_series * per_series + 2 * self.journal.max_bytes
+
+    def flush(self):
+        with self._lock:
+            for files in self._series.values():
+                for tier in files:
+                    tier.flush()
+
+    def close(self):
+        with self._lock:
+            for files in self._series.values():
+                for tier in files:
+                    tier.close()
+            self._series.clear()
+
+
+# Diario de inventarios
+
+JOURNAL_ENTRY = struct.Struct("<dH16sI")    # instante, longitud del nombre, suma, longitud del contenido
+
+
+class SnapshotJournal:
+    """Registros de las sondas, añadidos solo cuando cambian"""
+
+    def __init__(self, path, max_bytes=JOURNAL_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._last = None           # sonda -> suma del último registro guardado
+
+    def _entries(self, path, payloads=True):
+        """(instante, sonda, suma, contenido o None) sin leer los contenidos que no se piden"""
+        if not os.path.exists(path):
+            return
+        with open(path, "rb") as f:
+            while True:
+                header = f.read(JOURNAL_ENTRY.size)
+                if len(header) < JOURNAL_ENTRY.size:
+                    return
+                taken_at, name_length, digest, length = JOURNAL_ENTRY.unpack(header)
+                probe = f.read(name_length).decode("utf-8")
+                if payloads:
+                    payload = f.read(length)
+                    if len(payload) < length:
+                        return      # Entrada incompleta (escritura interrumpida)
+                else:
+                    f.seek(length, os.SEEK_CUR)
+                    payload = None
+                yield taken_at, probe, digest, payload
+
+    def _load_digests(self):
+        self._last = {}
+        for path in (self.path + ".old", self.path):
+            for _, probe, digest, _ in self._entries(path, payloads=False):
+                self._last[probe] = digest
+
+    def record(self, probe, record, taken_at=None):
+        """Añade el registro de una sonda si difiere del último guardado; True si se añadió"""
+        data = to_dict(record)
+        digest = bytes.fromhex(snapshot_delta.checksum(snapshot_delta.normalize(data)))[:16]
+        with self._lock:
+            if self._last is None:
+                self._load_digests()
+            if self._last.get(probe) == digest:
+                return False
+            payload = zlib.compress(json.dumps(data, ensure_ascii=False, default=str).encode("utf-8"))
+            name = probe.encode("utf-8")
+            if os.path.exists(self.path) and os.path.getsize(self.path) >= self.max_bytes:
+                os.replace(self.path, self.path + ".old")
+            with open(self.path, "ab") as f:
+                f.write(JOURNAL_ENTRY.pack(time.time() if taken_at is None else taken_at,
+                                           len(name), digest, len(payload)) + name + payload)
+            self._last[probe] = digest
+            return True
+
+    def record_snapshot(self, snapshot):
+        """Guarda las sondas de una instantánea que cambiaron; devuelve sus nombres"""
+        return [probe for probe, record in snapshot
+                if record is not None and self.record(probe, record, snapshot.taken_at)]
+
+    def history(self, probe=None, start=None, end=None):
+        """(instante, sonda, registro) guardados, del más antiguo al más reciente"""
+        for path in (self.path + ".old", self.path):
+            for taken_at, name, _, payload in self._entries(path):
+                if probe is not None and name != probe:
+                    continue
+                if (start is not None and taken_at < start) or (end is not None and taken_at >= end):
+                    continue
+                yield taken_at, name, from_dict(json.loads(zlib.decompress(payload)))
+
+
+# Grabación
+
+class HistoryRecorder:
+    """
+    Graba en un HistoryStore las métricas de un LiveMonitor propio a baja
+    frecuencia; las muestras se vuelcan al almacén cada `flush_interval` s.
+    """
+
+    def __init__(self, store, rate=0.5, flush_interval=10.0, cores=False):
+        import live_monitor
+        self.store = store
+        self.flush_interval = flush_interval
+        self.cores = cores
+        capacity = int(flush_interval * max(rate, live_monitor.MIN_RATE_HZ) * 2) + 2
+        self.monitor = live_monitor.LiveMonitor(rate=rate, capacity=capacity)
+        self._count = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _recorded(self, name):
+        return name.startswith(RECORDED_PREFIXES) or (self.cores and name.startswith("cpu."))
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return self
+        self._stop.clear()
+        self.monitor.start()
+        self._thread = threading.Thread(target=self._run, name="HistoryRecorder", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self.monitor.stop(timeout)
+        self.drain()
+        self.store.flush()
+
+    def drain(self):
+        """Pasa al almacén las muestras tomadas desde la última vez"""
+        update = self.monitor.since(self._count)
+        self._count = update.count
+        for i, timestamp in enumerate(update.timestamps):
+            for name, values in update.series.items():
+                if self._recorded(name):
+                    self.store.append(name, timestamp, values[i])
+
+    def _run(self):
+        while not self._stop.wait(self.flush_interval):
+            self.drain()
+            self.store.flush()
+
+
+def _clock(timestamp):
+    return time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(timestamp))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Historial de métricas e inventarios de ARKToolsPC")
+    parser.add_argument("--path", help="Carpeta del historial (por defecto la de usuario)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    record = commands.add_parser("record", help="Graba métricas hasta Ctrl+C")
+    record.add_argument("--rate", type=float, default=0.5, help="Muestras por segundo")
+    record.add_argument("--cores", action="store_true", help="Graba también el uso por núcleo")
+    record.add_argument("--duration", type=float, help="Segundos de grabación (sin límite por defecto)")
+
+    commands.add_parser("list", help="Series grabadas y tamaño en disco")
+
+    show = commands.add_parser("show", help="Muestra una serie")
+    show.add_argument("name")
+    show.add_argument("--hours", type=float, default=1.0)
+    show.add_argument("--points", type=int, default=60, help="Máximo de puntos (elige el nivel)")
+
+    snapshots = commands.add_parser("snapshots", help="Cambios de inventario guardados")
+    snapshots.add_argument("--probe")
+    args = parser.parse_args(argv)
+
+    store = HistoryStore(args.path)
+    try:
+        if args.command == "record":
+            recorder = HistoryRecorder(store, rate=args.rate, cores=args.cores).start()
+            print(f"Grabando en {store.path} (Ctrl+C para terminar)", file=sys.stderr)
+            try:
+                if args.duration:
+                    time.sleep(args.duration)
+                else:
+                    while True:
+                        time.sleep(3600)
+            except KeyboardInterrupt:
+                pass
+            recorder.stop()
+        elif args.command == "list":
+            for name in store.series_names():
+                series = store.read(name)
+                last = f"{_clock(series.times[-1])}" if len(series) else "sin datos"
+                print(f"{name:40} {len(series):6} tramos de {series.step:.0f} s, último {last}")
+            print(f"{store.footprint() / 1024 ** 2:.1f} MB en disco "
+                  f"(máximo {store.max_footprint() / 1024 ** 2:.0f} MB)", file=sys.stderr)
+        elif args.command == "show":
+            series = store.read(args.name, start=time.time() - args.hours * 3600, max_points=args.points)
+            for t, mean, low, high in zip(series.times, series.mean, series.minimum, series.maximum):
+                print(f"{_clock(t)}  media {mean:14.2f}  mín {low:14.2f}  máx {high:14.2f}")
+            print(f"{len(series)} tramos de {series.step:.0f} s", file=sys.stderr)
+        elif args.command == "snapshots":
+            for taken_at, probe, record in store.journal.history(probe=args.probe):
+                print(f"{_clock(taken_at)}  {probe:12} {type(record).__name__}")
+    finally:
+        store.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
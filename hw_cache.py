@@ -0,0 +1,265 @@
+# hw_cache.py
+#
+# Caché en disco de las secciones de hardware que casi nunca cambian entre
+# ejecuciones (placa base, módulos de RAM, identidad de la CPU, discos y GPU).
+#
+# Cada entrada guarda el registro, una huella barata del hardware y el
+# identificador de arranque. Al leerla:
+#   1. Si superó su TTL, se vuelve a consultar.
+#   2. Las secciones que no pueden cambiar sin reiniciar (CPU, RAM, placa base)
+#      son válidas sin consultar nada mientras el arranque sea el mismo.
+#   3. En otro caso se calcula la huella con una consulta WQL proyectada
+#      (solo números de serie, tamaños, versiones...) y solo si cambió se
+#      repite la consulta completa.
+#
+# El archivo se guarda por equipo; se conservan como mucho MAX_MACHINES
+# equipos (los usados más recientemente) y se descartan las entradas caducadas.
+
+import hashlib
+import json
+import os
+import platform
+import threading
+import time
+
+import wmi_session
+# psutil se carga en el primer uso (ver lazy_deps.py)
+from lazy_deps import psutil
+from records import to_dict, from_dict
+
+
+CACHE_VERSION = 1
+DEFAULT_TTL = 7 * 24 * 3600      # Una semana
+MAX_MACHINES = 4
+
+
+class Section:
+    """Sección cacheable: clase WMI y propiedades que forman su huella"""
+
+    __slots__ = ("name", "wmi_class", "properties", "boot_stable", "ttl")
+
+    def __init__(self, name, wmi_class, properties, boot_stable, ttl=DEFAULT_TTL):
+        self.name = name
+        self.wmi_class = wmi_class
+        self.properties = properties
+        self.boot_stable = boot_stable
+        self.ttl = ttl
+
+
+SECTIONS = {
+    s.name: s for s in (
+        Section("motherboard", "Win32_BaseBoard", ["Manufacturer", "Product", "SerialNumber"], True),
+        Section("ram", "Win32_PhysicalMemory", ["BankLabel", "Capacity", "SerialNumber"], True),
+        Section("cpu", "Win32_Processor", ["ProcessorId", "Name"], True),
+        # Los discos USB y las actualizaciones de controladores cambian sin reiniciar
+        Section("disk", "Win32_DiskDrive", ["Model", "SerialNumber", "Size"], False, ttl=24 * 3600),
+        Section("gpu", "Win32_VideoController", ["Name", "DriverVersion"], False),
+    )
+}
+
+
+def default_cache_path():
+    override = os.environ.get("ARKTOOLSPC_CACHE")
+    if override:
+        return override
+    base = os.environ.get("LOCALAPPDATA") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "ARKToolsPC", "hw_cache.json")
+
+
+def boot_id():
+    """Identificador del arranque actual (cambia en cada reinicio)"""
+    try:
+        with open("/proc/sys/kernel/random/boot_id", encoding="ascii") as f:
+            return f.read().strip()
+    except OSError:
+        pass
+    try:
+        return str(int(psutil.boot_time()))
+    except Exception:
+        return None
+
+
+def fingerprint(section):
+    """Huella de una sección a partir de una consulta WQL con solo las propiedades necesarias"""
+    columns = ", ".join(section.properties)
+    rows = wmi_session.wql(f"SELECT {columns} FROM {section.wmi_class}")
+    values = sorted(
+        "|".join(str(getattr(row, prop, "") or "").strip() for prop in section.properties)
+        for row in rows
+    )
+    digest = hashlib.sha1("\n".join(values).encode("utf-8")).hexdigest()
+    return f"{len(values)}:{digest}"
+
+
+class HardwareCache:
+    def __init__(self, path=None, enabled=None, max_machines=MAX_MACHINES, sections=None):
+        self.path = path or default_cache_path()
+        if enabled is None:
+            enabled = not os.environ.get("ARKTOOLSPC_NO_CACHE")
+        self.enabled = enabled
+        self.max_machines = max_machines
+        self.sections = SECTIONS if sections is None else sections
+        self.machine = platform.node() or "local"
+        self._lock = threading.RLock()
+        self._data = None
+        self._boot = None           # Se calcula en la primera consulta (no al importar)
+        self.stats = {"hits": 0, "fingerprint_hits": 0, "misses": 0, "refreshes": 0}
+
+    @property
+    def _boot_id(self):
+        if self._boot is None:
+            self._boot = boot_id() or ""
+        return self._boot or None
+
+    # Persistencia
+
+    def _load(self):
+        if self._data is not None:
+            return self._data
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") != CACHE_VERSION:
+                data = None
+        except (OSError, ValueError):
+            data = None
+        self._data = data or {"version": CACHE_VERSION, "machines": {}}
+        self._evict()
+        return self._data
+
+    def _save(self):
+        self._evict()
+        directory = os.path.dirname(self.path)
+        try:
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self._data, f, ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp_path, self.path)
+        except OSError:
+            # La caché es una optimización: si no se puede escribir se sigue sin ella
+            pass
+
+    def _evict(self):
+        """Descarta entradas caducadas y los equipos menos usados por encima del máximo"""
+        now = time.time()
+        machines = self._data["machines"]
+        for machine in list(machines):
+            entries = machines[machine].get("sections", {})
+            for name in list(entries):
+                section = self.sections.get(name)
+                if section is None or now - entries[name].get("stored_at", 0) > section.ttl:
+                    del entries[name]
+            if not entries:
+                del machines[machine]
+
+        if len(machines) > self.max_machines:
+            by_use = sorted(machines, key=lambda m: machines[m].get("last_used", 0), reverse=True)
+            for machine in by_use[self.max_machines:]:
+                del machines[machine]
+
+    def _entries(self):
+        machine = self._load()["machines"].setdefault(self.machine, {"sections": {}})
+        machine["last_used"] = time.time()
+        return machine["sections"]
+
+    # Consulta
+
+    def _validate(self, section, entry):
+        """
+        Comprueba una entrada. Devuelve "boot" (mismo arranque), "fingerprint"
+        (la huella coincide) o None si hay que volver a consultar.
+        """
+        if time.time() - entry.get("stored_at", 0) > section.ttl:
+            return None
+        if section.boot_stable and self._boot_id and entry.get("boot_id") == self._boot_id:
+            return "boot"
+        if entry.get("fingerprint") == fingerprint(section):
+            return "fingerprint"
+        return None
+
+    def get(self, name, collector, force=False):
+        """
+        Devuelve el registro de la sección `name`, desde la caché si sigue siendo
+        válido o llamando a `collector()` si no. Los registros con error no se guardan.
+        """
+        section = self.sections.get(name)
+        if not self.enabled or section is None:
+            return collector()
+
+        # Las consultas WMI se hacen fuera del cerrojo para que las secciones
+        # se puedan consultar en paralelo (por ejemplo desde el informe)
+        with self._lock:
+            entry = self._entries().get(name)
+
+        try:
+            validated = None if force or entry is None else self._validate(section, entry)
+        except Exception:
+            # No se pudo calcular la huella: se vuelve a consultar todo
+            validated = None
+
+        if validated is not None:
+            with self._lock:
+                if validated == "boot":
+                    self.stats["hits"] += 1
+                else:
+                    self.stats["fingerprint_hits"] += 1
+                    if entry.get("boot_id") != self._boot_id:
+                        # Revalidada tras un reinicio: el próximo acceso ya no necesita la huella
+                        entry["boot_id"] = self._boot_id
+                        self._save()
+            return from_dict(entry["record"])
+
+        try:
+            current_fingerprint = fingerprint(section)
+        except Exception:
+            current_fingerprint = None
+        record = collector()
+
+        with self._lock:
+            self.stats["misses"] += 1
+            entries = self._entries()
+            if getattr(record, "error", None) or current_fingerprint is None:
+                entries.pop(name, None)
+            else:
+                entries[name] = {
+                    "record": to_dict(record),
+                    "fingerprint": current_fingerprint,
+                    "boot_id": self._boot_id,
+                    "stored_at": time.time(),
+                }
+            self._save()
+        return record
+
+    def invalidate(self, name=None):
+        """Fuerza la próxima consulta de una sección (o de todas si name es None)"""
+        with self._lock:
+            entries = self._entries()
+            if name is None:
+                entries.clear()
+            else:
+                entries.pop(name, None)
+            self.stats["refreshes"] += 1
+            self._save()
+
+    def clear(self):
+        """Borra el archivo de caché completo"""
+        with self._lock:
+            self._data = {"version": CACHE_VERSION, "machines": {}}
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+
+
+# Caché compartida por system_info.py
+cache = HardwareCache()
+
+
+def cached(name, collector, force=False):
+    return cache.get(name, collector, force=force)
+
+
+def refresh(name=None):
+    cache.invalidate(name)
@@ -0,0 +1,217 @@
+# hw_report.py
+#
+# Motor del "Informe de Hardware": ejecuta todas las sondas de system_info.py
+# en paralelo con un número acotado de hilos. Cada sonda tiene su propio tiempo
+# límite; si una se cuelga o falla, el informe conserva el resto de resultados
+# y anota el estado y el tiempo de reloj de cada sonda.
+#
+# Los hilos de trabajo son daemon a propósito: una llamada WMI colgada no se
+# puede interrumpir desde Python, y con hilos daemon al menos no impide cerrar
+# la aplicación.
+
+import itertools
+import queue
+import threading
+import time
+
+import system_info
+from records import HardwareReport, ProbeTiming, to_dict
+
+
+# Sondas incluidas en el informe, en el orden en que se presentan
+REPORT_PROBES = [
+    "system", "os", "cpu", "ram", "motherboard", "disk", "gpu",
+    "nic", "network", "audio", "usb", "bluetooth", "com",
+]
+
+DEFAULT_TIMEOUT = 15.0
+
+# Sondas que lanzan procesos externos o recorren tablas grandes
+PROBE_TIMEOUTS = {
+    "os": 30.0,
+    "ipconfig": 20.0,
+    "usb": 20.0,
+    "bluetooth": 20.0,
+}
+
+
+class _ProbeState:
+    __slots__ = ("name", "started", "finished", "record", "error")
+
+    def __init__(self, name):
+        self.name = name
+        self.started = None
+        self.finished = None
+        self.record = None
+        self.error = None
+
+
+def _timing(state, limit, now, cancelled=False):
+    """ProbeTiming de una sonda terminada, vencida o (si `cancelled`) abandonada"""
+    timing = ProbeTiming(name=state.name)
+    if state.finished is not None:
+        timing.seconds = state.finished - state.started
+        if state.error is not None:
+            timing.status, timing.error = "error", state.error
+    elif cancelled:
+        timing.status = "cancelled"
+    else:
+        timing.status = "timeout"
+        if state.started is not None:
+            timing.seconds = now - state.started
+            timing.error = f"Sin respuesta tras {limit:g} s"
+        else:
+            timing.error = "No llegó a ejecutarse"
+    return timing
+
+
+def run_report(probes=None, max_workers=6, timeouts=None, default_timeout=DEFAULT_TIMEOUT,
+               total_timeout=None, cancel=None, registry=None, on_probe=None):
+    """
+    Ejecuta las sondas en paralelo y devuelve un HardwareReport.
+
+    - `timeouts`: {sonda: segundos}, medidos desde que la sonda empieza a ejecutarse.
+    - `total_timeout`: límite global (por defecto el doble del mayor límite
+      individual); lo que siga en cola o en curso al agotarse se marca como timeout.
+    - `cancel`: threading.Event opcional para abandonar el informe.
+    - `registry`: {nombre: función}, por defecto system_info.PROBES.
+    - `on_probe`: función opcional on_probe(timing, record) a la que se llama
+      desde el hilo que ejecuta run_report en cuanto cada sonda termina, falla
+      o vence (record es None si no hay registro), sin esperar a las demás.
+    """
+    registry = system_info.PROBES if registry is None else registry
+    names = list(REPORT_PROBES if probes is None else probes)
+    limits = dict(PROBE_TIMEOUTS)
+    limits.update(timeouts or {})
+
+    def limit(name):
+        return limits.get(name, default_timeout)
+
+    if total_timeout is None:
+        total_timeout = 2 * max((limit(n) for n in names), default=default_timeout)
+
+    states = {name: _ProbeState(name) for name in names}
+    pending = queue.Queue()
+    for name in names:
+        pending.put(name)
+    done = threading.Condition()
+    # Al volver run_report los hilos que sigan vivos no toman más sondas de la cola
+    finished = threading.Event()
+    timed_out = set()
+
+    def worker():
+        while True:
+            if finished.is_set() or (cancel is not None and cancel.is_set()):
+                return
+            try:
+                name = pending.get_nowait()
+            except queue.Empty:
+                return
+            state = states[name]
+            state.started = time.perf_counter()
+            try:
+                record = registry[name]()
+            except Exception as e:
+                record, error = None, str(e)
+            else:
+                error = None
+            with done:
+                state.record, state.error = record, error
+                state.finished = time.perf_counter()
+                done.notify_all()
+                if name in timed_out:
+                    return      # Ya se arrancó otro hilo en su lugar
+
+    threads = itertools.count()
+
+    def start_worker():
+        threading.Thread(target=worker, name=f"HardwareReport-{next(threads)}", daemon=True).start()
+
+    report = HardwareReport()
+    start = time.perf_counter()
+    for _ in range(max(1, min(max_workers, len(names)))):
+        start_worker()
+
+    resolved = {}           # Sondas ya resueltas: nombre -> ProbeTiming
+    try:
+        while True:
+            with done:
+                now = time.perf_counter()
+                # Sondas en curso que superaron su límite: su hilo sigue bloqueado,
+                # así que se arranca otro para que la cola no se quede sin atender
+                for s in states.values():
+                    if s.finished is None and s.started is not None and s.name not in timed_out \
+                            and now - s.started >= limit(s.name):
+                        timed_out.add(s.name)
+                        if not pending.empty():
+                            start_worker()
+
+                fresh = [(s, _timing(s, limit(s.name), now)) for s in states.values()
+                         if s.name not in resolved and (s.finished is not None or s.name in timed_out)]
+                for s, timing in fresh:
+                    resolved[s.name] = timing
+
+                running = [s for s in states.values() if s.name not in resolved]
+                stop = (not running or (cancel is not None and cancel.is_set())
+                        or now - start >= total_timeout)
+                if not fresh and not stop:
+                    # Dormir hasta el próximo vencimiento (o un margen corto)
+                    deadlines = [s.started + limit(s.name) for s in running if s.started is not None]
+                    deadlines.append(start + total_timeout)
+                    done.wait(max(0.0, min(min(deadlines) - now, 0.25)))
+
+            # Los avisos se dan fuera del candado: un consumidor lento no frena a los hilos
+            if on_probe is not None:
+                for s, timing in fresh:
+                    on_probe(timing, s.record if timing.status == "ok" else None)
+            if stop:
+                break
+    finally:
+        finished.set()
+
+    report.wall_seconds = time.perf_counter() - start
+    cancelled = cancel is not None and cancel.is_set()
+    now = time.perf_counter()
+
+    leftovers = []
+    with done:
+        for name in names:
+            s = states[name]
+            timing = resolved.get(name)
+            if timing is None:
+                # Cancelada o fuera del límite global
+                timing = _timing(s, limit(name), now, cancelled=cancelled)
+                leftovers.append(timing)
+            if timing.status == "ok":
+                report.snapshot.records[name] = s.record
+            report.timings.append(timing)
+
+    if on_probe is not None:
+        for timing in leftovers:
+            on_probe(timing, report.snapshot.records.get(timing.name))
+
+    return report
+
+
+# Resultado por sonda en JSON (CLI no interactiva y agente)
+
+def probe_status(timing, record):
+    """Estado de una sonda: un registro con `error` también cuenta como fallo"""
+    if timing.status == "ok" and getattr(record, "error", None):
+        return "error", record.error
+    return timing.status, timing.error
+
+
+def probe_line(timing, record, host, backend):
+    """Objeto JSON de una sonda: una línea de la salida NDJSON de main.py"""
+    status, error = probe_status(timing, record)
+    return {
+        "host": host,
+        "backend": backend,
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "probe": timing.name,
+        "status": status,
+        "seconds": None if timing.seconds is None else round(timing.seconds, 4),
+        "error": error,
+        "record": to_dict(record) if record is not None else None,
+    }
@@ -0,0 +1,300 @@
+# inventory_search.py
+#
+# Búsqueda instantánea sobre el inventario ya recolectado, sin volver a
+# ejecutar sondas ni consultar WMI. Cada campo de texto o número de un registro
+# (y de los elementos de sus listas: dispositivos, módulos, discos,
+# adaptadores...) es una entrada del índice invertido:
+#
+#   token -> entradas     los valores se parten en palabras alfanuméricas en
+#                         minúsculas ("USB\VID_046D&PID_C52B" -> usb, vid,
+#                         046d, pid, c52b)
+#   vocabulario ordenado  términos cortos (1-2 caracteres): búsqueda por prefijo
+#   trigrama -> tokens    términos de 3 o más: búsqueda por subcadena dentro de
+#                         los tokens ("52b" encuentra "c52b")
+#
+# Una consulta con varios términos devuelve las entradas que los contienen
+# todos; se ordenan primero las que contienen la consulta literal, luego por
+# calidad de coincidencia (exacta, prefijo, subcadena).
+#
+# update(sonda, registro) sustituye solo las entradas de esa sonda, así que
+# refrescar una sección no reconstruye el índice.
+#
+# Uso:
+#   python inventory_search.py 046d                    # ejecuta las sondas del informe
+#   python inventory_search.py --file equipo.json 00:1B:21
+#   python inventory_search.py --file equipo.ndjson "intel 630"
+
+import argparse
+import bisect
+import dataclasses
+import json
+import re
+import sys
+import threading
+import time
+from dataclasses import dataclass
+
+from records import Snapshot, HardwareReport, from_dict
+
+
+MAX_RESULTS = 500
+MIN_SUBSTRING = 3               # Términos más cortos se buscan solo como prefijo
+
+# Atributos que identifican a un elemento de una lista, por orden de preferencia
+TITLE_FIELDS = ("name", "description", "model", "port", "connection_id", "device_id",
+                "bank", "label")
+
+EXACT, PREFIX, SUBSTRING = 0, 1, 2
+MATCH_NAMES = ("exacta", "prefijo", "subcadena")
+
+_TOKEN = re.compile(r"[^\W_]+")
+
+
+def tokens(text):
+    return _TOKEN.findall(str(text).casefold())
+
+
+def _trigrams(token):
+    return {token[i:i + 3] for i in range(len(token) - 2)}
+
+
+@dataclass(slots=True, frozen=True)
+class Entry:
+    """Un campo indexado: sonda, elemento dentro del registro, campo y valor"""
+    probe: str
+    item: str
+    field: str
+    value: str
+
+
+@dataclass(slots=True, frozen=True)
+class SearchHit:
+    probe: str
+    item: str
+    field: str
+    value: str
+    match: str                  # exacta | prefijo | subcadena
+    phrase: bool                # el valor contiene la consulta literal
+
+
+def _title(item, index):
+    for name in TITLE_FIELDS:
+        value = getattr(item, name, None)
+        if value:
+            return str(value)
+    return f"#{index + 1}"
+
+
+def _entries(probe, record, item="", path=""):
+    """Entradas (campo, valor) de un registro, recorriendo sus listas de registros"""
+    for f in dataclasses.fields(record):
+        value = getattr(record, f.name)
+        name = f"{path}{f.name}"
+        if value is None or isinstance(value, bool) or f.name == "error":
+            continue
+        if dataclasses.is_dataclass(value):
+            yield from _entries(probe, value, item, f"{name}.")
+        elif isinstance(value, (list, tuple)):
+            for i, element in enumerate(value):
+                if dataclasses.is_dataclass(element):
+                    label = _title(element, i)
+                    yield from _entries(probe, element, f"{item} › {label}" if item else label)
+                elif element is not None:
+                    yield Entry(probe, item, name, str(element))
+        elif isinstance(value, dict):
+            for key, element in value.items():
+                if element is not None and not isinstance(element, (bool, dict, list)):
+                    yield Entry(probe, item, f"{name}.{key}", str(element))
+        elif str(value):
+            yield Entry(probe, item, name, str(value))
+
+
+class InventoryIndex:
+    """Índice invertido del inventario; se actualiza por sonda"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = {}          # id -> Entry
+        self._by_probe = {}         # sonda -> [id]
+        self._postings = {}         # token -> {id}
+        self._vocabulary = []       # tokens ordenados (prefijos)
+        self._trigrams = {}         # trigrama -> {token}
+        self._next_id = 0
+        self.last_query_seconds = 0.0
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def probes(self):
+        return list(self._by_probe)
+
+    @property
+    def token_count(self):
+        return len(self._postings)
+
+    # Construcción
+
+    def update(self, probe, record):
+        """Sustituye las entradas de una sonda por las de su registro nuevo"""
+        entries = list(_entries(probe, record)) if record is not None else []
+        with self._lock:
+            self._remove(probe)
+            ids = self._by_probe[probe] = []
+            for entry in entries:
+                entry_id = self._next_id
+                self._next_id += 1
+                self._entries[entry_id] = entry
+                ids.append(entry_id)
+                for token in set(tokens(entry.value)):
+                    self._add_token(token, entry_id)
+
+    def update_snapshot(self, snapshot):
+        """Indexa todas las sondas de una instantánea (o de un informe)"""
+        if isinstance(snapshot, HardwareReport):
+            snapshot = snapshot.snapshot
+        for probe, record in snapshot:
+            self.update(probe, record)
+
+    def remove(self, probe):
+        with self._lock:
+            self._remove(probe)
+
+    def _remove(self, probe):
+        for entry_id in self._by_probe.pop(probe, ()):
+            entry = self._entries.pop(entry_id)
+            for token in set(tokens(entry.value)):
+                postings = self._postings[token]
+                postings.discard(entry_id)
+                if not postings:
+                    self._drop_token(token)
+
+    def _add_token(self, token, entry_id):
+        postings = self._postings.get(token)
+        if postings is None:
+            postings = self._postings[token] = set()
+            bisect.insort(self._vocabulary, token)
+            for trigram in _trigrams(token):
+                self._trigrams.setdefault(trigram, set()).add(token)
+        postings.add(entry_id)
+
+    def _drop_token(self, token):
+        del self._postings[token]
+        del self._vocabulary[bisect.bisect_left(self._vocabulary, token)]
+        for trigram in _trigrams(token):
+            owners = self._trigrams[trigram]
+            owners.discard(token)
+            if not owners:
+                del self._trigrams[trigram]
+
+    # Consulta
+
+    def _matching_tokens(self, term):
+        """Tokens del vocabulario que contienen `term` (o empiezan por él si es corto)"""
+        if len(term) < MIN_SUBSTRING:
+            start = bisect.bisect_left(self._vocabulary, term)
+            end = bisect.bisect_left(self._vocabulary, term + "\U0010ffff")
+            return self._vocabulary[start:end]
+        sets = sorted((self._trigrams.get(t, set()) for t in _trigrams(term)), key=len)
+        if not sets[0]:
+            return []
+        candidates = set.intersection(*sets) if len(sets) > 1 else sets[0]
+        return [token for token in candidates if term in token]
+
+    def _term_matches(self, term):
+        """id de entrada -> mejor tipo de coincidencia de `term`"""
+        best = {}
+        for token in self._matching_tokens(term):
+            kind = EXACT if token == term else PREFIX if token.startswith(term) else SUBSTRING
+            for entry_id in self._postings[token]:
+                if best.get(entry_id, SUBSTRING + 1) > kind:
+                    best[entry_id] = kind
+        return best
+
+    def search(self, query, limit=MAX_RESULTS):
+        """Entradas que contienen todos los términos de `query`, las mejores primero"""
+        start = time.perf_counter()
+        terms = list(dict.fromkeys(tokens(query)))
+        if not terms:
+            return []
+        phrase = query.strip().casefold()
+
+        with self._lock:
+            matches = []
+            for term in terms:
+                found = self._term_matches(term)
+                if not found:
+                    self.last_query_seconds = time.perf_counter() - start
+                    return []
+                matches.append(found)
+            matches.sort(key=len)
+            ids = set(matches[0]).intersection(*matches[1:])
+
+            ranked = []
+            for entry_id in ids:
+                entry = self._entries[entry_id]
+                kind = max(found[entry_id] for found in matches)
+                ranked.append((phrase not in entry.value.casefold(), kind, entry_id, entry))
+        ranked.sort(key=lambda r: r[:3])
+
+        hits = [SearchHit(entry.probe, entry.item, entry.field, entry.value, MATCH_NAMES[kind], not missing)
+                for missing, kind, _, entry in ranked[:limit]]
+        self.last_query_seconds = time.perf_counter() - start
+        return hits
+
+
+# Carga de archivos exportados
+
+def load_records(path):
+    """Registros de un JSON exportado (Snapshot o HardwareReport) o de NDJSON de main.py/agent.py"""
+    with open(path, encoding="utf-8") as f:
+        text = f.read()
+    try:
+        documents = [json.loads(text)]
+    except json.JSONDecodeError:
+        documents = [json.loads(line) for line in text.splitlines() if line.strip()]
+
+    snapshot = Snapshot()
+    for document in documents:
+        if "probe" in document and "record" in document:
+            # Línea NDJSON de probe_line()
+            if document["record"] is not None:
+                snapshot.records[document["probe"]] = from_dict(document["record"])
+            continue
+        value = from_dict(document)
+        if isinstance(value, HardwareReport):
+            value = value.snapshot
+        if isinstance(value, Snapshot):
+            snapshot.records.update(value.records)
+    return snapshot
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Busca en el inventario recolectado")
+    parser.add_argument("query", help="Texto a buscar (todas las palabras; prefijo o subcadena)")
+    parser.add_argument("--file", help="JSON exportado o NDJSON de main.py (por defecto ejecuta las sondas)")
+    parser.add_argument("--limit", type=int, default=50)
+    args = parser.parse_args(argv)
+
+    if args.file:
+        snapshot = load_records(args.file)
+    else:
+        import hw_report
+        snapshot = hw_report.run_report().snapshot
+
+    index = InventoryIndex()
+    start = time.perf_counter()
+    index.update_snapshot(snapshot)
+    built = time.perf_counter() - start
+    hits = index.search(args.query, limit=args.limit)
+
+    for hit in hits:
+        where = f"{hit.probe} › {hit.item}" if hit.item else hit.probe
+        print(f"{where} | {hit.field}: {hit.value}")
+    print(f"{len(hits)} resultados; índice de {len(index)} entradas y {index.token_count} tokens "
+          f"en {built * 1000:.1f} ms, consulta en {index.last_query_seconds * 1000:.2f} ms", file=sys.stderr)
+    return 0 if hits else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
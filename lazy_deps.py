@@ -0,0 +1,111 @@
+# lazy_deps.py
+#
+# Carga diferida de dependencias pesadas o específicas de una plataforma
+# (psutil, winreg, wmi, subprocess...). El módulo real se importa la primera
+# vez que se usa un atributo; si no está instalado se lanza
+# MissingDependencyError, que las sondas capturan como cualquier otro error,
+# de modo que system_info se puede importar en cualquier sistema.
+
+import importlib
+import threading
+
+
+class MissingDependencyError(ImportError):
+    """Una dependencia opcional no está disponible en este sistema"""
+
+
+class LazyModule:
+    """Sustituto de un módulo que lo importa en el primer acceso a un atributo"""
+
+    def __init__(self, name, hint=None):
+        self.__dict__["_name"] = name
+        self.__dict__["_hint"] = hint
+        self.__dict__["_module"] = None
+        self.__dict__["_error"] = None
+        self.__dict__["_override"] = None
+        self.__dict__["_lock"] = threading.Lock()
+
+    def _load(self):
+        override = self.__dict__["_override"]
+        if override is not None:
+            return override
+        module = self.__dict__["_module"]
+        if module is not None:
+            return module
+
+        with self.__dict__["_lock"]:
+            if self.__dict__["_module"] is None and self.__dict__["_error"] is None:
+                try:
+                    self.__dict__["_module"] = importlib.import_module(self._name)
+                except ImportError as e:
+                    self.__dict__["_error"] = e
+
+        if self.__dict__["_error"] is not None:
+            message = f"El módulo '{self._name}' no está disponible"
+            if self._hint:
+                message += f" ({self._hint})"
+            raise MissingDependencyError(message) from self.__dict__["_error"]
+        return self.__dict__["_module"]
+
+    @property
+    def available(self):
+        try:
+            self._load()
+            return True
+        except MissingDependencyError:
+            return False
+
+    @property
+    def loaded(self):
+        """True si el módulo ya se importó (sin forzar la importación)"""
+        return self.__dict__["_module"] is not None
+
+    def override(self, module):
+        """
+        Sirve `module` en lugar del módulo real (grabación y reproducción de
+        sondas, ver probe_replay.py). None vuelve al módulo real.
+        """
+        self.__dict__["_override"] = module
+
+    @property
+    def overridden(self):
+        return self.__dict__["_override"] is not None
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __setattr__(self, attr, value):
+        # Permite sustituir funciones del módulo real (por ejemplo en pruebas)
+        setattr(self._load(), attr, value)
+
+    def __repr__(self):
+        state = "sustituido" if self.overridden else "cargado" if self.loaded else "sin cargar"
+        return f"<LazyModule {self._name} ({state})>"
+
+
+_modules = {}
+_modules_lock = threading.Lock()
+
+
+def lazy_module(name, hint=None):
+    """Devuelve el proxy compartido del módulo `name`"""
+    with _modules_lock:
+        module = _modules.get(name)
+        if module is None:
+            module = _modules[name] = LazyModule(name, hint)
+        return module
+
+
+def optional_import(name):
+    """Importa `name` ahora y devuelve el módulo, o None si no está instalado"""
+    module = lazy_module(name)
+    try:
+        return module._load()
+    except MissingDependencyError:
+        return None
+
+
+psutil = lazy_module("psutil", "pip install psutil")
+winreg = lazy_module("winreg", "solo disponible en Windows")
+subprocess = lazy_module("subprocess")
+numpy = lazy_module("numpy", "pip install numpy")
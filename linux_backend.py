@@ -0,0 +1,733 @@
+# linux_backend.py
+#
+# Implementación de las sondas de hardware para Linux. Lee directamente
+# /proc y /sys (sin lanzar procesos) y devuelve los mismos registros de
+# records.py que las sondas WMI, de modo que renderers.py, el informe y las
+# interfaces gráficas funcionan igual en los dos sistemas.
+#
+# Todas las rutas se resuelven respecto a una raíz configurable (set_root),
+# lo que permite ejecutar las sondas contra una copia de /proc y /sys.
+
+import configparser
+import functools
+import ipaddress
+import locale
+import os
+import platform
+import re
+import socket
+import struct
+
+import network_inventory
+from records import (
+    Processor, CPUInfo, MemoryModule, RAMInfo, Disk, DiskInfo, GPU, GPUInfo,
+    MotherboardInfo, NetworkAdapter, NetworkInfo, NIC, NICInfo, AudioDevice, AudioInfo, COMPort,
+    COMInfo, PnPDevice, USBInfo, BluetoothInfo, RegionalSetting, RegionalSettings,
+)
+
+
+_root = "/"
+
+
+def set_root(path):
+    """Cambia la raíz desde la que se leen /proc, /sys y /etc ("/" por defecto)"""
+    global _root
+    _root = path or "/"
+    _pci_ids.cache_clear()
+
+
+def _path(path):
+    return os.path.join(_root, path.lstrip("/"))
+
+
+def _read(path, default=None):
+    try:
+        with open(_path(path), encoding="utf-8", errors="replace") as f:
+            return f.read().strip()
+    except OSError:
+        return default
+
+
+def _read_bytes(path):
+    try:
+        with open(_path(path), "rb") as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def _listdir(path):
+    try:
+        return sorted(os.listdir(_path(path)))
+    except OSError:
+        return []
+
+
+def _exists(path):
+    return os.path.exists(_path(path))
+
+
+def _link_name(path):
+    """Nombre del destino de un enlace de sysfs (driver, subsystem...) o None"""
+    full = _path(path)
+    if not os.path.islink(full):
+        return None
+    return os.path.basename(os.readlink(full))
+
+
+def _int(value, base=10):
+    try:
+        return int(value, base)
+    except (TypeError, ValueError):
+        return None
+
+
+def _size_kb(value):
+    """'2048K' / '32M' (formato de sysfs) -> KB"""
+    match = re.fullmatch(r"(\d+)([KMG]?)", value or "")
+    if not match:
+        return None
+    number, unit = int(match.group(1)), match.group(2)
+    if not unit:
+        return number // 1024      # Bytes
+    return number * {"K": 1, "M": 1024, "G": 1024 * 1024}[unit]
+
+
+# Identificación de dispositivos PCI y USB
+
+PCI_VENDORS = {
+    "0x1002": "Advanced Micro Devices, Inc. [AMD/ATI]",
+    "0x1022": "Advanced Micro Devices, Inc. [AMD]",
+    "0x10de": "NVIDIA Corporation",
+    "0x10ec": "Realtek Semiconductor Co., Ltd.",
+    "0x14e4": "Broadcom Inc.",
+    "0x15ad": "VMware",
+    "0x168c": "Qualcomm Atheros",
+    "0x1234": "QEMU",
+    "0x1414": "Microsoft Corporation",
+    "0x1af4": "Red Hat, Inc.",
+    "0x8086": "Intel Corporation",
+}
+
+PCI_IDS_PATHS = ["/usr/share/hwdata/pci.ids", "/usr/share/misc/pci.ids", "/usr/share/pci.ids"]
+
+
+@functools.lru_cache(maxsize=256)
+def _pci_ids(vendor, device):
+    """(fabricante, dispositivo) según la base pci.ids del sistema, si existe"""
+    vendor, device = vendor[2:].lower(), device[2:].lower()
+    for candidate in PCI_IDS_PATHS:
+        try:
+            f = open(_path(candidate), encoding="utf-8", errors="replace")
+        except OSError:
+            continue
+        with f:
+            vendor_name = None
+            for line in f:
+                if line.startswith("#") or not line.strip():
+                    continue
+                if not line.startswith("\t"):
+                    if vendor_name is not None:
+                        break       # Se pasó del fabricante sin encontrar el dispositivo
+                    if line[:4].lower() == vendor:
+                        vendor_name = line[4:].strip()
+                elif vendor_name is not None and not line.startswith("\t\t") and line[1:5].lower() == device:
+                    return vendor_name, line[5:].strip()
+            if vendor_name is not None:
+                return vendor_name, None
+    return None, None
+
+
+def _pci_identity(path):
+    vendor = _read(f"{path}/vendor")
+    device = _read(f"{path}/device")
+    if not vendor or not device:
+        return None, None
+    vendor_name, device_name = _pci_ids(vendor, device)
+    vendor_name = vendor_name or PCI_VENDORS.get(vendor.lower())
+    return vendor_name, device_name or f"Dispositivo PCI {vendor[2:]}:{device[2:]}"
+
+
+def _device_identity(path):
+    """
+    (fabricante, nombre, hwid) del dispositivo físico de una entrada de sysfs:
+    se sube por el árbol de /sys/devices hasta el primer dispositivo PCI o USB.
+    """
+    current = os.path.realpath(_path(path))
+    devices_root = os.path.realpath(_path("/sys/devices"))
+    while current.startswith(devices_root + os.sep):
+        relative = "/" + os.path.relpath(current, os.path.realpath(_root))
+        if _exists(f"{relative}/idVendor"):
+            vid, pid = _read(f"{relative}/idVendor", ""), _read(f"{relative}/idProduct", "")
+            name = _read(f"{relative}/product") or f"Dispositivo USB {vid}:{pid}"
+            return _read(f"{relative}/manufacturer"), name, f"USB VID:PID={vid.upper()}:{pid.upper()}"
+        if _link_name(f"{relative}/subsystem") == "pci":
+            vendor, name = _pci_identity(relative)
+            vid, pid = _read(f"{relative}/vendor", "0x"), _read(f"{relative}/device", "0x")
+            return vendor, name, f"PCI\\VEN_{vid[2:].upper()}&DEV_{pid[2:].upper()}"
+        current = os.path.dirname(current)
+    return None, None, None
+
+
+# CPU
+
+# Códigos de Win32_Processor.Architecture, para que el registro sea el mismo en los dos sistemas
+ARCHITECTURES = {
+    "i386": 0, "i486": 0, "i586": 0, "i686": 0, "x86": 0,
+    "armv7l": 5, "armv6l": 5, "arm": 5,
+    "ia64": 6,
+    "x86_64": 9, "amd64": 9,
+    "aarch64": 12, "arm64": 12,
+}
+
+
+def _cpuinfo_blocks():
+    blocks = []
+    for chunk in _read("/proc/cpuinfo", "").split("\n\n"):
+        fields = {}
+        for line in chunk.splitlines():
+            key, sep, value = line.partition(":")
+            if sep:
+                fields[key.strip()] = value.strip()
+        if "processor" in fields:
+            blocks.append(fields)
+    return blocks
+
+
+def _cache_sizes(cpus):
+    """Tamaño total (KB) de cada nivel de caché de un paquete, sin contar dos veces las compartidas"""
+    seen, sizes = set(), {}
+    for cpu in cpus:
+        base = f"/sys/devices/system/cpu/cpu{cpu}/cache"
+        for index in _listdir(base):
+            if not index.startswith("index"):
+                continue
+            level = _int(_read(f"{base}/{index}/level"))
+            cache_type = _read(f"{base}/{index}/type", "")
+            key = (level, cache_type, _read(f"{base}/{index}/shared_cpu_list", str(cpu)))
+            if level is None or cache_type == "Instruction" or key in seen:
+                continue
+            seen.add(key)
+            sizes[level] = sizes.get(level, 0) + (_size_kb(_read(f"{base}/{index}/size")) or 0)
+    return sizes
+
+
+def probe_cpu_identity():
+    """Datos fijos de los procesadores a partir de /proc/cpuinfo y /sys/devices/system/cpu"""
+    info = CPUInfo()
+    try:
+        blocks = _cpuinfo_blocks()
+        if not blocks:
+            raise OSError("No se pudo leer /proc/cpuinfo")
+
+        packages = {}
+        for block in blocks:
+            packages.setdefault(block.get("physical id", "0"), []).append(block)
+
+        architecture = ARCHITECTURES.get(platform.machine().lower())
+        for package_id, package in sorted(packages.items()):
+            first = package[0]
+            cpus = [block["processor"] for block in package]
+            core_ids = {block.get("core id") for block in package if "core id" in block}
+
+            max_khz = _int(_read(f"/sys/devices/system/cpu/cpu{cpus[0]}/cpufreq/cpuinfo_max_freq"))
+            if max_khz:
+                max_clock = max_khz // 1000
+            else:
+                mhz = first.get("cpu MHz")
+                max_clock = round(float(mhz)) if mhz else None
+
+            caches = _cache_sizes(cpus)
+            info.processors.append(Processor(
+                name=first.get("model name") or first.get("Hardware") or platform.processor() or "Desconocido",
+                manufacturer=first.get("vendor_id"),
+                architecture=architecture,
+                logical_cores=len(package),
+                physical_cores=_int(first.get("cpu cores")) or len(core_ids) or len(package),
+                max_clock_mhz=max_clock,
+                l2_cache_kb=caches.get(2),
+                l3_cache_kb=caches.get(3),
+                socket=f"CPU {package_id}",
+            ))
+    except Exception as e:
+        info.error = str(e)
+    return info
+
+
+# Memoria
+
+# Tipos de memoria SMBIOS (estructura de tipo 17)
+SMBIOS_MEMORY_TYPES = {0x12: "DDR", 0x13: "DDR2", 0x18: "DDR3", 0x1A: "DDR4", 0x1B: "LPDDR",
+                       0x1C: "LPDDR2", 0x1D: "LPDDR3", 0x1E: "LPDDR4", 0x22: "DDR5", 0x23: "LPDDR5"}
+
+
+def _smbios_memory_module(raw):
+    """MemoryModule a partir de una estructura SMBIOS de tipo 17 o None si la ranura está vacía"""
+    length = raw[1]
+    strings = raw[length:].split(b"\0")
+
+    def word(offset):
+        return struct.unpack_from("<H", raw, offset)[0] if length >= offset + 2 else 0
+
+    def string(offset):
+        index = raw[offset] if length > offset else 0
+        if not index or index > len(strings):
+            return None
+        return strings[index - 1].decode("latin-1").strip() or None
+
+    size = word(0x0C)
+    if size in (0, 0xFFFF):
+        return None
+    if size == 0x7FFF and length >= 0x20:
+        capacity = struct.unpack_from("<I", raw, 0x1C)[0] * 1024 * 1024
+    elif size & 0x8000:
+        capacity = (size & 0x7FFF) * 1024
+    else:
+        capacity = size * 1024 * 1024
+
+    return MemoryModule(
+        bank=string(0x11) or string(0x10),
+        manufacturer=string(0x17),
+        part_number=string(0x1A),
+        capacity_bytes=capacity,
+        speed_mhz=word(0x15) or None,
+        memory_type=SMBIOS_MEMORY_TYPES.get(raw[0x12] if length > 0x12 else 0, "Otro"),
+        serial=string(0x18),
+    )
+
+
+def collect_ram_info():
+    """
+    Memoria total de /proc/meminfo y módulos de las tablas SMBIOS. Las tablas
+    solo son legibles como root: sin permisos se informa únicamente el total.
+    """
+    info = RAMInfo()
+    try:
+        for line in _read("/proc/meminfo", "").splitlines():
+            if line.startswith("MemTotal:"):
+                info.total_bytes = int(line.split()[1]) * 1024
+                break
+        else:
+            raise OSError("No se pudo leer /proc/meminfo")
+
+        for entry in _listdir("/sys/firmware/dmi/entries"):
+            if entry.startswith("17-"):
+                raw = _read_bytes(f"/sys/firmware/dmi/entries/{entry}/raw")
+                module = _smbios_memory_module(raw) if raw else None
+                if module is not None:
+                    info.modules.append(module)
+    except Exception as e:
+        info.error = str(e)
+    return info
+
+
+# Almacenamiento
+
+def _disk_interface(block):
+    target = os.path.realpath(_path(f"/sys/block/{block}"))
+    for marker, interface in (("/usb", "USB"), ("/nvme", "NVMe"), ("/ata", "IDE"),
+                              ("/virtio", "VirtIO"), ("/mmc", "SD"), ("/host", "SCSI")):
+        if marker in target:
+            return interface
+    return None
+
+
+def collect_disk_info():
+    info = DiskInfo()
+    try:
+        for block in _listdir("/sys/block"):
+            # Solo discos físicos: loop, ram, zram, dm-* y md* no tienen dispositivo asociado
+            if not _exists(f"/sys/block/{block}/device"):
+                continue
+            base = f"/sys/block/{block}"
+            record = Disk(device_id=f"/dev/{block}")
+            try:
+                manufacturer, name, _ = _device_identity(f"{base}/device")
+                vendor = _read(f"{base}/device/vendor")
+                record.model = _read(f"{base}/device/model") or name
+                # En virtio y NVMe 'vendor' es un identificador numérico (0x1af4), no un nombre
+                record.manufacturer = vendor if vendor and not vendor.startswith("0x") else manufacturer
+                record.interface = _disk_interface(block)
+                sectors = _int(_read(f"{base}/size"))
+                record.size_bytes = sectors * 512 if sectors else None
+                record.media_type = 'SSD' if _read(f"{base}/queue/rotational") == "0" else 'HDD'
+                record.serial = _read(f"{base}/device/serial") or _read(f"{base}/serial") or None
+            except Exception as e:
+                record.error = str(e)
+            info.disks.append(record)
+    except Exception as e:
+        info.error = str(e)
+    return info
+
+
+# Gráficos y placa base
+
+def collect_gpu_info():
+    info = GPUInfo()
+    try:
+        for card in _listdir("/sys/class/drm"):
+            if not re.fullmatch(r"card\d+", card):
+                continue        # cardN-HDMI-A-1 y similares son conectores, no tarjetas
+            base = f"/sys/class/drm/{card}/device"
+            manufacturer, name, _ = _device_identity(base)
+            driver = _link_name(f"{base}/driver")
+            vram = _int(_read(f"{base}/mem_info_vram_total"))
+            info.gpus.append(GPU(
+                name=name or card,
+                manufacturer=manufacturer,
+                processor=driver,
+                driver_version=(_read(f"/sys/module/{driver}/version") if driver else None) or platform.release(),
+                adapter_ram_bytes=vram,
+            ))
+    except Exception as e:
+        info.error = str(e)
+    return info
+
+
+def collect_motherboard_info():
+    base = "/sys/class/dmi/id"
+    manufacturer = _read(f"{base}/board_vendor")
+    product = _read(f"{base}/board_name")
+    if manufacturer is None and product is None:
+        return MotherboardInfo(found=False)
+    return MotherboardInfo(
+        manufacturer=manufacturer,
+        product=product,
+        version=_read(f"{base}/board_version"),
+        serial=_read(f"{base}/board_serial"),     # Solo legible como root
+    )
+
+
+# Red
+
+def _hex_ipv4(value):
+    return socket.inet_ntoa(struct.pack("<L", int(value, 16)))
+
+
+def _routes():
+    """Rutas IPv4 de /proc/net/route: (interfaz, destino, máscara, puerta de enlace, flags)"""
+    routes = []
+    for line in _read("/proc/net/route", "").splitlines()[1:]:
+        fields = line.split()
+        if len(fields) >= 8:
+            routes.append((fields[0], _hex_ipv4(fields[1]), _hex_ipv4(fields[7]),
+                           _hex_ipv4(fields[2]), int(fields[3], 16)))
+    return routes
+
+
+def _ipv4_addresses(routes):
+    """{interfaz: [dirección/prefijo]} a partir de las direcciones locales de /proc/net/fib_trie"""
+    lines = _read("/proc/net/fib_trie", "").splitlines()
+    local = {lines[i - 1].split()[-1] for i, line in enumerate(lines) if i and "/32 host LOCAL" in line}
+
+    addresses = {}
+    for address in sorted(local, key=ipaddress.IPv4Address):
+        ip = ipaddress.IPv4Address(address)
+        if ip.is_loopback:
+            addresses.setdefault("lo", []).append(f"{address}/8")
+            continue
+        for iface, destination, mask, _, _ in routes:
+            network = ipaddress.IPv4Network(f"{destination}/{mask}", strict=False)
+            if network.prefixlen and ip in network:
+                addresses.setdefault(iface, []).append(f"{address}/{network.prefixlen}")
+                break
+    return addresses
+
+
+def _ipv6_addresses():
+    addresses = {}
+    for line in _read("/proc/net/if_inet6", "").splitlines():
+        fields = line.split()
+        if len(fields) == 6:
+            ip = ipaddress.IPv6Address(bytes.fromhex(fields[0]))
+            addresses.setdefault(fields[5], []).append(f"{ip}/{int(fields[2], 16)}")
+    return addresses
+
+
+def _dns_servers():
+    return [line.split()[1] for line in _read("/etc/resolv.conf", "").splitlines()
+            if line.startswith("nameserver") and len(line.split()) > 1]
+
+
+def _dotted(label, width=36):
+    """Etiqueta con puntos de relleno, como en la salida de ipconfig"""
+    label = f"{label} "
+    return label + ". " * ((width - len(label)) // 2) + ": "
+
+
+def _gateways(routes):
+    """{interfaz: [puerta de enlace]} de las rutas por defecto (RTF_GATEWAY)"""
+    gateways = {}
+    for iface, destination, _, gateway, flags in routes:
+        if destination == "0.0.0.0" and flags & 0x2:
+            gateways.setdefault(iface, []).append(gateway)
+    return gateways
+
+
+def _dhcp_lease(base):
+    """Servidor DHCP de la concesión de systemd-networkd; None si no hay concesión conocida"""
+    text = _read(f"/run/systemd/netif/leases/{_read(f'{base}/ifindex')}")
+    if text is None:
+        return None
+    match = re.search(r"^SERVER_ADDRESS=(\S+)", text, re.MULTILINE)
+    return match.group(1) if match else ""
+
+
+def _counter(base, name):
+    return _int(_read(f"{base}/statistics/{name}"))
+
+
+def collect_network_info():
+    """
+    Configuración IP de cada interfaz de /sys/class/net y /proc/net, unida a
+    las tarjetas de collect_nic_info() (ver network_inventory.py)
+    """
+    info = NetworkInfo(host_name=platform.node())
+    try:
+        routes = _routes()
+        ipv4, ipv6, gateways = _ipv4_addresses(routes), _ipv6_addresses(), _gateways(routes)
+        dns_servers = _dns_servers()
+        adapters = {}
+        for iface in _listdir("/sys/class/net"):
+            base = f"/sys/class/net/{iface}"
+            speed = _int(_read(f"{base}/speed"))
+            lease = _dhcp_lease(base)
+            adapters[iface] = NetworkAdapter(
+                name=iface,
+                mac_address=network_inventory.format_mac(_read(f"{base}/address")),
+                status=_nic_status(base)[1],
+                is_up=bool((_int(_read(f"{base}/flags"), 16) or 0) & 0x1),     # IFF_UP
+                speed_bps=speed * 1_000_000 if speed and speed > 0 else None,
+                mtu=_int(_read(f"{base}/mtu")),
+                ipv4=ipv4.get(iface, []),
+                ipv6=ipv6.get(iface, []),
+                gateways=gateways.get(iface, []),
+                # resolv.conf es global: se asigna a las interfaces con salida por defecto
+                dns_servers=list(dns_servers) if iface in gateways else [],
+                dhcp_enabled=True if lease is not None else None,
+                dhcp_server=lease or None,
+                bytes_sent=_counter(base, "tx_bytes"),
+                bytes_recv=_counter(base, "rx_bytes"),
+                packets_sent=_counter(base, "tx_packets"),
+                packets_recv=_counter(base, "rx_packets"),
+                errors_in=_counter(base, "rx_errors"),
+                errors_out=_counter(base, "tx_errors"),
+                drops_in=_counter(base, "rx_dropped"),
+                drops_out=_counter(base, "tx_dropped"),
+            )
+        network_inventory.merge_nics(adapters, collect_nic_info().nics)
+        info.adapters = network_inventory.ordered(adapters)
+    except Exception as e:
+        info.error = str(e)
+    return info
+
+
+def collect_ipconfig_text():
+    """
+    Resumen de la configuración de red con el mismo estilo que 'ipconfig /all',
+    construido a partir de /sys/class/net y /proc/net (sonda "ipconfig")
+    """
+    try:
+        routes = _routes()
+        ipv4, ipv6, gateways = _ipv4_addresses(routes), _ipv6_addresses(), _gateways(routes)
+
+        lines = ["", "Configuración IP de Linux", ""]
+        lines.append(_dotted("   Nombre de host") + platform.node())
+        lines.append(_dotted("   Servidores DNS") + (", ".join(_dns_servers()) or "-"))
+
+        for iface in _listdir("/sys/class/net"):
+            base = f"/sys/class/net/{iface}"
+            _, description, _ = _device_identity(f"{base}/device") if _exists(f"{base}/device") else (None, None, None)
+            lines += ["", f"Adaptador {iface}:", ""]
+            lines.append(_dotted("   Descripción") + (description or "Interfaz virtual"))
+            lines.append(_dotted("   Dirección física") + (_read(f"{base}/address") or "-").upper().replace(":", "-"))
+            lines.append(_dotted("   Estado") + (_read(f"{base}/operstate") or "-"))
+            lines.append(_dotted("   MTU") + (_read(f"{base}/mtu") or "-"))
+            for address in ipv4.get(iface, []):
+                lines.append(_dotted("   Dirección IPv4") + address)
+            for address in ipv6.get(iface, []):
+                lines.append(_dotted("   Dirección IPv6") + address)
+            for gateway in gateways.get(iface, []):
+                lines.append(_dotted("   Puerta de enlace predeterminada") + gateway)
+        return NetworkInfo(raw_text="\n".join(lines) + "\n")
+
+    except Exception as e:
+        return NetworkInfo(error=str(e))
+
+
+# Estado del enlace (operstate) -> código y texto de NetConnectionStatus que usa system_info
+OPERSTATE_STATUS = {
+    "up": ("2", "Connected"),
+    "dormant": ("9", "Authenticating"),
+    "notpresent": ("5", "Hardware not present"),
+    "lowerlayerdown": ("8", "Media disconnected"),
+}
+
+
+def _nic_status(base):
+    operstate = _read(f"{base}/operstate", "unknown")
+    if operstate in OPERSTATE_STATUS:
+        return OPERSTATE_STATUS[operstate]
+    flags = _int(_read(f"{base}/flags"), 16) or 0
+    if not flags & 0x1:                         # IFF_UP desactivado
+        return "6", "Hardware disabled"
+    if _read(f"{base}/carrier") == "1":
+        return "2", "Connected"
+    return "8", "Media disconnected"
+
+
+ARPHRD_TYPES = {"1": "Ethernet 802.3", "32": "InfiniBand", "512": "PPP", "772": "Loopback", "801": "Wireless 802.11"}
+
+
+def collect_nic_info():
+    """Tarjetas de red físicas (las interfaces de /sys/class/net con dispositivo asociado)"""
+    info = NICInfo()
+    try:
+        for iface in _listdir("/sys/class/net"):
+            base = f"/sys/class/net/{iface}"
+            if not _exists(f"{base}/device"):
+                continue
+            manufacturer, name, _ = _device_identity(f"{base}/device")
+            status_code, status = _nic_status(base)
+            speed = _int(_read(f"{base}/speed"))     # Mb/s; no se puede leer con el enlace caído
+            net_type = _read(f"{base}/type")
+            info.nics.append(NIC(
+                connection_id=iface,
+                name=name or iface,
+                manufacturer=manufacturer,
+                mac_address=(_read(f"{base}/address") or "").upper() or None,
+                adapter_type=ARPHRD_TYPES.get(net_type, f"ARPHRD {net_type}"),
+                status_code=status_code,
+                status=status,
+                speed_bps=speed * 1_000_000 if speed and speed > 0 else None,
+            ))
+    except Exception as e:
+        info.error = str(e)
+    return info
+
+
+# Dispositivos
+
+def collect_audio_devices():
+    info = AudioInfo()
+    try:
+        cards = _read("/proc/asound/cards")
+        if cards is None:
+            return info             # Sin ALSA no hay tarjetas de sonido
+        for match in re.finditer(r"^\s*(\d+)\s+\[[^\]]*\]:\s+(\S+)\s+-\s+(.*)$", cards, re.MULTILINE):
+            number, driver, name = match.groups()
+            manufacturer, _, _ = _device_identity(f"/sys/class/sound/card{number}/device")
+            info.devices.append(AudioDevice(name=name.strip(), manufacturer=manufacturer or driver, status="OK"))
+    except Exception as e:
+        info.error = str(e)
+    return info
+
+
+def collect_com_ports():
+    """Puertos serie de /sys/class/tty (los mismos que muestra pyserial)"""
+    info = COMInfo()
+    try:
+        for tty in _listdir("/sys/class/tty"):
+            base = f"/sys/class/tty/{tty}"
+            if _link_name(f"{base}/device/driver") is None:
+                continue
+            # Los puertos 8250 sin hardware detrás aparecen con tipo 0 (PORT_UNKNOWN)
+            if _read(f"{base}/type") == "0":
+                continue
+            _, name, hwid = _device_identity(f"{base}/device")
+            info.ports.append(COMPort(port=f"/dev/{tty}", description=name or tty, hwid=hwid or "n/a"))
+    except Exception as e:
+        info.error = str(e)
+    return info
+
+
+def collect_usb_devices():
+    """Dispositivos de /sys/bus/usb/devices (las entradas con ':' son interfaces, no dispositivos)"""
+    info = USBInfo()
+    try:
+        for entry in _listdir("/sys/bus/usb/devices"):
+            base = f"/sys/bus/usb/devices/{entry}"
+            if ":" in entry or not _exists(f"{base}/idVendor"):
+                continue
+            vid, pid = _read(f"{base}/idVendor", "").upper(), _read(f"{base}/idProduct", "").upper()
+            product = _read(f"{base}/product")
+            info.devices.append(PnPDevice(
+                description=product or f"Dispositivo USB {vid}:{pid}",
+                name=product,
+                device_id=f"USB\\VID_{vid}&PID_{pid}\\{_read(f'{base}/serial') or entry}",
+                status="OK",
+            ))
+    except Exception as e:
+        info.error = str(e)
+    return info
+
+
+def collect_bluetooth_devices():
+    """
+    Adaptadores de /sys/class/bluetooth y dispositivos emparejados de
+    /var/lib/bluetooth (este último directorio solo es legible como root)
+    """
+    info = BluetoothInfo()
+    try:
+        for adapter in _listdir("/sys/class/bluetooth"):
+            if ":" in adapter:
+                continue        # hci0:256 y similares son conexiones activas
+            _, name, _ = _device_identity(f"/sys/class/bluetooth/{adapter}/device")
+            info.devices.append(PnPDevice(
+                description=name or "Adaptador Bluetooth",
+                name=adapter,
+                device_id=f"BTH\\{adapter.upper()}",
+                status="OK",
+            ))
+
+        for controller in _listdir("/var/lib/bluetooth"):
+            for address in _listdir(f"/var/lib/bluetooth/{controller}"):
+                text = _read(f"/var/lib/bluetooth/{controller}/{address}/info")
+                if text is None:
+                    continue
+                parser = configparser.ConfigParser(interpolation=None, strict=False)
+                parser.read_string(text)
+                name = parser.get("General", "Name", fallback=None)
+                info.devices.append(PnPDevice(
+                    description=name or address,
+                    name=name,
+                    device_id=f"BTHENUM\\{address.replace(':', '')}",
+                    status="OK",
+                ))
+    except Exception as e:
+        info.error = str(e)
+    return info
+
+
+# Configuración regional
+
+# Valores de REGIONAL_VALUES (nombres del Registro) -> origen en el locale de C
+LOCALE_SOURCES = {
+    "sDecimal": ("localeconv", "decimal_point"),
+    "sThousand": ("localeconv", "thousands_sep"),
+    "sMonDecimalSep": ("localeconv", "mon_decimal_point"),
+    "sMonThousandSep": ("localeconv", "mon_thousands_sep"),
+    "sShortDate": ("langinfo", "D_FMT"),
+    "sTimeFormat": ("langinfo", "T_FMT"),
+    "sCurrency": ("localeconv", "currency_symbol"),
+}
+
+
+def collect_regional_settings(values):
+    """Configuración regional del locale del proceso para los (etiqueta, clave) de `values`"""
+    info = RegionalSettings()
+    try:
+        locale.setlocale(locale.LC_ALL, '')
+        conventions = locale.localeconv()
+        for label, name in values:
+            source, key = LOCALE_SOURCES.get(name, (None, None))
+            if source == "localeconv":
+                value = conventions.get(key)
+            elif source == "langinfo":
+                value = locale.nl_langinfo(getattr(locale, key))
+            else:
+                value = None
+            info.settings.append(RegionalSetting(label=label, key=name, value=value or "No definido"))
+    except Exception as e:
+        info.error = str(e)
+    return info
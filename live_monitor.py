@@ -0,0 +1,432 @@
+# live_monitor.py
+#
+# Monitor en vivo: uso de CPU por núcleo, memoria, E/S por disco y tráfico por
+# tarjeta de red, muestreados con psutil a una frecuencia configurable (hasta
+# 10 Hz) en un hilo propio.
+#
+# Cada serie se guarda en un RingBuffer de tamaño fijo respaldado por un
+# array('d'): añadir una muestra no reserva memoria y la ventana nunca crece.
+# Las interfaces (qt_monitor.py, tk_monitor.py) piden solo las muestras nuevas
+# desde la última lectura con since() y actualizan únicamente lo que cambió.
+#
+# El uso de CPU se calcula a partir de psutil.cpu_times() y no con
+# psutil.cpu_percent(interval=None), cuya referencia es global y la comparte
+# cpu_sampler.py: dos muestreadores con cpu_percent se falsearían entre sí.
+
+import os
+import sys
+import threading
+import time
+from array import array
+from dataclasses import dataclass, field
+
+from lazy_deps import psutil
+from cpu_sampler import SamplerStats
+
+
+MAX_RATE_HZ = 10.0
+MIN_RATE_HZ = 0.5
+DEFAULT_RATE_HZ = 2.0
+DEFAULT_CAPACITY = 600          # 60 s a 10 Hz
+
+# Tiempos de psutil.cpu_times() que ya están incluidos en user (Linux)
+_GUEST_FIELDS = ("guest", "guest_nice")
+# Tiempos que cuentan como CPU sin trabajo
+_IDLE_FIELDS = ("idle", "iowait")
+
+_SKIP_DISK_PREFIXES = ("loop", "ram", "zram")
+
+
+class RingBuffer:
+    """Ventana circular de tamaño fijo sobre un array de C (float64 por defecto)"""
+
+    __slots__ = ("_data", "_capacity", "_head", "_count")
+
+    def __init__(self, capacity, typecode="d"):
+        if capacity < 1:
+            raise ValueError("capacity debe ser al menos 1")
+        self._data = array(typecode, bytes(array(typecode).itemsize * capacity))
+        self._capacity = capacity
+        self._head = 0          # Posición de la próxima escritura
+        self._count = 0
+
+    @property
+    def capacity(self):
+        return self._capacity
+
+    def __len__(self):
+        return self._count
+
+    def append(self, value):
+        self._data[self._head] = value
+        self._head = (self._head + 1) % self._capacity
+        if self._count < self._capacity:
+            self._count += 1
+
+    def latest(self):
+        if not self._count:
+            return None
+        return self._data[self._head - 1]
+
+    def last(self, n=None):
+        """Las últimas n muestras (todas si n es None) en orden cronológico"""
+        n = self._count if n is None else max(0, min(n, self._count))
+        if not n:
+            return []
+        start = (self._head - n) % self._capacity
+        end = start + n
+        if end <= self._capacity:
+            return self._data[start:end].tolist()
+        return self._data[start:].tolist() + self._data[:end - self._capacity].tolist()
+
+    def clear(self):
+        self._head = 0
+        self._count = 0
+
+
+@dataclass(slots=True)
+class MonitorUpdate:
+    """Muestras tomadas desde una lectura anterior (ver LiveMonitor.since)"""
+    count: int                                  # Total de muestras tomadas hasta ahora
+    timestamps: list = field(default_factory=list)
+    series: dict = field(default_factory=dict)  # nombre -> valores nuevos
+    dropped: int = 0                            # Muestras que ya salieron de la ventana
+
+    @property
+    def empty(self):
+        return not self.timestamps
+
+
+def _cpu_busy_total(times):
+    total = sum(times)
+    for name in _GUEST_FIELDS:
+        total -= getattr(times, name, 0.0)
+    idle = sum(getattr(times, name, 0.0) for name in _IDLE_FIELDS)
+    return total - idle, total
+
+
+def _cpu_percent(before, after):
+    busy_before, total_before = before
+    busy_after, total_after = after
+    elapsed = total_after - total_before
+    if elapsed <= 0:
+        return 0.0
+    return max(0.0, min(100.0, 100.0 * (busy_after - busy_before) / elapsed))
+
+
+def _is_loopback(nic):
+    return nic == "lo" or "loopback" in nic.lower()
+
+
+def _is_whole_disk(name):
+    if name.startswith(_SKIP_DISK_PREFIXES):
+        return False
+    if sys.platform.startswith("linux"):
+        # psutil también devuelve las particiones; solo interesan los discos
+        return os.path.exists(f"/sys/block/{name}")
+    return True
+
+
+class LiveMonitor:
+    """
+    Hilo de muestreo a `rate` Hz con una ventana circular de `capacity` muestras
+    por serie. Las series se llaman:
+
+        cpu.total, cpu.<n>              % de uso (total y por núcleo)
+        mem.percent, mem.used           % y bytes de memoria física en uso
+        disk.<disco>.read / .write      bytes/s
+        net.<tarjeta>.recv / .sent      bytes/s
+
+    Los discos y tarjetas que aparecen más tarde (un USB, una VPN) crean su
+    serie al verse por primera vez; las muestras anteriores quedan a NaN.
+    """
+
+    def __init__(self, rate=DEFAULT_RATE_HZ, capacity=DEFAULT_CAPACITY,
+                 cpu=True, memory=True, disks=True, network=True):
+        self.rate = self._clamp(rate)
+        self.capacity = capacity
+        self.cpu = cpu
+        self.memory = memory
+        self.disks = disks
+        self.network = network
+
+        self._timestamps = RingBuffer(capacity)
+        self._series = {}
+        self._count = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._thread = None
+        self._stats = SamplerStats()
+
+        self._previous_cpu = None
+        self._previous_disks = None
+        self._previous_nics = None
+        self._previous_time = None
+        self._disk_names = {}   # Caché de _is_whole_disk
+
+    @staticmethod
+    def _clamp(rate):
+        return max(MIN_RATE_HZ, min(MAX_RATE_HZ, float(rate)))
+
+    # Control
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def interval(self):
+        return 1.0 / self.rate
+
+    def start(self):
+        """Arranca el hilo si no está en marcha (idempotente)"""
+        with self._lock:
+            if self.running:
+                return self
+            self._stop.clear()
+            self._stats = SamplerStats()
+            self._previous_time = None
+            self._thread = threading.Thread(target=self._run, name="LiveMonitor", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        self._wake.set()
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+        self._thread = None
+
+    def set_rate(self, rate):
+        """Cambia la frecuencia en caliente (limitada a MIN_RATE_HZ..MAX_RATE_HZ)"""
+        self.rate = self._clamp(rate)
+        self._wake.set()
+        return self.rate
+
+    def clear(self):
+        with self._lock:
+            self._timestamps.clear()
+            for buffer in self._series.values():
+                buffer.clear()
+
+    # Muestreo
+
+    def _buffer(self, name):
+        buffer = self._series.get(name)
+        if buffer is None:
+            buffer = self._series[name] = RingBuffer(self.capacity)
+            for _ in range(len(self._timestamps)):
+                buffer.append(float("nan"))
+        return buffer
+
+    def _read(self):
+        """Lee los contadores de psutil (fuera del candado)"""
+        counters = {"time": time.perf_counter()}
+        if self.cpu:
+            counters["cpu"] = [_cpu_busy_total(t) for t in psutil.cpu_times(percpu=True)]
+        if self.memory:
+            counters["mem"] = psutil.virtual_memory()
+        if self.disks:
+            counters["disks"] = psutil.disk_io_counters(perdisk=True) or {}
+        if self.network:
+            counters["nics"] = psutil.net_io_counters(pernic=True) or {}
+        return counters
+
+    def _rates(self, previous, current, elapsed, prefix, fields, keep):
+        values = {}
+        if previous is None:
+            return values
+        for name, now in current.items():
+            before = previous.get(name)
+            if before is None or not keep(name):
+                continue
+            for suffix, attr in fields:
+                delta = getattr(now, attr) - getattr(before, attr)
+                # Un contador que vuelve atrás (reinicio del driver) cuenta como 0
+                values[f"{prefix}.{name}.{suffix}"] = max(0, delta) / elapsed
+        return values
+
+    def _keep_disk(self, name):
+        keep = self._disk_names.get(name)
+        if keep is None:
+            keep = self._disk_names[name] = _is_whole_disk(name)
+        return keep
+
+    def _sample(self, counters):
+        """Convierte los contadores en valores; None si todavía no hay referencia"""
+        now = counters["time"]
+        previous_time, self._previous_time = self._previous_time, now
+        values = {}
+
+        if "mem" in counters:
+            values["mem.percent"] = counters["mem"].percent
+            values["mem.used"] = float(counters["mem"].total - counters["mem"].available)
+
+        if "cpu" in counters:
+            cores = counters["cpu"]
+            previous = self._previous_cpu
+            self._previous_cpu = cores
+            if previous is not None and len(previous) == len(cores):
+                busy = [_cpu_percent(before, after) for before, after in zip(previous, cores)]
+                for n, value in enumerate(busy):
+                    values[f"cpu.{n}"] = value
+                values["cpu.total"] = sum(busy) / len(busy)
+
+        if previous_time is None:
+            self._previous_disks = counters.get("disks")
+            self._previous_nics = counters.get("nics")
+            return None
+        elapsed = max(now - previous_time, 1e-6)
+
+        if "disks" in counters:
+            values.update(self._rates(self._previous_disks, counters["disks"], elapsed, "disk",
+                                      (("read", "read_bytes"), ("write", "write_bytes")), self._keep_disk))
+            self._previous_disks = counters["disks"]
+        if "nics" in counters:
+            values.update(self._rates(self._previous_nics, counters["nics"], elapsed, "net",
+                                      (("recv", "bytes_recv"), ("sent", "bytes_sent")),
+                                      lambda nic: not _is_loopback(nic)))
+            self._previous_nics = counters["nics"]
+        return values
+
+    def _store(self, timestamp, values):
+        with self._lock:
+            for name in values:
+                if name not in self._series:
+                    self._buffer(name)
+            self._timestamps.append(timestamp)
+            for name, buffer in self._series.items():
+                buffer.append(values.get(name, float("nan")))
+            self._count += 1
+
+    def _run(self):
+        # Primera lectura de referencia (incluye la importación de psutil,
+        # que no forma parte del coste del muestreo)
+        try:
+            self._sample(self._read())
+        except Exception:
+            pass
+
+        started_wall = time.perf_counter()
+        started_cpu = time.thread_time()
+        self._stats.started_at = time.time()
+        deadline = time.perf_counter()
+
+        while not self._stop.is_set():
+            # Plazos absolutos: el coste de cada muestra no retrasa la siguiente
+            deadline += self.interval
+            wait = deadline - time.perf_counter()
+            if wait < 0:
+                deadline = time.perf_counter()
+                wait = 0
+            if self._wake.wait(wait):
+                self._wake.clear()
+                deadline = time.perf_counter()
+                if self._stop.is_set():
+                    break
+
+            t0 = time.perf_counter()
+            try:
+                values = self._sample(self._read())
+            except Exception:
+                # Un fallo puntual de psutil no debe detener el monitor
+                values = None
+            if values is not None:
+                self._store(time.time(), values)
+            elapsed = time.perf_counter() - t0
+
+            with self._lock:
+                self._stats.samples += 1
+                self._stats.sample_seconds += elapsed
+                self._stats.cpu_seconds = time.thread_time() - started_cpu
+                self._stats.wall_seconds = time.perf_counter() - started_wall
+
+    # Lectura
+
+    @property
+    def count(self):
+        return self._count
+
+    def names(self, prefix=""):
+        """Series disponibles, opcionalmente solo las que empiezan por `prefix`"""
+        with self._lock:
+            return [name for name in self._series if name.startswith(prefix)]
+
+    def devices(self, kind):
+        """Discos ("disk") o tarjetas de red ("net") con serie"""
+        seen = []
+        for name in self.names(kind + "."):
+            device = name[len(kind) + 1:].rsplit(".", 1)[0]
+            if device not in seen:
+                seen.append(device)
+        return seen
+
+    def cores(self):
+        return sorted(int(name[4:]) for name in self.names("cpu.") if name[4:].isdigit())
+
+    def latest(self, name):
+        with self._lock:
+            buffer = self._series.get(name)
+            return buffer.latest() if buffer is not None else None
+
+    def series(self, name, n=None):
+        """Últimas n muestras de una serie (toda la ventana si n es None)"""
+        with self._lock:
+            buffer = self._series.get(name)
+            return buffer.last(n) if buffer is not None else []
+
+    def since(self, count):
+        """
+        Muestras tomadas después de la lectura que devolvió `count`. Si el
+        lector se ha quedado atrás más de una ventana, solo recibe la ventana
+        y `dropped` indica cuántas se perdió.
+        """
+        with self._lock:
+            new = self._count - count
+            available = min(new, len(self._timestamps))
+            update = MonitorUpdate(count=self._count, dropped=max(0, new - available))
+            if available > 0:
+                update.timestamps = self._timestamps.last(available)
+                update.series = {name: buffer.last(available) for name, buffer in self._series.items()}
+            return update
+
+    def stats(self):
+        with self._lock:
+            s = self._stats
+            return SamplerStats(s.samples, s.cpu_seconds, s.wall_seconds, s.sample_seconds, s.started_at)
+
+    def overhead_percent(self):
+        """Coste del hilo de muestreo en % de la CPU total del equipo (todos los núcleos)"""
+        return self.stats().overhead_percent / (psutil.cpu_count() or 1)
+
+
+def format_rate(bytes_per_second):
+    """Velocidad legible: B/s, KB/s, MB/s o GB/s"""
+    value = float(bytes_per_second)
+    for unit in ("B/s", "KB/s", "MB/s"):
+        if value < 1024:
+            return f"{value:.0f} {unit}" if unit == "B/s" else f"{value:.1f} {unit}"
+        value /= 1024
+    return f"{value:.2f} GB/s"
+
+
+# Monitor compartido por las interfaces gráficas (solo muestrea mientras hay
+# una ventana de monitor abierta)
+monitor = LiveMonitor()
+
+
+if __name__ == "__main__":
+    # Medición rápida del coste: python live_monitor.py [Hz] [segundos]
+    rate = float(sys.argv[1]) if len(sys.argv) > 1 else MAX_RATE_HZ
+    seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 10.0
+    monitor.set_rate(rate)
+    monitor.start()
+    time.sleep(seconds)
+    monitor.stop()
+    stats = monitor.stats()
+    print(f"{stats.samples} muestras a {monitor.rate:g} Hz, {stats.avg_sample_ms:.2f} ms por muestra, "
+          f"coste {monitor.overhead_percent():.3f} % de la CPU total ({psutil.cpu_count()} CPU lógicas)")
+    print(f"Series: {len(monitor.names())}; discos: {', '.join(monitor.devices('disk')) or '-'}; "
+          f"red: {', '.join(monitor.devices('net')) or '-'}")
@@ -1,6 +1,38 @@
 # main.py
+#
+# Sin argumentos muestra el menú interactivo. Con argumentos funciona sin
+# interacción, para scripts y recolección masiva: ejecuta las sondas indicadas
+# (en paralelo con --jobs) y escribe un objeto JSON por sonda en cuanto cada una
+# termina (NDJSON), para que un pipeline de logs pueda consumirlas sin esperar
+# a la más lenta.
+#
+#   python main.py --list
+#   python main.py cpu ram disk
+#   python main.py --all --jobs 6 --timeout 20 > equipo.ndjson
+#   python main.py os network --format text
+#
+# Código de salida: 0 todas correctas, 1 alguna falló (fallo parcial),
+# 2 argumentos incorrectos, 3 fallaron todas, 130 interrumpido.
+
+import argparse
+import json
+import os
+import platform
+import sys
 
 from system_info import get_system_info, get_cpu_info, get_ram_info, get_disk_info, get_gpu_info, get_motherboard_info
+import system_info
+import hw_report
+import hw_cache
+from hw_report import probe_line, probe_status
+from renderers import render_text, render_json
+
+
+EXIT_OK = 0
+EXIT_PARTIAL = 1
+EXIT_USAGE = 2
+EXIT_FAILED = 3
+EXIT_INTERRUPTED = 130
 
 def menu():
     print("\n=== ARKToolsPC - Información del Hardware ===")
@@ -39,5 +71,113 @@ def run_tool():
             print(f"Error: {e}")
             continue
 
+
+# Modo no interactivo
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="main.py",
+        description="ARKToolsPC sin interacción: ejecuta sondas y escribe una línea JSON por sonda.",
+        epilog="Códigos de salida: 0 todo correcto, 1 fallo parcial, 2 uso incorrecto, 3 todo falló.",
+    )
+    parser.add_argument("probes", nargs="*", help="Sondas a ejecutar (ver --list)")
+    parser.add_argument("--all", action="store_true", help="Ejecuta todas las sondas del backend (salvo ipconfig, que se pide por nombre)")
+    parser.add_argument("--list", action="store_true", help="Lista las sondas disponibles y termina")
+    parser.add_argument("-j", "--jobs", type=int, default=1, help="Sondas en paralelo (1 = una tras otra)")
+    parser.add_argument("--timeout", type=float, help="Límite en segundos por sonda (por defecto el del informe)")
+    parser.add_argument("--format", choices=("ndjson", "json", "text"), default="ndjson",
+                        help="ndjson: una línea por sonda al terminar (por defecto); "
+                             "json: un único documento al final; text: texto legible")
+    parser.add_argument("--backend", help="Fuerza el backend (windows, linux)")
+    parser.add_argument("--no-cache", action="store_true", help="No usa la caché de hardware fijo")
+    parser.add_argument("-q", "--quiet", action="store_true", help="Sin resumen final en stderr")
+    return parser
+
+
+def exit_code(statuses):
+    failed = sum(1 for status in statuses if status != "ok")
+    if not failed:
+        return EXIT_OK
+    return EXIT_FAILED if failed == len(statuses) else EXIT_PARTIAL
+
+
+def run_headless(argv):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.jobs < 1:
+        parser.error("--jobs debe ser al menos 1")
+    if args.no_cache:
+        hw_cache.cache.enabled = False
+    if args.backend:
+        try:
+            system_info.set_backend(args.backend.lower())
+        except ValueError as e:
+            parser.error(str(e))
+
+    if args.list:
+        for name in system_info.PROBES:
+            print(name)
+        return EXIT_OK
+
+    if args.all:
+        names = system_info.default_probes()
+    elif args.probes:
+        names = list(dict.fromkeys(args.probes))
+    else:
+        names = list(hw_report.REPORT_PROBES)
+    unknown = [name for name in names if name not in system_info.PROBES]
+    if unknown:
+        parser.error(f"Sondas desconocidas: {', '.join(unknown)} (ver --list)")
+
+    host = platform.node()
+    statuses = []
+
+    def emit(timing, record):
+        status, error = probe_status(timing, record)
+        statuses.append(status)
+        if args.format == "ndjson":
+            line = json.dumps(probe_line(timing, record, host, system_info.backend),
+                              ensure_ascii=False, default=str)
+            sys.stdout.write(line + "\n")
+        elif args.format == "text":
+            if record is not None:
+                sys.stdout.write(render_text(record))
+            if status != "ok":
+                sys.stdout.write(f"[{timing.name}] {status.upper()}: {error}\n")
+        else:
+            return
+        sys.stdout.flush()
+
+    timeouts = None if args.timeout is None else {name: args.timeout for name in names}
+    report = hw_report.run_report(names, max_workers=args.jobs, timeouts=timeouts, on_probe=emit)
+
+    if args.format == "json":
+        sys.stdout.write(render_json(report) + "\n")
+        sys.stdout.flush()
+
+    code = exit_code(statuses)
+    if not args.quiet:
+        ok = statuses.count("ok")
+        print(f"{ok}/{len(statuses)} sondas correctas en {report.wall_seconds:.2f} s ({host}, {system_info.backend})",
+              file=sys.stderr)
+    return code
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv:
+        run_tool()
+        return EXIT_OK
+    try:
+        return run_headless(argv)
+    except KeyboardInterrupt:
+        return EXIT_INTERRUPTED
+    except BrokenPipeError:
+        # El consumidor cerró la tubería (por ejemplo `| head`): no es un error nuestro
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+        return EXIT_OK
+
+
 if __name__ == "__main__":
-    run_tool()
\ No newline at end of file
+    sys.exit(main())
@@ -0,0 +1,296 @@
+# mem_bench.py
+#
+# Prueba de rendimiento de la memoria: ancho de banda con los núcleos de STREAM
+# (copy, scale y triad) sobre arrays de NumPy mucho mayores que la caché L3, y
+# latencia con un recorrido de punteros aleatorio. El resultado se compara con
+# el máximo teórico de los módulos (Win32_PhysicalMemory / SMBIOS):
+#
+#   por canal = velocidad (MT/s) x 8 bytes        (bus de 64 bits)
+#   teórico   = por canal x canales ocupados      (módulos, hasta MAX_CHANNELS)
+#
+# Un equipo con dos o más módulos cuyo ancho de banda medido no supera el de un
+# solo canal suele tener los módulos en el mismo canal (ranuras mal elegidas) o
+# el doble canal desactivado.
+#
+# Detalles de la medición:
+#   - las operaciones de NumPy liberan el GIL, así que los arrays se reparten en
+#     trozos entre un hilo por núcleo físico y todos copian a la vez;
+#   - se usan ufuncs con out= para no crear temporales (que añadirían tráfico);
+#     triad (a = b + q*c) se hace por bloques que caben en la caché L2 para que
+#     el resultado intermedio no vuelva a memoria;
+#   - cada núcleo se repite y se toma el mejor tiempo, como en STREAM; los bytes
+#     contados son los de STREAM (copy y scale 16 por elemento, triad 24);
+#   - la latencia es el tiempo por salto de una cadena i = siguiente[i] sobre un
+#     ciclo aleatorio con un salto por línea de caché, menos el de la misma
+#     cadena sobre un conjunto que cabe en L1 (el coste del intérprete), de modo
+#     que queda la latencia de la memoria (incluye fallos de TLB).
+#
+# Uso:
+#   python mem_bench.py
+#   python mem_bench.py --size 512 --threads 4 --channels 4
+
+import argparse
+import os
+import sys
+import threading
+import time
+
+# NumPy y psutil se cargan en el primer uso (ver lazy_deps.py)
+from lazy_deps import numpy as np, psutil
+
+from records import MemoryBenchmark, Snapshot
+
+
+MIN_ARRAY_MB = 256
+L3_FACTOR = 4                   # Cada array ocupa al menos 4 veces la L3
+MAX_MEMORY_FRACTION = 0.25      # Los tres arrays juntos, como mucho, 1/4 de la memoria libre
+DEFAULT_L3_BYTES = 32 * 1024 ** 2
+REPEAT = 5
+TRIAD_BLOCK = 32 * 1024         # Elementos por bloque de triad (256 KB por array)
+MAX_CHANNELS = 2                # Canales del controlador supuestos (doble canal)
+SINGLE_CHANNEL_SUSPECT = 1.0    # Medido / un canal por debajo de esto con 2+ módulos: sospechoso
+LATENCY_HOPS = 2_000_000
+LATENCY_MB = 256
+BASELINE_BYTES = 16 * 1024      # Conjunto que cabe en L1
+LINE_ELEMENTS = 8               # int64 por línea de caché de 64 bytes
+
+
+class BenchmarkCancelled(Exception):
+    pass
+
+
+def _check(cancel):
+    if cancel is not None and cancel.is_set():
+        raise BenchmarkCancelled()
+
+
+def l3_cache_bytes():
+    """Tamaño de la caché L3 (la del primer procesador) o None si no se puede saber"""
+    if sys.platform.startswith("linux"):
+        base = "/sys/devices/system/cpu/cpu0/cache"
+        try:
+            for index in sorted(os.listdir(base)):
+                path = os.path.join(base, index)
+                if not index.startswith("index"):
+                    continue
+                with open(os.path.join(path, "level")) as f:
+                    if f.read().strip() != "3":
+                        continue
+                with open(os.path.join(path, "size")) as f:
+                    size = f.read().strip().upper()
+                factor = {"K": 1024, "M": 1024 ** 2}.get(size[-1:], 1)
+                return int(size.rstrip("KM")) * factor
+        except (OSError, ValueError):
+            return None
+    elif sys.platform == "win32":
+        try:
+            import wmi_session
+            rows = wmi_session.select(wmi_session.WMIQuery("Win32_Processor", ("L3CacheSize",)))
+            sizes = [int(row.L3CacheSize) for row in rows if row.L3CacheSize]
+            return sizes[0] * 1024 if sizes else None
+        except Exception:
+            return None
+    return None
+
+
+def array_elements(size_mb=None, l3_bytes=None):
+    """Elementos float64 de cada array: 4 x L3 y al menos MIN_ARRAY_MB, sin pasar de la memoria libre"""
+    if size_mb:
+        wanted = size_mb * 1024 ** 2
+    else:
+        wanted = max(MIN_ARRAY_MB * 1024 ** 2, L3_FACTOR * (l3_bytes or DEFAULT_L3_BYTES))
+    limit = int(psutil.virtual_memory().available * MAX_MEMORY_FRACTION / 3)
+    return max(TRIAD_BLOCK, min(wanted, limit) // 8 // TRIAD_BLOCK * TRIAD_BLOCK)
+
+
+# Ancho de banda
+
+def _chunks(n, parts):
+    step = -(-n // parts)
+    return [(start, min(n, start + step)) for start in range(0, n, step)]
+
+
+def _parallel(kernel, chunks):
+    """Ejecuta kernel(hilo, inicio, fin) en un hilo por trozo; segundos de reloj del conjunto"""
+    barrier = threading.Barrier(len(chunks) + 1)
+    errors = []
+
+    def worker(index, start, end):
+        barrier.wait()
+        try:
+            kernel(index, start, end)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(i, *chunk), daemon=True) for i, chunk in enumerate(chunks)]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    began = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - began
+    if errors:
+        raise errors[0]
+    return elapsed
+
+
+def _bandwidth(n, threads, repeat, cancel):
+    """GB/s de copy (c = a), scale (b = q*c) y triad (a = b + q*c)"""
+    a = np.full(n, 1.0)
+    b = np.full(n, 2.0)
+    c = np.zeros(n)
+    q = 3.0
+    chunks = _chunks(n, threads)
+    # Búfer intermedio de triad, uno por hilo y del tamaño de un bloque
+    scratch = [np.empty(TRIAD_BLOCK) for _ in chunks]
+
+    def copy(_, start, end):
+        np.copyto(c[start:end], a[start:end])
+
+    def scale(_, start, end):
+        np.multiply(c[start:end], q, out=b[start:end])
+
+    def triad(index, start, end):
+        tmp = scratch[index]
+        for block in range(start, end, TRIAD_BLOCK):
+            stop = min(end, block + TRIAD_BLOCK)
+            part = tmp[:stop - block]
+            np.multiply(c[block:stop], q, out=part)
+            np.add(b[block:stop], part, out=a[block:stop])
+
+    results = {}
+    for name, kernel, bytes_per_element in (("copy", copy, 16), ("scale", scale, 16), ("triad", triad, 24)):
+        best = None
+        for _ in range(repeat):
+            _check(cancel)
+            elapsed = _parallel(kernel, chunks)
+            best = elapsed if best is None else min(best, elapsed)
+        results[name] = bytes_per_element * n / best / 1e9
+    return results
+
+
+# Latencia
+
+def _chain(lines, rng):
+    """Un solo ciclo en orden aleatorio que toca un elemento por línea de caché"""
+    order = rng.permutation(lines) * LINE_ELEMENTS
+    chain = np.zeros(lines * LINE_ELEMENTS, dtype=np.int64)
+    chain[order] = np.roll(order, -1)
+    return chain
+
+
+def _chase(chain, hops):
+    """Segundos por salto de la cadena (bucle desenrollado x8)"""
+    view = memoryview(chain)
+    i = 0
+    start = time.perf_counter()
+    for _ in range(hops // 8):
+        i = view[i]; i = view[i]; i = view[i]; i = view[i]
+        i = view[i]; i = view[i]; i = view[i]; i = view[i]
+    return (time.perf_counter() - start) / (hops // 8 * 8)
+
+
+def _latency(size_bytes, hops, cancel):
+    rng = np.random.default_rng(1)
+    baseline = _chain(max(2, BASELINE_BYTES // 64), rng)
+    _chase(baseline, hops // 10)                     # Calentamiento
+    overhead = _chase(baseline, hops)
+    _check(cancel)
+    chain = _chain(max(2, size_bytes // 64), rng)
+    _chase(chain, hops // 10)
+    _check(cancel)
+    return max(0.0, _chase(chain, hops) - overhead) * 1e9
+
+
+# Comparación con los módulos
+
+def theoretical(modules, channels=MAX_CHANNELS):
+    """(MT/s, GB/s de un canal, GB/s teóricos) según los módulos de RAMInfo"""
+    speeds = [int(m.speed_mhz) for m in modules if m.speed_mhz]
+    if not speeds:
+        return None, None, None
+    # Todos los módulos trabajan a la velocidad del más lento
+    speed = min(speeds)
+    single = speed * 8 / 1000
+    return speed, round(single, 1), round(single * max(1, min(len(modules), channels)), 1)
+
+
+def _notes(result, l3_bytes):
+    notes = []
+    best = max(v for v in (result.copy_gbps, result.scale_gbps, result.triad_gbps) if v is not None)
+    if l3_bytes and result.array_bytes < 2 * l3_bytes:
+        notes.append(f"Los arrays ({result.array_bytes // 2 ** 20} MB) no superan con holgura la caché L3 "
+                     f"({l3_bytes // 2 ** 20} MB): el resultado puede estar inflado por la caché")
+    if result.single_channel_gbps is None:
+        notes.append("Sin velocidad de los módulos: no se puede comparar con el máximo teórico")
+    elif result.modules >= 2 and best < result.single_channel_gbps * SINGLE_CHANNEL_SUSPECT:
+        notes.append(f"Con {result.modules} módulos el ancho de banda medido ({best:.1f} GB/s) no supera "
+                     f"el de un solo canal ({result.single_channel_gbps:.1f} GB/s): revisar que los "
+                     f"módulos estén en ranuras de canales distintos")
+    return notes
+
+
+def run(modules=(), size_mb=None, threads=None, repeat=REPEAT, channels=MAX_CHANNELS,
+        latency_hops=LATENCY_HOPS, cancel=None):
+    """Mide la memoria; `modules` son los MemoryModule de get_ram_info() para la comparación"""
+    result = MemoryBenchmark(modules=len(modules))
+    started = time.perf_counter()
+    try:
+        threads = threads or psutil.cpu_count(logical=False) or os.cpu_count() or 1
+        l3_bytes = l3_cache_bytes()
+        n = array_elements(size_mb, l3_bytes)
+        result.array_bytes, result.threads = n * 8, threads
+        result.speed_mts, result.single_channel_gbps, result.theoretical_gbps = theoretical(modules, channels)
+
+        bandwidth = _bandwidth(n, threads, repeat, cancel)
+        result.copy_gbps = round(bandwidth["copy"], 2)
+        result.scale_gbps = round(bandwidth["scale"], 2)
+        result.triad_gbps = round(bandwidth["triad"], 2)
+        latency_bytes = max(LATENCY_MB * 1024 ** 2, L3_FACTOR * (l3_bytes or DEFAULT_L3_BYTES))
+        result.latency_ns = round(_latency(min(latency_bytes, n * 8), latency_hops, cancel), 1)
+
+        if result.theoretical_gbps:
+            result.efficiency_percent = round(100 * result.triad_gbps / result.theoretical_gbps, 1)
+        result.notes = _notes(result, l3_bytes)
+    except BenchmarkCancelled:
+        result.error = "Cancelada"
+    except Exception as e:
+        result.error = str(e)
+    result.seconds = round(time.perf_counter() - started, 2)
+    return result
+
+
+def benchmark_snapshot(cancel=None, **kwargs):
+    """Mide la memoria y devuelve la sonda "ram" con el resultado junto a los módulos"""
+    import system_info
+    info = system_info.collect(["ram"])["ram"]
+    info.benchmark = run(info.modules, cancel=cancel, **kwargs)
+    if cancel is not None and cancel.is_set():
+        raise BenchmarkCancelled()
+    return Snapshot(records={"ram": info})
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Prueba de rendimiento de memoria de ARKToolsPC")
+    parser.add_argument("--size", type=int, help="MB de cada uno de los tres arrays (por defecto 4 x L3)")
+    parser.add_argument("--threads", type=int, help="Hilos (por defecto uno por núcleo físico)")
+    parser.add_argument("--repeat", type=int, default=REPEAT)
+    parser.add_argument("--channels", type=int, default=MAX_CHANNELS,
+                        help="Canales de memoria del procesador para el máximo teórico")
+    parser.add_argument("--no-modules", action="store_true", help="No consulta los módulos (sin comparación)")
+    parser.add_argument("--json", action="store_true", help="Salida JSON")
+    args = parser.parse_args(argv)
+
+    from renderers import render_json, text_lines
+    modules = []
+    if not args.no_modules:
+        import system_info
+        modules = system_info.collect(["ram"])["ram"].modules
+    result = run(modules, size_mb=args.size, threads=args.threads, repeat=args.repeat, channels=args.channels)
+    print(render_json(result) if args.json else "\n".join(text_lines(result)))
+    return 1 if result.error else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,158 @@
+# network_inventory.py
+#
+# Inventario de red estructurado, sin lanzar procesos externos. Las interfaces
+# y sus direcciones salen de psutil (net_if_addrs, net_if_stats y
+# net_io_counters); a cada interfaz se le une después:
+#
+#   - la tarjeta de la sonda "nic" (modelo, fabricante, estado), por nombre de
+#     conexión o por dirección MAC;
+#   - en Windows, Win32_NetworkAdapterConfiguration (puertas de enlace, DNS y
+#     DHCP) leída con la sesión WMI compartida, por MAC o por descripción.
+#
+# linux_backend.py completa lo mismo con /proc/net/route y /etc/resolv.conf.
+# La salida de 'ipconfig /all' sigue disponible como sonda aparte ("ipconfig").
+
+import ipaddress
+import re
+
+# psutil se carga en el primer uso (ver lazy_deps.py)
+from lazy_deps import psutil
+
+import wmi_session
+from records import NetworkAdapter
+
+
+def mac_key(mac):
+    """MAC sin separadores y en mayúsculas ('00-1b-21-...' -> '001B21...'); None si no es válida"""
+    digits = re.sub(r"[^0-9A-Fa-f]", "", str(mac or "")).upper()
+    if len(digits) != 12 or not digits.strip("0"):
+        return None
+    return digits
+
+
+def format_mac(mac):
+    key = mac_key(mac)
+    return ":".join(key[i:i + 2] for i in range(0, 12, 2)) if key else None
+
+
+def _prefix_length(netmask):
+    """Longitud de prefijo de una máscara ('255.255.255.0' -> 24, 'ffff:ffff::' -> 32)"""
+    try:
+        return bin(int(ipaddress.ip_address(netmask))).count("1")
+    except ValueError:
+        return None
+
+
+def _address_version(address):
+    """4 o 6 para direcciones IP, "mac" para direcciones de enlace, None para el resto"""
+    try:
+        return ipaddress.ip_address(str(address).split("%", 1)[0]).version
+    except ValueError:
+        return "mac" if mac_key(address) else None
+
+
+def _with_prefix(address, prefix):
+    address = str(address).split("%", 1)[0]
+    return f"{address}/{prefix}" if prefix is not None else address
+
+
+# psutil
+
+def psutil_adapters():
+    """Interfaces de red según psutil: nombre -> NetworkAdapter"""
+    adapters = {}
+
+    # La familia de cada dirección se deduce de su forma y no de psutil.AF_LINK,
+    # que vale distinto en cada sistema (y así las grabaciones de probe_replay
+    # se reproducen igual en cualquier equipo)
+    for name, addresses in psutil.net_if_addrs().items():
+        adapter = adapters.setdefault(name, NetworkAdapter(name=name))
+        for addr in addresses:
+            version = _address_version(addr.address)
+            if version == "mac":
+                adapter.mac_address = adapter.mac_address or format_mac(addr.address)
+            elif version == 4:
+                adapter.ipv4.append(_with_prefix(addr.address, _prefix_length(addr.netmask)))
+            elif version == 6:
+                adapter.ipv6.append(_with_prefix(addr.address, _prefix_length(addr.netmask)))
+
+    for name, stats in psutil.net_if_stats().items():
+        adapter = adapters.setdefault(name, NetworkAdapter(name=name))
+        adapter.is_up = bool(stats.isup)
+        adapter.mtu = stats.mtu or None
+        adapter.speed_bps = stats.speed * 1_000_000 if stats.speed else None     # psutil da Mb/s
+
+    for name, io in psutil.net_io_counters(pernic=True).items():
+        adapter = adapters.get(name)
+        if adapter is None:
+            continue
+        adapter.bytes_sent, adapter.bytes_recv = io.bytes_sent, io.bytes_recv
+        adapter.packets_sent, adapter.packets_recv = io.packets_sent, io.packets_recv
+        adapter.errors_in, adapter.errors_out = io.errin, io.errout
+        adapter.drops_in, adapter.drops_out = io.dropin, io.dropout
+    return adapters
+
+
+# Uniones
+
+def _by_mac(adapters):
+    return {mac_key(a.mac_address): a for a in adapters.values() if mac_key(a.mac_address)}
+
+
+def merge_nics(adapters, nics):
+    """Une las tarjetas de la sonda "nic" (records.NIC) con las interfaces"""
+    macs = _by_mac(adapters)
+    for nic in nics:
+        adapter = adapters.get(nic.connection_id) or macs.get(mac_key(nic.mac_address))
+        if adapter is None:
+            # Tarjeta sin interfaz activa (desconectada o deshabilitada)
+            name = nic.connection_id or nic.name or nic.mac_address
+            adapter = adapters[name] = NetworkAdapter(name=name)
+        adapter.physical = True
+        adapter.description = nic.name
+        adapter.manufacturer = nic.manufacturer
+        adapter.mac_address = adapter.mac_address or format_mac(nic.mac_address)
+        adapter.status = nic.status
+        adapter.speed_bps = nic.speed_bps or adapter.speed_bps
+
+
+def _strings(value):
+    if value is None:
+        return []
+    if isinstance(value, str):
+        return [value]
+    return [str(v) for v in value if v]
+
+
+CONFIGURATION_QUERY = wmi_session.WMIQuery("Win32_NetworkAdapterConfiguration", (
+    "Index", "Description", "MACAddress", "IPAddress", "IPSubnet", "DefaultIPGateway",
+    "DNSServerSearchOrder", "DNSDomain", "DHCPEnabled", "DHCPServer"), where="IPEnabled = TRUE")
+
+
+def merge_configurations(adapters, configurations):
+    """Une las filas de Win32_NetworkAdapterConfiguration con las interfaces"""
+    macs = _by_mac(adapters)
+    descriptions = {a.description: a for a in adapters.values() if a.description}
+    for config in configurations:
+        adapter = macs.get(mac_key(config.MACAddress)) or descriptions.get(config.Description)
+        if adapter is None:
+            name = config.Description or format_mac(config.MACAddress) or f"Adaptador {config.Index}"
+            adapter = adapters.setdefault(name, NetworkAdapter(name=name, description=config.Description))
+            adapter.mac_address = adapter.mac_address or format_mac(config.MACAddress)
+
+        if not adapter.ipv4 and not adapter.ipv6:
+            # Sin datos de psutil para esta interfaz: direcciones de WMI
+            for address, subnet in zip(_strings(config.IPAddress), _strings(config.IPSubnet)):
+                prefix = int(subnet) if subnet.isdigit() else _prefix_length(subnet)
+                target = adapter.ipv4 if _address_version(address) == 4 else adapter.ipv6
+                target.append(_with_prefix(address, prefix))
+        adapter.gateways = _strings(config.DefaultIPGateway)
+        adapter.dns_servers = _strings(config.DNSServerSearchOrder)
+        adapter.dns_suffix = config.DNSDomain or None
+        adapter.dhcp_enabled = None if config.DHCPEnabled is None else bool(config.DHCPEnabled)
+        adapter.dhcp_server = (config.DHCPServer or None) if adapter.dhcp_enabled else None
+
+
+def ordered(adapters):
+    """Tarjetas físicas primero, luego las activas; dentro de cada grupo por nombre"""
+    return sorted(adapters.values(), key=lambda a: (not a.physical, not a.is_up, a.name.lower()))
@@ -0,0 +1,392 @@
+# powershell_host.py
+#
+# Proceso de PowerShell de larga duración para las consultas que no tienen
+# equivalente nativo (WMI o Registro). Arrancar powershell.exe cuesta entre uno
+# y varios segundos; aquí se arranca una sola vez y se le envían las consultas
+# por stdin.
+#
+# Protocolo (una línea JSON por mensaje, en UTF-8):
+#   al arrancar    <- {"id": 0, "ready": true}
+#   petición       -> {"id": 7, "script": "(Get-Date).Year"}
+#   respuesta      <- {"id": 7, "ok": true, "output": "2025\r\n"}
+#                  <- {"id": 7, "ok": false, "error": "mensaje"}
+#
+# Las peticiones se pueden encadenar sin esperar la respuesta anterior (el
+# proceso las atiende en orden) y varios hilos pueden usar el mismo proceso.
+# Un script que supera su tiempo límite no se puede interrumpir dentro de
+# PowerShell: se mata el proceso y se arranca otro, al que se reenvían las
+# peticiones que estaban en cola. Si el proceso muere por su cuenta, las
+# peticiones pendientes se reintentan una vez en un proceso nuevo.
+#
+# El protocolo se puede probar en Linux con un proceso sustituto escrito en
+# Python que entiende unas pocas órdenes (Start-Sleep, throw, exit, literales):
+#   python powershell_host.py --stand-in "'hola'" "Start-Sleep -Seconds 0.2; 'adiós'"
+#   python powershell_host.py "(Get-CimInstance Win32_OperatingSystem).Caption" --cold
+
+import argparse
+import atexit
+import base64
+import itertools
+import json
+import re
+import sys
+import threading
+import time
+
+# subprocess se carga en el primer uso (ver lazy_deps.py)
+from lazy_deps import subprocess
+
+import diagnostics
+
+
+DEFAULT_TIMEOUT = 15.0
+MAX_ATTEMPTS = 2                # Intentos por petición si el proceso muere
+CREATE_NO_WINDOW = 0x08000000   # Sin ventana de consola al lanzarlo desde la GUI
+
+# Bucle que ejecuta PowerShell: lee una petición por línea y contesta con otra
+BOOTSTRAP = r"""
+$ErrorActionPreference = 'Stop'
+$ProgressPreference = 'SilentlyContinue'
+$utf8 = New-Object System.Text.UTF8Encoding $false
+try { [Console]::InputEncoding = $utf8 } catch { }
+try { [Console]::OutputEncoding = $utf8 } catch { }
+$out = [Console]::Out
+$out.WriteLine('{"id":0,"ready":true}'); $out.Flush()
+while ($true) {
+    $line = [Console]::In.ReadLine()
+    if ($null -eq $line) { break }
+    if ($line -eq '') { continue }
+    $request = $line | ConvertFrom-Json
+    try {
+        $output = & ([ScriptBlock]::Create($request.script)) | Out-String
+        $response = @{ id = $request.id; ok = $true; output = $output }
+    } catch {
+        $response = @{ id = $request.id; ok = $false; error = $_.Exception.Message }
+    }
+    $out.WriteLine(($response | ConvertTo-Json -Compress)); $out.Flush()
+}
+"""
+
+
+class PowerShellError(RuntimeError):
+    """El script falló dentro de PowerShell o el proceso no pudo atenderlo"""
+
+
+class PowerShellTimeout(PowerShellError):
+    """El script superó su tiempo límite (el proceso se reinicia)"""
+
+
+class PowerShellUnavailable(PowerShellError):
+    """No se pudo lanzar PowerShell en este sistema"""
+
+
+def powershell_command(executable="powershell"):
+    encoded = base64.b64encode(BOOTSTRAP.encode("utf-16-le")).decode("ascii")
+    return [executable, "-NoLogo", "-NoProfile", "-NonInteractive", "-ExecutionPolicy", "Bypass",
+            "-EncodedCommand", encoded]
+
+
+def stand_in_command(startup_delay=0.0):
+    """Orden del proceso sustituto (mismo protocolo, sin PowerShell)"""
+    command = [sys.executable, __file__, "--serve-stand-in"]
+    if startup_delay:
+        command += ["--startup-delay", str(startup_delay)]
+    return command
+
+
+class _Request:
+    __slots__ = ("id", "script", "attempts", "done", "output", "error", "error_type")
+
+    def __init__(self, request_id, script):
+        self.id = request_id
+        self.script = script
+        self.attempts = 0
+        self.done = threading.Event()
+        self.output = None
+        self.error = None
+        self.error_type = PowerShellError
+
+    def fail(self, message, error_type=PowerShellError):
+        self.error = message
+        self.error_type = error_type
+        self.done.set()
+
+
+class PowerShellHost:
+    """
+    Un proceso de PowerShell compartido. run() envía un script y espera su
+    salida; el proceso se arranca en la primera petición y se reinicia solo.
+    """
+
+    def __init__(self, command=None, timeout=DEFAULT_TIMEOUT):
+        self.command = command or powershell_command()
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._process = None
+        self._started_at = 0.0
+        self._pending = {}          # id -> _Request enviadas y sin respuesta
+        self.stats = {
+            "starts": 0,
+            "startup_seconds": 0.0,     # Hasta la línea "ready" del último arranque
+            "requests": 0,
+            "errors": 0,
+            "timeouts": 0,
+            "crashes": 0,
+        }
+        atexit.register(self.close)
+
+    # Proceso
+
+    def _start(self):
+        kwargs = {}
+        if sys.platform == "win32":
+            kwargs["creationflags"] = CREATE_NO_WINDOW
+        try:
+            process = subprocess.Popen(
+                self.command, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                encoding="utf-8", errors="replace", bufsize=1, **kwargs)
+        except OSError as e:
+            raise PowerShellUnavailable(f"No se pudo lanzar PowerShell: {e}") from None
+        self._process = process
+        self._started_at = time.perf_counter()
+        self.stats["starts"] += 1
+        threading.Thread(target=self._read_loop, args=(process,), name="PowerShellHost", daemon=True).start()
+
+    def _send(self, request):
+        """Escribe la petición; False si el proceso ya no acepta entrada (murió)"""
+        request.attempts += 1
+        line = json.dumps({"id": request.id, "script": request.script}, ensure_ascii=False)
+        try:
+            self._process.stdin.write(line + "\n")
+            self._process.stdin.flush()
+        except (OSError, ValueError):
+            return False
+        return True
+
+    def _crashed(self):
+        """
+        El proceso murió por su cuenta (fin de la salida, poll() o escritura
+        fallida). PowerShell atiende en orden: la petición más antigua es la que
+        se ejecutaba y gasta su intento; el resto se reenvía a un proceso nuevo.
+        """
+        self._kill()
+        self.stats["crashes"] += 1
+        self._restart(culprit=min(self._pending, default=None))
+
+    def _kill(self):
+        process, self._process = self._process, None
+        if process is None:
+            return
+        try:
+            process.kill()
+            process.wait(timeout=5)
+        except Exception:
+            pass
+
+    def _restart(self, culprit=None):
+        """
+        Arranca un proceso nuevo y le reenvía la cola. Solo la petición `culprit`
+        (la que se estaba ejecutando) gasta un intento; si no le quedan, falla.
+        """
+        for request in list(self._pending.values()):
+            if request.id != culprit:
+                request.attempts -= 1
+            if request.attempts >= MAX_ATTEMPTS:
+                del self._pending[request.id]
+                request.fail("El proceso de PowerShell terminó durante la petición")
+        if not self._pending:
+            return
+        try:
+            self._start()
+        except PowerShellUnavailable as e:
+            for request in self._pending.values():
+                request.fail(str(e), PowerShellUnavailable)
+            self._pending.clear()
+            return
+        for request in sorted(self._pending.values(), key=lambda r: r.id):
+            if not self._send(request):
+                self._crashed()
+                return
+
+    def _read_loop(self, process):
+        for line in process.stdout:
+            try:
+                message = json.loads(line)
+            except ValueError:
+                continue            # Texto ajeno al protocolo (avisos de PowerShell)
+            if not isinstance(message, dict):
+                continue
+            if message.get("ready"):
+                with self._lock:
+                    self.stats["startup_seconds"] = time.perf_counter() - self._started_at
+                continue
+            with self._lock:
+                request = self._pending.pop(message.get("id"), None)
+            if request is None:
+                continue            # Petición ya vencida
+            if message.get("ok"):
+                request.output = message.get("output") or ""
+                request.done.set()
+            else:
+                request.fail(message.get("error") or "Error desconocido")
+
+        # Fin de la salida: si no fue un reinicio provocado, el proceso murió
+        with self._lock:
+            if self._process is process:
+                self._crashed()
+
+    # Peticiones
+
+    def run(self, script, timeout=None):
+        """Ejecuta `script` y devuelve su salida como texto (Out-String)"""
+        timeout = self.timeout if timeout is None else timeout
+        request = _Request(next(self._ids), script)
+        start = time.perf_counter()
+        with self._lock:
+            if self._process is not None and self._process.poll() is not None:
+                # Murió y _read_loop aún no vio el fin de la salida
+                self._crashed()
+            if self._process is None:
+                self._start()
+            self.stats["requests"] += 1
+            self._pending[request.id] = request
+            if not self._send(request):
+                self._crashed()
+
+        if not request.done.wait(timeout):
+            with self._lock:
+                if self._pending.pop(request.id, None) is not None:
+                    # El script sigue ejecutándose: solo se puede parar matando el proceso
+                    self.stats["timeouts"] += 1
+                    self._kill()
+                    self._restart()
+                    request.fail(f"Tiempo límite de {timeout:g} s superado", PowerShellTimeout)
+
+        if diagnostics.enabled:
+            diagnostics.add_command(f"powershell (persistente): {script}", time.perf_counter() - start,
+                                    returncode=0 if request.error is None else 1, error=request.error)
+        if request.error is not None:
+            with self._lock:
+                self.stats["errors"] += 1
+            raise request.error_type(request.error)
+        return request.output
+
+    @property
+    def running(self):
+        process = self._process
+        return process is not None and process.poll() is None
+
+    def close(self):
+        with self._lock:
+            process, self._process = self._process, None
+            for request in self._pending.values():
+                request.fail("El proceso de PowerShell se cerró")
+            self._pending.clear()
+        if process is None:
+            return
+        try:
+            process.stdin.close()       # El bucle termina al ver el fin de la entrada
+            process.wait(timeout=2)
+        except Exception:
+            process.kill()
+
+
+# Instancia global usada por system_info.py
+host = PowerShellHost()
+
+
+def run(script, timeout=None):
+    return host.run(script, timeout)
+
+
+# Proceso sustituto (solo para pruebas)
+
+def _stand_in_statement(statement):
+    """Ejecuta una orden del subconjunto que entiende el sustituto; devuelve su salida"""
+    match = re.fullmatch(r"Start-Sleep\s+-Seconds\s+(\S+)", statement)
+    if match:
+        time.sleep(float(match.group(1)))
+        return ""
+    match = re.fullmatch(r"exit(?:\s+(\d+))?", statement)
+    if match:
+        sys.stdout.flush()
+        raise SystemExit(int(match.group(1) or 0))
+    match = re.fullmatch(r"throw\s+'(.*)'", statement)
+    if match:
+        raise RuntimeError(match.group(1))
+    match = re.fullmatch(r"(?:Write-Output\s+)?'(.*)'", statement)
+    if match:
+        return match.group(1) + "\n"
+    raise RuntimeError(f"El sustituto no entiende: {statement}")
+
+
+def serve_stand_in(startup_delay=0.0):
+    time.sleep(startup_delay)
+    sys.stdout.reconfigure(encoding="utf-8")
+    print(json.dumps({"id": 0, "ready": True}), flush=True)
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        request = json.loads(line)
+        try:
+            output = "".join(_stand_in_statement(part.strip())
+                             for part in request["script"].split(";") if part.strip())
+            response = {"id": request["id"], "ok": True, "output": output}
+        except RuntimeError as e:
+            response = {"id": request["id"], "ok": False, "error": str(e)}
+        print(json.dumps(response, ensure_ascii=False), flush=True)
+
+
+# Línea de órdenes
+
+def _run_cold(script, executable):
+    """Referencia: un proceso de PowerShell nuevo por consulta"""
+    result = subprocess.run([executable, "-NoLogo", "-NoProfile", "-NonInteractive", "-Command", script],
+                            capture_output=True, text=True, encoding="utf-8", errors="replace")
+    return result.stdout
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Consultas a través del proceso de PowerShell persistente")
+    parser.add_argument("scripts", nargs="*", help="Scripts a ejecutar, uno tras otro")
+    parser.add_argument("--stand-in", action="store_true", help="Usa el proceso sustituto en lugar de PowerShell")
+    parser.add_argument("--executable", default="powershell", help="powershell o pwsh")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT)
+    parser.add_argument("--cold", action="store_true", help="Compara con lanzar un proceso por consulta")
+    parser.add_argument("--serve-stand-in", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--startup-delay", type=float, default=0.0, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.serve_stand_in:
+        serve_stand_in(args.startup_delay)
+        return 0
+
+    command = stand_in_command() if args.stand_in else powershell_command(args.executable)
+    worker = PowerShellHost(command, timeout=args.timeout)
+    code = 0
+    start = time.perf_counter()
+    for script in args.scripts:
+        call_start = time.perf_counter()
+        try:
+            output = worker.run(script)
+            print(output.rstrip("\r\n"))
+        except PowerShellError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            code = 1
+        print(f"  [{(time.perf_counter() - call_start) * 1000:.1f} ms]", file=sys.stderr)
+    total = time.perf_counter() - start
+    worker.close()
+    print(f"{len(args.scripts)} consultas en {total:.2f} s (arranque {worker.stats['startup_seconds']:.2f} s, "
+          f"{worker.stats['starts']} procesos)", file=sys.stderr)
+
+    if args.cold and not args.stand_in:
+        start = time.perf_counter()
+        for script in args.scripts:
+            _run_cold(script, args.executable)
+        print(f"Un proceso por consulta: {time.perf_counter() - start:.2f} s", file=sys.stderr)
+    return code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
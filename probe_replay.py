@@ -0,0 +1,778 @@
+# probe_replay.py
+#
+# Grabación y reproducción de los datos en bruto que consumen las sondas de
+# system_info.py: instancias WMI, resultados de psutil, valores del Registro y
+# salidas de procesos externos.
+#
+#   Grabación:    se envuelven las cuatro fuentes (backend de wmi_session y
+#                 proxies de lazy_deps), se ejecutan las sondas en el equipo
+#                 real y se guarda todo en un archivo JSON (comprimido si
+#                 termina en .gz).
+#   Reproducción: las mismas fuentes sirven los datos del archivo con una
+#                 latencia simulada configurable, de modo que un equipo lento
+#                 de un cliente (cientos de dispositivos PnP, WMI con retardos)
+#                 se puede reproducir y medir en Linux.
+#
+# Uso:
+#   python probe_replay.py record equipo.json.gz [sonda ...]
+#   python probe_replay.py replay equipo.json.gz [sonda ...] --latency laggy_wmi
+#   python probe_replay.py info equipo.json.gz
+
+import argparse
+import builtins
+import collections
+import gzip
+import json
+import platform
+import subprocess as _subprocess
+import sys
+import threading
+import time
+from dataclasses import dataclass, asdict
+
+import lazy_deps
+import wmi_session
+import device_inventory
+import hw_cache
+
+
+FIXTURE_VERSION = 1
+
+# Valores distintos que se guardan como máximo por cada llamada a psutil (el
+# muestreador de CPU llama a cpu_percent continuamente)
+MAX_VALUES_PER_CALL = 32
+
+
+class ReplayMissError(LookupError):
+    """La grabación no contiene la llamada que hace la sonda"""
+
+
+@dataclass(slots=True)
+class SimulatedLatency:
+    """Retardos (en segundos) que añade la reproducción a cada fuente"""
+    wmi_connect: float = 0.0
+    wmi_query: float = 0.0
+    wmi_row: float = 0.0        # Por cada fila devuelta
+    wmi_property: float = 0.0   # Por cada propiedad transferida (SELECT * trae todas)
+    psutil: float = 0.0
+    winreg: float = 0.0
+    subprocess: float = 0.0
+
+
+# Perfiles de latencia habituales
+LATENCY_PROFILES = {
+    "none": SimulatedLatency(),
+    "fast": SimulatedLatency(wmi_connect=0.05, wmi_query=0.01, wmi_row=0.0001, wmi_property=0.000005,
+                             subprocess=0.1),
+    "typical": SimulatedLatency(wmi_connect=0.3, wmi_query=0.05, wmi_row=0.0005, wmi_property=0.00002,
+                                psutil=0.001, winreg=0.001, subprocess=0.5),
+    "laggy_wmi": SimulatedLatency(wmi_connect=2.0, wmi_query=0.5, wmi_row=0.003, wmi_property=0.0001,
+                                  psutil=0.001, winreg=0.002, subprocess=1.5),
+}
+
+
+# Funciones de `platform` que se graban en "meta" y se sustituyen al reproducir,
+# para que las sondas tomen el camino del sistema grabado (collect_os_info solo
+# consulta WMI y el Registro si platform.system() es "Windows")
+PLATFORM_FIELDS = ("system", "node", "release", "version", "machine", "processor", "platform",
+                   "win32_edition")
+
+
+def _platform_meta():
+    return {name: getattr(platform, name)() for name in PLATFORM_FIELDS}
+
+
+class _ReplayPlatform:
+    """Sustituye las funciones de `platform` por los valores grabados mientras está activo"""
+
+    def __init__(self, meta, backend):
+        self.values = {name: meta.get(name) for name in PLATFORM_FIELDS if meta.get(name) is not None}
+        # El backend elegido manda: una grabación de Windows reproducida con el backend de Linux es Linux
+        self.values["system"] = "Linux" if backend == "linux" else "Windows"
+        self._saved = {}
+
+    def start(self):
+        for name in (*self.values, "uname"):
+            self._saved[name] = getattr(platform, name)
+        for name, value in self.values.items():
+            setattr(platform, name, lambda value=value: value)
+        real = self._saved["uname"]()
+        uname = platform.uname_result(self.values["system"], self.values.get("node", real.node),
+                                      self.values.get("release", real.release),
+                                      self.values.get("version", real.version),
+                                      self.values.get("machine", real.machine))
+        platform.uname = lambda: uname
+
+    def stop(self):
+        for name, function in self._saved.items():
+            setattr(platform, name, function)
+        self._saved.clear()
+
+
+def _sleep(seconds):
+    if seconds > 0:
+        time.sleep(seconds)
+
+
+# Serialización de valores
+
+def _encode(value):
+    """Convierte un resultado en JSON conservando las namedtuple de psutil"""
+    if value is None or isinstance(value, (bool, str)):
+        return value
+    if isinstance(value, (int, float)):
+        return int(value) if isinstance(value, int) else value   # Los IntEnum se guardan como int
+    if isinstance(value, tuple) and hasattr(value, "_fields"):
+        return {"__namedtuple__": type(value).__name__, "fields": list(value._fields),
+                "values": [_encode(v) for v in value]}
+    if isinstance(value, (list, tuple, set)):
+        return [_encode(v) for v in value]
+    if isinstance(value, dict):
+        return {"__dict__": [[_encode(k), _encode(v)] for k, v in value.items()]}
+    return str(value)
+
+
+_namedtuples = {}
+
+
+def _decode(value):
+    if isinstance(value, list):
+        return [_decode(v) for v in value]
+    if isinstance(value, dict):
+        if "__namedtuple__" in value:
+            key = (value["__namedtuple__"], tuple(value["fields"]))
+            cls = _namedtuples.get(key)
+            if cls is None:
+                cls = _namedtuples[key] = collections.namedtuple(*key)
+            return cls(*(_decode(v) for v in value["values"]))
+        if "__dict__" in value:
+            decoded = {}
+            for key, item in value["__dict__"]:
+                key = _decode(key)
+                decoded[tuple(key) if isinstance(key, list) else key] = _decode(item)
+            return decoded
+    return value
+
+
+def _encode_error(error):
+    return {"__error__": type(error).__name__, "message": str(error)}
+
+
+def _raise_recorded(entry):
+    cls = getattr(builtins, entry["__error__"], None)
+    if not (isinstance(cls, type) and issubclass(cls, Exception)):
+        cls = RuntimeError
+    raise cls(entry["message"])
+
+
+def _is_error(entry):
+    return isinstance(entry, dict) and "__error__" in entry
+
+
+def _call_key(name, args, kwargs):
+    return json.dumps([name, _encode(list(args)), {k: _encode(v) for k, v in sorted(kwargs.items())}],
+                      separators=(",", ":"), ensure_ascii=False)
+
+
+def _wmi_row(obj):
+    """Propiedades de una instancia WMI como diccionario JSON"""
+    properties = getattr(obj, "properties", None)
+    names = list(properties) if isinstance(properties, dict) else list(vars(obj))
+    row = {}
+    for name in names:
+        try:
+            row[name] = _encode(getattr(obj, name))
+        except Exception:
+            row[name] = None
+    return row
+
+
+# Grabación
+
+class _RecordingWMI:
+    """Envuelve una conexión WMI real y anota cada consulta y sus filas"""
+
+    def __init__(self, connection, recorder):
+        self._connection = connection
+        self._recorder = recorder
+
+    def query(self, text):
+        rows = self._connection.query(text)
+        self._recorder._store_wmi("wql", text, rows)
+        return rows
+
+    def __getattr__(self, class_name):
+        method = getattr(self._connection, class_name)
+
+        def call(**filters):
+            rows = method(**filters)
+            key = class_name if not filters else _call_key(class_name, (), filters)
+            self._recorder._store_wmi("classes" if not filters else "calls", key, rows)
+            return rows
+        return call
+
+
+class _RecordingModule:
+    """Envuelve un módulo (psutil, subprocess...) y anota cada llamada a función"""
+
+    def __init__(self, module, store, lock, encoder=_encode):
+        self._module = module
+        self._store = store
+        self._lock = lock
+        self._encoder = encoder
+
+    def __getattr__(self, name):
+        attr = getattr(self._module, name)
+        if not callable(attr) or isinstance(attr, type):
+            return attr
+
+        def call(*args, **kwargs):
+            key = _call_key(name, args, kwargs)
+            try:
+                result = attr(*args, **kwargs)
+            except Exception as e:
+                self._add(key, _encode_error(e))
+                raise
+            self._add(key, self._encoder(result))
+            return result
+        return call
+
+    def _add(self, key, value):
+        with self._lock:
+            values = self._store.setdefault(key, [])
+            if len(values) < MAX_VALUES_PER_CALL and (not values or values[-1] != value):
+                values.append(value)
+
+
+def _encode_completed(result):
+    return {"args": _encode(result.args), "returncode": result.returncode,
+            "stdout": result.stdout if not isinstance(result.stdout, bytes) else result.stdout.decode("latin-1"),
+            "stderr": result.stderr if not isinstance(result.stderr, bytes) else result.stderr.decode("latin-1")}
+
+
+REGISTRY_ROOTS = ["HKEY_CLASSES_ROOT", "HKEY_CURRENT_USER", "HKEY_LOCAL_MACHINE", "HKEY_USERS",
+                  "HKEY_CURRENT_CONFIG"]
+
+
+class _RegistryKey:
+    """Clave del Registro abierta durante la grabación o la reproducción"""
+
+    def __init__(self, path, handle=None):
+        self.path = path
+        self.handle = handle
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.Close()
+
+    def Close(self):
+        if self.handle is not None:
+            self.handle.Close()
+
+
+class _RecordingRegistry:
+    """Envuelve winreg anotando los valores leídos por clave"""
+
+    def __init__(self, module, store, lock):
+        self._module = module
+        self._store = store
+        self._lock = lock
+        self._roots = {getattr(module, name): name for name in REGISTRY_ROOTS if hasattr(module, name)}
+
+    def __getattr__(self, name):
+        return getattr(self._module, name)
+
+    def OpenKey(self, key, sub_key, *args, **kwargs):
+        root = self._roots.get(key, getattr(key, "path", str(key)))
+        handle = self._module.OpenKey(getattr(key, "handle", key), sub_key, *args, **kwargs)
+        return _RegistryKey(f"{root}\\{sub_key}", handle)
+
+    def QueryValueEx(self, key, name):
+        with self._lock:
+            values = self._store.setdefault(key.path, {})
+        try:
+            result = self._module.QueryValueEx(key.handle, name)
+        except Exception as e:
+            values[name] = _encode_error(e)
+            raise
+        values[name] = [_encode(result[0]), result[1]]
+        return result
+
+    def SetValueEx(self, key, *args):
+        return self._module.SetValueEx(key.handle, *args)
+
+    def CloseKey(self, key):
+        key.Close()
+
+
+class Recorder:
+    """
+    Graba los datos que consumen las sondas mientras está activo:
+
+        recorder = Recorder().start()
+        system_info.collect()
+        recorder.stop()
+        recorder.save("equipo.json.gz")
+    """
+
+    def __init__(self, factory=None):
+        self.factory = factory or wmi_session.default_wmi_factory
+        self._lock = threading.Lock()
+        self.data = {
+            "version": FIXTURE_VERSION,
+            "meta": {"recorded_at": time.strftime("%Y-%m-%d %H:%M:%S"), **_platform_meta()},
+            "wmi": {"classes": {}, "calls": {}, "wql": {}},
+            "psutil": {},
+            "subprocess": {},
+            "winreg": {},
+        }
+        self._cache_enabled = None
+        self._active = False
+
+    def _store_wmi(self, kind, key, rows):
+        encoded = [_wmi_row(row) for row in rows]
+        with self._lock:
+            self.data["wmi"][kind][key] = encoded
+
+    def start(self):
+        if self._active:
+            return self
+        self._active = True
+        recorder = self
+        factory = self.factory
+        wmi_session.set_backend(lambda: _RecordingWMI(factory(), recorder))
+
+        for name, wrap in (("psutil", _RecordingModule), ("winreg", _RecordingRegistry)):
+            proxy = lazy_deps.lazy_module(name)
+            if proxy.available:
+                proxy.override(wrap(proxy._load(), self.data[name], self._lock))
+
+        recording_run = _RecordingModule(_subprocess, self.data["subprocess"], self._lock,
+                                         encoder=_encode_completed)
+        lazy_deps.subprocess.override(recording_run)
+
+        # La caché de hardware y el índice PnP evitarían consultas que hay que grabar
+        self._cache_enabled = hw_cache.cache.enabled
+        hw_cache.cache.enabled = False
+        device_inventory.inventory.invalidate()
+        return self
+
+    def stop(self):
+        if not self._active:
+            return
+        self._active = False
+        wmi_session.set_backend(None)
+        for name in ("psutil", "winreg", "subprocess"):
+            lazy_deps.lazy_module(name).override(None)
+        hw_cache.cache.enabled = self._cache_enabled
+        device_inventory.inventory.invalidate()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def save(self, path):
+        save_fixture(self.data, path)
+
+
+def save_fixture(data, path):
+    text = json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+    if path.endswith(".gz"):
+        with gzip.open(path, "wt", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+
+
+def load_fixture(path):
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        data = json.load(f)
+    if data.get("version") != FIXTURE_VERSION:
+        raise ValueError(f"Versión de grabación no soportada: {data.get('version')}")
+    return data
+
+
+# Reproducción
+
+class ReplayWMI(wmi_session.InMemoryWMI):
+    """
+    Conexión WMI que sirve una grabación. Las consultas grabadas tal cual se
+    devuelven literalmente; el resto se evalúa sobre las clases grabadas
+    completas (igual que InMemoryWMI).
+    """
+
+    def __init__(self, data, latency):
+        super().__init__(data.get("classes"))
+        self._calls = data.get("calls", {})
+        self._wql = data.get("wql", {})
+        self._latency = latency
+
+    def _serve(self, rows):
+        properties = sum(len(vars(row)) for row in rows)
+        _sleep(self._latency.wmi_query + self._latency.wmi_row * len(rows)
+               + self._latency.wmi_property * properties)
+        return rows
+
+    def query(self, text):
+        rows = self._wql.get(text)
+        if rows is not None:
+            return self._serve([wmi_session.WMIObject(**row) for row in rows])
+        return self._serve(super().query(text))
+
+    def instances(self, class_name, **filters):
+        if filters:
+            rows = self._calls.get(_call_key(class_name, (), filters))
+            if rows is not None:
+                return self._serve([wmi_session.WMIObject(**row) for row in rows])
+        return self._serve(super().instances(class_name, **filters))
+
+
+class _ReplayModule:
+    """Sirve las llamadas grabadas de un módulo; los valores repetidos se devuelven en ciclo"""
+
+    def __init__(self, name, store, latency, fallback=None):
+        self._name = name
+        self._store = store
+        self._latency = latency
+        self._fallback = fallback
+        self._positions = {}
+        self._lock = threading.Lock()
+
+    def __getattr__(self, attr):
+        if self._fallback is not None and not any(key.startswith(f'["{attr}",') for key in self._store):
+            return getattr(self._fallback, attr)
+
+        def call(*args, **kwargs):
+            key = _call_key(attr, args, kwargs)
+            values = self._store.get(key)
+            if not values:
+                raise ReplayMissError(f"La grabación no contiene {self._name}.{attr}{args or ''}")
+            with self._lock:
+                position = self._positions.get(key, 0)
+                self._positions[key] = position + 1
+            _sleep(self._latency)
+            entry = values[position % len(values)]
+            if _is_error(entry):
+                _raise_recorded(entry)
+            return self._result(entry)
+        return call
+
+    def _result(self, entry):
+        return _decode(entry)
+
+
+class _ReplaySubprocess(_ReplayModule):
+    def _result(self, entry):
+        return _subprocess.CompletedProcess(entry["args"], entry["returncode"], entry["stdout"], entry["stderr"])
+
+
+class _ReplayRegistry:
+    """winreg simulado a partir de los valores grabados; las escrituras quedan en memoria"""
+
+    HKEY_CLASSES_ROOT = 0x80000000
+    HKEY_CURRENT_USER = 0x80000001
+    HKEY_LOCAL_MACHINE = 0x80000002
+    HKEY_USERS = 0x80000003
+    HKEY_CURRENT_CONFIG = 0x80000005
+    KEY_READ = 0x20019
+    KEY_SET_VALUE = 0x0002
+    REG_SZ = 1
+    REG_DWORD = 4
+
+    def __init__(self, store, latency):
+        self._store = store
+        self._latency = latency
+        self._roots = {getattr(self, name): name for name in REGISTRY_ROOTS}
+
+    def OpenKey(self, key, sub_key, *args, **kwargs):
+        _sleep(self._latency)
+        root = self._roots.get(key, getattr(key, "path", str(key)))
+        path = f"{root}\\{sub_key}"
+        if path not in self._store:
+            raise FileNotFoundError(f"[WinError 2] El sistema no puede encontrar el archivo especificado: {path}")
+        return _RegistryKey(path)
+
+    def QueryValueEx(self, key, name):
+        _sleep(self._latency)
+        entry = self._store.get(key.path, {}).get(name)
+        if entry is None:
+            raise FileNotFoundError(f"[WinError 2] El sistema no puede encontrar el archivo especificado: {name}")
+        if _is_error(entry):
+            _raise_recorded(entry)
+        return _decode(entry[0]), entry[1]
+
+    def SetValueEx(self, key, name, reserved, value_type, value):
+        self._store.setdefault(key.path, {})[name] = [value, value_type]
+
+    def CloseKey(self, key):
+        key.Close()
+
+
+class Replayer:
+    """
+    Sirve una grabación a las sondas hasta que se llama a stop():
+
+        with Replayer(load_fixture("equipo.json.gz"), latency="laggy_wmi"):
+            system_info.collect()
+
+    `backend` elige el backend de sondas de system_info (por defecto el del
+    sistema grabado) y `use_cache` decide si la caché de hardware interviene.
+    """
+
+    def __init__(self, data, latency=None, backend=None, use_cache=False):
+        if isinstance(latency, str):
+            latency = LATENCY_PROFILES[latency]
+        self.data = data
+        self.latency = latency or SimulatedLatency()
+        self.backend = backend or ("linux" if data["meta"].get("system") == "Linux" else "windows")
+        self.use_cache = use_cache
+        self._platform = _ReplayPlatform(data["meta"], self.backend)
+        self._previous_backend = None
+        self._cache_enabled = None
+        self._active = False
+
+    def _connect(self):
+        _sleep(self.latency.wmi_connect)
+        return ReplayWMI(self.data["wmi"], self.latency)
+
+    def start(self):
+        import system_info
+
+        if self._active:
+            return self
+        self._active = True
+        wmi_session.set_backend(self._connect)
+        lazy_deps.psutil.override(_ReplayModule("psutil", self.data["psutil"], self.latency.psutil))
+        lazy_deps.winreg.override(_ReplayRegistry(self.data["winreg"], self.latency.winreg))
+        lazy_deps.subprocess.override(_ReplaySubprocess("subprocess", self.data["subprocess"],
+                                                        self.latency.subprocess, fallback=_subprocess))
+
+        self._platform.start()
+        self._previous_backend = system_info.backend
+        system_info.set_backend(self.backend)
+        self._cache_enabled = hw_cache.cache.enabled
+        hw_cache.cache.enabled = self.use_cache and self._cache_enabled
+        device_inventory.inventory.invalidate()
+        return self
+
+    def stop(self):
+        import system_info
+
+        if not self._active:
+            return
+        self._active = False
+        wmi_session.set_backend(None)
+        for name in ("psutil", "winreg", "subprocess"):
+            lazy_deps.lazy_module(name).override(None)
+        system_info.set_backend(self._previous_backend)
+        self._platform.stop()
+        hw_cache.cache.enabled = self._cache_enabled
+        device_inventory.inventory.invalidate()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def replay(path, latency=None, backend=None, use_cache=False):
+    """Atajo: carga una grabación y empieza a servirla"""
+    return Replayer(load_fixture(path), latency=latency, backend=backend, use_cache=use_cache).start()
+
+
+def synthetic_fixture(pnp_devices=120, disks=2, ram_modules=2, nics=2, cores=8):
+    """
+    Grabación sintética de un equipo Windows típico, para medir sin haber
+    grabado ningún equipo real (por ejemplo en CI). `pnp_devices` permite
+    simular equipos con muchos dispositivos.
+    """
+    svmem = collections.namedtuple("svmem", "total available percent used free")
+    scputimes = collections.namedtuple("scputimes", "user system idle")
+    snicaddr = collections.namedtuple("snicaddr", "family address netmask broadcast ptp")
+    snicstats = collections.namedtuple("snicstats", "isup duplex speed mtu flags")
+    snetio = collections.namedtuple("snetio", "bytes_sent bytes_recv packets_sent packets_recv "
+                                              "errin errout dropin dropout")
+
+    def call(name, *args, **kwargs):
+        return _call_key(name, args, kwargs)
+
+    pnp = []
+    for i in range(pnp_devices):
+        bus, pnp_class = [("USB", "USB"), ("HID", "HIDClass"), ("PCI", "System"),
+                          ("BTHENUM", "Bluetooth"), ("ACPI", "System")][i % 5]
+        device_id = f"{bus}\\VID_{i:04X}&PID_{i * 7 % 65536:04X}\\{i}"
+        pnp.append({"DeviceID": device_id,
+                    "Description": f"Dispositivo {pnp_class} {i}", "Name": f"Dispositivo {pnp_class} {i}",
+                    "Status": "OK", "PNPClass": pnp_class,
+                    # Resto de la instancia, que solo viaja con SELECT *
+                    "Availability": None, "Caption": f"Dispositivo {pnp_class} {i}",
+                    "ClassGuid": "{36fc9e60-c465-11cf-8056-444553540000}", "CompatibleID": [f"{bus}\\Class_00"],
+                    "ConfigManagerErrorCode": 0, "ConfigManagerUserConfig": False,
+                    "CreationClassName": "Win32_PnPEntity", "ErrorCleared": None, "ErrorDescription": None,
+                    "HardwareID": [device_id.rsplit("\\", 1)[0]], "InstallDate": None, "LastErrorCode": None,
+                    "Manufacturer": "(Estándar)", "PNPDeviceID": device_id, "PowerManagementCapabilities": None,
+                    "PowerManagementSupported": None, "Present": True, "Service": pnp_class.lower(),
+                    "StatusInfo": None, "SystemCreationClassName": "Win32_ComputerSystem",
+                    "SystemName": "SINTETICO"})
+
+    classes = {
+        "Win32_Processor": [{"Name": "Intel(R) Core(TM) i7-10700 CPU @ 2.90GHz", "Manufacturer": "GenuineIntel",
+                             "Architecture": 9, "NumberOfLogicalProcessors": cores,
+                             "NumberOfCores": max(1, cores // 2), "MaxClockSpeed": 2904, "L2CacheSize": 2048,
+                             "L3CacheSize": 16384, "SocketDesignation": "LGA1200",
+                             "ProcessorId": "BFEBFBFF000A0655"}],
+        "Win32_PhysicalMemory": [{"BankLabel": f"BANK {i}", "Manufacturer": "Kingston", "PartNumber": "KF432C16BB/8",
+                                  "Capacity": str(8 * 1024 ** 3), "Speed": 3200, "SMBIOSMemoryType": 26,
+                                  "SerialNumber": f"{0x1A2B3C00 + i:X}"} for i in range(ram_modules)],
+        "Win32_DiskDrive": [{"DeviceID": f"\\\\.\\PHYSICALDRIVE{i}", "Model": f"Samsung SSD 970 EVO {i}",
+                             "Manufacturer": "(Unidades de disco estándar)", "InterfaceType": "SCSI",
+                             "Size": str(500107862016), "SerialNumber": f"S4EVNX0N{i:06d}"} for i in range(disks)],
+        "Win32_VideoController": [{"Name": "NVIDIA GeForce RTX 3060", "AdapterCompatibility": "NVIDIA",
+                                   "VideoProcessor": "NVIDIA GeForce RTX 3060", "DriverVersion": "31.0.15.5222",
+                                   "AdapterRAM": 4293918720}],
+        "Win32_BaseBoard": [{"Manufacturer": "ASUSTeK COMPUTER INC.", "Product": "PRIME B460M-A",
+                             "Version": "Rev 1.xx", "SerialNumber": "200574589001234"}],
+        "Win32_NetworkAdapter": [{"Name": f"Intel(R) Ethernet Connection I219-V #{i}", "NetConnectionID": f"Ethernet {i}",
+                                  "Manufacturer": "Intel Corporation", "MACAddress": f"00:1B:21:3A:4F:{i:02X}",
+                                  "AdapterType": "Ethernet 802.3", "NetConnectionStatus": 2,
+                                  "Speed": "1000000000", "PhysicalAdapter": True} for i in range(nics)],
+        "Win32_NetworkAdapterConfiguration": [
+            {"Index": i, "Description": f"Intel(R) Ethernet Connection I219-V #{i}",
+             "MACAddress": f"00:1B:21:3A:4F:{i:02X}", "IPEnabled": True, "DHCPEnabled": True,
+             "DHCPServer": "192.168.1.1", "IPAddress": [f"192.168.{i + 1}.20", f"fe80::21b:21ff:fe3a:4f{i:02x}"],
+             "IPSubnet": ["255.255.255.0", "64"], "DefaultIPGateway": [f"192.168.{i + 1}.1"],
+             "DNSServerSearchOrder": ["192.168.1.1", "8.8.8.8"], "DNSDomain": "oficina.local"}
+            for i in range(nics)],
+        "Win32_SoundDevice": [{"Name": "Realtek High Definition Audio", "Manufacturer": "Realtek", "Status": "OK"}],
+        "Win32_PnPEntity": pnp,
+        "Win32_OperatingSystem": [{"Caption": "Microsoft Windows 10 Pro", "Version": "10.0.19045",
+                                   "SerialNumber": "00330-80000-00000-AA000", "OSArchitecture": "64 bits",
+                                   "CodeSet": "1252", "OSLanguage": 3082, "CountryCode": "34", "Locale": "0c0a",
+                                   "Organization": "", "RegisteredUser": "usuario",
+                                   "InstallDate": "20230115093000.000000+060"}],
+        "Win32_ComputerSystem": [{"Domain": "WORKGROUP", "Workgroup": "WORKGROUP", "PartOfDomain": False}],
+    }
+
+    return {
+        "version": FIXTURE_VERSION,
+        "meta": {"recorded_at": time.strftime("%Y-%m-%d %H:%M:%S"), "node": "SINTETICO",
+                 "system": "Windows", "release": "10", "version": "10.0.19045", "machine": "AMD64",
+                 "processor": "Intel64 Family 6 Model 158 Stepping 10, GenuineIntel",
+                 "platform": "Windows-10-10.0.19045-SP0", "win32_edition": "Professional"},
+        "wmi": {"classes": classes, "calls": {}, "wql": {}},
+        "psutil": {
+            call("virtual_memory"): [_encode(svmem(16 * 1024 ** 3, 9 * 1024 ** 3, 43.7, 7 * 1024 ** 3, 9 * 1024 ** 3))],
+            call("cpu_times"): [_encode(scputimes(5230.5, 1810.2, 90211.7))],
+            call("cpu_percent", interval=None): [_encode(value) for value in (12.5, 8.0, 15.3)],
+            call("cpu_percent", interval=None, percpu=True): [_encode([10.0 + i for i in range(cores)])],
+            call("cpu_freq"): [_encode(collections.namedtuple("scpufreq", "current min max")(2904.0, 0.0, 2904.0))],
+            # Familias de Windows: AF_LINK = -1, AF_INET = 2, AF_INET6 = 23
+            call("net_if_addrs"): [_encode({
+                f"Ethernet {i}": [snicaddr(-1, f"00-1B-21-3A-4F-{i:02X}", None, None, None),
+                                  snicaddr(2, f"192.168.{i + 1}.20", "255.255.255.0", None, None),
+                                  snicaddr(23, f"fe80::21b:21ff:fe3a:4f{i:02x}", None, None, None)]
+                for i in range(nics)})],
+            call("net_if_stats"): [_encode({f"Ethernet {i}": snicstats(True, 2, 1000, 1500, "")
+                                            for i in range(nics)})],
+            call("net_io_counters", pernic=True): [_encode({
+                f"Ethernet {i}": snetio(812_345_678, 4_512_345_678, 2_345_678, 4_123_456, 0, 0, 12, 0)
+                for i in range(nics)})],
+        },
+        "subprocess": {
+            call("run", ["ipconfig", "/all"], capture_output=True, text=True, encoding="cp850"): [
+                {"args": ["ipconfig", "/all"], "returncode": 0, "stderr": "",
+                 "stdout": "\nConfiguración IP de Windows\n\n   Nombre de host. . . . . . . . . : SINTETICO\n"}],
+        },
+        "winreg": {
+            "HKEY_CURRENT_USER\\Control Panel\\International": {
+                "sDecimal": [",", 1], "sThousand": [".", 1], "sMonDecimalSep": [",", 1],
+                "sMonThousandSep": [".", 1], "sShortDate": ["dd/MM/yyyy", 1], "sTimeFormat": ["H:mm:ss", 1],
+                "sCurrency": ["€", 1],
+            },
+            "HKEY_LOCAL_MACHINE\\SYSTEM\\CurrentControlSet\\Control\\Terminal Server": {
+                "fDenyTSConnections": [1, 4],
+            },
+        },
+    }
+
+
+def describe(data):
+    """Resumen legible del contenido de una grabación"""
+    meta = data["meta"]
+    wmi = data["wmi"]
+    lines = [f"Equipo: {meta.get('node')} ({meta.get('system')} {meta.get('release')}), "
+             f"grabado el {meta.get('recorded_at')}"]
+    for class_name, rows in sorted(wmi["classes"].items()):
+        lines.append(f"  WMI {class_name}: {len(rows)} instancias")
+    for key, rows in sorted(wmi["calls"].items()):
+        lines.append(f"  WMI {key}: {len(rows)} instancias")
+    for text, rows in sorted(wmi["wql"].items()):
+        lines.append(f"  WQL {text}: {len(rows)} filas")
+    lines.append(f"  psutil: {len(data['psutil'])} llamadas distintas")
+    lines.append(f"  Registro: {sum(len(v) for v in data['winreg'].values())} valores")
+    lines.append(f"  Procesos externos: {len(data['subprocess'])}")
+    return "\n".join(lines)
+
+
+# Línea de órdenes
+
+def _run_probes(probes):
+    import system_info
+
+    timings = {}
+    for name in probes or system_info.default_probes():
+        start = time.perf_counter()
+        record = system_info.PROBES[name]()
+        timings[name] = (time.perf_counter() - start, getattr(record, "error", None))
+    return timings
+
+
+def _print_timings(timings):
+    for name, (seconds, error) in timings.items():
+        print(f"{name:<15} {seconds:7.3f} s  {'ERROR: ' + error if error else 'OK'}")
+    print(f"{'Total':<15} {sum(s for s, _ in timings.values()):7.3f} s")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Grabación y reproducción de sondas de ARKToolsPC")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    record_cmd = commands.add_parser("record", help="Ejecuta las sondas en este equipo y graba sus datos")
+    record_cmd.add_argument("fixture")
+    record_cmd.add_argument("probes", nargs="*")
+
+    replay_cmd = commands.add_parser("replay", help="Ejecuta las sondas contra una grabación")
+    replay_cmd.add_argument("fixture")
+    replay_cmd.add_argument("probes", nargs="*")
+    replay_cmd.add_argument("--latency", default="none", choices=sorted(LATENCY_PROFILES))
+    replay_cmd.add_argument("--cache", action="store_true", help="Deja intervenir la caché de hardware")
+
+    info_cmd = commands.add_parser("info", help="Muestra el contenido de una grabación")
+    info_cmd.add_argument("fixture")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "record":
+        with Recorder() as recorder:
+            timings = _run_probes(args.probes)
+        recorder.save(args.fixture)
+        _print_timings(timings)
+        print(f"\nGrabación guardada en {args.fixture}")
+    elif args.command == "replay":
+        with Replayer(load_fixture(args.fixture), latency=args.latency, use_cache=args.cache) as replayer:
+            print(f"Latencia simulada: {args.latency} {asdict(replayer.latency)}\n")
+            _print_timings(_run_probes(args.probes))
+    else:
+        print(describe(load_fixture(args.fixture)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,138 @@
+# qt_device_table.py
+#
+# Tabla de dispositivos de arktoolspcq.py sobre device_table.py. El modelo solo
+# responde por las celdas que la vista pide (las visibles), con filas de altura
+# fija para que QTableView no tenga que medir cada fila; ordenar y filtrar
+# reordenan índices en memoria, así que con decenas de miles de filas no hay
+# que volver a consultar ni a crear widgets por celda.
+
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex, QTimer
+from PyQt6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QLineEdit, QLabel, QTableView, QHeaderView,
+    QAbstractItemView
+)
+
+FILTER_DELAY_MS = 150           # Espera tras la última tecla antes de filtrar
+SIZE_SAMPLE_ROWS = 200          # Filas que se miden para ajustar el ancho de las columnas
+
+_RIGHT = Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter
+
+
+class DeviceTableModel(QAbstractTableModel):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.table = None
+
+    def set_table(self, table):
+        self.beginResetModel()
+        self.table = table
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() or self.table is None else len(self.table)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() or self.table is None else len(self.table.columns)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole or role == Qt.ItemDataRole.ToolTipRole:
+            return self.table.cell(index.row(), index.column())
+        if role == Qt.ItemDataRole.TextAlignmentRole and self.table.columns[index.column()].numeric:
+            return _RIGHT
+        return None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole or self.table is None:
+            return None
+        if orientation == Qt.Orientation.Horizontal:
+            return self.table.columns[section].title
+        return str(section + 1)
+
+    def sort(self, column, order=Qt.SortOrder.AscendingOrder):
+        if self.table is None or column < 0:
+            return
+        self.layoutAboutToBeChanged.emit()
+        self.table.sort(column, descending=order == Qt.SortOrder.DescendingOrder)
+        self.layoutChanged.emit()
+
+    def set_filter(self, text):
+        if self.table is None:
+            return
+        # Cambia el número de filas: reinicio del modelo (más barato que
+        # notificar miles de filas quitadas una a una)
+        self.beginResetModel()
+        self.table.set_filter(text)
+        self.endResetModel()
+
+
+class DeviceTableView(QWidget):
+    """Filtro, resumen y QTableView de una DeviceTable"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        top = QHBoxLayout()
+        self.filter_edit = QLineEdit()
+        self.filter_edit.setPlaceholderText("Filtrar (todas las palabras, en cualquier columna)")
+        self.filter_edit.setClearButtonEnabled(True)
+        self.filter_edit.textChanged.connect(self._schedule_filter)
+        top.addWidget(self.filter_edit, 1)
+        self.summary_label = QLabel()
+        top.addWidget(self.summary_label)
+        layout.addLayout(top)
+
+        self.model = DeviceTableModel(self)
+        self.view = QTableView()
+        self.view.setModel(self.model)
+        self.view.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.view.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.view.setAlternatingRowColors(True)
+        self.view.setWordWrap(False)
+        self.view.setSortingEnabled(True)
+        self.view.horizontalHeader().setSortIndicator(-1, Qt.SortOrder.AscendingOrder)
+
+        # Altura fija por fila: la vista calcula la posición de cualquier fila sin medirla
+        rows = self.view.verticalHeader()
+        rows.setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        rows.setDefaultSectionSize(self.view.fontMetrics().height() + 6)
+        rows.setVisible(False)
+
+        header = self.view.horizontalHeader()
+        header.setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
+        header.setResizeContentsPrecision(SIZE_SAMPLE_ROWS)
+        header.setStretchLastSection(True)
+        layout.addWidget(self.view)
+
+        self._filter_timer = QTimer(self)
+        self._filter_timer.setSingleShot(True)
+        self._filter_timer.setInterval(FILTER_DELAY_MS)
+        self._filter_timer.timeout.connect(self.apply_filter)
+
+    def set_table(self, table):
+        self._filter_timer.stop()
+        self.filter_edit.blockSignals(True)
+        self.filter_edit.clear()
+        self.filter_edit.blockSignals(False)
+        self.model.set_table(table)
+        self.view.horizontalHeader().setSortIndicator(-1, Qt.SortOrder.AscendingOrder)
+        # Ancho según las primeras SIZE_SAMPLE_ROWS filas, no según todas
+        self.view.resizeColumnsToContents()
+        self.view.scrollToTop()
+        self._update_summary()
+
+    def clear(self):
+        self.set_table(None)
+
+    def _schedule_filter(self, _text):
+        self._filter_timer.start()
+
+    def apply_filter(self):
+        self._filter_timer.stop()
+        self.model.set_filter(self.filter_edit.text())
+        self._update_summary()
+
+    def _update_summary(self):
+        table = self.model.table
+        self.summary_label.setText(table.summary() if table is not None else "")
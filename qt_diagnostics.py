@@ -0,0 +1,169 @@
+# qt_diagnostics.py
+#
+# Panel de diagnóstico de arktoolspcq.py: muestra las trazas de diagnostics.py
+# (tiempo por fase de cada sonda, consultas WMI, procesos externos y tiempo de
+# renderizado) y permite activar la instrumentación, limpiarla y exportarla.
+
+import time
+
+from PyQt6.QtCore import Qt, QTimer
+from PyQt6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QCheckBox, QPushButton, QTableWidget,
+    QTableWidgetItem, QLabel, QTabWidget, QFileDialog, QMessageBox, QHeaderView
+)
+
+import diagnostics
+import wmi_session
+
+
+PROBE_COLUMNS = ["Sonda", "Llamadas", "Media ms", "Máx ms", "Conexión WMI ms", "Consultas WMI ms",
+                 "Procesos ms", "Muestra CPU ms", "Procesado ms", "Consultas", "Filas", "Propiedades",
+                 "Errores"]
+TRACE_COLUMNS = ["Hora", "Sonda", "Hilo", "Total ms", "Conexión WMI ms", "Consultas WMI ms",
+                 "Procesos ms", "Muestra CPU ms", "Procesado ms", "Consultas", "Filas",
+                 "Propiedades", "Procesos externos / error"]
+RENDER_COLUMNS = ["Hora", "Contenido", "Formato", "ms", "Caracteres / filas"]
+
+
+def _ms(seconds):
+    return f"{seconds * 1000:.1f}"
+
+
+def _clock(timestamp):
+    return time.strftime("%H:%M:%S", time.localtime(timestamp))
+
+
+def _item(value, numeric=False):
+    item = QTableWidgetItem(str(value))
+    if numeric:
+        item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+    return item
+
+
+def _fill(table, rows, numeric_from=1):
+    table.setRowCount(len(rows))
+    for r, row in enumerate(rows):
+        for c, value in enumerate(row):
+            table.setItem(r, c, _item(value, numeric=c >= numeric_from))
+
+
+def _table(columns):
+    table = QTableWidget(0, len(columns))
+    table.setHorizontalHeaderLabels(columns)
+    table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+    table.setAlternatingRowColors(True)
+    table.verticalHeader().setVisible(False)
+    table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+    table.horizontalHeader().setStretchLastSection(True)
+    return table
+
+
+class DiagnosticsDialog(QDialog):
+    """Ventana no modal con el resumen por sonda, las trazas individuales y los renderizados"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Diagnóstico de rendimiento")
+        self.resize(980, 520)
+
+        layout = QVBoxLayout(self)
+
+        top = QHBoxLayout()
+        self.enabled_check = QCheckBox("Activar instrumentación")
+        self.enabled_check.setChecked(diagnostics.enabled)
+        self.enabled_check.toggled.connect(self.set_enabled)
+        top.addWidget(self.enabled_check)
+        top.addStretch()
+        self.wmi_label = QLabel()
+        top.addWidget(self.wmi_label)
+        layout.addLayout(top)
+
+        self.tabs = QTabWidget()
+        self.summary_table = _table(PROBE_COLUMNS)
+        self.traces_table = _table(TRACE_COLUMNS)
+        self.renders_table = _table(RENDER_COLUMNS)
+        self.tabs.addTab(self.summary_table, "Resumen por sonda")
+        self.tabs.addTab(self.traces_table, "Llamadas")
+        self.tabs.addTab(self.renders_table, "Renderizado")
+        layout.addWidget(self.tabs)
+
+        buttons = QHBoxLayout()
+        for text, slot in (("Actualizar", self.refresh), ("Limpiar", self.clear),
+                           ("Exportar JSON...", self.export_json)):
+            button = QPushButton(text)
+            button.clicked.connect(slot)
+            buttons.addWidget(button)
+        buttons.addStretch()
+        close_button = QPushButton("Cerrar")
+        close_button.clicked.connect(self.close)
+        buttons.addWidget(close_button)
+        layout.addLayout(buttons)
+
+        # Refresco periódico mientras la ventana está abierta
+        self.timer = QTimer(self)
+        self.timer.setInterval(1000)
+        self.timer.timeout.connect(self.refresh)
+
+        self.refresh()
+
+    def showEvent(self, event):
+        self.timer.start()
+        super().showEvent(event)
+
+    def hideEvent(self, event):
+        self.timer.stop()
+        super().hideEvent(event)
+
+    def set_enabled(self, checked):
+        if checked:
+            diagnostics.enable()
+        else:
+            diagnostics.disable()
+
+    def refresh(self):
+        summary = diagnostics.summary()
+        _fill(self.summary_table, [
+            [probe, s["calls"], _ms(s["mean"]), _ms(s["max"]),
+             _ms(s["phases"]["wmi_connect"]), _ms(s["phases"]["wmi_query"]),
+             _ms(s["phases"]["subprocess"]), _ms(s["phases"]["cpu_sampler"]), _ms(s["phases"]["python"]),
+             f"{s['wmi_queries']:.1f}", f"{s['wmi_rows']:.0f}", f"{s['wmi_properties']:.0f}", s["errors"]]
+            for probe, s in sorted(summary.items(), key=lambda item: item[1]["mean"], reverse=True)
+        ])
+
+        rows = []
+        for trace in reversed(diagnostics.traces()):
+            detail = "; ".join(f"{c.command} ({_ms(c.seconds)} ms)" for c in trace.commands)
+            if trace.error:
+                detail = f"{detail}; ERROR: {trace.error}" if detail else f"ERROR: {trace.error}"
+            rows.append([
+                _clock(trace.started_at), trace.probe, trace.thread, _ms(trace.total),
+                _ms(trace.phases.get("wmi_connect", 0.0)), _ms(trace.phases.get("wmi_query", 0.0)),
+                _ms(trace.phases.get("subprocess", 0.0)), _ms(trace.phases.get("cpu_sampler", 0.0)),
+                _ms(trace.python_seconds),
+                trace.wmi_queries, trace.wmi_rows, trace.wmi_properties, detail,
+            ])
+        _fill(self.traces_table, rows, numeric_from=3)
+        for r in range(len(rows)):
+            self.traces_table.item(r, len(TRACE_COLUMNS) - 1).setTextAlignment(Qt.AlignmentFlag.AlignLeft)
+
+        _fill(self.renders_table, [
+            [_clock(r.started_at), r.target, r.format, _ms(r.seconds), r.chars]
+            for r in reversed(diagnostics.renders())
+        ], numeric_from=3)
+
+        self.wmi_label.setText(wmi_session.session.format_stats())
+
+    def clear(self):
+        diagnostics.clear()
+        wmi_session.session.reset_stats()
+        self.refresh()
+
+    def export_json(self):
+        path, _ = QFileDialog.getSaveFileName(self, "Exportar diagnóstico", "arktoolspc_diagnostico.json",
+                                              "JSON (*.json)")
+        if not path:
+            return
+        try:
+            diagnostics.export_json(path)
+        except OSError as e:
+            QMessageBox.critical(self, "Error", f"No se pudo guardar el archivo: {e}")
@@ -0,0 +1,364 @@
+# qt_monitor.py
+#
+# Ventana de monitor en vivo de arktoolspcq.py sobre live_monitor.py.
+#
+# En cada tic solo se piden las muestras nuevas (LiveMonitor.since) y solo se
+# toca lo que cambió: las etiquetas y barras se actualizan si su valor varía y
+# las gráficas (Sparkline) desplazan su imagen y dibujan únicamente el tramo
+# nuevo; la gráfica completa solo se redibuja al cambiar de escala o de tamaño.
+
+import math
+import time
+from collections import deque
+
+from PyQt6.QtCore import Qt, QTimer, QPointF
+from PyQt6.QtGui import QPainter, QPixmap, QColor, QPen
+from PyQt6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QGridLayout, QGroupBox, QLabel, QProgressBar,
+    QDoubleSpinBox, QPushButton, QScrollArea, QWidget, QSizePolicy
+)
+
+import live_monitor
+from live_monitor import format_rate
+
+
+STEP_PX = 3                     # Píxeles por muestra
+PLOT_HEIGHT = 48
+BACKGROUND = QColor(0, 0, 0)
+GRID = QColor(40, 40, 40)
+COLORS = (QColor(80, 200, 120), QColor(230, 150, 60))
+
+
+def _gib(value):
+    return f"{value / 1024 ** 3:.1f} GB"
+
+
+def _nice_ceiling(value):
+    """Escala redondeada (1, 2, 5 x 10^n) que contiene a value"""
+    if value <= 0:
+        return 1.0
+    exponent = math.floor(math.log10(value))
+    for factor in (1, 2, 5, 10):
+        if value <= factor * 10 ** exponent:
+            return float(factor * 10 ** exponent)
+    return float(10 ** (exponent + 1))
+
+
+class Sparkline(QWidget):
+    """
+    Gráfica de una o varias series con desplazamiento incremental. Con `scale`
+    fija (por ejemplo 100 para porcentajes) nunca cambia de escala; sin ella se
+    ajusta al máximo visible.
+    """
+
+    def __init__(self, series=1, scale=None, parent=None):
+        super().__init__(parent)
+        self.fixed_scale = scale
+        self.scale = scale or 1.0
+        self.setMinimumHeight(PLOT_HEIGHT)
+        self.setMaximumHeight(PLOT_HEIGHT)
+        self.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Fixed)
+        self.setAttribute(Qt.WidgetAttribute.WA_OpaquePaintEvent)
+        self._columns = [deque(maxlen=self._visible()) for _ in range(series)]
+        self._pixmap = None
+        self._scrolled = 0
+        self.full_redraws = 0
+
+    def _visible(self):
+        return max(2, self.width() // STEP_PX + 2)
+
+    def _y(self, value):
+        if value != value:      # NaN: sin dato
+            value = 0.0
+        height = self.height() - 1
+        return height - min(value / self.scale, 1.0) * (height - 1)
+
+    def _pen(self, n):
+        pen = QPen(COLORS[n % len(COLORS)])
+        pen.setWidth(1)
+        return pen
+
+    def add(self, *columns):
+        """Añade muestras nuevas: una lista de valores por serie"""
+        count = len(columns[0]) if columns else 0
+        if not count:
+            return
+        for buffer, values in zip(self._columns, columns):
+            buffer.extend(values)
+
+        rescale = False
+        if self.fixed_scale is None:
+            peak = max((v for values in columns for v in values if v == v), default=0.0)
+            if peak > self.scale:
+                rescale = True
+            self._scrolled += count
+            # Reducir la escala como mucho una vez por ancho de gráfica recorrido
+            if self._scrolled >= self._columns[0].maxlen:
+                self._scrolled = 0
+                rescale = True
+
+        rescaled = rescale and self._rescale()
+        if self._pixmap is None or rescaled:
+            self._redraw()
+        else:
+            self._draw_tail(count)
+        self.update()
+
+    def _rescale(self):
+        visible = [v for buffer in self._columns for v in buffer if v == v]
+        scale = _nice_ceiling(max(visible) if visible else 0.0)
+        if scale == self.scale:
+            return False
+        self.scale = scale
+        return True
+
+    def _redraw(self):
+        """Dibuja toda la gráfica (al cambiar de escala o de tamaño)"""
+        self.full_redraws += 1
+        self._pixmap = QPixmap(self.size())
+        self._pixmap.fill(BACKGROUND)
+        painter = QPainter(self._pixmap)
+        painter.setPen(GRID)
+        painter.drawLine(0, self.height() // 2, self.width(), self.height() // 2)
+        for n, buffer in enumerate(self._columns):
+            values = list(buffer)
+            x0 = self.width() - (len(values) - 1) * STEP_PX - 1
+            painter.setPen(self._pen(n))
+            for i in range(1, len(values)):
+                painter.drawLine(QPointF(x0 + (i - 1) * STEP_PX, self._y(values[i - 1])),
+                                 QPointF(x0 + i * STEP_PX, self._y(values[i])))
+        painter.end()
+
+    def _draw_tail(self, count):
+        """Desplaza la imagen y dibuja solo los `count` tramos nuevos"""
+        dx = count * STEP_PX
+        width = self.width()
+        self._pixmap.scroll(-dx, 0, self._pixmap.rect())
+        painter = QPainter(self._pixmap)
+        painter.fillRect(width - dx - 1, 0, dx + 1, self.height(), BACKGROUND)
+        painter.setPen(GRID)
+        painter.drawLine(width - dx - 1, self.height() // 2, width, self.height() // 2)
+        for n, buffer in enumerate(self._columns):
+            if len(buffer) < 2:
+                continue
+            tail = list(buffer)[-(count + 1):]
+            x0 = width - (len(tail) - 1) * STEP_PX - 1
+            painter.setPen(self._pen(n))
+            for i in range(1, len(tail)):
+                painter.drawLine(QPointF(x0 + (i - 1) * STEP_PX, self._y(tail[i - 1])),
+                                 QPointF(x0 + i * STEP_PX, self._y(tail[i])))
+        painter.end()
+
+    def resizeEvent(self, event):
+        visible = self._visible()
+        if visible != self._columns[0].maxlen:
+            self._columns = [deque(buffer, maxlen=visible) for buffer in self._columns]
+        if self._pixmap is not None:
+            self._redraw()
+        super().resizeEvent(event)
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        if self._pixmap is None:
+            painter.fillRect(self.rect(), BACKGROUND)
+        else:
+            painter.drawPixmap(event.rect(), self._pixmap, event.rect())
+        painter.end()
+
+
+class _Texts:
+    """Etiquetas que solo se reescriben cuando cambia su texto"""
+
+    def __init__(self):
+        self._last = {}
+
+    def set(self, label, text):
+        if self._last.get(id(label)) != text:
+            self._last[id(label)] = text
+            label.setText(text)
+
+
+class MonitorDialog(QDialog):
+    """Ventana no modal del monitor en vivo; el muestreo solo corre mientras está visible"""
+
+    def __init__(self, monitor=None, parent=None):
+        super().__init__(parent)
+        self.monitor = monitor or live_monitor.monitor
+        self.setWindowTitle("Monitor en vivo")
+        self.resize(720, 620)
+
+        self.seen = self.monitor.count
+        self.texts = _Texts()
+        self.render_seconds = 0.0
+        self.render_started = time.perf_counter()
+        self.core_bars = []
+        self.device_rows = {"disk": {}, "net": {}}
+
+        layout = QVBoxLayout(self)
+
+        top = QHBoxLayout()
+        top.addWidget(QLabel("Frecuencia (Hz):"))
+        self.rate_spin = QDoubleSpinBox()
+        self.rate_spin.setRange(live_monitor.MIN_RATE_HZ, live_monitor.MAX_RATE_HZ)
+        self.rate_spin.setSingleStep(0.5)
+        self.rate_spin.setValue(self.monitor.rate)
+        self.rate_spin.valueChanged.connect(self.set_rate)
+        top.addWidget(self.rate_spin)
+        self.pause_button = QPushButton("Pausar")
+        self.pause_button.setCheckable(True)
+        self.pause_button.toggled.connect(self.set_paused)
+        top.addWidget(self.pause_button)
+        top.addStretch()
+        self.cost_label = QLabel()
+        top.addWidget(self.cost_label)
+        layout.addLayout(top)
+
+        content = QWidget()
+        self.content_layout = QVBoxLayout(content)
+
+        cpu_box = QGroupBox("CPU")
+        cpu_layout = QVBoxLayout(cpu_box)
+        self.cpu_label = QLabel("Uso total: -")
+        cpu_layout.addWidget(self.cpu_label)
+        self.cpu_plot = Sparkline(scale=100.0)
+        cpu_layout.addWidget(self.cpu_plot)
+        self.cores_layout = QGridLayout()
+        cpu_layout.addLayout(self.cores_layout)
+        self.content_layout.addWidget(cpu_box)
+
+        mem_box = QGroupBox("Memoria")
+        mem_layout = QVBoxLayout(mem_box)
+        self.mem_label = QLabel("En uso: -")
+        mem_layout.addWidget(self.mem_label)
+        self.mem_plot = Sparkline(scale=100.0)
+        mem_layout.addWidget(self.mem_plot)
+        self.content_layout.addWidget(mem_box)
+
+        self.device_boxes = {}
+        for kind, title in (("disk", "Discos (lectura / escritura)"), ("net", "Red (recibido / enviado)")):
+            box = QGroupBox(title)
+            QVBoxLayout(box)
+            self.device_boxes[kind] = box
+            self.content_layout.addWidget(box)
+        self.content_layout.addStretch()
+
+        scroll = QScrollArea()
+        scroll.setWidgetResizable(True)
+        scroll.setWidget(content)
+        layout.addWidget(scroll)
+
+        buttons = QHBoxLayout()
+        buttons.addStretch()
+        close_button = QPushButton("Cerrar")
+        close_button.clicked.connect(self.close)
+        buttons.addWidget(close_button)
+        layout.addLayout(buttons)
+
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.tick)
+
+    # Control
+
+    def showEvent(self, event):
+        if not self.pause_button.isChecked():
+            self._start()
+        super().showEvent(event)
+
+    def hideEvent(self, event):
+        self._stop()
+        super().hideEvent(event)
+
+    def _start(self):
+        self.render_seconds = 0.0
+        self.render_started = time.perf_counter()
+        self.monitor.start()
+        self.timer.start(int(1000 / self.monitor.rate))
+
+    def _stop(self):
+        self.timer.stop()
+        self.monitor.stop()
+
+    def set_rate(self, rate):
+        rate = self.monitor.set_rate(rate)
+        if self.timer.isActive():
+            self.timer.start(int(1000 / rate))
+
+    def set_paused(self, paused):
+        self.pause_button.setText("Continuar" if paused else "Pausar")
+        if paused:
+            self._stop()
+        else:
+            self._start()
+
+    # Actualización incremental
+
+    def _add_core_bars(self, cores):
+        columns = 2 if len(cores) > 8 else 1
+        for n in cores[len(self.core_bars):]:
+            bar = QProgressBar()
+            bar.setRange(0, 100)
+            bar.setFormat(f"Núcleo {n}: %p %")
+            bar.setFixedHeight(16)
+            self.cores_layout.addWidget(bar, n // columns, n % columns)
+            self.core_bars.append(bar)
+
+    def _add_device_row(self, kind, device):
+        box = self.device_boxes[kind]
+        label = QLabel(device)
+        plot = Sparkline(series=2)
+        box.layout().addWidget(label)
+        box.layout().addWidget(plot)
+        self.device_rows[kind][device] = (label, plot)
+
+    def tick(self):
+        update = self.monitor.since(self.seen)
+        if update.empty:
+            return
+        start = time.perf_counter()
+        self.seen = update.count
+        series = update.series
+
+        if "cpu.total" in series:
+            cores = self.monitor.cores()
+            if len(cores) > len(self.core_bars):
+                self._add_core_bars(cores)
+            total = series["cpu.total"]
+            self.cpu_plot.add(total)
+            self.texts.set(self.cpu_label, f"Uso total: {total[-1]:.0f} %")
+            for n, bar in enumerate(self.core_bars):
+                value = series.get(f"cpu.{n}", [0.0])[-1]
+                if value == value and bar.value() != round(value):
+                    bar.setValue(round(value))
+
+        if "mem.percent" in series:
+            percent = series["mem.percent"]
+            self.mem_plot.add(percent)
+            self.texts.set(self.mem_label, f"En uso: {_gib(series['mem.used'][-1])} ({percent[-1]:.0f} %)")
+
+        for kind, first, second, names in (("disk", "read", "write", ("L", "E")),
+                                           ("net", "recv", "sent", ("↓", "↑"))):
+            for device in self.monitor.devices(kind):
+                a = series.get(f"{kind}.{device}.{first}")
+                b = series.get(f"{kind}.{device}.{second}")
+                if a is None or b is None:
+                    continue
+                if device not in self.device_rows[kind]:
+                    self._add_device_row(kind, device)
+                label, plot = self.device_rows[kind][device]
+                plot.add(a, b)
+                self.texts.set(label, f"{device}   {names[0]} {format_rate(a[-1] if a[-1] == a[-1] else 0)}"
+                                      f"   {names[1]} {format_rate(b[-1] if b[-1] == b[-1] else 0)}")
+
+        self.render_seconds += time.perf_counter() - start
+        self._update_cost()
+
+    def _update_cost(self):
+        stats = self.monitor.stats()
+        wall = time.perf_counter() - self.render_started
+        render = 100.0 * self.render_seconds / wall / (live_monitor.psutil.cpu_count() or 1) if wall else 0.0
+        self.texts.set(self.cost_label, f"Coste: muestreo {self.monitor.overhead_percent():.2f} %, "
+                                        f"dibujo {render:.2f} % de la CPU ({stats.samples} muestras)")
+
+    def closeEvent(self, event):
+        self._stop()
+        super().closeEvent(event)
@@ -0,0 +1,89 @@
+# qt_search.py
+#
+# Búsqueda en el inventario de arktoolspcq.py sobre inventory_search.py. El
+# índice lo mantiene la ventana principal con lo recolectado en la sesión; esta
+# ventana solo lo consulta (sin ejecutar sondas) y vuelve a buscar cuando una
+# sección se refresca. Los resultados se muestran con el modelo de
+# qt_device_table.py, en el orden de relevancia del índice.
+
+from PyQt6.QtCore import Qt, QTimer
+from PyQt6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QLineEdit, QLabel, QPushButton, QTableView,
+    QHeaderView, QAbstractItemView
+)
+
+from device_table import Column, DeviceTable
+from qt_device_table import DeviceTableModel
+
+SEARCH_DELAY_MS = 60
+
+
+class SearchDialog(QDialog):
+    """Ventana no modal: caja de búsqueda y tabla de coincidencias"""
+
+    def __init__(self, index, labels=None, parent=None):
+        super().__init__(parent)
+        self.index = index
+        self.labels = labels or {}
+        self.setWindowTitle("Buscar en el inventario")
+        self.resize(900, 480)
+
+        layout = QVBoxLayout(self)
+        self.query_edit = QLineEdit()
+        self.query_edit.setPlaceholderText("Número de serie, VID/PID, dirección MAC, versión de driver...")
+        self.query_edit.setClearButtonEnabled(True)
+        self.query_edit.textChanged.connect(lambda _: self._timer.start())
+        layout.addWidget(self.query_edit)
+
+        self.model = DeviceTableModel(self)
+        self.view = QTableView()
+        self.view.setModel(self.model)
+        self.view.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.view.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.view.setAlternatingRowColors(True)
+        self.view.setWordWrap(False)
+        self.view.setSortingEnabled(True)
+        self.view.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        self.view.verticalHeader().setVisible(False)
+        self.view.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
+        self.view.horizontalHeader().setStretchLastSection(True)
+        layout.addWidget(self.view)
+
+        bottom = QHBoxLayout()
+        self.status_label = QLabel()
+        bottom.addWidget(self.status_label)
+        bottom.addStretch()
+        close_button = QPushButton("Cerrar")
+        close_button.clicked.connect(self.close)
+        bottom.addWidget(close_button)
+        layout.addLayout(bottom)
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(SEARCH_DELAY_MS)
+        self._timer.timeout.connect(self.refresh)
+        self.columns = (
+            Column("Sección", lambda hit: self.labels.get(hit.probe, hit.probe)),
+            Column("Elemento", lambda hit: hit.item or None),
+            Column("Campo", lambda hit: hit.field),
+            Column("Valor", lambda hit: hit.value),
+            Column("Coincidencia", lambda hit: hit.match),
+        )
+        self.refresh()
+
+    def refresh(self):
+        """Repite la búsqueda actual (al escribir o cuando el índice cambia)"""
+        self._timer.stop()
+        query = self.query_edit.text()
+        if not query.strip():
+            self.model.set_table(None)
+            self.status_label.setText(f"{len(self.index)} campos indexados de {len(self.index.probes)} secciones")
+            return
+
+        hits = self.index.search(query)
+        self.model.set_table(DeviceTable("Resultados", self.columns, hits))
+        self.view.horizontalHeader().setSortIndicator(-1, Qt.SortOrder.AscendingOrder)
+        self.view.resizeColumnsToContents()
+        self.status_label.setText(
+            f"{len(hits)} resultados en {self.index.last_query_seconds * 1000:.1f} ms "
+            f"({len(self.index)} campos indexados)")
@@ -0,0 +1,169 @@
+# qt_workers.py
+#
+# Ejecución de sondas fuera del hilo de la GUI PyQt6. Cada petición se envía a
+# un QThreadPool; mientras está en curso se muestra un indicador en la barra de
+# estado con un botón para cancelarla. Las peticiones repetidas con la misma
+# clave se unen a la que ya está en curso en lugar de encolarse otra vez.
+
+import threading
+
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+from PyQt6.QtWidgets import QWidget, QHBoxLayout, QLabel, QProgressBar, QToolButton
+
+
+class _TaskSignals(QObject):
+    finished = pyqtSignal(object, object)   # clave, resultado
+    failed = pyqtSignal(object, str)        # clave, mensaje de error
+    done = pyqtSignal()                     # run() terminó (con o sin resultado)
+
+
+class _Task(QRunnable):
+    def __init__(self, key, func, pass_cancel=False):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.key = key
+        self.func = func
+        self.pass_cancel = pass_cancel
+        self.cancel_event = threading.Event()
+        self.signals = _TaskSignals()
+
+    def run(self):
+        try:
+            self._run()
+        finally:
+            self.signals.done.emit()
+
+    def _run(self):
+        if self.cancel_event.is_set():
+            return
+        try:
+            if self.pass_cancel:
+                result = self.func(cancel=self.cancel_event)
+            else:
+                result = self.func()
+        except Exception as e:
+            if not self.cancel_event.is_set():
+                self.signals.failed.emit(self.key, str(e))
+            return
+        # Un resultado cancelado se descarta: el hilo no se puede interrumpir,
+        # pero su resultado ya no interesa a nadie
+        if not self.cancel_event.is_set():
+            self.signals.finished.emit(self.key, result)
+
+
+class TaskIndicator(QWidget):
+    """Indicador de ocupado de una petición: texto, barra indeterminada y botón de cancelar"""
+
+    def __init__(self, text, on_cancel, parent=None):
+        super().__init__(parent)
+        layout = QHBoxLayout(self)
+        layout.setContentsMargins(4, 0, 4, 0)
+        layout.setSpacing(4)
+
+        self.label = QLabel(text)
+        layout.addWidget(self.label)
+
+        bar = QProgressBar()
+        bar.setRange(0, 0)  # Indeterminada
+        bar.setFixedSize(60, 12)
+        bar.setTextVisible(False)
+        layout.addWidget(bar)
+
+        cancel_button = QToolButton()
+        cancel_button.setText("✕")
+        cancel_button.setToolTip(f"Cancelar: {text}")
+        cancel_button.setAutoRaise(True)
+        cancel_button.clicked.connect(on_cancel)
+        layout.addWidget(cancel_button)
+
+
+class TaskDispatcher(QObject):
+    """
+    Envía funciones al pool de hilos y publica sus resultados en el hilo de la GUI.
+
+    result_ready(clave, resultado) y task_failed(clave, mensaje) se emiten en el
+    hilo de la GUI. Una clave identifica la petición (por ejemplo la sonda
+    "cpu"): mientras hay una en curso, submit() con la misma clave no encola nada.
+    """
+
+    result_ready = pyqtSignal(object, object)
+    task_failed = pyqtSignal(object, str)
+    task_cancelled = pyqtSignal(object)
+
+    def __init__(self, status_bar=None, max_threads=4, parent=None):
+        super().__init__(parent)
+        self.status_bar = status_bar
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max_threads)
+        self._tasks = {}
+        self._indicators = {}
+        # Referencias a todas las tareas hasta que su hilo termine, incluidas las
+        # canceladas: si Python las liberase antes, el hilo usaría un objeto destruido
+        self._alive = set()
+
+    def is_running(self, key):
+        return key in self._tasks
+
+    def running(self):
+        return list(self._tasks)
+
+    def submit(self, key, func, label=None, pass_cancel=False):
+        """
+        Encola func en el pool. Devuelve False si ya había una petición en curso
+        con la misma clave (la nueva se une a ella).
+        """
+        if key in self._tasks:
+            return False
+
+        task = _Task(key, func, pass_cancel=pass_cancel)
+        task.signals.finished.connect(self._on_finished)
+        task.signals.failed.connect(self._on_failed)
+        task.signals.done.connect(lambda: self._alive.discard(task))
+        self._tasks[key] = task
+        self._alive.add(task)
+
+        if self.status_bar is not None:
+            indicator = TaskIndicator(label or str(key), lambda: self.cancel(key))
+            self.status_bar.addPermanentWidget(indicator)
+            self._indicators[key] = indicator
+
+        self.pool.start(task)
+        return True
+
+    def cancel(self, key):
+        """Cancela una petición: si no ha empezado se retira de la cola; si no, se descarta su resultado"""
+        task = self._tasks.get(key)
+        if task is None:
+            return
+        task.cancel_event.set()
+        if self.pool.tryTake(task):
+            self._alive.discard(task)  # No llegó a empezar: no habrá señal done
+        self._finish(key)
+        self.task_cancelled.emit(key)
+
+    def cancel_all(self):
+        for key in list(self._tasks):
+            self.cancel(key)
+
+    def _finish(self, key):
+        self._tasks.pop(key, None)
+        indicator = self._indicators.pop(key, None)
+        if indicator is not None:
+            if self.status_bar is not None:
+                self.status_bar.removeWidget(indicator)
+            indicator.deleteLater()
+
+    def _on_finished(self, key, result):
+        task = self._tasks.get(key)
+        # Se ignoran resultados de una petición cancelada y reemplazada por otra
+        if task is None or task.signals is not self.sender():
+            return
+        self._finish(key)
+        self.result_ready.emit(key, result)
+
+    def _on_failed(self, key, message):
+        task = self._tasks.get(key)
+        if task is None or task.signals is not self.sender():
+            return
+        self._finish(key)
+        self.task_failed.emit(key, message)
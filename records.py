@@ -0,0 +1,473 @@
+# records.py
+#
+# Registros tipados que devuelven las funciones collect_* de system_info.py.
+# Son dataclasses con __slots__ y solo contienen datos: la presentación
+# (consola, GUI, JSON) está en renderers.py, de modo que una misma recolección
+# sirve para todas las salidas sin volver a consultar el hardware.
+
+import dataclasses
+import time
+from dataclasses import dataclass, field
+from typing import Optional
+
+
+@dataclass(slots=True)
+class SystemInfo:
+    system: str
+    release: str
+    version: str
+    node: str
+    machine: str
+
+
+# CPU
+
+@dataclass(slots=True)
+class Processor:
+    name: str
+    manufacturer: Optional[str] = None
+    architecture: Optional[int] = None
+    logical_cores: Optional[int] = None
+    physical_cores: Optional[int] = None
+    max_clock_mhz: Optional[int] = None
+    l2_cache_kb: Optional[int] = None
+    l3_cache_kb: Optional[int] = None
+    socket: Optional[str] = None
+    processor_id: Optional[str] = None
+
+
+@dataclass(slots=True)
+class CPUTimes:
+    user: float
+    system: float
+    idle: float
+
+
+@dataclass(slots=True)
+class CPUScalingStep:
+    """Un punto de la curva de escalado: puntuación con `workers` procesos a la vez"""
+    workers: int
+    score: float = 0.0
+    per_worker: float = 0.0
+    efficiency_percent: Optional[float] = None
+
+
+@dataclass(slots=True)
+class CPUBenchmark:
+    """Resultado de cpu_bench.py; puntuación = miles de iteraciones del núcleo de cálculo por segundo"""
+    logical_cores: int = 0
+    physical_cores: Optional[int] = None
+    workers: int = 0                # Procesos de la prueba (--workers o los núcleos lógicos)
+    single_score: Optional[float] = None
+    scaling: list = field(default_factory=list)
+    sustained_seconds: float = 0.0
+    sustained_scores: list = field(default_factory=list)
+    throttle_percent: Optional[float] = None
+    freq_start_mhz: Optional[float] = None
+    freq_end_mhz: Optional[float] = None
+    freq_min_mhz: Optional[float] = None
+    load_percent: Optional[float] = None
+    notes: list = field(default_factory=list)
+    taken_at: float = field(default_factory=time.time)
+    seconds: float = 0.0
+    error: Optional[str] = None
+
+
+@dataclass(slots=True)
+class CPUInfo:
+    processors: list = field(default_factory=list)
+    usage_percent: Optional[float] = None
+    per_core_percent: list = field(default_factory=list)
+    times: Optional[CPUTimes] = None
+    benchmark: Optional[CPUBenchmark] = None
+    error: Optional[str] = None
+
+
+# Memoria
+
+@dataclass(slots=True)
+class MemoryModule:
+    bank: Optional[str] = None
+    manufacturer: Optional[str] = None
+    part_number: Optional[str] = None
+    capacity_bytes: int = 0
+    speed_mhz: Optional[int] = None
+    memory_type: str = "Otro"
+    serial: Optional[str] = None
+
+
+@dataclass(slots=True)
+class MemoryBenchmark:
+    """Resultado de mem_bench.py: ancho de banda (GB/s) y latencia frente a lo teórico de los módulos"""
+    array_bytes: int = 0
+    threads: int = 1
+    copy_gbps: Optional[float] = None
+    scale_gbps: Optional[float] = None
+    triad_gbps: Optional[float] = None
+    latency_ns: Optional[float] = None
+    modules: int = 0
+    speed_mts: Optional[int] = None
+    single_channel_gbps: Optional[float] = None
+    theoretical_gbps: Optional[float] = None
+    efficiency_percent: Optional[float] = None
+    notes: list = field(default_factory=list)
+    taken_at: float = field(default_factory=time.time)
+    seconds: float = 0.0
+    error: Optional[str] = None
+
+
+@dataclass(slots=True)
+class RAMInfo:
+    total_bytes: Optional[int] = None
+    modules: list = field(default_factory=list)
+    benchmark: Optional[MemoryBenchmark] = None
+    error: Optional[str] = None
+
+
+# Almacenamiento
+
+@dataclass(slots=True)
+class Disk:
+    device_id: Optional[str] = None
+    model: Optional[str] = None
+    manufacturer: Optional[str] = None
+    interface: Optional[str] = None
+    size_bytes: Optional[int] = None
+    media_type: str = "HDD"
+    serial: Optional[str] = None
+    error: Optional[str] = None
+
+
+@dataclass(slots=True)
+class DiskBenchmark:
+    """Resultado de disk_bench.py sobre un volumen; disk_id enlaza con Disk.device_id"""
+    volume: str
+    disk_id: Optional[str] = None
+    file_bytes: int = 0
+    direct_io: bool = False         # Sin la caché del sistema (O_DIRECT / FILE_FLAG_NO_BUFFERING)
+    threads: int = 1
+    seq_read_mbps: Optional[float] = None
+    seq_write_mbps: Optional[float] = None
+    rand_read_iops: Optional[float] = None
+    rand_write_iops: Optional[float] = None
+    read_latency_us: dict = field(default_factory=dict)     # p50, p95, p99, max
+    write_latency_us: dict = field(default_factory=dict)
+    taken_at: float = field(default_factory=time.time)
+    seconds: float = 0.0
+    error: Optional[str] = None
+
+
+@dataclass(slots=True)
+class DiskInfo:
+    disks: list = field(default_factory=list)
+    benchmarks: list = field(default_factory=list)          # DiskBenchmark de los volúmenes medidos
+    error: Optional[str] = None
+
+    @property
+    def total_bytes(self):
+        return sum(d.size_bytes for d in self.disks if d.size_bytes and not d.error)
+
+
+# Gráficos y placa base
+
+@dataclass(slots=True)
+class GPU:
+    name: Optional[str] = None
+    manufacturer: Optional[str] = None
+    processor: Optional[str] = None
+    driver_version: Optional[str] = None
+    adapter_ram_bytes: Optional[int] = None
+
+
+@dataclass(slots=True)
+class GPUInfo:
+    gpus: list = field(default_factory=list)
+    error: Optional[str] = None
+
+
+@dataclass(slots=True)
+class MotherboardInfo:
+    manufacturer: Optional[str] = None
+    product: Optional[str] = None
+    version: Optional[str] = None
+    serial: Optional[str] = None
+    found: bool = True
+    error: Optional[str] = None
+
+
+# Red
+
+@dataclass(slots=True)
+class NetworkAdapter:
+    """Interfaz de red con su configuración IP y contadores de tráfico"""
+    name: str                                   # Nombre de la conexión (Ethernet, Wi-Fi, eth0...)
+    description: Optional[str] = None           # Modelo de la tarjeta
+    manufacturer: Optional[str] = None
+    mac_address: Optional[str] = None
+    physical: bool = False                      # Corresponde a una tarjeta de la sonda "nic"
+    status: Optional[str] = None
+    is_up: Optional[bool] = None
+    speed_bps: Optional[int] = None
+    mtu: Optional[int] = None
+    ipv4: list = field(default_factory=list)    # "192.168.1.10/24"
+    ipv6: list = field(default_factory=list)
+    gateways: list = field(default_factory=list)
+    dns_servers: list = field(default_factory=list)
+    dns_suffix: Optional[str] = None
+    dhcp_enabled: Optional[bool] = None
+    dhcp_server: Optional[str] = None
+    bytes_sent: Optional[int] = None
+    bytes_recv: Optional[int] = None
+    packets_sent: Optional[int] = None
+    packets_recv: Optional[int] = None
+    errors_in: Optional[int] = None
+    errors_out: Optional[int] = None
+    drops_in: Optional[int] = None
+    drops_out: Optional[int] = None
+
+
+@dataclass(slots=True)
+class NetworkInfo:
+    host_name: Optional[str] = None
+    adapters: list = field(default_factory=list)
+    raw_text: str = ""                          # Salida de 'ipconfig /all' (solo la sonda "ipconfig")
+    error: Optional[str] = None
+
+
+@dataclass(slots=True)
+class NIC:
+    connection_id: Optional[str] = None
+    name: Optional[str] = None
+    manufacturer: Optional[str] = None
+    mac_address: Optional[str] = None
+    adapter_type: Optional[str] = None
+    status_code: Optional[str] = None
+    status: Optional[str] = None
+    speed_bps: Optional[int] = None
+
+
+@dataclass(slots=True)
+class NICInfo:
+    nics: list = field(default_factory=list)
+    error: Optional[str] = None
+
+
+# Dispositivos
+
+@dataclass(slots=True)
+class AudioDevice:
+    name: Optional[str] = None
+    manufacturer: Optional[str] = None
+    status: Optional[str] = None
+
+
+@dataclass(slots=True)
+class AudioInfo:
+    devices: list = field(default_factory=list)
+    error: Optional[str] = None
+
+
+@dataclass(slots=True)
+class COMPort:
+    port: str
+    description: Optional[str] = None
+    hwid: Optional[str] = None
+
+
+@dataclass(slots=True)
+class COMInfo:
+    ports: list = field(default_factory=list)
+    error: Optional[str] = None
+
+
+@dataclass(slots=True)
+class PnPDevice:
+    description: Optional[str] = None
+    name: Optional[str] = None
+    device_id: Optional[str] = None
+    status: Optional[str] = None
+
+
+@dataclass(slots=True)
+class USBInfo:
+    devices: list = field(default_factory=list)
+    error: Optional[str] = None
+
+
+@dataclass(slots=True)
+class BluetoothInfo:
+    devices: list = field(default_factory=list)
+    error: Optional[str] = None
+
+
+# Sistema operativo
+
+@dataclass(slots=True)
+class WindowsDetails:
+    caption: Optional[str] = None
+    version: Optional[str] = None
+    serial: Optional[str] = None
+    architecture: Optional[str] = None
+    code_set: Optional[str] = None
+    language: Optional[int] = None
+    country_code: Optional[str] = None
+    locale: Optional[str] = None
+    organization: Optional[str] = None
+    registered_user: Optional[str] = None
+    install_date: Optional[str] = None
+    install_date_error: Optional[str] = None
+    error: Optional[str] = None
+
+
+@dataclass(slots=True)
+class DomainInfo:
+    part_of_domain: bool = False
+    domain: Optional[str] = None
+    workgroup: Optional[str] = None
+    error: Optional[str] = None
+
+
+@dataclass(slots=True)
+class OSInfo:
+    system: str = ""
+    node: str = ""
+    version: str = ""
+    edition: str = "N/A"
+    machine: str = ""
+    processor: str = ""
+    platform: str = ""
+    cpu_count: Optional[int] = None
+    python_version: str = ""
+    windows: Optional[WindowsDetails] = None
+    domain: Optional[DomainInfo] = None
+    rdp_enabled: Optional[bool] = None
+    rdp_error: Optional[str] = None
+    locale_lang: Optional[str] = None
+    locale_encoding: Optional[str] = None
+
+
+# Configuración regional
+
+@dataclass(slots=True)
+class RegionalSetting:
+    label: str
+    key: str
+    value: Optional[str] = None
+
+
+@dataclass(slots=True)
+class RegionalSettings:
+    settings: list = field(default_factory=list)
+    error: Optional[str] = None
+
+
+@dataclass(slots=True)
+class LocaleDateTime:
+    date: Optional[str] = None
+    time: Optional[str] = None
+    datetime: Optional[str] = None
+    error: Optional[str] = None
+
+
+# Instantánea
+
+@dataclass(slots=True)
+class Snapshot:
+    """Resultado de una recolección: nombre de sonda -> registro"""
+    records: dict = field(default_factory=dict)
+    taken_at: float = field(default_factory=time.time)
+
+    def __getitem__(self, name):
+        return self.records[name]
+
+    def __contains__(self, name):
+        return name in self.records
+
+    def __iter__(self):
+        return iter(self.records.items())
+
+
+# Informe de hardware
+
+@dataclass(slots=True)
+class ProbeTiming:
+    """Resultado de una sonda dentro de un informe: estado y tiempo de reloj"""
+    name: str
+    status: str = "ok"          # ok | error | timeout | cancelled
+    seconds: Optional[float] = None
+    error: Optional[str] = None
+
+
+@dataclass(slots=True)
+class HardwareReport:
+    snapshot: Snapshot = field(default_factory=Snapshot)
+    timings: list = field(default_factory=list)
+    started_at: float = field(default_factory=time.time)
+    wall_seconds: float = 0.0
+
+    @property
+    def failed(self):
+        return [t for t in self.timings if t.status != "ok"]
+
+    @property
+    def complete(self):
+        return not self.failed
+
+
+# Serialización
+
+RECORD_TYPES = {
+    cls.__name__: cls
+    for cls in (
+        SystemInfo, Processor, CPUTimes, CPUScalingStep, CPUBenchmark, CPUInfo, MemoryModule,
+        MemoryBenchmark, RAMInfo, Disk, DiskBenchmark, DiskInfo, GPU, GPUInfo, MotherboardInfo,
+        NetworkAdapter, NetworkInfo, NIC, NICInfo,
+        AudioDevice, AudioInfo, COMPort, COMInfo, PnPDevice, USBInfo, BluetoothInfo, WindowsDetails, DomainInfo,
+        OSInfo, RegionalSetting, RegionalSettings, LocaleDateTime, ProbeTiming,
+        HardwareReport,
+    )
+}
+
+
+def to_dict(value):
+    """
+    Convierte un registro (o una lista/dict de registros) en estructuras JSON.
+    Cada registro lleva su tipo en la clave "type" para poder reconstruirlo.
+    """
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        if isinstance(value, Snapshot):
+            return {
+                "type": "Snapshot",
+                "taken_at": value.taken_at,
+                "records": {name: to_dict(rec) for name, rec in value.records.items()},
+            }
+        data = {"type": type(value).__name__}
+        for f in dataclasses.fields(value):
+            data[f.name] = to_dict(getattr(value, f.name))
+        return data
+    if isinstance(value, (list, tuple)):
+        return [to_dict(v) for v in value]
+    if isinstance(value, dict):
+        return {k: to_dict(v) for k, v in value.items()}
+    return value
+
+
+def from_dict(data):
+    """Operación inversa de to_dict()"""
+    if isinstance(data, list):
+        return [from_dict(v) for v in data]
+    if not isinstance(data, dict):
+        return data
+
+    type_name = data.get("type")
+    if type_name == "Snapshot":
+        return Snapshot(
+            records={name: from_dict(rec) for name, rec in data["records"].items()},
+            taken_at=data.get("taken_at", 0.0),
+        )
+    cls = RECORD_TYPES.get(type_name)
+    if cls is None:
+        return {k: from_dict(v) for k, v in data.items()}
+
+    names = {f.name for f in dataclasses.fields(cls)}
+    return cls(**{k: from_dict(v) for k, v in data.items() if k in names})
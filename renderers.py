@@ -0,0 +1,548 @@
+# renderers.py
+#
+# Presentación de los registros de records.py. Cada formato es independiente
+# de la recolección:
+#   render_text()  texto de consola (el formato histórico de ARKToolsPC)
+#   render_html()  texto enriquecido para el área de contenido de la GUI PyQt6
+#   render_json()  salida para máquinas (informes, integración con otras herramientas)
+# Todos aceptan un registro suelto o una instantánea (records.Snapshot).
+
+import html
+import json
+from functools import singledispatch
+
+from records import (
+    SystemInfo, CPUInfo, CPUBenchmark, RAMInfo, MemoryBenchmark, DiskInfo, DiskBenchmark, GPUInfo, MotherboardInfo, NetworkInfo,
+    NICInfo, AudioInfo, COMInfo, USBInfo, BluetoothInfo, OSInfo, RegionalSettings,
+    LocaleDateTime, Snapshot, HardwareReport, to_dict,
+)
+
+
+def _gb(size_bytes):
+    return round(int(size_bytes) / (1024**3), 2)
+
+
+def _join(lines):
+    return "\n".join(lines) + "\n"
+
+
+@singledispatch
+def text_lines(record):
+    """Líneas de texto de un registro (una entrada por cada print() histórico)"""
+    return [str(record)]
+
+
+@text_lines.register
+def _(record: Snapshot):
+    lines = []
+    for _, rec in record:
+        lines.extend(text_lines(rec))
+    return lines
+
+
+@text_lines.register
+def _(info: SystemInfo):
+    return [
+        "\n=== Información del Sistema ===",
+        f"Sistema Operativo: {info.system} {info.release} ({info.version})",
+        f"Nombre del equipo: {info.node}",
+        f"Arquitectura: {info.machine}",
+    ]
+
+
+@text_lines.register
+def _(info: CPUInfo):
+    out = ["\n=== Información Detallada del Procesador ==="]
+    for cpu in info.processors:
+        out.append(f"Nombre: {cpu.name}")
+        out.append(f"Fabricante: {cpu.manufacturer}")
+        out.append(f"Arquitectura: {cpu.architecture}")
+        out.append(f"Núcleos lógicos: {cpu.logical_cores}")
+        out.append(f"Núcleos físicos: {cpu.physical_cores}")
+        out.append(f"Velocidad máxima: {cpu.max_clock_mhz} MHz")
+        if cpu.l2_cache_kb:
+            out.append(f"Tamaño L2 Cache: {cpu.l2_cache_kb} KB")
+        if cpu.l3_cache_kb:
+            out.append(f"Tamaño L3 Cache: {cpu.l3_cache_kb} KB")
+        out.append(f"Socket: {cpu.socket}")
+        out.append(f"Versión: {cpu.processor_id}")
+        out.append("-" * 40)
+
+    if info.usage_percent is not None:
+        out.append("=== Información adicional (uso actual) ===")
+        out.append(f"Uso total de CPU: {info.usage_percent}%")
+        if info.per_core_percent:
+            out.append("Uso por núcleo: " + ", ".join(f"{p}%" for p in info.per_core_percent))
+    if info.times is not None:
+        out.append(f"Tiempo de CPU (usuario/sistema/inactivo): {info.times.user:.2f}s usuario, "
+                   f"{info.times.system:.2f}s sistema, "
+                   f"{info.times.idle:.2f}s inactivo")
+    if info.error:
+        out.append(f"No se pudo obtener información completa de la CPU: {info.error}")
+    if info.benchmark is not None:
+        out.extend(text_lines(info.benchmark))
+    return out
+
+
+@text_lines.register
+def _(benchmark: CPUBenchmark):
+    cores = f"{benchmark.logical_cores} núcleos lógicos"
+    if benchmark.physical_cores:
+        cores += f", {benchmark.physical_cores} físicos"
+    if benchmark.workers and benchmark.workers != benchmark.logical_cores:
+        cores += f"; {benchmark.workers} procesos"
+    out = [f"Rendimiento de la CPU ({cores}):"]
+    if benchmark.error:
+        out.append(f"  Error en la prueba de rendimiento: {benchmark.error}")
+    if benchmark.single_score is not None:
+        out.append(f"  Puntuación de un núcleo: {_fmt(benchmark.single_score, '')}")
+    for step in benchmark.scaling:
+        efficiency = "" if step.efficiency_percent is None else f", eficiencia {step.efficiency_percent:.0f} %"
+        workers = f"{step.workers} proceso" + ("s" if step.workers > 1 else "")
+        out.append(f"  {workers:>12}: {_fmt(step.score, '')} "
+                   f"({_fmt(step.per_worker, '')} por proceso{efficiency})")
+    if benchmark.sustained_scores:
+        scores = benchmark.sustained_scores
+        out.append(f"  Sostenida ({benchmark.sustained_seconds:.0f} s): de {_fmt(scores[0], '')} "
+                   f"a {_fmt(scores[-1], '')}, mínimo {_fmt(min(scores), '')}"
+                   + (f", caída {benchmark.throttle_percent:.0f} %" if (benchmark.throttle_percent or 0) > 0 else ""))
+    if benchmark.freq_end_mhz is not None or benchmark.load_percent is not None:
+        out.append(f"  Frecuencia: {_fmt(benchmark.freq_start_mhz, ' MHz')} al inicio, "
+                   f"{_fmt(benchmark.freq_end_mhz, ' MHz')} al final (mínima {_fmt(benchmark.freq_min_mhz, ' MHz')}); "
+                   f"uso medio {_fmt(benchmark.load_percent, ' %')}")
+    out.extend(f"  ⚠️ {note}" for note in benchmark.notes)
+    return out
+
+
+@text_lines.register
+def _(info: RAMInfo):
+    out = ["\n=== Información Detallada de Memoria RAM ==="]
+    if info.total_bytes is not None:
+        out.append(f"Memoria total instalada: {_gb(info.total_bytes)} GB\n")
+    for mem in info.modules:
+        out.append(f"Banco: {mem.bank}")
+        out.append(f"Fabricante: {mem.manufacturer}")
+        out.append(f"Modelo: {mem.part_number}")
+        out.append(f"Tamaño: {_gb(mem.capacity_bytes)} GB")
+        out.append(f"Velocidad: {mem.speed_mhz} MHz")
+        out.append(f"Tipo: {mem.memory_type}")
+        out.append(f"Número de Serie: {mem.serial}")
+        out.append("-" * 40)
+    if info.error:
+        out.append(f"No se pudo obtener información completa de la RAM: {info.error}")
+    if info.benchmark is not None:
+        out.extend(text_lines(info.benchmark))
+    return out
+
+
+@text_lines.register
+def _(benchmark: MemoryBenchmark):
+    out = [f"Rendimiento de la memoria (3 arrays de {benchmark.array_bytes // 2 ** 20} MB, "
+           f"{benchmark.threads} hilos):"]
+    if benchmark.error:
+        out.append(f"  Error en la prueba de rendimiento: {benchmark.error}")
+    if benchmark.triad_gbps is not None:
+        out.append(f"  Ancho de banda: copy {_fmt(benchmark.copy_gbps, ' GB/s')}, "
+                   f"scale {_fmt(benchmark.scale_gbps, ' GB/s')}, triad {_fmt(benchmark.triad_gbps, ' GB/s')}")
+    if benchmark.latency_ns is not None:
+        out.append(f"  Latencia (acceso aleatorio): {_fmt(benchmark.latency_ns, ' ns')}")
+    if benchmark.theoretical_gbps is not None:
+        efficiency = "" if benchmark.efficiency_percent is None else f", triad al {benchmark.efficiency_percent:.0f} %"
+        out.append(f"  Teórico ({benchmark.speed_mts} MT/s, {benchmark.modules} módulos): "
+                   f"{_fmt(benchmark.theoretical_gbps, ' GB/s')} "
+                   f"(un canal {_fmt(benchmark.single_channel_gbps, ' GB/s')}{efficiency})")
+    out.extend(f"  ⚠️ {note}" for note in benchmark.notes)
+    return out
+
+
+@text_lines.register
+def _(info: DiskInfo):
+    out = ["\n=== INFORMACION BASICA DE DISCOS FISICOS ==="]
+    if info.error:
+        out.append(f"🚨 No se pudo obtener información completa de los discos: {info.error}")
+        return out
+    if not info.disks:
+        out.append("No se encontraron discos físicos.")
+        return out
+
+    for disk in info.disks:
+        if disk.error:
+            out.append(f"⚠︝ Error al procesar disco {disk.device_id}: {disk.error}")
+            out.append("-" * 50)
+            continue
+        out.append(f"\nModelo: {disk.model or 'Desconocido'}")
+        out.append(f"Fabricante: {disk.manufacturer or 'Desconocido'}")
+        out.append(f"Interfaz: {disk.interface or 'Desconocida'}")
+        size_gb = _gb(disk.size_bytes) if disk.size_bytes else 'N/A'
+        out.append(f"Tamaño total: {size_gb} GB")
+        out.append(f"Tipo: {disk.media_type}")
+        out.append(f"Número de Serie: {disk.serial or 'No disponible'}")
+        for benchmark in info.benchmarks:
+            if benchmark.disk_id and benchmark.disk_id.casefold() == str(disk.device_id).casefold():
+                out.extend(text_lines(benchmark))
+        out.append("-" * 50)
+
+    # Volúmenes medidos cuyo disco no se pudo identificar (red, RAID, LVM...)
+    known = {str(d.device_id).casefold() for d in info.disks}
+    for benchmark in info.benchmarks:
+        if not benchmark.disk_id or benchmark.disk_id.casefold() not in known:
+            out.extend(text_lines(benchmark))
+            out.append("-" * 50)
+
+    # Resumen final del almacenamiento total
+    if info.total_bytes > 0:
+        out.append("\n=== RESUMEN DE ALMACENAMIENTO TOTAL ===")
+        out.append(f"Almacenamiento total instalado: {_gb(info.total_bytes)} GB")
+        out.append("=" * 50)
+    return out
+
+
+def _fmt(value, unit):
+    return "N/D" if value is None else f"{value:,.1f}{unit}"
+
+
+@text_lines.register
+def _(benchmark: DiskBenchmark):
+    cache = "sin caché del sistema" if benchmark.direct_io else "con caché del sistema"
+    out = [f"Rendimiento del volumen {benchmark.volume} "
+           f"(archivo de {benchmark.file_bytes // 2 ** 20} MB, {cache}, {benchmark.threads} en curso):"]
+    if benchmark.error:
+        out.append(f"  Error en la prueba de rendimiento: {benchmark.error}")
+    if benchmark.seq_read_mbps is not None or benchmark.seq_write_mbps is not None:
+        out.append(f"  Secuencial (1 MB): lectura {_fmt(benchmark.seq_read_mbps, ' MB/s')}, "
+                   f"escritura {_fmt(benchmark.seq_write_mbps, ' MB/s')}")
+    for label, iops, latency in (("lectura", benchmark.rand_read_iops, benchmark.read_latency_us),
+                                 ("escritura", benchmark.rand_write_iops, benchmark.write_latency_us)):
+        if iops is None:
+            continue
+        percentiles = ", ".join(f"{name} {value:.0f} µs" for name, value in latency.items())
+        out.append(f"  Aleatorio 4 KB, {label}: {iops:,.0f} IOPS ({percentiles})")
+    return out
+
+
+@text_lines.register
+def _(info: GPUInfo):
+    out = ["\n=== Información de Tarjeta(s) Gráfica(s) ==="]
+    for gpu in info.gpus:
+        out.append(f"Nombre: {gpu.name}")
+        out.append(f"Fabricante: {gpu.manufacturer}")
+        out.append(f"Tipo de dispositivo: {gpu.processor}")
+        out.append(f"Versión del controlador: {gpu.driver_version}")
+        out.append(f"Memoria dedicada: {_gb(gpu.adapter_ram_bytes or 0)} GB")
+        out.append("-" * 40)
+    if info.error:
+        out.append(f"No se pudo obtener información de la GPU: {info.error}")
+    return out
+
+
+@text_lines.register
+def _(info: MotherboardInfo):
+    if info.error:
+        return [f"Error al obtener información de la placa base: {info.error}"]
+    if not info.found:
+        return ["No se pudo obtener información de la placa base."]
+    return [
+        "\n=== Información de la Placa Base ===",
+        f"Fabricante: {info.manufacturer}",
+        f"Producto: {info.product}",
+        f"Versión: {info.version}",
+        f"Número de Serie: {info.serial}",
+    ]
+
+
+def _mb(size_bytes):
+    return round(int(size_bytes) / (1024**2), 1)
+
+
+def _yes_no(value):
+    return "Desconocido" if value is None else ("Sí" if value else "No")
+
+
+@text_lines.register
+def _(info: NetworkInfo):
+    if info.raw_text:
+        # Sonda "ipconfig": salida sin procesar
+        return ["\n=== INFORMACIÓN COMPLETA DE RED ===\n", info.raw_text]
+
+    out = ["\n=== INFORMACIÓN DE RED ===\n"]
+    if info.host_name:
+        out.append(f"Nombre de host: {info.host_name}\n")
+    for adapter in info.adapters:
+        title = f"Adaptador: {adapter.name}"
+        if adapter.description and adapter.description != adapter.name:
+            title += f" ({adapter.description})"
+        out.append(title)
+        state = "activo" if adapter.is_up else "inactivo" if adapter.is_up is not None else None
+        out.append(f"  Estado: {', '.join(s for s in (adapter.status, state) if s) or 'Desconocido'}")
+        if adapter.manufacturer:
+            out.append(f"  Fabricante: {adapter.manufacturer}")
+        out.append(f"  Dirección MAC: {adapter.mac_address or 'No disponible'}")
+        for address in adapter.ipv4:
+            out.append(f"  IPv4: {address}")
+        for address in adapter.ipv6:
+            out.append(f"  IPv6: {address}")
+        if adapter.gateways:
+            out.append(f"  Puerta de enlace: {', '.join(adapter.gateways)}")
+        if adapter.dns_servers:
+            out.append(f"  Servidores DNS: {', '.join(adapter.dns_servers)}")
+        if adapter.dns_suffix:
+            out.append(f"  Sufijo DNS: {adapter.dns_suffix}")
+        dhcp = _yes_no(adapter.dhcp_enabled)
+        if adapter.dhcp_server:
+            dhcp += f" (servidor {adapter.dhcp_server})"
+        out.append(f"  DHCP: {dhcp}")
+        speed = f"{adapter.speed_bps // 1_000_000} Mb/s" if adapter.speed_bps else "Desconocida"
+        out.append(f"  Velocidad: {speed}" + (f", MTU {adapter.mtu}" if adapter.mtu else ""))
+        if adapter.bytes_sent is not None:
+            out.append(f"  Tráfico: enviados {_mb(adapter.bytes_sent)} MB, recibidos {_mb(adapter.bytes_recv)} MB "
+                       f"(errores {adapter.errors_in}/{adapter.errors_out}, "
+                       f"descartados {adapter.drops_in}/{adapter.drops_out})")
+        out.append("-" * 40)
+    if not info.adapters and not info.error:
+        out.append("  No se encontraron adaptadores de red.")
+    if info.error:
+        out.append(f"Error al obtener información de red: {info.error}")
+    return out
+
+
+@text_lines.register
+def _(info: NICInfo):
+    out = ["\n=== TARJETAS DE RED (NICs) ===\n"]
+    if not info.nics and not info.error:
+        out.append("  No se encontraron tarjetas de red físicas.")
+    for nic in info.nics:
+        out.append(f"Tarjeta: {nic.connection_id or 'Desconocido'}")
+        out.append(f"  Modelo: {nic.name}")
+        out.append(f"  Fabricante: {nic.manufacturer or 'Desconocido'}")
+        out.append(f"  Dirección MAC: {nic.mac_address or 'No disponible'}")
+        out.append(f"  Tipo: {nic.adapter_type}")
+        out.append(f"  Estado: {nic.status}")
+        out.append(f"  Velocidad: {nic.speed_bps or 'Desconocida'} bps")
+        out.append("-" * 40)
+    if info.error:
+        out.append(f"Error al obtener información de NICs: {info.error}")
+    return out
+
+
+@text_lines.register
+def _(info: AudioInfo):
+    out = ["\n=== TARJETAS DE AUDIO ===\n"]
+    for i, device in enumerate(info.devices, start=1):
+        out.append(f"{i}. Nombre: {device.name}")
+        out.append(f"   Fabricante: {device.manufacturer}")
+        out.append(f"   Estado: {device.status}")
+        out.append("-" * 40)
+    if info.error:
+        out.append(f"Error al obtener información de audio: {info.error}")
+    return out
+
+
+@text_lines.register
+def _(info: COMInfo):
+    out = ["\n=== PUERTOS COM ACTIVOS ===\n"]
+    if info.error:
+        out.append(f"Error al obtener información de puertos COM: {info.error}")
+        return out
+    if not info.ports:
+        out.append("  No se encontraron puertos COM.")
+    for port in info.ports:
+        out.append(f"Puerto: {port.port}")
+        out.append(f"  Descripción: {port.description}")
+        out.append(f"  HWID: {port.hwid}")
+        out.append("-" * 40)
+    return out
+
+
+def _device_lines(devices):
+    out = []
+    for device in devices:
+        out.append(f"Dispositivo: {device.description}")
+        if device.name:
+            out.append(f"  Nombre: {device.name}")
+        if device.device_id:
+            out.append(f"  ID del dispositivo: {device.device_id}")
+        if device.status:
+            out.append(f"  Estado: {device.status}")
+        out.append("-" * 40)
+    return out
+
+
+@text_lines.register
+def _(info: USBInfo):
+    out = ["\n=== DISPOSITIVOS USB CONECTADOS ===\n"]
+    if info.error:
+        out.append(f"Error al obtener información de dispositivos USB: {info.error}")
+    elif not info.devices:
+        out.append("  No hay dispositivos USB conectados.")
+    else:
+        out.extend(_device_lines(info.devices))
+    return out
+
+
+@text_lines.register
+def _(info: BluetoothInfo):
+    out = ["\n=== DISPOSITIVOS BLUETOOTH ===\n"]
+    if info.error:
+        out.append(f"Error al obtener información de dispositivos Bluetooth: {info.error}")
+    else:
+        if not info.devices:
+            out.append("  No hay dispositivos Bluetooth activos o emparejados.")
+        out.extend(_device_lines(info.devices))
+    out.append("=" * 40)
+    return out
+
+
+@text_lines.register
+def _(info: OSInfo):
+    out = [
+        "\n=== INFORMACIÓN DEL SISTEMA OPERATIVO ===\n",
+        f"Sistema Operativo: {info.system}",
+        f"Nombre del Equipo: {info.node}",
+        f"Versión del SO: {info.version}",
+        f"Edición: {info.edition}",
+        f"Arquitectura: {info.machine}",
+        f"Procesador: {info.processor}",
+        f"Plataforma: {info.platform}",
+        f"Número de procesadores lógicos: {info.cpu_count}",
+        f"Versión de Python: {info.python_version}",
+        "-" * 50,
+    ]
+
+    if info.system == "Windows":
+        out.append("=== Información específica de Windows ===")
+        win = info.windows
+        if win is not None:
+            if win.error:
+                out.append(f"Error al obtener info avanzada de Windows: {win.error}")
+            else:
+                out.append(f"Versión completa: {win.caption} {win.version}")
+                out.append(f"ID del producto: {win.serial}")
+                out.append(f"Tipo de instalación: {win.architecture} - {win.code_set}")
+                out.append(f"Idioma del sistema: {win.language}")
+                out.append(f"País/Región: {win.country_code}-{win.locale}")
+                out.append(f"Organización registrada: {win.organization or 'Desconocido'}")
+                out.append(f"Registrado a nombre de: {win.registered_user}")
+                if win.install_date_error:
+                    out.append(f"  No se pudo parsear la fecha de instalación: {win.install_date_error}")
+                else:
+                    out.append(f"Instalado: {win.install_date}")
+                out.append("-" * 50)
+
+        # Dominio o grupo de trabajo
+        dom = info.domain
+        if dom is not None:
+            if dom.error:
+                out.append(f"Error al obtener información de dominio/grupo de trabajo: {dom.error}")
+            else:
+                out.append(f"Pertenece a dominio: {'Sí' if dom.part_of_domain else 'No'}")
+                out.append(f"  Dominio: {dom.domain}")
+                out.append(f"  Grupo de trabajo: {dom.workgroup}")
+                out.append("-" * 50)
+
+        # Acceso remoto (RDP)
+        if info.rdp_error:
+            out.append(f"Error al obtener estado de RDP: {info.rdp_error}")
+        elif info.rdp_enabled is not None:
+            out.append(f"Acceso remoto (RDP): {'Habilitado' if info.rdp_enabled else 'Deshabilitado'}")
+            out.append("-" * 50)
+    else:
+        out.append("Para sistemas no Windows, puedes usar comandos como:")
+        out.append("  uname -a")
+        out.append("  lsb_release -a")
+        out.append("  sw_vers (en macOS)")
+        out.append("-" * 50)
+
+    out.append(f"Configuración regional predeterminada: {info.locale_lang}")
+    out.append(f"Codificación del sistema: {info.locale_encoding}")
+    return out
+
+
+@text_lines.register
+def _(info: RegionalSettings):
+    out = ["\n=== CONFIGURACIÓN REGIONAL (INTERNACIONAL) ===\n"]
+    for setting in info.settings:
+        out.append(f"{setting.label} ({setting.key}): {setting.value}")
+    if info.error:
+        out.append(f"Error al obtener información de configuración regional: {info.error}")
+    return out
+
+
+@text_lines.register
+def _(info: LocaleDateTime):
+    out = ["\n=== FECHA Y HORA ACTUAL SEGÚN EL LOCALE DEL SISTEMA ===\n"]
+    if info.error:
+        out.append(f"Error al obtener formato local: {info.error}")
+    else:
+        out.append(f"Fecha local (%x): {info.date}")
+        out.append(f"Hora local (%X): {info.time}")
+        out.append(f"Fecha/hora completa (%c): {info.datetime}")
+    out.append("-" * 50)
+    out.append("Este ejemplo muestra CÓMO EL SISTEMA interpreta los formatos tras el cambio regional.")
+    return out
+
+
+STATUS_LABELS = {
+    "ok": "OK",
+    "error": "ERROR",
+    "timeout": "SIN RESPUESTA",
+    "cancelled": "CANCELADA",
+}
+
+
+@text_lines.register
+def _(report: HardwareReport):
+    from datetime import datetime
+
+    taken = datetime.fromtimestamp(report.started_at).strftime("%Y-%m-%d %H:%M:%S")
+    out = [
+        "\n=== INFORME DE HARDWARE ===",
+        f"Fecha: {taken}",
+        f"Duración total: {report.wall_seconds:.2f} s",
+        "=" * 50,
+    ]
+    out.extend(text_lines(report.snapshot))
+
+    out.append("\n=== TIEMPOS DE LAS SONDAS ===\n")
+    for timing in report.timings:
+        seconds = f"{timing.seconds:7.2f} s" if timing.seconds is not None else "      - "
+        line = f"{timing.name:<12} {seconds}  {STATUS_LABELS.get(timing.status, timing.status)}"
+        if timing.error:
+            line += f" ({timing.error})"
+        out.append(line)
+    out.append("-" * 50)
+    probe_total = sum(t.seconds or 0.0 for t in report.timings)
+    out.append(f"Suma de tiempos de sondas: {probe_total:.2f} s")
+    out.append(f"Tiempo real del informe: {report.wall_seconds:.2f} s")
+    return out
+
+
+# Formatos de salida
+
+def render_text(record):
+    """Texto de consola, idéntico al que imprimían las funciones get_*"""
+    return _join(text_lines(record))
+
+
+def render_html(record):
+    """
+    HTML para QTextEdit: mismo contenido que render_text() con los títulos
+    resaltados y los separadores atenuados.
+    """
+    out = []
+    for line in render_text(record).split("\n"):
+        stripped = line.strip()
+        escaped = html.escape(line)
+        if stripped.startswith("===") and stripped.endswith("==="):
+            out.append(f'<b style="color:#7fd4ff">{escaped}</b>')
+        elif stripped and set(stripped) <= {"-", "="}:
+            out.append(f'<span style="color:#808080">{escaped}</span>')
+        elif stripped.startswith(("Error", "No se pudo", "🚨", "⚠")):
+            out.append(f'<span style="color:#ff8080">{escaped}</span>')
+        else:
+            out.append(escaped)
+    return '<pre style="font-family: Consolas; margin: 0">' + "\n".join(out) + "</pre>"
+
+
+def render_json(record, indent=2):
+    """JSON con el tipo de cada registro para poder reconstruirlo (records.from_dict)"""
+    return json.dumps(to_dict(record), indent=indent, ensure_ascii=False, default=str)
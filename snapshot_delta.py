@@ -0,0 +1,379 @@
+# snapshot_delta.py
+#
+# Diferencias entre dos inventarios. En vez de reenviar el inventario completo
+# en cada ciclo de recolección se envía solo lo que cambió: un dispositivo USB
+# nuevo, el estado de una tarjeta de red, la versión de un controlador...
+#
+# Se trabaja sobre la forma JSON de los registros (records.to_dict), que es la
+# que se transmite y almacena:
+#
+#   - normalize() quita los campos que cambian en cada lectura (uso de CPU,
+#     hora, instante de la captura) para que no generen diferencias;
+#   - diff() compara dos instantáneas normalizadas y devuelve operaciones
+#     "set" / "del" por ruta y "list" para las listas de dispositivos, que se
+#     comparan por su identificador (device_id, puerto, nombre...) y no por
+#     posición, de modo que un USB nuevo en medio de la lista es una sola
+#     operación;
+#   - checksum() identifica una instantánea normalizada. Cada delta lleva la
+#     suma de su base y la del resultado: quien lo recibe comprueba que tiene
+#     esa base (si no, ha perdido un delta y pide una resincronización
+#     completa) y que el resultado es el esperado.
+#
+# DeltaEncoder y DeltaDecoder encapsulan el intercambio emisor/receptor (los
+# usan agent.py y fleet.py con --delta).
+#
+# Uso:
+#   python snapshot_delta.py diff base.json nuevo.json -o delta.json
+#   python snapshot_delta.py apply base.json delta.json -o nuevo.json
+#   python snapshot_delta.py checksum base.json
+
+import argparse
+import copy
+import hashlib
+import json
+import sys
+from collections import OrderedDict
+
+from records import to_dict
+
+
+DELTA_VERSION = 1
+MAX_HISTORY = 8
+
+# Campos que cambian en cada lectura, por tipo de registro ("type" de
+# records.to_dict); la clave None se aplica a los diccionarios sin tipo
+VOLATILE_FIELDS = {
+    "Snapshot": {"taken_at"},
+    "HardwareReport": {"started_at", "wall_seconds", "timings"},
+    "CPUInfo": {"usage_percent", "per_core_percent", "times"},
+    "LocaleDateTime": {"date", "time", "datetime"},
+    "NetworkAdapter": {"bytes_sent", "bytes_recv", "packets_sent", "packets_recv",
+                       "errors_in", "errors_out", "drops_in", "drops_out"},
+}
+
+# Campos candidatos a identificar los elementos de una lista, por orden de preferencia
+IDENTITY_KEYS = ("device_id", "probe", "connection_id", "mac_address", "port", "key", "bank",
+                 "serial", "name", "label", "volume")
+
+
+class DeltaError(ValueError):
+    """Delta que no se puede aplicar"""
+
+
+class ResyncRequired(DeltaError):
+    """El receptor no tiene la base del delta (o el resultado no cuadra): hace falta la instantánea completa"""
+
+
+# Normalización y suma de control
+
+def normalize(data, volatile=VOLATILE_FIELDS):
+    """Copia de `data` (estructuras JSON o registros) sin los campos volátiles"""
+    if not isinstance(data, (dict, list)):
+        data = to_dict(data)
+    if volatile is None:
+        return copy.deepcopy(data)
+    return _strip(data, volatile)
+
+
+def _strip(value, volatile):
+    if isinstance(value, dict):
+        drop = volatile.get(value.get("type"), ())
+        return {k: _strip(v, volatile) for k, v in value.items() if k not in drop}
+    if isinstance(value, list):
+        return [_strip(v, volatile) for v in value]
+    return value
+
+
+def canonical(data):
+    return json.dumps(data, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+def checksum(data):
+    """Suma de control de una instantánea ya normalizada (128 bits en hexadecimal)"""
+    return hashlib.sha256(canonical(data).encode("utf-8")).hexdigest()[:32]
+
+
+# Diferencias
+
+def _same(a, b):
+    """Igualdad estricta: a diferencia de ==, True no es igual a 1 ni 1.0 a 1"""
+    if type(a) is not type(b) or a != b:
+        return False
+    if isinstance(a, dict):
+        return all(_same(v, b[k]) for k, v in a.items())
+    if isinstance(a, list):
+        return all(_same(x, y) for x, y in zip(a, b))
+    return True
+
+
+def _identity_key(*lists):
+    """Campo que identifica de forma única a los elementos de todas las listas (o None)"""
+    items = [item for items in lists for item in items]
+    if not items or not all(isinstance(item, dict) for item in items):
+        return None
+    for key in IDENTITY_KEYS:
+        for items in lists:
+            values = [item.get(key) for item in items]
+            if any(v is None or isinstance(v, (dict, list)) for v in values) or len(set(values)) != len(values):
+                break
+        else:
+            return key
+    return None
+
+
+def _diff(a, b, path, ops):
+    if _same(a, b):
+        return
+    if isinstance(a, dict) and isinstance(b, dict) and a.get("type") == b.get("type"):
+        for k in a:
+            if k not in b:
+                ops.append({"op": "del", "path": path + [k]})
+        for k, v in b.items():
+            if k not in a:
+                ops.append({"op": "set", "path": path + [k], "value": v})
+            else:
+                _diff(a[k], v, path + [k], ops)
+        return
+    if isinstance(a, list) and isinstance(b, list):
+        key = _identity_key(a, b)
+        if key is not None:
+            _diff_keyed(a, b, key, path, ops)
+            return
+        if len(a) == len(b):
+            for i, (x, y) in enumerate(zip(a, b)):
+                _diff(x, y, path + [i], ops)
+            return
+    ops.append({"op": "set", "path": path, "value": b})
+
+
+def _diff_keyed(a, b, key, path, ops):
+    old = {item[key]: item for item in a}
+    new = {item[key]: item for item in b}
+    op = {"op": "list", "path": path, "key": key}
+
+    removed = [k for k in old if k not in new]
+    added = [item for item in b if item[key] not in old]
+    changed = []
+    for k, item in new.items():
+        if k in old:
+            item_ops = []
+            _diff(old[k], item, [], item_ops)
+            if item_ops:
+                changed.append([k, item_ops])
+    # Orden resultante de quitar y añadir al final; solo se envía si no coincide
+    order = [k for k in old if k in new] + [item[key] for item in added]
+    target = [item[key] for item in b]
+
+    if removed:
+        op["remove"] = removed
+    if added:
+        op["add"] = added
+    if changed:
+        op["change"] = changed
+    if order != target:
+        op["order"] = target
+    if len(op) > 3:
+        ops.append(op)
+
+
+def diff(base, target):
+    """Operaciones que convierten `base` en `target` (ambas ya normalizadas)"""
+    ops = []
+    _diff(base, target, [], ops)
+    return ops
+
+
+# Aplicación
+
+def _parent(data, path):
+    node = data
+    for step in path[:-1]:
+        node = node[step]
+    return node
+
+
+def _apply_op(data, op):
+    path = op["path"]
+    kind = op["op"]
+    if kind == "set":
+        if not path:
+            return copy.deepcopy(op["value"])
+        _parent(data, path)[path[-1]] = copy.deepcopy(op["value"])
+    elif kind == "del":
+        del _parent(data, path)[path[-1]]
+    elif kind == "list":
+        items = data
+        for step in path:
+            items = items[step]
+        key = op["key"]
+        removed = set(op.get("remove", ()))
+        index = {item[key]: item for item in items if item[key] not in removed}
+        for item in op.get("add", ()):
+            index[item[key]] = copy.deepcopy(item)
+        for k, item_ops in op.get("change", ()):
+            item = index[k]
+            for item_op in item_ops:
+                item = _apply_op(item, item_op)
+            index[k] = item
+        items[:] = [index[k] for k in op["order"]] if "order" in op else list(index.values())
+    else:
+        raise DeltaError(f"Operación desconocida: {kind}")
+    return data
+
+
+def apply_ops(base, ops):
+    """Aplica las operaciones a una copia de `base` y la devuelve"""
+    data = copy.deepcopy(base)
+    try:
+        for op in ops:
+            data = _apply_op(data, op)
+    except (KeyError, IndexError, TypeError) as e:
+        raise DeltaError(f"El delta no corresponde a esta base: {e!r}") from None
+    return data
+
+
+# Mensajes
+
+def full_message(data, digest=None):
+    return {"type": "SnapshotFull", "version": DELTA_VERSION,
+            "checksum": digest or checksum(data), "data": data}
+
+
+def delta_message(base, target, base_digest=None, target_digest=None):
+    return {"type": "SnapshotDelta", "version": DELTA_VERSION,
+            "base": base_digest or checksum(base), "target": target_digest or checksum(target),
+            "ops": diff(base, target)}
+
+
+def apply_message(base, message):
+    """
+    Reconstruye la instantánea de un mensaje completo o delta. Lanza
+    ResyncRequired si el delta no parte de `base` o el resultado no cuadra.
+    """
+    if message.get("version") != DELTA_VERSION:
+        raise DeltaError(f"Versión de delta no soportada: {message.get('version')}")
+    if message.get("type") == "SnapshotFull":
+        return message["data"]
+    if message.get("type") != "SnapshotDelta":
+        raise DeltaError(f"Mensaje desconocido: {message.get('type')}")
+    if checksum(base) != message["base"]:
+        raise ResyncRequired("No se tiene la base del delta")
+    data = apply_ops(base, message["ops"])
+    if checksum(data) != message["target"]:
+        raise ResyncRequired("El resultado del delta no coincide con la suma de control")
+    return data
+
+
+class DeltaEncoder:
+    """
+    Lado emisor: recuerda las últimas instantáneas enviadas y contesta con un
+    delta si el receptor indica (`since`) una base que todavía conoce.
+    """
+
+    def __init__(self, volatile=VOLATILE_FIELDS, max_history=MAX_HISTORY):
+        self.volatile = volatile
+        self.max_history = max_history
+        self._history = OrderedDict()      # suma -> instantánea normalizada
+
+    def encode(self, data, since=None):
+        data = normalize(data, self.volatile)
+        digest = checksum(data)
+        self._history[digest] = data
+        self._history.move_to_end(digest)
+        while len(self._history) > self.max_history:
+            self._history.popitem(last=False)
+
+        base = self._history.get(since) if since else None
+        if base is None:
+            return full_message(data, digest)
+        message = delta_message(base, data, since, digest)
+        # Si casi todo cambió, el delta puede ocupar más que la instantánea
+        if len(canonical(message["ops"])) >= len(canonical(data)):
+            return full_message(data, digest)
+        return message
+
+
+class DeltaDecoder:
+    """Lado receptor: conserva la última instantánea y su suma de control"""
+
+    def __init__(self):
+        self.data = None
+        self.checksum = None
+
+    def decode(self, message):
+        try:
+            data = apply_message(self.data, message)
+        except ResyncRequired:
+            # Se olvida la base: la próxima petición será completa
+            self.data = self.checksum = None
+            raise
+        self.data = data
+        self.checksum = message.get("checksum") or message.get("target")
+        return data
+
+
+# Línea de órdenes
+
+def _load(path):
+    """Instantánea de un archivo JSON (Snapshot, HardwareReport o datos ya normalizados)"""
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    if isinstance(data, dict) and data.get("type") == "HardwareReport":
+        data = data["snapshot"]
+    return data
+
+
+def _dump(data, output):
+    text = json.dumps(data, indent=2, ensure_ascii=False)
+    if output:
+        with open(output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Deltas entre inventarios de ARKToolsPC")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("diff", help="Delta entre dos instantáneas")
+    p.add_argument("base")
+    p.add_argument("target")
+    p.add_argument("-o", "--output")
+    p.add_argument("--keep-volatile", action="store_true", help="Incluye uso de CPU, hora, etc.")
+
+    p = sub.add_parser("apply", help="Aplica un delta a una instantánea")
+    p.add_argument("base")
+    p.add_argument("delta")
+    p.add_argument("-o", "--output")
+    p.add_argument("--keep-volatile", action="store_true", help="El delta se calculó con --keep-volatile")
+
+    p = sub.add_parser("checksum", help="Suma de control de una instantánea normalizada")
+    p.add_argument("snapshot")
+    args = parser.parse_args(argv)
+
+    if args.command == "diff":
+        volatile = None if args.keep_volatile else VOLATILE_FIELDS
+        base = normalize(_load(args.base), volatile)
+        target = normalize(_load(args.target), volatile)
+        message = delta_message(base, target)
+        _dump(message, args.output)
+        print(f"{len(message['ops'])} operaciones; delta {len(canonical(message))} bytes, "
+              f"completa {len(canonical(target))} bytes", file=sys.stderr)
+    elif args.command == "apply":
+        with open(args.delta, encoding="utf-8") as f:
+            message = json.load(f)
+        try:
+            base = normalize(_load(args.base), None if args.keep_volatile else VOLATILE_FIELDS)
+            data = apply_message(base, message)
+        except DeltaError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 1
+        _dump(data, args.output)
+    else:
+        print(checksum(normalize(_load(args.snapshot))))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
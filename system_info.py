@@ -1,441 +1,515 @@
 # system_info.py Verision 1.0.6
+#
+# Cada sonda tiene dos caras:
+#   collect_*()  consulta el hardware y devuelve un registro de records.py
+#   get_*()      imprime ese registro en consola (compatibilidad con main.py)
+# La presentación vive en renderers.py; collect() agrupa varias sondas en una
+# instantánea que se puede mostrar en cualquier formato sin volver a consultar.
+#
+# Las funciones collect_* de este módulo son el backend de Windows (WMI,
+# Registro, psutil). linux_backend.py implementa las mismas sondas leyendo
+# /proc y /sys; PROBES apunta al backend del sistema actual (ver set_backend).
 
 from datetime import datetime
 import platform
-import psutil
-import subprocess
 import locale
 import os
-import winreg
-import GPUtil
-
-try:
-    import wmi
-except ImportError:
-    wmi = None
+import functools
+import time
+
+# psutil, winreg y subprocess se cargan en el primer uso (ver lazy_deps.py)
+from lazy_deps import psutil, subprocess, winreg
+
+import wmi_session
+import device_inventory
+import network_inventory
+import powershell_host
+import cpu_sampler
+import hw_cache
+import renderers
+import linux_backend
+import diagnostics
+from records import (
+    SystemInfo, Processor, CPUTimes, CPUInfo, MemoryModule, RAMInfo, Disk, DiskInfo,
+    GPU, GPUInfo, MotherboardInfo, NetworkInfo, NIC, NICInfo, AudioDevice, AudioInfo,
+    COMPort, COMInfo, PnPDevice, USBInfo, BluetoothInfo, WindowsDetails, DomainInfo,
+    OSInfo, RegionalSetting, RegionalSettings, LocaleDateTime, Snapshot,
+)
+
+
+def _strip(value):
+    return value.strip() if isinstance(value, str) else value
+
+
+def _int_or_none(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
 
 
-def get_system_info():
+def collect_system_info():
     uname = platform.uname()
-    print("\n=== Información del Sistema ===")
-    print(f"Sistema Operativo: {uname.system} {uname.release} ({uname.version})")
-    print(f"Nombre del equipo: {uname.node}")
-    print(f"Arquitectura: {uname.machine}")
-
+    return SystemInfo(
+        system=uname.system,
+        release=uname.release,
+        version=uname.version,
+        node=uname.node,
+        machine=uname.machine,
+    )
+
+
+# Consultas WMI: cada sonda declara las propiedades que lee y solo se piden esas
+
+PROCESSOR_QUERY = wmi_session.WMIQuery("Win32_Processor", (
+    "Name", "Manufacturer", "Architecture", "NumberOfLogicalProcessors", "NumberOfCores",
+    "MaxClockSpeed", "L2CacheSize", "L3CacheSize", "SocketDesignation", "ProcessorId"))
+MEMORY_QUERY = wmi_session.WMIQuery("Win32_PhysicalMemory", (
+    "BankLabel", "Manufacturer", "PartNumber", "Capacity", "Speed", "SMBIOSMemoryType", "SerialNumber"))
+DISK_QUERY = wmi_session.WMIQuery("Win32_DiskDrive", (
+    "DeviceID", "Model", "Manufacturer", "InterfaceType", "Size", "SerialNumber"))
+GPU_QUERY = wmi_session.WMIQuery("Win32_VideoController", (
+    "Name", "AdapterCompatibility", "VideoProcessor", "DriverVersion", "AdapterRAM"))
+BASEBOARD_QUERY = wmi_session.WMIQuery("Win32_BaseBoard", ("Manufacturer", "Product", "Version", "SerialNumber"))
+NIC_QUERY = wmi_session.WMIQuery("Win32_NetworkAdapter", (
+    "NetConnectionID", "Name", "Manufacturer", "MACAddress", "AdapterType", "NetConnectionStatus", "Speed"),
+    where="PhysicalAdapter = TRUE")
+SOUND_QUERY = wmi_session.WMIQuery("Win32_SoundDevice", ("Name", "Manufacturer", "Status"))
+OS_QUERY = wmi_session.WMIQuery("Win32_OperatingSystem", (
+    "Caption", "Version", "SerialNumber", "OSArchitecture", "CodeSet", "OSLanguage", "CountryCode",
+    "Locale", "Organization", "RegisteredUser", "InstallDate"))
+COMPUTER_SYSTEM_QUERY = wmi_session.WMIQuery("Win32_ComputerSystem", ("Domain", "Workgroup", "PartOfDomain"))
+
+
+# CPU
+
+def _probe_cpu_identity():
+    """Datos fijos de los procesadores (Win32_Processor); se guardan en la caché"""
+    info = CPUInfo()
+    try:
+        for cpu in wmi_session.select(PROCESSOR_QUERY):
+            info.processors.append(Processor(
+                name=_strip(cpu.Name),
+                manufacturer=cpu.Manufacturer,
+                architecture=cpu.Architecture,
+                logical_cores=cpu.NumberOfLogicalProcessors,
+                physical_cores=cpu.NumberOfCores,
+                max_clock_mhz=cpu.MaxClockSpeed,
+                l2_cache_kb=cpu.L2CacheSize,
+                l3_cache_kb=cpu.L3CacheSize,
+                socket=cpu.SocketDesignation,
+                processor_id=cpu.ProcessorId,
+            ))
+    except Exception as e:
+        info.error = str(e)
+    return info
 
-# system_info.py
 
-def get_cpu_info():
+def _add_cpu_usage(info):
+    """Completa los datos fijos de la CPU con el uso actual"""
+    if info.error:
+        return info
     try:
-        import wmi
-        c = wmi.WMI()
-
-        print("\n=== Información Detallada del Procesador ===")
-        for cpu in c.Win32_Processor():
-            print(f"Nombre: {cpu.Name.strip()}")
-            print(f"Fabricante: {cpu.Manufacturer}")
-            print(f"Arquitectura: {cpu.Architecture}")
-            print(f"Núcleos lógicos: {cpu.NumberOfLogicalProcessors}")
-            print(f"Núcleos físicos: {cpu.NumberOfCores}")
-            print(f"Velocidad máxima: {cpu.MaxClockSpeed} MHz")
-            
-            if cpu.L2CacheSize:
-                print(f"Tamaño L2 Cache: {cpu.L2CacheSize} KB")
-            if cpu.L3CacheSize:
-                print(f"Tamaño L3 Cache: {cpu.L3CacheSize} KB")
-                
-            print(f"Socket: {cpu.SocketDesignation}")
-            print(f"Versión: {cpu.ProcessorId}")
-            print("-" * 40)
-
-        # Información adicional con psutil
-        print("=== Información adicional (uso actual) ===")
-        print(f"Uso total de CPU: {psutil.cpu_percent(interval=1)}%")
-        print(f"Tiempo de CPU (usuario/sistema/inactivo): {psutil.cpu_times().user:.2f}s usuario, "
-              f"{psutil.cpu_times().system:.2f}s sistema, "
-              f"{psutil.cpu_times().idle:.2f}s inactivo")
+        # Uso actual desde el muestreador en segundo plano (no bloquea salvo
+        # en la primera lectura tras el arranque)
+        start = time.perf_counter()
+        sample = cpu_sampler.latest()
+        if diagnostics.enabled:
+            diagnostics.add_phase("cpu_sampler", time.perf_counter() - start)
+        if sample is not None:
+            info.usage_percent = sample.total
+            info.per_core_percent = list(sample.per_core)
+            info.times = CPUTimes(user=sample.user, system=sample.system, idle=sample.idle)
+        else:
+            times = psutil.cpu_times()
+            info.times = CPUTimes(user=times.user, system=times.system, idle=times.idle)
 
     except Exception as e:
-        print(f"No se pudo obtener información completa de la CPU: {e}")
+        info.error = str(e)
+    return info
 
 
-def get_ram_info():
+def collect_cpu_info():
+    return _add_cpu_usage(hw_cache.cached("cpu", _probe_cpu_identity))
+
+
+# Memoria
+
+def _memory_type(smbios_type):
+    code = _int_or_none(smbios_type)
+    return 'DDR4' if code == 24 else 'DDR3' if code == 21 else 'Otro'
+
+
+def _probe_ram_info():
+    info = RAMInfo()
     try:
-        import wmi
-        c = wmi.WMI()
-        print("\n=== Información Detallada de Memoria RAM ===")
-
-        total_ram = psutil.virtual_memory().total
-        print(f"Memoria total instalada: {round(total_ram / (1024**3), 2)} GB\n")
-
-        for mem in c.Win32_PhysicalMemory():
-            print(f"Banco: {mem.BankLabel}")
-            print(f"Fabricante: {mem.Manufacturer}")
-            print(f"Modelo: {mem.PartNumber.strip()}")
-            print(f"Tamaño: {round(int(mem.Capacity) / (1024**3), 2)} GB")
-            print(f"Velocidad: {mem.Speed} MHz")
-            print(f"Tipo: {'DDR4' if int(mem.SMBIOSMemoryType) == 24 else 'DDR3' if int(mem.SMBIOSMemoryType) == 21 else 'Otro'}")
-            print(f"Número de Serie: {mem.SerialNumber.strip()}")
-            print("-" * 40)
+        info.total_bytes = psutil.virtual_memory().total
+
+        for mem in wmi_session.select(MEMORY_QUERY):
+            info.modules.append(MemoryModule(
+                bank=mem.BankLabel,
+                manufacturer=mem.Manufacturer,
+                part_number=_strip(mem.PartNumber),
+                capacity_bytes=int(mem.Capacity),
+                speed_mhz=mem.Speed,
+                memory_type=_memory_type(mem.SMBIOSMemoryType),
+                serial=_strip(mem.SerialNumber),
+            ))
 
     except Exception as e:
-        print(f"No se pudo obtener información completa de la RAM: {e}")
+        info.error = str(e)
+    return info
+
+
+def collect_ram_info():
+    return hw_cache.cached("ram", _probe_ram_info)
+
 
 # Almacenamiento
 
-def get_disk_info():
+def _probe_disk_info():
+    info = DiskInfo()
     try:
-        import wmi
-        c = wmi.WMI()
-        print("\n=== INFORMACION BASICA DE DISCOS FISICOS ===")
+        for disk in wmi_session.select(DISK_QUERY):
+            record = Disk(device_id=disk.DeviceID)
+            try:
+                record.model = disk.Model
+                record.manufacturer = disk.Manufacturer
+                record.interface = disk.InterfaceType
+                record.size_bytes = int(disk.Size) if disk.Size else None
+                record.media_type = 'SSD' if 'SSD' in str(disk.Model) else 'HDD'
+                record.serial = _strip(disk.SerialNumber) or None
+            except Exception as e:
+                record.error = str(e)
+            info.disks.append(record)
 
-        disks = c.Win32_DiskDrive()
-        total_storage_bytes = 0  # Acumulador para el tamaño total
+    except Exception as e:
+        info.error = str(e)
+    return info
 
-        if not disks:
-            print("No se encontraron discos físicos.")
-            return
 
-        for disk in disks:
-            try:
-                print(f"\nModelo: {disk.Model or 'Desconocido'}")
-                print(f"Fabricante: {disk.Manufacturer or 'Desconocido'}")
-                print(f"Interfaz: {disk.InterfaceType or 'Desconocida'}")
+def collect_disk_info():
+    return hw_cache.cached("disk", _probe_disk_info)
 
-                size_gb = round(int(disk.Size) / (1024**3), 2) if disk.Size else 'N/A'
-                print(f"Tamaño total: {size_gb} GB")
 
-                print(f"Tipo: {'SSD' if 'SSD' in str(disk.Model) else 'HDD'}")
-                print(f"Número de Serie: {disk.SerialNumber.strip() if disk.SerialNumber else 'No disponible'}")
-                print("-" * 50)
+def _probe_gpu_info():
+    info = GPUInfo()
+    try:
+        for gpu in wmi_session.select(GPU_QUERY):
+            info.gpus.append(GPU(
+                name=gpu.Name,
+                manufacturer=gpu.AdapterCompatibility,
+                processor=gpu.VideoProcessor,
+                driver_version=gpu.DriverVersion,
+                adapter_ram_bytes=int(gpu.AdapterRAM),
+            ))
+    except Exception as e:
+        info.error = str(e)
+    return info
 
-                # Acumular solo si el disco tiene tamaño definido
-                if disk.Size:
-                    total_storage_bytes += int(disk.Size)
 
-            except Exception as e:
-                print(f"⚠︝ Error al procesar disco {disk.DeviceID}: {e}")
-                print("-" * 50)
-                continue
+def collect_gpu_info():
+    return hw_cache.cached("gpu", _probe_gpu_info)
 
-        # Mostrar resumen final del almacenamiento total
-        if total_storage_bytes > 0:
-            total_gb = round(total_storage_bytes / (1024**3), 2)
-            print("\n=== RESUMEN DE ALMACENAMIENTO TOTAL ===")
-            print(f"Almacenamiento total instalado: {total_gb} GB")
-            print("=" * 50)
 
+def _probe_motherboard_info():
+    try:
+        motherboard = wmi_session.select(BASEBOARD_QUERY)[0]  # Generalmente hay solo una placa base
+        return MotherboardInfo(
+            manufacturer=motherboard.Manufacturer,
+            product=motherboard.Product,
+            version=motherboard.Version,
+            serial=motherboard.SerialNumber,
+        )
+    except IndexError:
+        return MotherboardInfo(found=False)
     except Exception as e:
-        print(f"🚨 No se pudo obtener información completa de los discos: {e}")
+        return MotherboardInfo(error=str(e))
 
 
-def get_gpu_info():
+def collect_motherboard_info():
+    return hw_cache.cached("motherboard", _probe_motherboard_info)
+
+
+# Netware
+
+def collect_network_info():
+    """
+    Configuración IP de cada adaptador: interfaces y tráfico de psutil, tarjetas
+    de collect_nic_info() y DNS/DHCP/puertas de enlace de WMI (ver network_inventory.py)
+    """
+    info = NetworkInfo(host_name=platform.node())
     try:
-        import wmi
-        c = wmi.WMI()
-        print("\n=== Información de Tarjeta(s) Gráfica(s) ===")
-        for gpu in c.Win32_VideoController():
-            print(f"Nombre: {gpu.Name}")
-            print(f"Fabricante: {gpu.AdapterCompatibility}")
-            print(f"Tipo de dispositivo: {gpu.VideoProcessor}")
-            print(f"Versión del controlador: {gpu.DriverVersion}")
-            print(f"Memoria dedicada: {round(int(gpu.AdapterRAM) / (1024**3), 2)} GB")
-            print("-" * 40)
+        adapters = network_inventory.psutil_adapters()
     except Exception as e:
-        print(f"No se pudo obtener información de la GPU: {e}")
-
-def get_motherboard_info():
+        info.error = str(e)
+        return info
     try:
-        import wmi
-        c = wmi.WMI()
-        motherboard = c.Win32_BaseBoard()[0]  # Generalmente hay solo una placa base
-        print("\n=== Información de la Placa Base ===")
-        print(f"Fabricante: {motherboard.Manufacturer}")
-        print(f"Producto: {motherboard.Product}")
-        print(f"Versión: {motherboard.Version}")
-        print(f"Número de Serie: {motherboard.SerialNumber}")
-    except IndexError:
-        print("No se pudo obtener información de la placa base.")
+        # Tarjetas y configuración IP en un solo lote de consultas WMI
+        nic_rows, configurations = wmi_session.batch([NIC_QUERY, network_inventory.CONFIGURATION_QUERY])
+        network_inventory.merge_nics(adapters, _nic_records(nic_rows))
+        network_inventory.merge_configurations(adapters, configurations)
     except Exception as e:
-        print(f"Error al obtener información de la placa base: {e}")
+        # Sin WMI se conservan las direcciones de psutil
+        info.error = f"Tarjetas y configuración DNS/DHCP no disponibles: {e}"
+    info.adapters = network_inventory.ordered(adapters)
+    return info
 
-# Netware
 
-def get_network_info():
+def collect_ipconfig_text():
     """
-      Muestra la salida completa de 'ipconfig /all' del sistema
+      Salida completa de 'ipconfig /all' del sistema (sonda "ipconfig", opcional)
     """
-    print("\n=== INFORMACIÓN COMPLETA DE RED ===\n")
     try:
         # Ejecutar el comando ipconfig /all
-        result = subprocess.run(
-            ["ipconfig", "/all"], 
-            capture_output=True, 
-            text=True, 
+        result = diagnostics.run_command(
+            subprocess.run,
+            ["ipconfig", "/all"],
+            capture_output=True,
+            text=True,
             encoding="cp850"
             )
-
-        # Mostrar la salida completa
-        print(result.stdout)
+        return NetworkInfo(raw_text=result.stdout)
 
     except Exception as e:
-        print(f"Error al obtener información de red: {e}")
+        return NetworkInfo(error=str(e))
 
 # Hardware de red
-def get_nic_info():
+
+# Diccionario de estados de conexión
+NIC_STATUS_CODES = {
+    '1': 'Connecting',
+    '2': 'Connected',
+    '3': 'Disconnected',
+    '4': 'Disconnecting',
+    '5': 'Hardware not present',
+    '6': 'Hardware disabled',
+    '7': 'Hardware malfunction',
+    '8': 'Media disconnected',
+    '9': 'Authenticating',
+    '10': 'Credential rejected',
+    '11': 'Paused',
+    '12': 'No Media',
+    '13': 'Port blocked'
+}
+
+
+def _nic_records(rows):
+    nics = []
+    for nic in rows:
+        # Usamos el diccionario para traducir el código de estado
+        status_code = str(nic.NetConnectionStatus)
+        nics.append(NIC(
+            connection_id=nic.NetConnectionID,
+            name=nic.Name,
+            manufacturer=nic.Manufacturer,
+            mac_address=nic.MACAddress,
+            adapter_type=nic.AdapterType,
+            status_code=status_code,
+            status=NIC_STATUS_CODES.get(status_code, f"Desconocido ({status_code})"),
+            speed_bps=_int_or_none(nic.Speed),
+        ))
+    return nics
+
+
+def collect_nic_info():
     """
-    Muestra información detallada sobre las tarjetas de red (NICs)
+    Información detallada sobre las tarjetas de red (NICs)
     """
-    print("\n=== TARJETAS DE RED (NICs) ===\n")
+    info = NICInfo()
     try:
-        import wmi
-        c = wmi.WMI()
-
-        nics = c.Win32_NetworkAdapter(PhysicalAdapter=True)
-
-        # Diccionario de estados de conexión
-        status_codes = {
-            '1': 'Connecting',
-            '2': 'Connected',
-            '3': 'Disconnected',
-            '4': 'Disconnecting',
-            '5': 'Hardware not present',
-            '6': 'Hardware disabled',
-            '7': 'Hardware malfunction',
-            '8': 'Media disconnected',
-            '9': 'Authenticating',
-            '10': 'Credential rejected',
-            '11': 'Paused',
-            '12': 'No Media',
-            '13': 'Port blocked'
-        }
-
-        if not nics:
-            print("  No se encontraron tarjetas de red físicas.")
-
-        for nic in nics:
-            print(f"Tarjeta: {nic.NetConnectionID or 'Desconocido'}")
-            print(f"  Modelo: {nic.Name}")
-            print(f"  Fabricante: {nic.Manufacturer or 'Desconocido'}")
-            print(f"  Dirección MAC: {nic.MACAddress or 'No disponible'}")
-            print(f"  Tipo: {nic.AdapterType}")
-            
-            # Usamos el diccionario para traducir el código de estado
-            status_code = str(nic.NetConnectionStatus)
-            status_desc = status_codes.get(status_code, f"Desconocido ({status_code})")
-            print(f"  Estado: {status_desc}")
-            
-            print(f"  Velocidad: {nic.Speed or 'Desconocida'} bps")
-            print("-" * 40)
-
+        info.nics = _nic_records(wmi_session.select(NIC_QUERY))
     except Exception as e:
-        print(f"Error al obtener información de NICs: {e}")
-        
+        info.error = str(e)
+    return info
+
 # Hardware de audio
 
-def get_audio_devices():
-    """
-    Muestra información sobre dispositivos de audio
-    """
-    print("\n=== TARJETAS DE AUDIO ===\n")
+def collect_audio_devices():
+    info = AudioInfo()
     try:
-        import wmi
-        c = wmi.WMI()
-        for i, device in enumerate(c.Win32_SoundDevice(), start=1):
-            print(f"{i}. Nombre: {device.Name}")
-            print(f"   Fabricante: {device.Manufacturer}")
-            print(f"   Estado: {device.Status}")
-            print("-" * 40)
+        for device in wmi_session.select(SOUND_QUERY):
+            info.devices.append(AudioDevice(
+                name=device.Name,
+                manufacturer=device.Manufacturer,
+                status=device.Status,
+            ))
     except Exception as e:
-        print(f"Error al obtener información de audio: {e}")
-        
+        info.error = str(e)
+    return info
+
 # Puertos COM
-        
-def get_com_ports():
-    """
-    Muestra los puertos COM detectados en el sistema
-    """
-    print("\n=== PUERTOS COM ACTIVOS ===\n")
+
+def collect_com_ports():
+    info = COMInfo()
     try:
         from serial.tools import list_ports
-        ports = list_ports.comports()
-        if not ports:
-            print("  No se encontraron puertos COM.")
-        for port, desc, hwid in sorted(ports):
-            print(f"Puerto: {port}")
-            print(f"  Descripción: {desc}")
-            print(f"  HWID: {hwid}")
-            print("-" * 40)
+        for port, desc, hwid in sorted(list_ports.comports()):
+            info.ports.append(COMPort(port=port, description=desc, hwid=hwid))
     except Exception as e:
-        print(f"Error al obtener información de puertos COM: {e}")
+        info.error = str(e)
+    return info
 
-# Dispositivos USB
+# Dispositivos USB y Bluetooth
+
+def _pnp_device(device):
+    return PnPDevice(
+        description=device.Description,
+        name=device.Name,
+        device_id=device.DeviceID,
+        status=device.Status,
+    )
 
-def get_usb_devices():
-    """
-    Muestra información de dispositivos USB conectados (versión más estable)
-    """
-    print("\n=== DISPOSITIVOS USB CONECTADOS ===\n")
-    try:
-        import wmi
-        c = wmi.WMI()
-        devices = c.Win32_PnPEntity()
-
-        usb_devices = [d for d in devices if "USB" in str(d.Description or "")]
-
-        if not usb_devices:
-            print("  No hay dispositivos USB conectados.")
-            return
-
-        for device in usb_devices:
-            print(f"Dispositivo: {device.Description}")
-            if device.Name:
-                print(f"  Nombre: {device.Name}")
-            if device.DeviceID:
-                print(f"  ID del dispositivo: {device.DeviceID}")
-            if device.Status:
-                print(f"  Estado: {device.Status}")
-            print("-" * 40)
 
+def collect_usb_devices():
+    info = USBInfo()
+    try:
+        info.devices = [_pnp_device(d) for d in device_inventory.usb_devices()]
     except Exception as e:
-        print(f"Error al obtener información de dispositivos USB: {e}")
+        info.error = str(e)
+    return info
 
-# Dispositivos Bluetooth
 
-def get_bluetooth_devices():
-    """
-    Muestra información de dispositivos Bluetooth emparejados
-    """
-    print("\n=== DISPOSITIVOS BLUETOOTH ===\n")
+def collect_bluetooth_devices():
+    info = BluetoothInfo()
     try:
-        import wmi
-        c = wmi.WMI()
-        devices = c.Win32_PnPEntity()
+        info.devices = [_pnp_device(d) for d in device_inventory.bluetooth_devices()]
+    except Exception as e:
+        info.error = str(e)
+    return info
+
+# Sistema operativo
 
-        bluetooth_devices = [d for d in devices if "bluetooth" in str(d.Description or "").lower()]
+def _parse_install_date(install_date):
+    """Convierte InstallDate (CIM_DATETIME) en texto legible"""
+    if isinstance(install_date, str):
+        # Asumimos que es CIM_DATETIME si comienza con YYYYMMDDHHMMSS
+        if install_date.startswith(('20', '10')):  # Ejemplo: empieza con año
+            date_str = install_date.split('.')[0]
+            install_datetime = datetime.strptime(date_str, "%Y%m%d%H%M%S")
+            return install_datetime.strftime('%Y-%m-%d %H:%M:%S')
+        return f"{install_date} (formato desconocido)"
+    return f"{install_date}"
 
-        if not bluetooth_devices:
-            print("  No hay dispositivos Bluetooth activos o emparejados.")
 
-        for device in bluetooth_devices:
-            print(f"Dispositivo: {device.Description}")
-            if device.Name:
-                print(f"  Nombre: {device.Name}")
-            if device.DeviceID:
-                print(f"  ID del dispositivo: {device.DeviceID}")
-            if device.Status:
-                print(f"  Estado: {device.Status}")
-            print("-" * 40)
+def _collect_windows_details(rows):
+    details = WindowsDetails()
+    try:
+        os_info = rows[0]
+        details.caption = os_info.Caption
+        details.version = os_info.Version
+        details.serial = os_info.SerialNumber
+        details.architecture = os_info.OSArchitecture
+        details.code_set = os_info.CodeSet
+        details.language = os_info.OSLanguage
+        details.country_code = os_info.CountryCode
+        details.locale = os_info.Locale
+        details.organization = os_info.Organization
+        details.registered_user = os_info.RegisteredUser
 
+        try:
+            details.install_date = _parse_install_date(os_info.InstallDate)
+        except Exception as e:
+            details.install_date_error = str(e)
     except Exception as e:
-        print(f"Error al obtener información de dispositivos Bluetooth: {e}")
+        details.error = str(e)
+    return details
 
-    print("=" * 40)
-    
-def get_os_info():
-    """
-    Muestra información detallada del sistema operativo
-    """
-    print("\n=== INFORMACIÓN DEL SISTEMA OPERATIVO ===\n")
 
-    # Información básica del sistema
-    print(f"Sistema Operativo: {platform.system()}")
-    print(f"Nombre del Equipo: {platform.node()}")
-    print(f"Versión del SO: {platform.version()}")
-    print(f"Edición: {platform.win32_edition() if platform.system() == 'Windows' else 'N/A'}")
-    print(f"Arquitectura: {platform.machine()}")
-    print(f"Procesador: {platform.processor()}")
-    print(f"Plataforma: {platform.platform()}")
-    print(f"Número de procesadores lógicos: {os.cpu_count()}")
-    print(f"Versión de Python: {platform.python_version()}")
-    print("-" * 50)
+def _collect_domain_info(rows):
+    try:
+        comp_info = rows[0]
+        return DomainInfo(
+            part_of_domain=bool(comp_info.PartOfDomain),
+            domain=comp_info.Domain if comp_info.Domain else "No pertenece a un dominio",
+            workgroup=comp_info.Workgroup if not comp_info.PartOfDomain else "Dominio activo",
+        )
+    except Exception as e:
+        return DomainInfo(error=str(e))
+
 
-    # Información adicional en Windows
-    if platform.system() == "Windows":
-        c = wmi.WMI() if wmi else None
+# fDenyTSConnections = 0 permite Escritorio remoto; la directiva de grupo, si
+# la hay, tiene prioridad sobre la configuración local
+RDP_REGISTRY_KEYS = (
+    r"SOFTWARE\Policies\Microsoft\Windows NT\Terminal Services",
+    r"SYSTEM\CurrentControlSet\Control\Terminal Server",
+)
 
-        print("=== Información específica de Windows ===")
-        try:
-            os_info = c.Win32_OperatingSystem()[0]
-            print(f"Versión completa: {os_info.Caption} {os_info.Version}")
-            print(f"ID del producto: {os_info.SerialNumber}")
-            print(f"Tipo de instalación: {os_info.OSArchitecture} - {os_info.CodeSet}")
-            print(f"Idioma del sistema: {os_info.OSLanguage}")
-            print(f"País/Región: {os_info.CountryCode}-{os_info.Locale}")
-            print(f"Organización registrada: {os_info.Organization or 'Desconocido'}")
-            print(f"Registrado a nombre de: {os_info.RegisteredUser}")
-
-            # Corrección: Parsear InstallDate correctamente
-            # Corrección: Parsear InstallDate correctamente
+
+def _collect_rdp_enabled():
+    try:
+        for key_path in RDP_REGISTRY_KEYS:
             try:
-                install_date = os_info.InstallDate
-                if isinstance(install_date, str):
-                    # Asumimos que es CIM_DATETIME si comienza con YYYYMMDDHHMMSS
-                    if install_date.startswith(('20', '10')):  # Ejemplo: empieza con año
-                        date_str = install_date.split('.')[0]
-                        install_datetime = datetime.strptime(date_str, "%Y%m%d%H%M%S")
-                        print(f"Instalado: {install_datetime.strftime('%Y-%m-%d %H:%M:%S')}")
-                    else:
-                        print(f"Instalado: {install_date} (formato desconocido)")
-                else:
-                    print(f"Instalado: {install_date}")
-            except Exception as e:
-                print(f"  No se pudo parsear la fecha de instalación: {e}")
+                with winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, key_path) as key:
+                    return winreg.QueryValueEx(key, "fDenyTSConnections")[0] == 0
+            except FileNotFoundError:
+                continue
+    except OSError:
+        pass    # Registro no legible (permisos): se pregunta a WMI
+
+    # Sin valor en el Registro: Win32_TerminalServiceSetting está en otro espacio
+    # de nombres WMI, así que se consulta con el PowerShell persistente
+    output = powershell_host.run(
+        "(Get-CimInstance -Namespace root/CIMv2/TerminalServices -ClassName Win32_TerminalServiceSetting)"
+        ".AllowTSConnections", timeout=10)
+    return output.strip() == "1"
 
-            print("-" * 50)
-        except Exception as e:
-            print(f"Error al obtener info avanzada de Windows: {e}")
 
-        # Dominio o grupo de trabajo
+def collect_os_info():
+    """
+    Información detallada del sistema operativo
+    """
+    system = platform.system()
+    info = OSInfo(
+        system=system,
+        node=platform.node(),
+        version=platform.version(),
+        edition=platform.win32_edition() if system == 'Windows' else 'N/A',
+        machine=platform.machine(),
+        processor=platform.processor(),
+        platform=platform.platform(),
+        cpu_count=os.cpu_count(),
+        python_version=platform.python_version(),
+    )
+
+    # Información adicional en Windows
+    if system == "Windows":
         try:
-            comp_info = c.Win32_ComputerSystem()[0]
-            domain = comp_info.Domain if comp_info.Domain else "No pertenece a un dominio"
-            workgroup = comp_info.Workgroup if not comp_info.PartOfDomain else "Dominio activo"
-            print(f"Pertenece a dominio: {'Sí' if comp_info.PartOfDomain else 'No'}")
-            print(f"  Dominio: {domain}")
-            print(f"  Grupo de trabajo: {workgroup}")
-            print("-" * 50)
+            os_rows, computer_rows = wmi_session.batch([OS_QUERY, COMPUTER_SYSTEM_QUERY])
         except Exception as e:
-            print(f"Error al obtener información de dominio/grupo de trabajo: {e}")
-
-        # Acceso remoto (RDP)
+            info.windows = WindowsDetails(error=str(e))
+            info.domain = DomainInfo(error=str(e))
+        else:
+            info.windows = _collect_windows_details(os_rows)
+            info.domain = _collect_domain_info(computer_rows)
         try:
-            # Usamos PowerShell como alternativa segura
-            result = subprocess.run(
-                ["powershell", "(Get-WmiObject -Class Win32_TerminalServiceSetting -Namespace root\\CIMv2\\TerminalServices).AllowTSConnections"],
-                capture_output=True,
-                text=True,
-                encoding="latin-1",
-                errors="replace"
-            )
-            output = result.stdout.strip()
-            rdp_status = "Habilitado" if output == "1" else "Deshabilitado"
-            print(f"Acceso remoto (RDP): {rdp_status}")
-            print("-" * 50)
+            info.rdp_enabled = _collect_rdp_enabled()
         except Exception as e:
-            print(f"Error al obtener estado de RDP: {e}")
-
-    # Para Linux/macOS
-    else:
-        print("Para sistemas no Windows, puedes usar comandos como:")
-        print("  uname -a")
-        print("  lsb_release -a")
-        print("  sw_vers (en macOS)")
-        print("-" * 50)
+            info.rdp_error = str(e)
 
     # Configuración regional
-    lang, encoding = locale.getdefaultlocale()
-    print(f"Configuración regional predeterminada: {lang}")
-    print(f"Codificación del sistema: {encoding}")
+    info.locale_lang, info.locale_encoding = locale.getdefaultlocale()
+    return info
 
-def get_regional_settings():
+# Configuración regional
+
+REGIONAL_VALUES = [
+    ("S. Decimal", "sDecimal"),                 # Separador decimal
+    ("S. Miles", "sThousand"),                  # Separador de miles
+    ("S. Moneda Decimal", "sMonDecimalSep"),    # Separador decimal en moneda
+    ("S. Moneda Miles", "sMonThousandSep"),     # Separador de miles en moneda
+    ("Formato Fecha Corta", "sShortDate"),      # Formato de fecha corta
+    ("Formato de Hora", "sTimeFormat"),         # Formato de hora
+    ("Símbolo de Moneda", "sCurrency"),         # Símbolo de moneda
+]
+
+
+def collect_regional_settings():
     """
-    Muestra configuración regional desde el Registro de Windows
+    Configuración regional desde el Registro de Windows
     """
-    print("\n=== CONFIGURACIÓN REGIONAL (INTERNACIONAL) ===\n")
+    info = RegionalSettings()
     try:
-        import winreg
-
         key_path = r"Control Panel\International"
         with winreg.OpenKey(winreg.HKEY_CURRENT_USER, key_path) as key:
             def get_value(name):
@@ -444,33 +518,229 @@ def get_regional_settings():
                 except FileNotFoundError:
                     return "No definido"
 
-            # Valores actuales
-            s_decimal     = get_value("sDecimal")         # Separador decimal
-            s_thousand    = get_value("sThousand")        # Separador de miles
-            s_mon_decimal = get_value("sMonDecimalSep")   # Separador decimal en moneda
-            s_mon_thousand= get_value("sMonThousandSep") # Separador de miles en moneda
-            s_short_date  = get_value("sShortDate")      # Formato de fecha corta
-            s_time_format = get_value("sTimeFormat")     # Formato de hora
-            s_currency    = get_value("sCurrency")       # Símbolo de moneda
-
-            # Mostrar información
-            print(f"S. Decimal (sDecimal): {s_decimal}")
-            print(f"S. Miles (sThousand): {s_thousand}")
-            print(f"S. Moneda Decimal (sMonDecimalSep): {s_mon_decimal}")
-            print(f"S. Moneda Miles (sMonThousandSep): {s_mon_thousand}")
-            print(f"Formato Fecha Corta (sShortDate): {s_short_date}")
-            print(f"Formato de Hora (sTimeFormat): {s_time_format}")
-            print(f"Símbolo de Moneda (sCurrency): {s_currency}")
+            for label, name in REGIONAL_VALUES:
+                info.settings.append(RegionalSetting(label=label, key=name, value=get_value(name)))
+
+    except Exception as e:
+        info.error = str(e)
+    return info
+
+
+def collect_current_datetime():
+    """
+    Fecha y hora actual usando formatos del sistema (locale)
+    para verificar si los cambios regionales surtieron efecto.
+    """
+    import time
+
+    try:
+        # Forzar recarga del locale actual del sistema
+        locale.setlocale(locale.LC_ALL, '')  # Usa el locale predeterminado del sistema
 
+        # Formatos que DEBERÍAN verse afectados por el cambio en el registro
+        return LocaleDateTime(
+            date=time.strftime("%x"),       # Fecha local (lo que más importa)
+            time=time.strftime("%X"),       # Hora local
+            datetime=time.strftime("%c"),   # Fecha y hora completa local
+        )
     except Exception as e:
-        print(f"Error al obtener información de configuración regional: {e}")
-        
+        return LocaleDateTime(error=str(e))
+
+# Backends
+#
+# Un backend es un diccionario {sonda: función} con las mismas claves en todos
+# los sistemas; cada función devuelve el mismo tipo de registro de records.py.
+
+def _collect_linux_cpu_info():
+    return _add_cpu_usage(linux_backend.probe_cpu_identity())
+
+
+WINDOWS_PROBES = {
+    "system": collect_system_info,
+    "cpu": collect_cpu_info,
+    "ram": collect_ram_info,
+    "disk": collect_disk_info,
+    "gpu": collect_gpu_info,
+    "motherboard": collect_motherboard_info,
+    "network": collect_network_info,
+    "ipconfig": collect_ipconfig_text,
+    "nic": collect_nic_info,
+    "audio": collect_audio_devices,
+    "com": collect_com_ports,
+    "usb": collect_usb_devices,
+    "bluetooth": collect_bluetooth_devices,
+    "os": collect_os_info,
+    "regional": collect_regional_settings,
+    "datetime": collect_current_datetime,
+}
+
+LINUX_PROBES = dict(
+    WINDOWS_PROBES,
+    cpu=_collect_linux_cpu_info,
+    ram=linux_backend.collect_ram_info,
+    disk=linux_backend.collect_disk_info,
+    gpu=linux_backend.collect_gpu_info,
+    motherboard=linux_backend.collect_motherboard_info,
+    network=linux_backend.collect_network_info,
+    ipconfig=linux_backend.collect_ipconfig_text,
+    nic=linux_backend.collect_nic_info,
+    audio=linux_backend.collect_audio_devices,
+    com=linux_backend.collect_com_ports,
+    usb=linux_backend.collect_usb_devices,
+    bluetooth=linux_backend.collect_bluetooth_devices,
+    regional=functools.partial(linux_backend.collect_regional_settings, REGIONAL_VALUES),
+)
+
+BACKENDS = {
+    "windows": WINDOWS_PROBES,
+    "linux": LINUX_PROBES,
+}
+
+
+def default_backend():
+    """Backend del sistema actual; ARKTOOLSPC_BACKEND permite forzar otro"""
+    name = os.environ.get("ARKTOOLSPC_BACKEND")
+    if name:
+        return name.lower()
+    return "linux" if platform.system() == "Linux" else "windows"
+
+
+# Sondas del backend activo. Se actualiza en el sitio para que quien guardó
+# una referencia (por ejemplo hw_report) vea siempre el backend actual.
+PROBES = {}
+backend = None
+
+
+def set_backend(name):
+    """Activa el backend `name` ("windows" o "linux")"""
+    global backend
+    if name not in BACKENDS:
+        raise ValueError(f"Backend desconocido: {name} (disponibles: {', '.join(BACKENDS)})")
+    PROBES.clear()
+    # Cada sonda deja una traza en diagnostics.py cuando la instrumentación está activa
+    PROBES.update((probe, diagnostics.traced(probe, func)) for probe, func in BACKENDS[name].items())
+    backend = name
+
+
+set_backend(default_backend())
+
+
+def refresh_static(name=None):
+    """Descarta la caché de hardware fijo (una sección o todas) para forzar una nueva consulta"""
+    hw_cache.refresh(name)
+
+
+# Sondas que solo se ejecutan si se piden por nombre: "ipconfig" lanza un
+# proceso externo y su volcado en bruto repite lo que ya da "network"
+OPT_IN_PROBES = {"ipconfig"}
+
+
+def default_probes():
+    """Sondas del backend activo que se ejecutan cuando no se indica ninguna"""
+    return [name for name in PROBES if name not in OPT_IN_PROBES]
+
+
+def collect(names=None):
+    """
+    Ejecuta las sondas indicadas (todas salvo OPT_IN_PROBES si names es None) y
+    devuelve una instantánea. La instantánea se puede renderizar tantas veces
+    como haga falta.
+    """
+    if isinstance(names, str):
+        names = [names]
+    names = default_probes() if names is None else names
+    return Snapshot(records={name: PROBES[name]() for name in names})
+
+# Salida por consola (compatibilidad con main.py y los menús)
+
+def _print(record):
+    print(renderers.render_text(record), end="")
+
+
+def get_system_info():
+    _print(PROBES["system"]())
+
+
+def get_cpu_info():
+    _print(PROBES["cpu"]())
+
+
+def get_ram_info():
+    _print(PROBES["ram"]())
+
+
+def get_disk_info():
+    _print(PROBES["disk"]())
+
+
+def get_gpu_info():
+    _print(PROBES["gpu"]())
+
+
+def get_motherboard_info():
+    _print(PROBES["motherboard"]())
+
+
+def get_network_info(raw=False):
+    """
+      Muestra la configuración de red de cada adaptador; con raw=True, la
+      salida completa de 'ipconfig /all' del sistema
+    """
+    _print(PROBES["ipconfig" if raw else "network"]())
+
+
+def get_nic_info():
+    """
+    Muestra información detallada sobre las tarjetas de red (NICs)
+    """
+    _print(PROBES["nic"]())
+
+
+def get_audio_devices():
+    """
+    Muestra información sobre dispositivos de audio
+    """
+    _print(PROBES["audio"]())
+
+
+def get_com_ports():
+    """
+    Muestra los puertos COM detectados en el sistema
+    """
+    _print(PROBES["com"]())
+
+
+def get_usb_devices():
+    """
+    Muestra información de dispositivos USB conectados (versión más estable)
+    """
+    _print(PROBES["usb"]())
+
+
+def get_bluetooth_devices():
+    """
+    Muestra información de dispositivos Bluetooth emparejados
+    """
+    _print(PROBES["bluetooth"]())
+
+
+def get_os_info():
+    """
+    Muestra información detallada del sistema operativo
+    """
+    _print(PROBES["os"]())
+
+
+def get_regional_settings():
+    """
+    Muestra configuración regional desde el Registro de Windows
+    """
+    _print(PROBES["regional"]())
+
 def set_regional_settings():
     """
     Establece la configuración regional del sistema en el Registro de Windows
     """
-    import winreg
-
     key_path = r"Control Panel\International"
     try:
         # Abrir la clave del Registro con permisos de escritura
@@ -504,26 +774,4 @@ def show_current_datetime():
     Muestra la fecha y hora actual usando formatos del sistema (locale)
     para verificar si los cambios regionales surtieron efecto.
     """
-    import time
-    import locale
-
-    print(f"\n=== FECHA Y HORA ACTUAL SEGÚN EL LOCALE DEL SISTEMA ===\n")
-
-    try:
-        # Forzar recarga del locale actual del sistema
-        locale.setlocale(locale.LC_ALL, '')  # Usa el locale predeterminado del sistema
-
-        # Formatos que DEBERÍAN verse afectados por el cambio en el registro
-        fecha_local = time.strftime("%x")   # Fecha local (lo que más importa)
-        hora_local = time.strftime("%X")    # Hora local
-        fecha_hora_local = time.strftime("%c")  # Fecha y hora completa local
-
-        print(f"Fecha local (%x): {fecha_local}")
-        print(f"Hora local (%X): {hora_local}")
-        print(f"Fecha/hora completa (%c): {fecha_hora_local}")
-
-    except Exception as e:
-        print(f"Error al obtener formato local: {e}")
-
-    print("-" * 50)
-    print("Este ejemplo muestra CÓMO EL SISTEMA interpreta los formatos tras el cambio regional.")
+    _print(PROBES["datetime"]())
@@ -0,0 +1,81 @@
+# test_powershell_host.py
+#
+# Pruebas de PowerShellHost con el proceso sustituto (stand_in_command()), que
+# habla el mismo protocolo sin necesitar PowerShell.
+#
+# Uso:
+#   python -m unittest discover -s tests
+
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+import powershell_host
+from powershell_host import PowerShellError, PowerShellHost, PowerShellTimeout, PowerShellUnavailable
+
+
+class PowerShellHostTest(unittest.TestCase):
+
+    def setUp(self):
+        self.host = PowerShellHost(command=powershell_host.stand_in_command(), timeout=10.0)
+
+    def tearDown(self):
+        self.host.close()
+
+    def test_pipelined_threads_share_one_process(self):
+        scripts = [f"Start-Sleep -Seconds 0.02; '{i}'" for i in range(24)]
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            outputs = list(pool.map(self.host.run, scripts))
+
+        self.assertEqual(outputs, [f"{i}\n" for i in range(24)])
+        self.assertEqual(self.host.stats["starts"], 1)
+        self.assertEqual(self.host.stats["requests"], 24)
+        self.assertEqual(self.host.stats["errors"], 0)
+
+    def test_timeout_restarts_process(self):
+        with self.assertRaises(PowerShellTimeout):
+            self.host.run("Start-Sleep -Seconds 5", timeout=0.5)
+        self.assertEqual(self.host.stats["timeouts"], 1)
+
+        # El proceso bloqueado se mató: la siguiente petición arranca otro
+        self.assertEqual(self.host.run("'hola'"), "hola\n")
+        self.assertEqual(self.host.stats["starts"], 2)
+        self.assertEqual(self.host.stats["crashes"], 0)
+
+    def test_crash_retries_only_the_culprit_once(self):
+        self.host.run("'arranque'")
+        errors = []
+
+        def culprit():
+            try:
+                self.host.run("Start-Sleep -Seconds 0.3; exit 1")
+            except PowerShellError as e:
+                errors.append(e)
+
+        thread = threading.Thread(target=culprit)
+        thread.start()
+        # Estas peticiones quedan en cola detrás de la que hace caer el proceso
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            outputs = list(pool.map(self.host.run, ["'a'", "'b'", "'c'"]))
+        thread.join()
+
+        self.assertEqual(outputs, ["a\n", "b\n", "c\n"])
+        self.assertEqual(len(errors), 1)
+        self.assertNotIsInstance(errors[0], PowerShellTimeout)
+        # Un intento y un reintento de la culpable; las demás no gastan intentos
+        self.assertEqual(self.host.stats["crashes"], powershell_host.MAX_ATTEMPTS)
+        self.assertEqual(self.host.stats["starts"], 1 + powershell_host.MAX_ATTEMPTS)
+        self.assertEqual(self.host.stats["errors"], 1)
+
+    def test_missing_executable_is_unavailable(self):
+        host = PowerShellHost(command=["/nonexistent/powershell"])
+        try:
+            with self.assertRaises(PowerShellUnavailable):
+                host.run("'hola'")
+            self.assertFalse(host.running)
+        finally:
+            host.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,144 @@
+# test_wmi_session.py
+#
+# Pruebas de WMISession sobre InMemoryWMI: una conexión por hilo, reconexión
+# única solo ante errores de conexión y tiempos de conexión frente a consulta.
+#
+# Uso:
+#   python -m unittest discover -s tests
+
+import threading
+import time
+import unittest
+
+from wmi_session import InMemoryWMI, WMISession, is_connection_error, is_query_error
+
+
+CLASSES = {"Win32_Processor": [{"Name": "CPU 0", "NumberOfCores": 4}, {"Name": "CPU 1", "NumberOfCores": 4}]}
+
+# Como pywintypes.com_error: (hresult, texto, excepinfo, argerr); con signo, como lo da pywin32
+RPC_SERVER_UNAVAILABLE = (-2147023174, "El servidor RPC no está disponible.", None, None)
+INVALID_QUERY = (-2147352567, "Excepción.", (0, "SWbemServicesEx", "Consulta no válida", None, 0, -2147217385), None)
+
+
+class FakeComError(Exception):
+    """Sustituto de pywintypes.com_error (solo importan sus args)"""
+
+
+class Backend:
+    """Fábrica de InMemoryWMI que cuenta conexiones y puede fallar o tardar"""
+
+    def __init__(self, connect_delay=0.0, query_delay=0.0):
+        self.connect_delay = connect_delay
+        self.query_delay = query_delay
+        self.failures = []          # Excepciones que lanzan las próximas consultas, en orden
+        self.connections = []       # (hilo, conexión) de cada llamada a la fábrica
+        self._lock = threading.Lock()
+
+    def __call__(self, namespace=None):
+        time.sleep(self.connect_delay)
+        connection = _FlakyWMI(self, CLASSES)
+        with self._lock:
+            self.connections.append((threading.get_ident(), connection))
+        return connection
+
+
+class _FlakyWMI(InMemoryWMI):
+
+    def __init__(self, backend, classes):
+        super().__init__(classes)
+        self.backend = backend
+
+    def query(self, text):
+        time.sleep(self.backend.query_delay)
+        with self.backend._lock:
+            failure = self.backend.failures.pop(0) if self.backend.failures else None
+        if failure is not None:
+            raise failure
+        return super().query(text)
+
+
+class WMISessionTest(unittest.TestCase):
+
+    def test_one_connection_per_thread(self):
+        backend = Backend()
+        session = WMISession(factory=backend)
+        barrier = threading.Barrier(4)
+
+        def worker():
+            barrier.wait()          # Todos los hilos vivos a la vez
+            for _ in range(3):
+                self.assertEqual(len(session.wql("SELECT Name FROM Win32_Processor")), 2)
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(backend.connections), 4)
+        self.assertEqual(len({ident for ident, _ in backend.connections}), 4)
+        stats = session.stats()
+        self.assertEqual(stats["connects"], 4)
+        self.assertEqual(stats["queries"], 12)
+        self.assertEqual(stats["reconnects"], 0)
+
+    def test_reconnects_once_on_connection_error(self):
+        for error in (ConnectionError("conexión perdida"), FakeComError(*RPC_SERVER_UNAVAILABLE)):
+            with self.subTest(error=type(error).__name__):
+                self.assertTrue(is_connection_error(error))
+                backend = Backend()
+                session = WMISession(factory=backend)
+                session.wql("SELECT Name FROM Win32_Processor")
+                backend.failures.append(error)
+
+                rows = session.wql("SELECT Name FROM Win32_Processor")
+
+                self.assertEqual([row.Name for row in rows], ["CPU 0", "CPU 1"])
+                self.assertEqual(len(backend.connections), 2)
+                self.assertEqual(session.stats()["reconnects"], 1)
+
+    def test_second_connection_error_is_raised(self):
+        backend = Backend()
+        session = WMISession(factory=backend)
+        backend.failures += [ConnectionError("caída"), ConnectionError("sigue caída")]
+
+        with self.assertRaises(ConnectionError):
+            session.wql("SELECT Name FROM Win32_Processor")
+        self.assertEqual(len(backend.connections), 2)
+        self.assertEqual(session.stats()["reconnects"], 1)
+
+    def test_query_error_is_not_retried(self):
+        error = FakeComError(*INVALID_QUERY)
+        self.assertTrue(is_query_error(error))
+        self.assertFalse(is_connection_error(error))
+        backend = Backend()
+        session = WMISession(factory=backend)
+        backend.failures.append(error)
+
+        with self.assertRaises(FakeComError):
+            session.wql("SELECT Name FROM Win32_Processor")
+        self.assertEqual(len(backend.connections), 1)
+        self.assertEqual(session.stats()["reconnects"], 0)
+        # La conexión sigue siendo válida para la consulta siguiente
+        self.assertEqual(len(session.wql("SELECT Name FROM Win32_Processor")), 2)
+        self.assertEqual(len(backend.connections), 1)
+
+    def test_connect_time_is_separate_from_query_time(self):
+        backend = Backend(connect_delay=0.2, query_delay=0.05)
+        session = WMISession(factory=backend)
+
+        session.wql("SELECT Name FROM Win32_Processor")
+        session.wql("SELECT Name FROM Win32_Processor")
+
+        stats = session.stats()
+        self.assertEqual(stats["connects"], 1)
+        self.assertEqual(stats["queries"], 2)
+        self.assertEqual(stats["rows"], 4)
+        self.assertEqual(stats["properties"], 4)
+        self.assertGreaterEqual(stats["connect_time"], 0.2)
+        self.assertGreaterEqual(stats["query_time"], 0.1)
+        self.assertLess(stats["query_time"], stats["connect_time"])
+
+
+if __name__ == "__main__":
+    unittest.main()
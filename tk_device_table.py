@@ -0,0 +1,151 @@
+# tk_device_table.py
+#
+# Tabla de dispositivos de arktoolspc.py (Tkinter) sobre device_table.py.
+#
+# ttk.Treeview crea un elemento por fila insertada, lo que con miles de filas
+# es lento de llenar y de desplazar. Aquí el Treeview tiene solo tantos
+# elementos como filas caben en la ventana y la barra de desplazamiento mueve
+# una ventana (offset) sobre DeviceTable.order: al desplazarse, ordenar o
+# filtrar solo se reescriben los textos de esos elementos.
+
+import tkinter as tk
+from tkinter import ttk
+
+FILTER_DELAY_MS = 150           # Espera tras la última tecla antes de filtrar
+ROW_HEIGHT = 20                 # Altura de fila del estilo de Treeview por defecto
+HEADER_HEIGHT = 24
+COLUMN_WIDTH = 140
+SORT_MARKS = (" ▲", " ▼")
+
+
+class DeviceTableFrame:
+    """Filtro, resumen y Treeview virtual de una DeviceTable"""
+
+    def __init__(self, parent):
+        self.frame = ttk.Frame(parent)
+        self.table = None
+        self.offset = 0
+        self._items = []
+        self._filter_job = None
+
+        top = ttk.Frame(self.frame)
+        top.pack(side="top", fill="x", pady=(0, 5))
+        ttk.Label(top, text="Filtrar:").pack(side="left")
+        self.filter_var = tk.StringVar()
+        self.filter_var.trace_add("write", self._schedule_filter)
+        ttk.Entry(top, textvariable=self.filter_var).pack(side="left", fill="x", expand=True, padx=5)
+        self.summary_label = ttk.Label(top)
+        self.summary_label.pack(side="right")
+
+        # El cuerpo no se adapta al Treeview: es el Treeview el que toma la altura del cuerpo
+        self.body = ttk.Frame(self.frame)
+        self.body.pack(side="top", fill="both", expand=True)
+        self.body.pack_propagate(False)
+        self.scrollbar = ttk.Scrollbar(self.body, orient="vertical", command=self._on_scrollbar)
+        self.scrollbar.pack(side="right", fill="y")
+        self.tree = ttk.Treeview(self.body, show="headings", selectmode="browse", height=1)
+        self.tree.pack(side="left", fill="x", expand=True, anchor="n")
+
+        self.body.bind("<Configure>", self._on_resize)
+        for widget in (self.tree, self.scrollbar):
+            widget.bind("<MouseWheel>", self._on_wheel)
+            widget.bind("<Button-4>", lambda e: self.scroll(-3))
+            widget.bind("<Button-5>", lambda e: self.scroll(3))
+
+    def pack(self, **kwargs):
+        self.frame.pack(**kwargs)
+
+    def pack_forget(self):
+        self.frame.pack_forget()
+
+    # Datos
+
+    def set_table(self, table):
+        self.table = table
+        self.offset = 0
+        self.filter_var.set("")
+        if self._filter_job is not None:
+            self.frame.after_cancel(self._filter_job)
+            self._filter_job = None
+        columns = [str(i) for i in range(len(table.columns))] if table is not None else []
+        self.tree.configure(columns=columns)
+        for i, column in enumerate(table.columns if table is not None else ()):
+            self.tree.heading(str(i), text=column.title, command=lambda c=i: self.sort(c))
+            self.tree.column(str(i), width=COLUMN_WIDTH, stretch=True,
+                             anchor="e" if column.numeric else "w")
+        self.refresh()
+
+    def clear(self):
+        self.set_table(None)
+
+    def sort(self, column):
+        if self.table is None:
+            return
+        descending = self.table.sort_column == column and not self.table.descending
+        self.table.sort(column, descending=descending)
+        for i, spec in enumerate(self.table.columns):
+            mark = SORT_MARKS[descending] if i == column else ""
+            self.tree.heading(str(i), text=spec.title + mark)
+        self.offset = 0
+        self.refresh()
+
+    def _schedule_filter(self, *_):
+        if self._filter_job is not None:
+            self.frame.after_cancel(self._filter_job)
+        self._filter_job = self.frame.after(FILTER_DELAY_MS, self.apply_filter)
+
+    def apply_filter(self):
+        self._filter_job = None
+        if self.table is not None and self.table.set_filter(self.filter_var.get()):
+            self.offset = 0
+            self.refresh()
+
+    # Ventana visible
+
+    def _on_resize(self, event):
+        visible = max(1, (event.height - HEADER_HEIGHT) // ROW_HEIGHT)
+        if visible != self._visible_rows():
+            self.tree.configure(height=visible)
+            self.refresh()
+
+    def _visible_rows(self):
+        return int(self.tree.cget("height"))
+
+    def refresh(self):
+        """Reescribe los elementos del Treeview con las filas de la ventana actual"""
+        total = len(self.table) if self.table is not None else 0
+        visible = self._visible_rows()
+        self.offset = max(0, min(self.offset, total - visible))
+        shown = min(visible, total)
+
+        # Se crean o borran elementos solo si cambia cuántas filas caben
+        while len(self._items) < shown:
+            self._items.append(self.tree.insert("", "end"))
+        if len(self._items) > shown:
+            self.tree.delete(*self._items[shown:])
+            del self._items[shown:]
+
+        for i, item in enumerate(self._items):
+            self.tree.item(item, values=self.table.rows[self.table.order[self.offset + i]])
+
+        if total:
+            self.scrollbar.set(self.offset / total, (self.offset + shown) / total)
+        else:
+            self.scrollbar.set(0, 1)
+        self.summary_label.configure(text=self.table.summary() if self.table is not None else "")
+
+    def scroll(self, rows):
+        self.offset += rows
+        self.refresh()
+
+    def _on_scrollbar(self, action, value, unit=None):
+        total = len(self.table) if self.table is not None else 0
+        if action == "moveto":
+            self.offset = int(float(value) * total)
+        elif action == "scroll":
+            step = self._visible_rows() if unit == "pages" else 1
+            self.offset += int(value) * step
+        self.refresh()
+
+    def _on_wheel(self, event):
+        self.scroll(-3 if event.delta > 0 else 3)
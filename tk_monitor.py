@@ -0,0 +1,292 @@
+# tk_monitor.py
+#
+# Ventana de monitor en vivo de arktoolspc.py (Tkinter) sobre live_monitor.py.
+#
+# Igual que qt_monitor.py, cada tic pide solo las muestras nuevas y toca solo
+# lo que cambió: las etiquetas y barras se actualizan si su valor varía y las
+# gráficas desplazan sus segmentos del Canvas y crean únicamente los nuevos,
+# borrando los que salen por la izquierda.
+
+import math
+import time
+import tkinter as tk
+from collections import deque
+from tkinter import ttk
+
+import live_monitor
+from live_monitor import format_rate
+
+
+STEP_PX = 3                     # Píxeles por muestra
+PLOT_HEIGHT = 48
+PLOT_WIDTH = 640
+BACKGROUND = "black"
+GRID = "#282828"
+COLORS = ("#50c878", "#e6963c")
+
+
+def _nice_ceiling(value):
+    """Escala redondeada (1, 2, 5 x 10^n) que contiene a value"""
+    if value <= 0:
+        return 1.0
+    exponent = math.floor(math.log10(value))
+    for factor in (1, 2, 5, 10):
+        if value <= factor * 10 ** exponent:
+            return float(factor * 10 ** exponent)
+    return float(10 ** (exponent + 1))
+
+
+class Sparkline:
+    """
+    Gráfica sobre un Canvas con desplazamiento incremental: cada muestra es un
+    segmento; los nuevos se añaden a la derecha y el resto se mueve con una
+    sola llamada a Canvas.move.
+    """
+
+    def __init__(self, parent, series=1, scale=None, width=PLOT_WIDTH):
+        self.canvas = tk.Canvas(parent, width=width, height=PLOT_HEIGHT, bg=BACKGROUND,
+                                highlightthickness=0)
+        self.width = width
+        self.fixed_scale = scale
+        self.scale = scale or 1.0
+        visible = width // STEP_PX + 2
+        self._columns = [deque(maxlen=visible) for _ in range(series)]
+        self._segments = [deque() for _ in range(series)]
+        self._scrolled = 0
+        self.full_redraws = 0
+        self.canvas.create_line(0, PLOT_HEIGHT // 2, width, PLOT_HEIGHT // 2, fill=GRID)
+
+    def pack(self, **kwargs):
+        self.canvas.pack(**kwargs)
+
+    def _y(self, value):
+        if value != value:      # NaN: sin dato
+            value = 0.0
+        height = PLOT_HEIGHT - 1
+        return height - min(value / self.scale, 1.0) * (height - 1)
+
+    def add(self, *columns):
+        count = len(columns[0]) if columns else 0
+        if not count:
+            return
+        for buffer, values in zip(self._columns, columns):
+            buffer.extend(values)
+
+        rescale = False
+        if self.fixed_scale is None:
+            peak = max((v for values in columns for v in values if v == v), default=0.0)
+            if peak > self.scale:
+                rescale = True
+            self._scrolled += count
+            # Reducir la escala como mucho una vez por ancho de gráfica recorrido
+            if self._scrolled >= self._columns[0].maxlen:
+                self._scrolled = 0
+                rescale = True
+
+        if rescale and self._rescale():
+            self._redraw()
+        else:
+            self._draw_tail(count)
+
+    def _rescale(self):
+        visible = [v for buffer in self._columns for v in buffer if v == v]
+        scale = _nice_ceiling(max(visible) if visible else 0.0)
+        if scale == self.scale:
+            return False
+        self.scale = scale
+        return True
+
+    def _segment(self, n, x, before, after):
+        return self.canvas.create_line(x - STEP_PX, self._y(before), x, self._y(after),
+                                       fill=COLORS[n % len(COLORS)], tags="data")
+
+    def _redraw(self):
+        self.full_redraws += 1
+        self.canvas.delete("data")
+        for n, buffer in enumerate(self._columns):
+            values = list(buffer)
+            x0 = self.width - (len(values) - 1) * STEP_PX - 1
+            self._segments[n] = deque(self._segment(n, x0 + i * STEP_PX, values[i - 1], values[i])
+                                      for i in range(1, len(values)))
+
+    def _draw_tail(self, count):
+        self.canvas.move("data", -count * STEP_PX, 0)
+        for n, buffer in enumerate(self._columns):
+            if len(buffer) < 2:
+                continue
+            tail = list(buffer)[-(count + 1):]
+            x0 = self.width - (len(tail) - 1) * STEP_PX - 1
+            segments = self._segments[n]
+            for i in range(1, len(tail)):
+                segments.append(self._segment(n, x0 + i * STEP_PX, tail[i - 1], tail[i]))
+            while len(segments) >= buffer.maxlen:
+                self.canvas.delete(segments.popleft())
+
+
+class MonitorWindow:
+    """Ventana del monitor en vivo; el muestreo solo corre mientras está abierta"""
+
+    def __init__(self, root, monitor=None):
+        self.root = root
+        self.monitor = monitor or live_monitor.monitor
+        self.window = tk.Toplevel(root)
+        self.window.title("Monitor en vivo")
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+
+        self.seen = self.monitor.count
+        self.after_id = None
+        self.paused = False
+        self.texts = {}
+        self.render_seconds = 0.0
+        self.render_started = time.perf_counter()
+        self.core_bars = []
+        self.device_rows = {"disk": {}, "net": {}}
+
+        top = ttk.Frame(self.window)
+        top.pack(fill="x", padx=10, pady=5)
+        ttk.Label(top, text="Frecuencia (Hz):").pack(side="left")
+        self.rate_var = tk.DoubleVar(value=self.monitor.rate)
+        ttk.Spinbox(top, from_=live_monitor.MIN_RATE_HZ, to=live_monitor.MAX_RATE_HZ, increment=0.5,
+                    width=6, textvariable=self.rate_var, command=self.set_rate).pack(side="left", padx=5)
+        self.pause_button = ttk.Button(top, text="Pausar", command=self.toggle_pause)
+        self.pause_button.pack(side="left")
+        self.cost_var = tk.StringVar()
+        ttk.Label(top, textvariable=self.cost_var).pack(side="right")
+
+        cpu_frame = ttk.LabelFrame(self.window, text="CPU")
+        cpu_frame.pack(fill="x", padx=10, pady=5)
+        self.cpu_var = tk.StringVar(value="Uso total: -")
+        ttk.Label(cpu_frame, textvariable=self.cpu_var).pack(anchor="w")
+        self.cpu_plot = Sparkline(cpu_frame, scale=100.0)
+        self.cpu_plot.pack(fill="x")
+        self.cores_frame = ttk.Frame(cpu_frame)
+        self.cores_frame.pack(fill="x")
+
+        mem_frame = ttk.LabelFrame(self.window, text="Memoria")
+        mem_frame.pack(fill="x", padx=10, pady=5)
+        self.mem_var = tk.StringVar(value="En uso: -")
+        ttk.Label(mem_frame, textvariable=self.mem_var).pack(anchor="w")
+        self.mem_plot = Sparkline(mem_frame, scale=100.0)
+        self.mem_plot.pack(fill="x")
+
+        self.device_frames = {}
+        for kind, title in (("disk", "Discos (lectura / escritura)"), ("net", "Red (recibido / enviado)")):
+            frame = ttk.LabelFrame(self.window, text=title)
+            frame.pack(fill="x", padx=10, pady=5)
+            self.device_frames[kind] = frame
+
+        self._start()
+
+    # Control
+
+    def _start(self):
+        self.render_seconds = 0.0
+        self.render_started = time.perf_counter()
+        self.monitor.start()
+        self._schedule()
+
+    def _stop(self):
+        if self.after_id is not None:
+            self.window.after_cancel(self.after_id)
+            self.after_id = None
+        self.monitor.stop()
+
+    def _schedule(self):
+        self.after_id = self.window.after(int(1000 / self.monitor.rate), self.tick)
+
+    def set_rate(self):
+        try:
+            rate = self.monitor.set_rate(self.rate_var.get())
+        except (tk.TclError, ValueError):
+            return
+        self.rate_var.set(rate)
+
+    def toggle_pause(self):
+        self.paused = not self.paused
+        self.pause_button.configure(text="Continuar" if self.paused else "Pausar")
+        if self.paused:
+            self._stop()
+        else:
+            self._start()
+
+    def close(self):
+        self._stop()
+        self.window.destroy()
+
+    # Actualización incremental
+
+    def _set_text(self, var, text):
+        if self.texts.get(str(var)) != text:
+            self.texts[str(var)] = text
+            var.set(text)
+
+    def _add_core_bars(self, cores):
+        columns = 2 if len(cores) > 8 else 1
+        for n in cores[len(self.core_bars):]:
+            ttk.Label(self.cores_frame, text=f"Núcleo {n}").grid(row=n // columns, column=2 * (n % columns),
+                                                                 sticky="w", padx=(0, 5))
+            bar = ttk.Progressbar(self.cores_frame, maximum=100, length=250)
+            bar.grid(row=n // columns, column=2 * (n % columns) + 1, sticky="ew", pady=1)
+            self.core_bars.append([bar, None])
+
+    def _add_device_row(self, kind, device):
+        frame = self.device_frames[kind]
+        var = tk.StringVar(value=device)
+        ttk.Label(frame, textvariable=var).pack(anchor="w")
+        plot = Sparkline(frame, series=2)
+        plot.pack(fill="x")
+        self.device_rows[kind][device] = (var, plot)
+
+    def tick(self):
+        self.after_id = None
+        update = self.monitor.since(self.seen)
+        if not update.empty:
+            start = time.perf_counter()
+            self._apply(update)
+            self.render_seconds += time.perf_counter() - start
+            self._update_cost()
+        self._schedule()
+
+    def _apply(self, update):
+        self.seen = update.count
+        series = update.series
+
+        if "cpu.total" in series:
+            cores = self.monitor.cores()
+            if len(cores) > len(self.core_bars):
+                self._add_core_bars(cores)
+            total = series["cpu.total"]
+            self.cpu_plot.add(total)
+            self._set_text(self.cpu_var, f"Uso total: {total[-1]:.0f} %")
+            for n, entry in enumerate(self.core_bars):
+                value = series.get(f"cpu.{n}", [0.0])[-1]
+                if value == value and entry[1] != round(value):
+                    entry[1] = round(value)
+                    entry[0]["value"] = entry[1]
+
+        if "mem.percent" in series:
+            percent = series["mem.percent"]
+            self.mem_plot.add(percent)
+            self._set_text(self.mem_var, f"En uso: {series['mem.used'][-1] / 1024 ** 3:.1f} GB "
+                                         f"({percent[-1]:.0f} %)")
+
+        for kind, first, second, names in (("disk", "read", "write", ("L", "E")),
+                                           ("net", "recv", "sent", ("↓", "↑"))):
+            for device in self.monitor.devices(kind):
+                a = series.get(f"{kind}.{device}.{first}")
+                b = series.get(f"{kind}.{device}.{second}")
+                if a is None or b is None:
+                    continue
+                if device not in self.device_rows[kind]:
+                    self._add_device_row(kind, device)
+                var, plot = self.device_rows[kind][device]
+                plot.add(a, b)
+                self._set_text(var, f"{device}   {names[0]} {format_rate(a[-1] if a[-1] == a[-1] else 0)}"
+                                    f"   {names[1]} {format_rate(b[-1] if b[-1] == b[-1] else 0)}")
+
+    def _update_cost(self):
+        stats = self.monitor.stats()
+        wall = time.perf_counter() - self.render_started
+        render = 100.0 * self.render_seconds / wall / (live_monitor.psutil.cpu_count() or 1) if wall else 0.0
+        self._set_text(self.cost_var, f"Coste: muestreo {self.monitor.overhead_percent():.2f} %, "
+                                      f"dibujo {render:.2f} % de la CPU ({stats.samples} muestras)")
@@ -0,0 +1,542 @@
+# wmi_session.py
+#
+# Capa de sesión WMI compartida por todas las funciones de system_info.py.
+#
+# Cada hilo abre una única conexión WMI (COM exige una conexión por hilo) y la
+# reutiliza entre consultas. La conexión se renueva cuando supera su edad máxima
+# o cuando una consulta falla por una conexión caída. El backend es
+# intercambiable: por defecto usa el paquete `wmi`, pero se puede inyectar
+# cualquier fábrica (por ejemplo InMemoryWMI) para probar en Linux.
+#
+# Cada sonda declara con WMIQuery las propiedades que lee y select()/batch()
+# piden solo esas (SELECT Name, Capacity FROM ...) en lugar de la instancia
+# completa; las estadísticas cuentan filas y propiedades transferidas para
+# comparar con las consultas sin proyección (query()).
+
+import re
+import threading
+import time
+
+import diagnostics
+
+
+DEFAULT_NAMESPACE = "root\\cimv2"
+
+# wbemFlagReturnImmediately | wbemFlagForwardOnly
+WBEM_SEMISYNC_FLAGS = 0x10 | 0x20
+
+
+# HRESULT de conexión caída: solo estos justifican reconectar y repetir la
+# consulta. Los errores de la propia consulta (clase o propiedad inexistente,
+# WQL mal formado) se repetirían igual y se propagan sin reintento.
+CONNECTION_HRESULTS = frozenset({
+    0x800706BA,     # RPC_S_SERVER_UNAVAILABLE
+    0x800706BE,     # RPC_S_CALL_FAILED
+    0x800706BF,     # RPC_S_CALL_FAILED_DNE
+    0x80010007,     # RPC_E_SERVER_DIED
+    0x80010012,     # RPC_E_SERVER_DIED_DNE
+    0x80010108,     # RPC_E_DISCONNECTED
+    0x800401FD,     # CO_E_OBJNOTCONNECTED
+    0x80041015,     # WBEM_E_TRANSPORT_FAILURE
+    0x80041033,     # WBEM_E_SHUTTING_DOWN
+})
+
+# HRESULT de una consulta que el servidor rechaza: clase o propiedad que no
+# existe en esta versión de Windows o WQL mal formado
+QUERY_ERROR_HRESULTS = frozenset({
+    0x80041002,     # WBEM_E_NOT_FOUND
+    0x80041010,     # WBEM_E_INVALID_CLASS
+    0x80041017,     # WBEM_E_INVALID_QUERY
+})
+
+
+class WMIUnavailableError(RuntimeError):
+    """No hay backend WMI disponible en este sistema."""
+
+
+def _hresults(error):
+    """HRESULT de un pywintypes.com_error (o del que envuelve wmi.x_wmi), incluido el de excepinfo"""
+    error = getattr(error, "com_error", None) or error
+    args = getattr(error, "args", ())
+    if len(args) >= 1 and isinstance(args[0], int):
+        yield args[0] & 0xFFFFFFFF
+    # DISP_E_EXCEPTION lleva el código real de WMI en excepinfo[5] (scode)
+    if len(args) >= 3 and isinstance(args[2], tuple) and len(args[2]) > 5 and isinstance(args[2][5], int):
+        yield args[2][5] & 0xFFFFFFFF
+
+
+def is_connection_error(error):
+    """True si `error` indica una conexión WMI caída (y no un fallo de la consulta)"""
+    if isinstance(error, ConnectionError):
+        return True
+    return any(code in CONNECTION_HRESULTS for code in _hresults(error))
+
+
+def is_query_error(error):
+    """True si el servidor rechazó la consulta (clase o propiedad inexistente, WQL inválido)"""
+    return any(code in QUERY_ERROR_HRESULTS for code in _hresults(error))
+
+
+class WMIConnection:
+    """
+    Conexión de default_wmi_factory: el espacio de nombres del paquete `wmi`
+    (query() e instancias por clase) y, para los lotes, el SWbemServices del
+    mismo espacio de nombres abierto con win32com. Así _execute_batch no
+    depende de la API privada del paquete `wmi`.
+    """
+
+    def __init__(self, connection, namespace=None):
+        self.connection = connection
+        self.namespace = namespace or DEFAULT_NAMESPACE
+        self._services = None
+
+    @property
+    def services(self):
+        """SWbemServices (se abre en el primer lote)"""
+        if self._services is None:
+            import win32com.client
+            locator = win32com.client.Dispatch("WbemScripting.SWbemLocator")
+            self._services = locator.ConnectServer(".", self.namespace)
+        return self._services
+
+    def __getattr__(self, name):
+        return getattr(self.connection, name)
+
+
+def default_wmi_factory(namespace=None):
+    """
+    Abre una conexión con el paquete `wmi`, inicializando COM en el hilo actual
+    si es necesario (los hilos secundarios no lo tienen inicializado).
+    """
+    try:
+        import wmi
+    except ImportError as e:
+        raise WMIUnavailableError("El módulo 'wmi' no está instalado") from e
+
+    try:
+        import pythoncom
+        pythoncom.CoInitialize()
+    except ImportError:
+        pass
+
+    return WMIConnection(wmi.WMI(namespace=namespace) if namespace else wmi.WMI(), namespace)
+
+
+class WMIQuery:
+    """
+    Consulta declarada por una sonda: clase, propiedades que lee y filtro WQL
+    opcional. Sin propiedades equivale a SELECT * (todas).
+    """
+    __slots__ = ("class_name", "properties", "where", "namespace")
+
+    def __init__(self, class_name, properties=(), where=None, namespace=DEFAULT_NAMESPACE):
+        self.class_name = class_name
+        self.properties = tuple(properties)
+        self.where = where
+        self.namespace = namespace
+
+    @property
+    def wql(self):
+        text = f"SELECT {', '.join(self.properties) or '*'} FROM {self.class_name}"
+        return f"{text} WHERE {self.where}" if self.where else text
+
+    def __repr__(self):
+        return f"<WMIQuery {self.namespace}: {self.wql}>"
+
+
+def _namespace_key(namespace):
+    return (namespace or DEFAULT_NAMESPACE).replace("/", "\\").lower()
+
+
+def _marshalled(rows, properties):
+    """Propiedades transferidas: las proyectadas, o todas las de la clase con SELECT *"""
+    if not rows:
+        return 0
+    if properties:
+        return len(rows) * len(properties)
+    sample = rows[0]
+    names = getattr(sample, "properties", None)
+    return len(rows) * len(names if isinstance(names, dict) else vars(sample))
+
+
+def _projection(text):
+    """Propiedades de una consulta WQL literal (vacío si es SELECT *)"""
+    match = _WQL_RE.match(text.strip())
+    if not match or match.group("columns").strip() == "*":
+        return ()
+    return tuple(name.strip() for name in match.group("columns").split(","))
+
+
+def _com_row(obj, properties):
+    """Fila de SWbemObject leída de una vez: solo las propiedades pedidas (todas con SELECT *)"""
+    if properties:
+        return WMIObject(**{name: obj.Properties_(name).Value for name in properties})
+    return WMIObject(**{prop.Name: prop.Value for prop in obj.Properties_})
+
+
+def _execute_batch(connection, queries):
+    """Filas de cada consulta, todas sobre la misma conexión"""
+    if isinstance(connection, WMIConnection):
+        services = connection.services
+        # Semisíncronas: se lanzan todas antes de leer la primera, de modo que
+        # el servidor WMI las prepara a la vez en lugar de una tras otra
+        pending = [services.ExecQuery(query.wql, "WQL", WBEM_SEMISYNC_FLAGS) for query in queries]
+        return [[_com_row(obj, query.properties) for obj in result]
+                for query, result in zip(queries, pending)]
+    return [list(connection.query(query.wql)) for query in queries]
+
+
+class _ThreadState(threading.local):
+    def __init__(self):
+        self.connections = {}       # espacio de nombres -> (conexión, abierta en, generación)
+
+
+class WMISession:
+    """
+    Administra una conexión WMI por hilo (y por espacio de nombres) y acumula
+    estadísticas de tiempo de conexión frente a tiempo de consulta y de filas y
+    propiedades transferidas.
+    """
+
+    def __init__(self, factory=None, max_age=600.0):
+        self._factory = factory or default_wmi_factory
+        self.max_age = max_age
+        self._local = _ThreadState()
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._stats = {
+            "connects": 0,
+            "reconnects": 0,
+            "connect_time": 0.0,
+            "queries": 0,
+            "batches": 0,
+            "query_time": 0.0,
+            "rows": 0,
+            "properties": 0,
+        }
+
+    # Backend
+
+    def set_factory(self, factory):
+        """Cambia el backend y descarta las conexiones abiertas en todos los hilos"""
+        with self._lock:
+            self._factory = factory or default_wmi_factory
+            self._generation += 1
+
+    # Conexión
+
+    def _open(self, namespace):
+        start = time.perf_counter()
+        if _namespace_key(namespace) == _namespace_key(DEFAULT_NAMESPACE):
+            connection = self._factory()
+        else:
+            try:
+                connection = self._factory(namespace=namespace)
+            except TypeError:
+                raise WMIUnavailableError(f"El backend WMI no admite el espacio de nombres {namespace}") from None
+        elapsed = time.perf_counter() - start
+
+        with self._lock:
+            self._stats["connects"] += 1
+            self._stats["connect_time"] += elapsed
+            generation = self._generation
+        if diagnostics.enabled:
+            diagnostics.add_phase("wmi_connect", elapsed, connects=1)
+
+        self._local.connections[_namespace_key(namespace)] = (connection, time.monotonic(), generation)
+        return connection
+
+    def _is_stale(self, namespace=DEFAULT_NAMESPACE):
+        entry = self._local.connections.get(_namespace_key(namespace))
+        if entry is None:
+            return True
+        _, opened_at, generation = entry
+        if generation != self._generation:
+            return True
+        return self.max_age is not None and time.monotonic() - opened_at > self.max_age
+
+    def connection(self, namespace=DEFAULT_NAMESPACE):
+        """Devuelve la conexión del hilo actual, abriéndola o renovándola si hace falta"""
+        if self._is_stale(namespace):
+            return self._open(namespace)
+        return self._local.connections[_namespace_key(namespace)][0]
+
+    def invalidate(self, namespace=DEFAULT_NAMESPACE):
+        """Descarta la conexión del hilo actual; la próxima consulta reconecta"""
+        self._local.connections.pop(_namespace_key(namespace), None)
+
+    def invalidate_all(self):
+        """Descarta las conexiones de todos los hilos (por ejemplo para medir en frío)"""
+        with self._lock:
+            self._generation += 1
+
+    # Consultas
+
+    def _run(self, call, projections, namespace=DEFAULT_NAMESPACE):
+        """
+        Ejecuta call(conexión), que devuelve una lista de filas por consulta, y
+        anota tiempo, filas y propiedades. `projections` son las propiedades
+        pedidas en cada consulta (vacío = todas).
+        """
+        # El tiempo de consulta no incluye el de abrir la conexión (se cuenta aparte)
+        try:
+            connection = self.connection(namespace)
+            start = time.perf_counter()
+            results = call(connection)
+        except WMIUnavailableError:
+            raise
+        except Exception as e:
+            if not is_connection_error(e):
+                raise
+            # La conexión quedó inválida (RPC caído, servicio reiniciado...).
+            # Se reintenta una sola vez con una conexión nueva.
+            self.invalidate(namespace)
+            with self._lock:
+                self._stats["reconnects"] += 1
+            connection = self.connection(namespace)
+            start = time.perf_counter()
+            results = call(connection)
+
+        elapsed = time.perf_counter() - start
+        rows = sum(len(result) for result in results)
+        properties = sum(_marshalled(result, projection) for result, projection in zip(results, projections))
+        with self._lock:
+            self._stats["queries"] += len(results)
+            self._stats["batches"] += len(results) > 1
+            self._stats["query_time"] += elapsed
+            self._stats["rows"] += rows
+            self._stats["properties"] += properties
+        if diagnostics.enabled:
+            diagnostics.add_phase("wmi_query", elapsed, queries=len(results), rows=rows, properties=properties)
+        return results
+
+    def query(self, class_name, **filters):
+        """
+        Equivalente a `c.<class_name>(**filters)` sobre la conexión compartida.
+        Trae todas las propiedades; las sondas usan select() con las que leen.
+        Devuelve siempre una lista.
+        """
+        return self._run(lambda c: [list(getattr(c, class_name)(**filters))], [()])[0]
+
+    def wql(self, text):
+        """Ejecuta una consulta WQL literal sobre la conexión compartida"""
+        return self._run(lambda c: [list(c.query(text))], [_projection(text)])[0]
+
+    def select(self, query):
+        """Filas de una consulta declarada (WMIQuery), solo con sus propiedades"""
+        return self.batch([query])[0]
+
+    def batch(self, queries):
+        """
+        Ejecuta varias consultas declaradas y devuelve sus filas en el mismo
+        orden. Las que comparten espacio de nombres van juntas por la misma
+        conexión.
+        """
+        results = [None] * len(queries)
+        groups = {}
+        for i, query in enumerate(queries):
+            groups.setdefault(_namespace_key(query.namespace), []).append(i)
+        for indexes in groups.values():
+            group = [queries[i] for i in indexes]
+            rows = self._run(lambda c: _execute_batch(c, group), [q.properties for q in group],
+                             namespace=group[0].namespace)
+            for i, result in zip(indexes, rows):
+                results[i] = result
+        return results
+
+    # Estadísticas
+
+    def stats(self):
+        """Copia de las estadísticas acumuladas (tiempos en segundos)"""
+        with self._lock:
+            return dict(self._stats)
+
+    def reset_stats(self):
+        with self._lock:
+            for key in self._stats:
+                self._stats[key] = 0 if isinstance(self._stats[key], int) else 0.0
+
+    def format_stats(self):
+        s = self.stats()
+        return (
+            f"Conexiones: {s['connects']} ({s['connect_time'] * 1000:.1f} ms), "
+            f"reconexiones: {s['reconnects']}, "
+            f"consultas: {s['queries']} ({s['query_time'] * 1000:.1f} ms, {s['batches']} lotes), "
+            f"filas: {s['rows']}, propiedades: {s['properties']}"
+        )
+
+
+# Backend en memoria
+
+class WMIObject:
+    """Instancia WMI (simulada o leída de un SWbemObject): expone las propiedades como atributos"""
+
+    def __init__(self, **properties):
+        self.__dict__.update(properties)
+
+    def __getattr__(self, name):
+        # WMI devuelve None para propiedades sin valor
+        return None
+
+    def __repr__(self):
+        return f"<WMIObject {self.__dict__!r}>"
+
+
+class InMemoryWMI:
+    """
+    Sustituto de `wmi.WMI()` que sirve instancias desde un diccionario
+    {"Win32_Processor": [{...}, ...], ...}. Sirve para pruebas y para
+    reproducir equipos concretos sin Windows.
+    """
+
+    def __init__(self, classes=None):
+        self.classes = {}
+        for class_name, rows in (classes or {}).items():
+            self.add(class_name, rows)
+
+    def add(self, class_name, rows):
+        self.classes.setdefault(class_name, []).extend(
+            row if isinstance(row, WMIObject) else WMIObject(**row) for row in rows
+        )
+
+    def instances(self, class_name, **filters):
+        rows = self.classes.get(class_name, [])
+        if not filters:
+            return list(rows)
+        return [
+            row for row in rows
+            if all(getattr(row, key) == value for key, value in filters.items())
+        ]
+
+    def query(self, text):
+        """
+        Subconjunto de WQL suficiente para las consultas de la herramienta:
+        SELECT <props|*> FROM <clase> [WHERE <prop> = <valor> | <prop> LIKE '<patrón>' [AND ...]]
+        """
+        match = _WQL_RE.match(text.strip())
+        if not match:
+            raise ValueError(f"Consulta WQL no soportada: {text}")
+
+        columns, class_name, where = match.group("columns", "class_name", "where")
+        conditions = [_parse_condition(part) for part in _split_and(where)] if where else []
+        rows = [
+            row for row in self.classes.get(class_name, [])
+            if all(condition(row) for condition in conditions)
+        ]
+
+        if columns.strip() == "*":
+            return rows
+        names = [name.strip() for name in columns.split(",")]
+        return [WMIObject(**{name: getattr(row, name) for name in names}) for row in rows]
+
+    def __getattr__(self, class_name):
+        if not class_name.startswith("Win32_") and not class_name.startswith("CIM_"):
+            raise AttributeError(class_name)
+        return lambda **filters: self.instances(class_name, **filters)
+
+
+_WQL_RE = re.compile(
+    r"SELECT\s+(?P<columns>.+?)\s+FROM\s+(?P<class_name>\w+)(?:\s+WHERE\s+(?P<where>.+))?$",
+    re.IGNORECASE | re.DOTALL,
+)
+_CONDITION_RE = re.compile(
+    r"(?P<name>\w+)\s*(?P<op>=|<>|!=|LIKE)\s*(?P<value>'(?:[^'\\]|\\.)*'|\S+)$",
+    re.IGNORECASE,
+)
+
+
+def _split_and(where):
+    # Divide por AND fuera de los literales de texto
+    parts, current, quoted = [], [], False
+    tokens = re.split(r"(\s+AND\s+|')", where, flags=re.IGNORECASE)
+    for token in tokens:
+        if token == "'":
+            quoted = not quoted
+            current.append(token)
+        elif not quoted and re.fullmatch(r"\s+AND\s+", token, re.IGNORECASE):
+            parts.append("".join(current))
+            current = []
+        else:
+            current.append(token)
+    parts.append("".join(current))
+    return [part.strip() for part in parts if part.strip()]
+
+
+def _parse_literal(value):
+    if value.startswith("'"):
+        return re.sub(r"\\(.)", r"\1", value[1:-1])
+    upper = value.upper()
+    if upper in ("TRUE", "FALSE"):
+        return upper == "TRUE"
+    if upper == "NULL":
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        return value
+
+
+def _like_to_regex(pattern):
+    out = []
+    for char in pattern:
+        if char == "%":
+            out.append(".*")
+        elif char == "_":
+            out.append(".")
+        else:
+            out.append(re.escape(char))
+    return re.compile("".join(out), re.IGNORECASE | re.DOTALL)
+
+
+def _parse_condition(text):
+    match = _CONDITION_RE.match(text)
+    if not match:
+        raise ValueError(f"Condición WQL no soportada: {text}")
+    name, op, value = match.group("name"), match.group("op").upper(), _parse_literal(match.group("value"))
+
+    if op == "LIKE":
+        regex = _like_to_regex(str(value))
+        return lambda row: regex.fullmatch(str(getattr(row, name) or "")) is not None
+    if op == "=":
+        return lambda row: _wql_equals(getattr(row, name), value)
+    return lambda row: not _wql_equals(getattr(row, name), value)
+
+
+def _wql_equals(actual, expected):
+    # WQL compara cadenas sin distinguir mayúsculas
+    if isinstance(actual, str) and isinstance(expected, str):
+        return actual.lower() == expected.lower()
+    return actual == expected
+
+
+def quote(value):
+    """Literal WQL de texto con las barras invertidas y comillas escapadas"""
+    return "'" + str(value).replace("\\", "\\\\").replace("'", "\\'") + "'"
+
+
+# Sesión global usada por system_info.py
+session = WMISession()
+
+
+def query(class_name, **filters):
+    return session.query(class_name, **filters)
+
+
+def wql(text):
+    return session.wql(text)
+
+
+def select(query):
+    return session.select(query)
+
+
+def batch(queries):
+    return session.batch(queries)
+
+
+def set_backend(factory):
+    """
+    Sustituye el backend WMI global. `factory` es un invocable que devuelve un
+    objeto compatible con `wmi.WMI()`; None restaura el backend por defecto.
+    """
+    session.set_factory(factory)